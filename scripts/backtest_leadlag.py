@@ -0,0 +1,84 @@
+"""lead-lag 설정 그리드 walk-forward 백테스트.
+
+sector_performance 전체 히스토리(얼린 연도 샤드 포함)로 점수 → 시그널 → 채점을
+재현해 설정별 적중률을 비교한다. DB에는 아무것도 쓰지 않는다.
+
+사용법:
+    python scripts/backtest_leadlag.py
+    python scripts/backtest_leadlag.py --lookback 60 120 --max-lag 1 2 --jobs 4
+    python scripts/backtest_leadlag.py --start 2024-01-01 --json backtest.json --top 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.backtest import build_grid, load_panel, run_backtest
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _format_row(row: dict) -> str:
+    hit_rate = f"{row['hit_rate']:.1%}" if row["hit_rate"] is not None else "-"
+    mean_return = (
+        f"{row['mean_signed_return']:+.2f}%" if row["mean_signed_return"] is not None else "-"
+    )
+    return (
+        f"lookback={row['lookback_days']:>3}  max_lag={row['max_lag']}  "
+        f"min_corr={row['min_correlation']:.2f}  min_move={row['min_leader_move']:.1f}  "
+        f"signals={row['signals']:>6}  verified={row['verified']:>6}  "
+        f"hit={hit_rate:>6}  mean={mean_return:>7}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="lead-lag 파라미터 walk-forward 백테스트")
+    parser.add_argument("--start", default=None, help="히스토리 시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="히스토리 종료일 (YYYY-MM-DD)")
+    parser.add_argument("--lookback", type=int, nargs="+", help="LEADLAG_LOOKBACK_DAYS 후보")
+    parser.add_argument("--max-lag", type=int, nargs="+", help="LEADLAG_MAX_LAG 후보")
+    parser.add_argument("--min-corr", type=float, nargs="+", help="LEADLAG_MIN_CORRELATION 후보")
+    parser.add_argument("--min-move", type=float, nargs="+", help="LEADLAG_SIGNAL_MIN_LEADER_MOVE 후보")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("--top", type=int, default=None, help="적중률 상위 N개만 출력")
+    parser.add_argument("--json", type=Path, default=None, help="전체 결과를 JSON으로 저장할 경로")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    panel = load_panel(args.start, args.end)
+    if not len(panel.dates):
+        raise SystemExit("백테스트 불가: 섹터 성과 데이터 없음")
+    logger.info(
+        f"패널 로드: {panel.dates[0]} ~ {panel.dates[-1]}, "
+        f"섹터 {len(panel.sectors)}개 × 국가 {len(panel.countries)}개 × {len(panel.dates)}일"
+    )
+
+    grid = build_grid(args.lookback, args.max_lag, args.min_corr, args.min_move)
+    results = run_backtest(panel, grid, jobs=args.jobs)
+    for row in results[: args.top] if args.top else results:
+        print(_format_row(row))
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(results, ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        logger.info(f"결과 저장: {args.json}")
+    logger.info(f"백테스트 완료: 설정 {len(results)}개, {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
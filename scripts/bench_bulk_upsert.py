@@ -0,0 +1,119 @@
+"""Compare row-by-row and staging-table upserts at several batch sizes.
+
+For each size the benchmark upserts synthetic rows twice into a fresh scratch
+DB: once as new rows and once more as a re-save of the same snapshot (the
+common case when a market is collected again on the same day). It times
+``upsert_stock_daily`` on the raw DB and ``upsert_instrument_universe`` on
+the summary DB with ``BULK_UPSERT_THRESHOLD`` forced off and on, and
+reports how many bytes each step appended to the DB's WAL file.
+
+사용법:
+    python -m scripts.bench_bulk_upsert
+    python -m scripts.bench_bulk_upsert --sizes 5000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+
+DEFAULT_SIZES = (5_000, 50_000, 500_000)
+MODES = {"row-by-row": 10**12, "staging": 0}
+
+
+def _synthetic_rows(size: int) -> list[dict]:
+    return [
+        {
+            "date": "2026-04-20",
+            "country": "US",
+            "ticker": f"T{index:07d}",
+            "name": f"Ticker {index}",
+            "sector": f"Sector {index % 11}",
+            "market_cap": 1_000_000_000 + index,
+            "close_price": 100.0 + index % 50,
+            "daily_return": (index % 7) - 3.0,
+            "volume": 1_000_000,
+            "avg_volume_20d": 900_000,
+            "is_filtered": 1,
+            "is_abnormal": 0,
+        }
+        for index in range(size)
+    ]
+
+
+def _wal_bytes(db_path: Path) -> int:
+    wal_path = db_path.with_name(db_path.name + "-wal")
+    return wal_path.stat().st_size if wal_path.exists() else 0
+
+
+def _measure(db_path: Path, conn, func) -> tuple[float, int]:
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    started = time.perf_counter()
+    func()
+    conn.commit()
+    return time.perf_counter() - started, _wal_bytes(db_path)
+
+
+def _run(size: int, threshold: int) -> dict[str, tuple[float, int]]:
+    rows = _synthetic_rows(size)
+    timings: dict[str, tuple[float, int]] = {}
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        data_dir = Path(tempdir)
+        with patch.object(database, "DATA_DIR", data_dir), patch.object(
+            database, "DB_PATH", data_dir / "marketbot.db"
+        ), patch.object(database, "RAW_DB_PATH", data_dir / "marketbot_raw.db"), patch.object(
+            database, "BULK_UPSERT_THRESHOLD", threshold
+        ):
+            database._reset_schema_guard()
+            with database.DatabaseSession() as session:
+                for label in ("stock_daily insert", "stock_daily resave"):
+                    timings[label] = _measure(
+                        database.RAW_DB_PATH,
+                        session.raw,
+                        lambda: database.upsert_stock_daily(session.raw, rows),
+                    )
+                for label in ("universe insert", "universe resave"):
+                    timings[label] = _measure(
+                        database.DB_PATH,
+                        session.summary,
+                        lambda: database.upsert_instrument_universe(session.summary, "US", rows),
+                    )
+            database._reset_schema_guard()
+
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="bulk upsert benchmark")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="배치 크기 목록 (기본 5000 50000 500000)",
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(f"rows={size}")
+        results = {mode: _run(size, threshold) for mode, threshold in MODES.items()}
+        for label in results["row-by-row"]:
+            line = f"  {label:<20}"
+            for mode, timings in results.items():
+                elapsed, wal_bytes = timings[label]
+                line += f"  {mode} {size / elapsed:>9,.0f} rows/s {wal_bytes / 1024:>8,.0f} KiB WAL"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
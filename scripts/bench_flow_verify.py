@@ -0,0 +1,168 @@
+"""Compare per-signal flow signal verification with the set-based pass.
+
+Seeds a scratch summary DB with a year of sector returns for every country
+and sector and the backlog a data gap leaves behind: pending signals (lag
+1/2) created over the last BACKLOG_DAYS, while two follower markets stopped
+reporting GAP_DAYS ago so part of the backlog expires instead of verifying.
+It then copies the DB and times the old loop — one ``get_sector_return_after`` and one
+``resolve_flow_signal`` per signal — against ``resolve_pending_flow_signals``.
+Resulting ``flow_signals`` tables must match exactly.
+
+사용법:
+    python -m scripts.bench_flow_verify
+    python -m scripts.bench_flow_verify --signals 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+from src.config import COUNTRIES, SECTORS
+
+DEFAULT_SIGNALS = (1_000, 10_000)
+END_DATE = date(2026, 4, 20)
+EXPIRE_BEFORE = (END_DATE - timedelta(days=7)).isoformat()
+BACKLOG_DAYS = 45
+GAP_DAYS = 20
+
+
+def _seed(conn, n_signals: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    days = [
+        (END_DATE - timedelta(days=offset)).isoformat()
+        for offset in range(365, -1, -1)
+        if (END_DATE - timedelta(days=offset)).weekday() < 5
+    ]
+    countries = list(COUNTRIES)
+    sectors = sorted(set(SECTORS.values()))
+    gap_start = (END_DATE - timedelta(days=GAP_DAYS)).isoformat()
+    conn.executemany(
+        """
+        INSERT INTO sector_performance (
+            date, country, sector, daily_return, breadth, stock_count, collected_at
+        )
+        VALUES (?, ?, ?, ?, 0.5, 10, ?)
+        """,
+        (
+            (day, country, sector, round(float(value), 2), day)
+            for day in days
+            for country_index, country in enumerate(countries)
+            if country_index >= 2 or day < gap_start
+            for sector, value in zip(sectors, rng.normal(size=len(sectors)))
+            if rng.random() > 0.05
+        ),
+    )
+    backlog = [day for day in days if day >= (END_DATE - timedelta(days=BACKLOG_DAYS)).isoformat()]
+    signals = []
+    for _ in range(n_signals):
+        leader, follower = rng.choice(countries, size=2, replace=False)
+        signals.append(
+            {
+                "created_date": backlog[int(rng.integers(len(backlog)))],
+                "sector": sectors[int(rng.integers(len(sectors)))],
+                "leader": str(leader),
+                "follower": str(follower),
+                "lag": int(rng.integers(1, 3)),
+                "leader_return": 1.5,
+                "predicted_direction": 1 if rng.random() < 0.5 else -1,
+                "correlation": 0.5,
+            }
+        )
+    database.upsert_flow_signals(conn, signals)
+    conn.commit()
+
+
+def _verify_per_signal(conn) -> dict:
+    verified = expired = 0
+    for signal in database.get_flow_signals(conn, status="pending"):
+        outcome = database.get_sector_return_after(
+            conn,
+            signal["follower"],
+            signal["sector"],
+            signal["created_date"],
+            max(int(signal["lag"] or 1) - 1, 0),
+        )
+        if outcome is not None and outcome["daily_return"] is not None:
+            follower_return = float(outcome["daily_return"])
+            database.resolve_flow_signal(
+                conn,
+                signal["id"],
+                status="verified",
+                target_date=outcome["date"],
+                follower_return=follower_return,
+                hit=int(follower_return * signal["predicted_direction"] > 0),
+            )
+            verified += 1
+        elif signal["created_date"] < EXPIRE_BEFORE:
+            database.resolve_flow_signal(conn, signal["id"], status="expired")
+            expired += 1
+    return {"verified": verified, "expired": expired}
+
+
+def _timed(db_path: Path, func) -> tuple[float, dict, list[tuple]]:
+    conn = database._connect(db_path)
+    try:
+        started = time.perf_counter()
+        outcome = func(conn)
+        conn.commit()
+        seconds = time.perf_counter() - started
+        rows = conn.execute(
+            "SELECT id, status, target_date, follower_return, hit FROM flow_signals ORDER BY id"
+        ).fetchall()
+    finally:
+        conn.close()
+    return seconds, outcome, [tuple(row) for row in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="flow signal 채점 벤치마크")
+    parser.add_argument("--signals", type=int, nargs="+", default=list(DEFAULT_SIGNALS))
+    args = parser.parse_args()
+
+    for n_signals in args.signals:
+        with tempfile.TemporaryDirectory() as tempdir:
+            data_dir = Path(tempdir)
+            with patch.object(database, "DATA_DIR", data_dir), patch.object(
+                database, "DB_PATH", data_dir / "marketbot.db"
+            ), patch.object(database, "RAW_DB_PATH", data_dir / "marketbot_raw.db"):
+                database._reset_schema_guard()
+                database.init_db()
+                conn = database.get_connection()
+                try:
+                    _seed(conn, n_signals)
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                finally:
+                    conn.close()
+                copy_path = data_dir / "marketbot_copy.db"
+                shutil.copy(database.DB_PATH, copy_path)
+
+                loop_seconds, loop_outcome, loop_rows = _timed(database.DB_PATH, _verify_per_signal)
+                set_seconds, set_outcome, set_rows = _timed(
+                    copy_path,
+                    lambda conn: database.resolve_pending_flow_signals(conn, EXPIRE_BEFORE),
+                )
+
+        if loop_rows != set_rows or loop_outcome != set_outcome:
+            raise SystemExit(f"signals={n_signals}: set-based 결과가 per-signal 결과와 다릅니다")
+        print(
+            f"signals={n_signals:>6}  verified={set_outcome['verified']:>6} "
+            f"expired={set_outcome['expired']:>5}  per-signal {loop_seconds:7.3f}s  "
+            f"set-based {set_seconds:7.3f}s  x{loop_seconds / max(set_seconds, 1e-9):.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Count SQLite statements spent on schema setup during one collection run.
+
+A VN incremental run calls ``init_db()`` from ``BaseCollector.run``, the
+failure-policy lookup, every checkpoint save and the final checkpoint clear,
+and the report step adds one call per ``compute_*``. This replays that call
+pattern against a scratch DB and compares the legacy behaviour (full schema
+script on every call) with the versioned, once-per-process initialization.
+
+사용법:
+    python -m scripts.bench_init_db
+    python -m scripts.bench_init_db --checkpoint-batches 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+
+
+def _simulated_run_calls(checkpoint_batches: int) -> list[str]:
+    """init_db/init_raw_db call sequence for one VN run plus report prep."""
+    calls = ["init_db"]  # BaseCollector.run
+    calls.append("init_db")  # VietnamCollector._load_recent_failure_policy
+    calls.append("init_db")  # VietnamCollector._load_pending_checkpoint
+    calls.extend(["init_db"] * checkpoint_batches)  # _save_checkpoint per batch
+    calls.append("init_db")  # _clear_checkpoint
+    calls.append("init_raw_db")  # BaseCollector.run
+    calls.append("init_db")  # collect_benchmarks
+    calls.extend(["init_db"] * 4)  # compute_trend_scores + lead-lag steps
+    return calls
+
+
+def _legacy_init(path, migrations) -> None:
+    conn = database._connect(path, "durable")
+    try:
+        for _, _, migrate in migrations:
+            migrate(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _count_statements(calls: list[str], *, legacy: bool) -> tuple[int, float]:
+    counter = {"statements": 0}
+    original_connect = database._connect
+
+    def counting_connect(path, profile="durable") -> sqlite3.Connection:
+        conn = original_connect(path, profile)
+        counter["statements"] += 1  # connection-level PRAGMAs issued in _connect
+        conn.set_trace_callback(
+            lambda _sql: counter.__setitem__("statements", counter["statements"] + 1)
+        )
+        return conn
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        data_dir = Path(tempdir)
+        with patch.object(database, "DATA_DIR", data_dir), patch.object(
+            database, "DB_PATH", data_dir / "marketbot.db"
+        ), patch.object(database, "RAW_DB_PATH", data_dir / "marketbot_raw.db"), patch.object(
+            database, "_connect", counting_connect
+        ):
+            database._reset_schema_guard()
+            started = time.perf_counter()
+            for call in calls:
+                if legacy:
+                    if call == "init_db":
+                        _legacy_init(database.DB_PATH, database.SUMMARY_MIGRATIONS)
+                    else:
+                        _legacy_init(database.RAW_DB_PATH, database.RAW_MIGRATIONS)
+                else:
+                    getattr(database, call)()
+            elapsed = time.perf_counter() - started
+            database._reset_schema_guard()
+
+    return counter["statements"], elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="init_db statement benchmark")
+    parser.add_argument(
+        "--checkpoint-batches",
+        type=int,
+        default=5,
+        help="VN checkpoint 저장 횟수 (기본 5)",
+    )
+    args = parser.parse_args()
+
+    calls = _simulated_run_calls(args.checkpoint_batches)
+    legacy_count, legacy_elapsed = _count_statements(calls, legacy=True)
+    guarded_count, guarded_elapsed = _count_statements(calls, legacy=False)
+
+    print(f"init calls per run: {len(calls)}")
+    print(f"before (full schema every call): {legacy_count} statements, {legacy_elapsed * 1000:.1f} ms")
+    print(f"after  (versioned + guarded):    {guarded_count} statements, {guarded_elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Compare the per-pair lead-lag loop with the vectorized panel engine.
+
+Builds a synthetic sector return history (LEADLAG_LOOKBACK_DAYS of business
+days, ~10% missing days and some zero returns) and times the old path —
+per-sector pivot, ``_score_pair`` for every country permutation — against
+``score_lead_lag_history``. Results must match exactly.
+
+사용법:
+    python -m scripts.bench_leadlag
+    python -m scripts.bench_leadlag --countries 7 20 50 --sectors 11
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from itertools import permutations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src import leadlag
+from src.config import COUNTRIES, LEADLAG_LOOKBACK_DAYS, LEADLAG_MIN_OVERLAP
+
+DEFAULT_COUNTRIES = (7, 20, 50)
+
+
+def _synthetic_history(
+    n_countries: int,
+    n_sectors: int,
+    seed: int = 0,
+    days: int = LEADLAG_LOOKBACK_DAYS,
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    countries = list(COUNTRIES)[:n_countries]
+    countries += [f"X{index:02d}" for index in range(n_countries - len(countries))]
+    dates = pd.bdate_range(end="2026-04-20", periods=days * 5 // 7)
+    frames = []
+    for sector_index in range(n_sectors):
+        driver = rng.normal(size=len(dates) + 2)
+        for country_index, country in enumerate(countries):
+            lag = country_index % 3
+            returns = 0.6 * driver[2 - lag : len(dates) + 2 - lag] + rng.normal(size=len(dates))
+            returns = np.round(returns, 1)
+            keep = rng.random(len(dates)) > 0.1
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "date": dates[keep].strftime("%Y-%m-%d"),
+                        "country": country,
+                        "sector": f"Sector {sector_index:02d}",
+                        "daily_return": returns[keep],
+                    }
+                )
+            )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _per_pair_scores(history: pd.DataFrame) -> list[dict]:
+    rows = []
+    for sector, sector_frame in history.groupby("sector"):
+        pivot = sector_frame.pivot_table(
+            index="date",
+            columns="country",
+            values="daily_return",
+        ).sort_index()
+        countries = [c for c in pivot.columns if pivot[c].notna().sum() >= LEADLAG_MIN_OVERLAP]
+        for leader, follower in permutations(countries, 2):
+            scored = leadlag._score_pair(pivot, leader, follower)
+            if scored is not None:
+                rows.append({"sector": sector, "leader": leader, "follower": follower, **scored})
+    return rows
+
+
+def _timed(func, history):
+    started = time.perf_counter()
+    result = func(history)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="lead-lag engine benchmark")
+    parser.add_argument(
+        "--countries",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_COUNTRIES),
+        help="국가 수 목록 (기본 7 20 50)",
+    )
+    parser.add_argument("--sectors", type=int, default=11, help="섹터 수 (기본 11)")
+    args = parser.parse_args()
+
+    for n_countries in args.countries:
+        history = _synthetic_history(n_countries, args.sectors)
+        loop_seconds, loop_rows = _timed(_per_pair_scores, history)
+        panel_seconds, panel_rows = _timed(leadlag.score_lead_lag_history, history)
+        if loop_rows != panel_rows:
+            raise SystemExit(f"countries={n_countries}: results differ")
+        print(
+            f"countries={n_countries:>3} pairs={len(panel_rows):>6}  "
+            f"per-pair {loop_seconds:>8.3f}s  panel {panel_seconds:>7.3f}s  "
+            f"x{loop_seconds / panel_seconds:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Time the cross-sector lead-lag engine on a year of synthetic history.
+
+Builds the ``bench_leadlag`` synthetic history over ``--days`` calendar days
+(default 365), adds a market-wide daily factor so some cross-sector pairs
+pass the correlation cut, and scores every (country, sector) -> (other
+country, other sector) pair three ways: ``_score_pair`` on a two-column
+frame per pair, the batched engine with per-lag products and the batched
+engine with FFT cross-correlation. The loop and the direct engine must pick the same lags
+and observation counts with correlations within 1e-4; direct and FFT must
+agree the same way. The significance stage is then timed on the pairs that
+pass ``LEADLAG_CROSS_SECTOR_MIN_CORRELATION``.
+
+사용법:
+    python -m scripts.bench_leadlag_cross_sector
+    python -m scripts.bench_leadlag_cross_sector --countries 7 20 --days 365 --skip-loop
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.bench_leadlag import _synthetic_history
+from src import leadlag
+from src.config import (
+    LEADLAG_CROSS_SECTOR_MIN_CORRELATION,
+    LEADLAG_MIN_OVERLAP,
+    LEADLAG_SIGNIFICANCE_RESAMPLES,
+)
+from src.panel import SectorReturnPanel
+
+DEFAULT_COUNTRIES = (7,)
+
+
+def _with_market_factor(history: pd.DataFrame, weight: float, seed: int = 1) -> pd.DataFrame:
+    dates = np.sort(history["date"].unique())
+    factor = pd.Series(np.random.default_rng(seed).normal(size=len(dates)), index=dates)
+    returns = history["daily_return"] + weight * history["date"].map(factor).to_numpy()
+    return history.assign(daily_return=np.round(returns, 1))
+
+
+def _per_pair_scores(panel: SectorReturnPanel) -> list[dict]:
+    rows = []
+    for leader_sector, sector_values in zip(panel.sectors, panel.values):
+        for leader, leader_series in zip(panel.countries, sector_values):
+            if np.isfinite(leader_series).sum() < LEADLAG_MIN_OVERLAP:
+                continue
+            for follower_sector, follower_values in zip(panel.sectors, panel.values):
+                if follower_sector == leader_sector:
+                    continue
+                for follower, follower_series in zip(panel.countries, follower_values):
+                    if follower == leader or np.isfinite(follower_series).sum() < LEADLAG_MIN_OVERLAP:
+                        continue
+                    frame = pd.DataFrame({leader: leader_series, follower: follower_series})
+                    scored = leadlag._score_pair(frame, leader, follower)
+                    if scored is not None:
+                        rows.append(
+                            {
+                                "sector": leader_sector,
+                                "follower_sector": follower_sector,
+                                "leader": leader,
+                                "follower": follower,
+                                **scored,
+                            }
+                        )
+    return rows
+
+
+def _timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def _mismatches(left: list[dict], right: list[dict]) -> int:
+    def keyed(rows):
+        return {
+            (row["sector"], row["follower_sector"], row["leader"], row["follower"]): row
+            for row in rows
+        }
+
+    left, right = keyed(left), keyed(right)
+    return sum(
+        key not in right
+        or (left[key]["lag"], left[key]["n_obs"]) != (right[key]["lag"], right[key]["n_obs"])
+        or abs(left[key]["correlation"] - right[key]["correlation"]) > 1e-4
+        for key in left
+    ) + len(right.keys() - left.keys())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="cross-sector lead-lag benchmark")
+    parser.add_argument("--countries", type=int, nargs="+", default=list(DEFAULT_COUNTRIES))
+    parser.add_argument("--sectors", type=int, default=11, help="섹터 수 (기본 11)")
+    parser.add_argument("--days", type=int, default=365, help="캘린더 일수 (기본 365)")
+    parser.add_argument("--market-weight", type=float, default=1.0, help="시장 공통 요인 비중")
+    parser.add_argument("--skip-loop", action="store_true", help="페어별 루프 생략")
+    args = parser.parse_args()
+
+    for n_countries in args.countries:
+        history = _with_market_factor(
+            _synthetic_history(n_countries, args.sectors, days=args.days), args.market_weight
+        )
+        panel = SectorReturnPanel.from_history(history)
+        direct_seconds, direct = _timed(leadlag.score_cross_sector_panel, panel, "direct")
+        fft_seconds, fft = _timed(leadlag.score_cross_sector_panel, panel, "fft")
+        if _mismatches(direct, fft):
+            raise SystemExit(f"countries={n_countries}: direct and fft results differ")
+        significance_seconds, _ = _timed(leadlag.score_significance, panel, direct)
+        line = (
+            f"countries={n_countries:>3} dates={len(panel.dates)} stored={len(direct):>6}  "
+            f"direct {direct_seconds:7.2f}s  fft {fft_seconds:7.2f}s  "
+            f"significance x{LEADLAG_SIGNIFICANCE_RESAMPLES} {significance_seconds:7.2f}s"
+        )
+        if not args.skip_loop:
+            loop_seconds, loop = _timed(_per_pair_scores, panel)
+            cut = [
+                row
+                for row in loop
+                if abs(row["correlation"]) >= LEADLAG_CROSS_SECTOR_MIN_CORRELATION
+            ]
+            if _mismatches(cut, direct):
+                raise SystemExit(f"countries={n_countries}: per-pair and batched results differ")
+            line += (
+                f"  per-pair ({len(loop)} pairs) {loop_seconds:7.2f}s  "
+                f"x{loop_seconds / direct_seconds:,.0f}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
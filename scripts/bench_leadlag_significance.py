@@ -0,0 +1,142 @@
+"""Compare a per-pair resampling loop with the batched significance stage.
+
+Builds the same synthetic sector return history as ``bench_leadlag`` (one
+lookback window, ~10% missing days), scores it with the panel engine and
+times permutation p-values plus bootstrap intervals two ways: a loop that
+draws one permutation and one bootstrap sample per pair per resample, and
+``score_significance`` shuffling every pair at once (serial and with
+``--jobs`` processes). The two use different random streams, so the report
+shows how far their p-values and interval bounds drift apart rather than
+requiring an exact match; the serial and parallel batched runs must match
+exactly.
+
+사용법:
+    python -m scripts.bench_leadlag_significance
+    python -m scripts.bench_leadlag_significance --countries 7 --resamples 1000 --jobs 4
+    python -m scripts.bench_leadlag_significance --countries 7 20 50 --skip-loop --resamples 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.bench_leadlag import _synthetic_history
+from src import leadlag
+from src.config import LEADLAG_CONFIDENCE_LEVEL, LEADLAG_MIN_OVERLAP
+from src.panel import SectorReturnPanel
+
+DEFAULT_COUNTRIES = (7,)
+
+
+def _correlation(x: np.ndarray, y: np.ndarray) -> float:
+    if x.std() == 0 or y.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(x, y)[0, 1])
+
+
+def _best_abs(leader: np.ndarray, follower: np.ndarray, lags: list[int]) -> float:
+    best = 0.0
+    for lag in lags:
+        correlation = abs(_correlation(leader[: len(leader) - lag], follower[lag:]))
+        if correlation > best:
+            best = correlation
+    return best
+
+
+def _per_pair_significance(history: pd.DataFrame, scores: list[dict], n_resamples: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    pivots = {
+        sector: frame.pivot_table(index="date", columns="country", values="daily_return").sort_index()
+        for sector, frame in history.groupby("sector")
+    }
+    tail = (1 - LEADLAG_CONFIDENCE_LEVEL) / 2
+    rows = []
+    for row in scores:
+        aligned = pivots[row["sector"]][[row["leader"], row["follower"]]].dropna()
+        leader = aligned[row["leader"]].to_numpy()
+        follower = aligned[row["follower"]].to_numpy()
+        lags = [
+            lag
+            for lag in leadlag._allowed_lags(row["leader"], row["follower"])
+            if len(leader) - lag >= LEADLAG_MIN_OVERLAP
+        ]
+        observed = _best_abs(leader, follower, lags)
+        exceed = sum(
+            _best_abs(leader, rng.permutation(follower), lags) >= observed - 1e-9
+            for _ in range(n_resamples)
+        )
+        x = leader[: len(leader) - row["lag"]]
+        y = follower[row["lag"] :]
+        bootstrap = []
+        for _ in range(n_resamples):
+            picks = rng.integers(len(x), size=len(x))
+            bootstrap.append(_correlation(x[picks], y[picks]))
+        ci_low, ci_high = np.nanquantile(bootstrap, [tail, 1 - tail])
+        rows.append(
+            {
+                **row,
+                "p_value": round((1 + exceed) / (1 + n_resamples), 4),
+                "ci_low": round(float(ci_low), 4),
+                "ci_high": round(float(ci_high), 4),
+            }
+        )
+    return rows
+
+
+def _timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def _max_drift(left: list[dict], right: list[dict], name: str) -> float:
+    return max(abs(a[name] - b[name]) for a, b in zip(left, right))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="lead-lag significance benchmark")
+    parser.add_argument("--countries", type=int, nargs="+", default=list(DEFAULT_COUNTRIES))
+    parser.add_argument("--sectors", type=int, default=11, help="섹터 수 (기본 11)")
+    parser.add_argument("--resamples", type=int, default=1000, help="재표본 수 (기본 1000)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="병렬 프로세스 수")
+    parser.add_argument("--skip-loop", action="store_true", help="페어별 루프 생략")
+    args = parser.parse_args()
+
+    for n_countries in args.countries:
+        history = _synthetic_history(n_countries, args.sectors)
+        panel = SectorReturnPanel.from_history(history)
+        scores = leadlag.score_lead_lag_panel(panel)
+        serial_seconds, serial = _timed(
+            leadlag.score_significance, panel, scores, n_resamples=args.resamples, jobs=1
+        )
+        parallel_seconds, parallel = _timed(
+            leadlag.score_significance, panel, scores, n_resamples=args.resamples, jobs=args.jobs
+        )
+        if parallel != serial:
+            raise SystemExit(f"countries={n_countries}: parallel results differ")
+        line = (
+            f"countries={n_countries:>3} pairs={len(scores):>6} resamples={args.resamples}  "
+            f"batched {serial_seconds:7.2f}s  jobs={args.jobs} {parallel_seconds:7.2f}s"
+        )
+        if not args.skip_loop:
+            loop_seconds, loop = _timed(_per_pair_significance, history, scores, args.resamples)
+            line += (
+                f"  per-pair {loop_seconds:7.2f}s  x{loop_seconds / serial_seconds:,.0f}  "
+                f"max |Δp| {_max_drift(loop, serial, 'p_value'):.3f}  "
+                f"max |Δci| {max(_max_drift(loop, serial, 'ci_low'), _max_drift(loop, serial, 'ci_high')):.3f}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
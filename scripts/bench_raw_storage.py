@@ -0,0 +1,116 @@
+"""Compare on-disk size of the legacy and normalized raw ``stock_daily`` layouts.
+
+Builds a v1 raw DB (one wide ``stock_daily`` row per ticker and day), runs
+the raw migrations on a copy, VACUUMs both and prints the file sizes.
+
+사용법:
+    python -m scripts.bench_raw_storage
+    python -m scripts.bench_raw_storage --tickers 2500 --days 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+
+SECTORS = ("반도체", "전기전자", "화학", "금융", "제약", "운수장비", "서비스업", "유통업")
+
+
+def _legacy_rows(tickers: int, days: int):
+    start = date(2026, 1, 1)
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).isoformat()
+        for index in range(tickers):
+            yield (
+                day,
+                f"{index:06d}",
+                f"한국종목 {index} 보통주",
+                "KR",
+                SECTORS[index % len(SECTORS)],
+                1_000_000_000.0 + index,
+                10_000.0 + offset,
+                (index % 13) - 6.0,
+                100_000.0 + index,
+                95_000.0 + index,
+                index % 2,
+                int(index % 50 == 0),
+            )
+
+
+def _build_legacy_db(path: Path, tickers: int, days: int) -> None:
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        database._raw_v1_base_schema(conn)
+        conn.executemany(
+            """
+            INSERT INTO stock_daily (
+                date, ticker, name, country, sector, market_cap,
+                close_price, daily_return, volume, avg_volume_20d,
+                is_filtered, is_abnormal
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            _legacy_rows(tickers, days),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _vacuumed_size(path: Path) -> int:
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    return path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="raw storage size benchmark")
+    parser.add_argument("--tickers", type=int, default=2500, help="종목 수 (기본 2500)")
+    parser.add_argument("--days", type=int, default=60, help="거래일 수 (기본 60)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        data_dir = Path(tempdir)
+        legacy_path = data_dir / "legacy_raw.db"
+        normalized_path = data_dir / "marketbot_raw.db"
+
+        _build_legacy_db(legacy_path, args.tickers, args.days)
+        legacy_size = _vacuumed_size(legacy_path)
+        shutil.copyfile(legacy_path, normalized_path)
+
+        with patch.object(database, "DATA_DIR", data_dir), patch.object(
+            database, "RAW_DB_PATH", normalized_path
+        ):
+            database._reset_schema_guard()
+            started = time.perf_counter()
+            database.init_raw_db()
+            migrate_elapsed = time.perf_counter() - started
+            database._reset_schema_guard()
+        normalized_size = _vacuumed_size(normalized_path)
+
+    rows = args.tickers * args.days
+    print(f"rows={rows} (tickers={args.tickers}, days={args.days})")
+    print(f"legacy stock_daily:     {legacy_size / 1024 / 1024:8.2f} MiB  ({legacy_size / rows:.1f} B/row)")
+    print(f"dimension + fact table: {normalized_size / 1024 / 1024:8.2f} MiB  ({normalized_size / rows:.1f} B/row)")
+    print(f"reduction: {1 - normalized_size / legacy_size:.1%}, migration {migrate_elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
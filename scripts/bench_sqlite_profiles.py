@@ -0,0 +1,115 @@
+"""Compare upsert and read throughput across the SQLite profiles in config.
+
+Each profile gets a fresh raw DB in a scratch directory. The benchmark
+upserts synthetic ``stock_daily`` rows in per-market batches, the same way
+``BaseCollector.run`` does, and then runs the date-range reads that the
+report and lead-lag steps issue.
+
+사용법:
+    python -m scripts.bench_sqlite_profiles
+    python -m scripts.bench_sqlite_profiles --rows 50000 --batches 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+from src.config import SQLITE_PROFILES
+
+
+def _synthetic_batches(rows: int, batches: int) -> list[list[dict]]:
+    tickers = max(1, rows // batches)
+    start = date(2026, 1, 1)
+    result = []
+    for batch_index in range(batches):
+        day = (start + timedelta(days=batch_index)).isoformat()
+        result.append(
+            [
+                {
+                    "date": day,
+                    "country": "US",
+                    "ticker": f"T{ticker:05d}",
+                    "name": f"Ticker {ticker}",
+                    "sector": f"Sector {ticker % 11}",
+                    "market_cap": 1_000_000_000 + ticker,
+                    "close_price": 100.0 + ticker % 50,
+                    "daily_return": (ticker % 7) - 3.0,
+                    "volume": 1_000_000,
+                    "avg_volume_20d": 900_000,
+                    "is_filtered": 1,
+                    "is_abnormal": 0,
+                }
+                for ticker in range(tickers)
+            ]
+        )
+    return result
+
+
+def _run_profile(profile: str, batches: list[list[dict]]) -> tuple[float, float, int]:
+    with tempfile.TemporaryDirectory() as tempdir:
+        data_dir = Path(tempdir)
+        with patch.object(database, "DATA_DIR", data_dir), patch.object(
+            database, "RAW_DB_PATH", data_dir / "marketbot_raw.db"
+        ), patch.object(database, "RAW_DB_PROFILE", profile):
+            database._reset_schema_guard()
+            database.init_raw_db()
+
+            conn = database.get_raw_connection(profile)
+            try:
+                started = time.perf_counter()
+                for batch in batches:
+                    database.upsert_stock_daily(conn, batch)
+                    conn.commit()
+                write_elapsed = time.perf_counter() - started
+
+                started = time.perf_counter()
+                read_rows = 0
+                for _ in range(5):
+                    for row in conn.execute(
+                        """
+                        SELECT date, sector, AVG(daily_return), SUM(market_cap)
+                        FROM stock_daily
+                        WHERE country = ? AND date BETWEEN ? AND ?
+                        GROUP BY date, sector
+                        """,
+                        ("US", batches[0][0]["date"], batches[-1][0]["date"]),
+                    ):
+                        read_rows += 1
+                read_elapsed = time.perf_counter() - started
+            finally:
+                conn.close()
+            database._reset_schema_guard()
+
+    return write_elapsed, read_elapsed, read_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite profile benchmark")
+    parser.add_argument("--rows", type=int, default=20000, help="총 upsert 행 수 (기본 20000)")
+    parser.add_argument("--batches", type=int, default=5, help="커밋 단위 배치 수 (기본 5)")
+    args = parser.parse_args()
+
+    batches = _synthetic_batches(args.rows, args.batches)
+    total_rows = sum(len(batch) for batch in batches)
+
+    print(f"rows={total_rows} batches={len(batches)}")
+    for profile in SQLITE_PROFILES:
+        write_elapsed, read_elapsed, read_rows = _run_profile(profile, batches)
+        print(
+            f"{profile:<12} upsert {total_rows / write_elapsed:>10,.0f} rows/s"
+            f"  read {read_rows / read_elapsed:>10,.0f} groups/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
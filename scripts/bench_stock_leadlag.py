@@ -0,0 +1,99 @@
+"""Time the tiled stock-level lead-lag engine on a synthetic return matrix.
+
+Builds ``--markets`` markets of ``--stocks`` stocks each over ``--sessions``
+sessions (default 2 × 2,000 × 250), knocks out ``--missing`` of the cells to
+mimic holidays and halts, and plants ``--planted`` cross-market pairs where
+the follower repeats the leader one session later. ``score_stock_pairs`` must
+return every planted pair at lag 1; the script prints the wall time and the
+size of one correlation tile per ``--tile`` value.
+
+사용법:
+    python -m scripts.bench_stock_leadlag
+    python -m scripts.bench_stock_leadlag --stocks 1000 --tile 256 1024 4096
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.stock_leadlag import StockReturnMatrix, score_stock_pairs
+
+MARKETS = ("KR", "US", "JP", "CN", "TW", "HK", "VN")
+
+
+def _synthetic_matrix(
+    markets: int,
+    stocks: int,
+    sessions: int,
+    missing: float,
+    planted: int,
+    seed: int = 11,
+) -> tuple[StockReturnMatrix, set[tuple[str, str]]]:
+    rng = np.random.default_rng(seed)
+    countries = np.repeat(np.array(MARKETS[:markets], dtype=object), stocks)
+    tickers = np.array(
+        [f"{country}{index % stocks:05d}" for index, country in enumerate(countries)], dtype=object
+    )
+    returns = rng.normal(size=(len(tickers), sessions))
+    pairs = set()
+    for index in range(planted):
+        leader = index
+        follower = stocks * (1 + index % (markets - 1)) + index
+        returns[follower, 1:] = returns[leader, :-1] + 0.3 * returns[follower, 1:]
+        pairs.add((tickers[leader], tickers[follower]))
+    returns[rng.random(returns.shape) < missing] = np.nan
+    matrix = StockReturnMatrix(
+        countries,
+        tickers,
+        tickers.copy(),
+        np.array(["기타"] * len(tickers), dtype=object),
+        np.arange(sessions).astype(object),
+        returns,
+    )
+    return matrix, pairs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="stock-level lead-lag benchmark")
+    parser.add_argument("--markets", type=int, default=2, help="시장 수 (최대 7)")
+    parser.add_argument("--stocks", type=int, default=2000, help="시장별 종목 수")
+    parser.add_argument("--sessions", type=int, default=250, help="거래일 수")
+    parser.add_argument("--missing", type=float, default=0.03, help="결측 셀 비율")
+    parser.add_argument("--planted", type=int, default=20, help="심는 선행 페어 수")
+    parser.add_argument("--top-pairs", type=int, default=50, help="저장할 페어 수")
+    parser.add_argument("--tile", type=int, nargs="+", default=[1024], help="타일 한 변 크기")
+    args = parser.parse_args()
+
+    matrix, planted = _synthetic_matrix(
+        min(args.markets, len(MARKETS)), args.stocks, args.sessions, args.missing, args.planted
+    )
+    for tile in args.tile:
+        started = time.perf_counter()
+        rows = score_stock_pairs(matrix, top_pairs=args.top_pairs, tile=tile)
+        seconds = time.perf_counter() - started
+        found = {
+            (row["leader_ticker"], row["follower_ticker"])
+            for row in rows
+            if row["lag"] == 1
+        }
+        missed = planted - found
+        if missed:
+            raise SystemExit(f"tile={tile}: missed {len(missed)} planted pairs")
+        tile_mb = min(tile, len(matrix.tickers)) ** 2 * 8 * 6 / 1e6
+        print(
+            f"stocks={len(matrix.tickers)} sessions={len(matrix.dates)} tile={tile:>5}  "
+            f"{seconds:7.2f}s  pairs={len(rows)}  planted found={len(planted)}  "
+            f"~{tile_mb:,.0f}MB per tile"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Measure warm-start bundle save/restore time and bytes moved.
+
+Builds a synthetic raw layout (live raw DB plus sealed monthly partitions)
+in a scratch directory and times four steps: the first save, a save with
+nothing changed, a restore into an empty data dir (cold CI job) and a
+restore onto up-to-date files. Bytes are what the bundle adds to the cache
+and what a job reads back from it.
+
+사용법:
+    python -m scripts.bench_warm_start
+    python -m scripts.bench_warm_start --tickers 3000 --months 4 --codec gzip
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+from src import warm_start
+
+
+def _synthetic_rows(tickers: int, day: date) -> list[dict]:
+    return [
+        {
+            "date": day.isoformat(),
+            "country": "KR",
+            "ticker": f"{index:06d}",
+            "name": f"종목 {index}",
+            "sector": f"섹터 {index % 20}",
+            "market_cap": 1_000_000_000 + index,
+            "close_price": 10_000.0 + (index * 7 + day.toordinal()) % 500,
+            "daily_return": ((index + day.toordinal()) % 13) - 6.0,
+            "volume": 100_000 + index,
+            "avg_volume_20d": 95_000 + index,
+            "is_filtered": index % 2,
+            "is_abnormal": int(index % 50 == 0),
+        }
+        for index in range(tickers)
+    ]
+
+
+def _build_raw_history(tickers: int, months: int) -> None:
+    start = date(2026, 1, 1)
+    end = date(2026, 1 + months, 10) if months < 12 else date(2026, 12, 10)
+    database.init_raw_db()
+    conn = database.get_raw_connection()
+    try:
+        day = start
+        while day <= end:
+            if day.weekday() < 5:
+                database.upsert_stock_daily(conn, _synthetic_rows(tickers, day))
+            day += timedelta(days=1)
+        conn.commit()
+    finally:
+        conn.close()
+    database.seal_raw_partitions(as_of=end.isoformat())
+
+
+def _print(label: str, stats: dict, byte_key: str) -> None:
+    print(f"  {label:<22} {stats['seconds']:>7.2f}s  {stats[byte_key] / 2**20:>8.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="warm-start bundle benchmark")
+    parser.add_argument("--tickers", type=int, default=2500, help="종목 수 (기본 2500)")
+    parser.add_argument("--months", type=int, default=3, help="봉인할 지난 월 수 (기본 3)")
+    default_codec = "zstd" if importlib.util.find_spec("zstandard") else "gzip"
+    parser.add_argument(
+        "--codec",
+        choices=sorted(warm_start.CODEC_SUFFIX),
+        default=default_codec,
+        help=f"압축 코덱 (기본 {default_codec})",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        root = Path(tempdir)
+        data_dir = root / "data"
+        bundle_dir = root / "bundle"
+        with patch.object(database, "DATA_DIR", data_dir), patch.object(
+            database, "DB_PATH", data_dir / "marketbot.db"
+        ), patch.object(database, "RAW_DB_PATH", data_dir / "marketbot_raw.db"):
+            database._reset_schema_guard()
+            _build_raw_history(args.tickers, args.months)
+            source_bytes = sum(path.stat().st_size for path in warm_start.warm_start_files())
+            print(
+                f"codec={args.codec} files={len(warm_start.warm_start_files())} "
+                f"data={source_bytes / 2**20:.2f} MiB"
+            )
+
+            _print("save (first)", warm_start.save_bundle(bundle_dir, args.codec), "bytes_out")
+            unchanged = warm_start.save_bundle(bundle_dir, args.codec)
+            _print("save (unchanged)", {**unchanged, "bytes_in": 0}, "bytes_in")
+
+            shutil.rmtree(data_dir)
+            _print("restore (cold job)", warm_start.restore_bundle(bundle_dir), "bytes_read")
+            _print("restore (up to date)", warm_start.restore_bundle(bundle_dir), "bytes_read")
+            database._reset_schema_guard()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,52 +4,72 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import sys
 from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.config import RAW_PARTITION_DIRNAME
+
 RAW_DB_PATH = ROOT / "data" / "marketbot_raw.db"
 OUTPUT_PATH = ROOT / "src" / "collectors" / "data" / "kr_sector_reference.json"
 
+LATEST_SECTOR_SQL = """
+    WITH ranked AS (
+        SELECT
+            ticker,
+            sector,
+            date,
+            ROW_NUMBER() OVER (
+                PARTITION BY ticker
+                ORDER BY date DESC
+            ) AS rn
+        FROM stock_daily
+        WHERE country = 'KR'
+          AND sector IS NOT NULL
+          AND TRIM(sector) <> ''
+          AND sector <> '기타'
+    )
+    SELECT ticker, sector, date
+    FROM ranked
+    WHERE rn = 1
+    ORDER BY ticker
+"""
+
+
+def _raw_db_files() -> list[Path]:
+    """Live raw DB first, then sealed partitions (see src.database)."""
+    partition_dir = RAW_DB_PATH.parent / RAW_PARTITION_DIRNAME
+    partitions = sorted(partition_dir.glob("stock_daily_*.db")) if partition_dir.exists() else []
+    return [RAW_DB_PATH, *partitions]
+
 
 def build_reference() -> dict:
     if not RAW_DB_PATH.exists():
         raise FileNotFoundError(f"Raw DB not found: {RAW_DB_PATH}")
 
-    conn = sqlite3.connect(RAW_DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
-        rows = conn.execute(
-            """
-            WITH ranked AS (
-                SELECT
-                    ticker,
-                    sector,
-                    date,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ticker
-                        ORDER BY date DESC
-                    ) AS rn
-                FROM stock_daily
-                WHERE country = 'KR'
-                  AND sector IS NOT NULL
-                  AND TRIM(sector) <> ''
-                  AND sector <> '기타'
-            )
-            SELECT ticker, sector, date
-            FROM ranked
-            WHERE rn = 1
-            ORDER BY ticker
-            """
-        ).fetchall()
-    finally:
-        conn.close()
-
-    if not rows:
+    # Partitions are read one file at a time so full history never needs
+    # more ATTACHed databases than SQLite allows.
+    latest: dict[str, tuple[str, str]] = {}
+    for path in _raw_db_files():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(LATEST_SECTOR_SQL).fetchall()
+        finally:
+            conn.close()
+        for row in rows:
+            current = latest.get(row["ticker"])
+            if current is None or row["date"] > current[0]:
+                latest[row["ticker"]] = (row["date"], row["sector"])
+
+    if not latest:
         raise RuntimeError("No KR sector history found in raw DB")
 
-    latest_date = max(row["date"] for row in rows)
-    tickers = {row["ticker"]: row["sector"] for row in rows}
+    latest_date = max(date for date, _ in latest.values())
+    tickers = {ticker: sector for ticker, (_, sector) in sorted(latest.items())}
     return {
         "country": "KR",
         "source": str(RAW_DB_PATH.relative_to(ROOT)).replace("\\", "/"),
@@ -29,6 +29,13 @@ def main() -> None:
         result["backfilled_abnormal_rows"],
         result["vacuumed_summary"],
     )
+    logger.info(
+        "Raw partitions: sealed=%s pruned=%s raw_vacuumed=%s",
+        result["sealed_partitions"],
+        result["pruned_partitions"],
+        result["vacuumed_raw"],
+    )
+    logger.info("Summary years frozen: %s", result["frozen_years"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""여러 raw DB 파일(Actions artifact 등)을 raw DB 레이아웃으로 병합한다.
+
+각 소스의 (국가, 티커, 날짜) 행 중 collected_at이 가장 최근인 값을 남긴다.
+현재 기간 행은 data/marketbot_raw.db로, 지난 기간 행은 data/raw_partitions/의
+봉인 파티션으로 들어가며, 파티션 파일마다 별도 프로세스로 병렬 병합한다.
+
+사용법:
+    gh run download --pattern 'marketbot-raw-db-*' --dir artifacts
+    python scripts/merge_raw_db.py artifacts
+    python scripts/merge_raw_db.py a.db b.db --jobs 4 --as-of 2026-04-20
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import src.database as database
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _collect_sources(paths: list[Path]) -> list[Path]:
+    sources: set[Path] = set()
+    for path in paths:
+        if path.is_dir():
+            sources.update(candidate for candidate in path.rglob("*.db") if candidate.is_file())
+        elif path.is_file():
+            sources.add(path)
+        else:
+            raise FileNotFoundError(f"raw DB 소스 없음: {path}")
+    # 같은 collected_at이면 나중에 병합한 파일이 이기므로 오래된 파일부터 병합한다.
+    return sorted(sources, key=lambda source: (source.stat().st_mtime, str(source)))
+
+
+def plan_merge(sources: list[Path], as_of: str) -> dict[Path, tuple[list[str], list[Path]]]:
+    """대상 파일별 (파티션 키 목록, 소스 목록). 대상이 다르면 병렬로 병합해도 된다."""
+    current_key = database.raw_partition_key(as_of)
+    key_sources: dict[str, list[Path]] = {}
+    for source in sources:
+        for key in database.raw_db_partition_keys(source):
+            key_sources.setdefault(key, []).append(source)
+
+    plan: dict[Path, tuple[list[str], list[Path]]] = {}
+    for key in sorted(key_sources):
+        sealed = database._raw_partition_bounds(key) < database._raw_partition_bounds(current_key)
+        target = database._raw_partition_path(key) if sealed else database.RAW_DB_PATH
+        keys, target_sources = plan.setdefault(target, ([], []))
+        keys.append(key)
+        target_sources.extend(
+            source for source in key_sources[key] if source not in target_sources
+        )
+    for _, target_sources in plan.values():
+        target_sources.sort(key=sources.index)
+    return plan
+
+
+def _merge_target(target: Path, keys: list[str], sources: list[Path]) -> tuple[Path, int]:
+    seal = target != database.RAW_DB_PATH
+    return target, database.merge_raw_db_files(target, sources, keys, seal=seal)
+
+
+def merge(paths: list[Path], as_of: str | None = None, jobs: int = 1) -> dict[Path, int]:
+    sources = _collect_sources(paths)
+    plan = plan_merge(sources, as_of or datetime.utcnow().strftime("%Y-%m-%d"))
+    if jobs <= 1 or len(plan) <= 1:
+        return dict(
+            _merge_target(target, keys, target_sources)
+            for target, (keys, target_sources) in plan.items()
+        )
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_merge_target, target, keys, target_sources)
+            for target, (keys, target_sources) in plan.items()
+        ]
+        return dict(future.result() for future in futures)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MarketBot raw DB 병합")
+    parser.add_argument("sources", nargs="+", type=Path, help="raw DB 파일 또는 디렉터리")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="병렬 프로세스 수 (기본: CPU 수)",
+    )
+    parser.add_argument(
+        "--as-of",
+        default=None,
+        help="이 날짜가 속한 기간부터 live raw DB로 병합 (기본: 오늘 UTC)",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = merge(args.sources, args.as_of, args.jobs)
+    for target, rows in sorted(results.items()):
+        logger.info("%s: %d행 병합", target, rows)
+    logger.info(
+        "Raw merge complete: targets=%d rows=%d elapsed=%.1fs",
+        len(results),
+        sum(results.values()),
+        time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    main()
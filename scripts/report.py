@@ -3,6 +3,11 @@
 사용법:
     python -m scripts.report
     python -m scripts.report --date 2026-02-06
+    python -m scripts.report --prepare-only --leadlag-mode verify
+    python -m scripts.report --prepare-only --cross-sector direct
+    python -m scripts.report --prepare-only --force --date 2026-04-20
+    python -m scripts.report --show-runs
+    python -m scripts.report --backfill-trends 2025-01-01 2026-04-20
 """
 
 import argparse
@@ -14,7 +19,12 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT))
 
-from src.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from src.config import (
+    LEADLAG_CROSS_SECTOR,
+    LEADLAG_SCORE_MODE,
+    TELEGRAM_BOT_TOKEN,
+    TELEGRAM_CHAT_ID,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,15 +33,104 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def prepare_report_data(date: str | None = None) -> None:
-    """리포트용 파생 데이터를 계산해 DB에 저장한다."""
-    from src.analyzer import compute_trend_scores
-    from src.leadlag import update_lead_lag
+def prepare_report_data(
+    date: str | None = None,
+    leadlag_mode: str = LEADLAG_SCORE_MODE,
+    cross_sector: str = LEADLAG_CROSS_SECTOR,
+    force: bool = False,
+) -> dict:
+    """바뀐 sector_performance에 걸린 파생 데이터만 다시 계산해 DB에 저장한다.
+
+    수집기가 남긴 더티 (날짜, 국가) 표시를 읽어, 그 날짜들의 트렌드 스코어와
+    lookback 창에 그 날짜가 들어가는 lead-lag 기준일만 다시 계산한다. 리포트 날짜는
+    채점 → 점수 → 시그널을 모두, 지난 기준일은 점수만 다시 낸다. 계산은
+    ``src.pipeline`` DAG로 돌려 입력 fingerprint가 그대로인 노드는 건너뛴다.
+    처리한 표시만 지우고, 더티가 없으면 DB를 한 번 읽고 끝난다.
+    force면 더티와 fingerprint에 상관없이 리포트 날짜를 다시 계산한다.
+    """
+    from src.database import (
+        clear_dirty_sector_dates,
+        get_connection,
+        get_dirty_sector_dates,
+        init_db,
+    )
 
-    compute_trend_scores(date=date)
-    leadlag_summary = update_lead_lag(date=date)
-    logger.info(f"lead-lag 갱신: {leadlag_summary}")
-    logger.info("리포트용 파생 데이터 준비 완료")
+    init_db()
+    conn = get_connection()
+    try:
+        dirty = get_dirty_sector_dates(conn)
+        if not dirty and not force:
+            logger.info("리포트용 파생 데이터 최신 상태: 바뀐 날짜 없음")
+            return {"dirty": 0, "trend_dates": [], "lead_lag_dates": [], "nodes": {}}
+        if date is None:
+            row = conn.execute("SELECT MAX(date) FROM sector_performance").fetchone()
+            date = row[0] if row else None
+    finally:
+        conn.close()
+
+    from src.leadlag import affected_lead_lag_dates
+    from src.pipeline import report_nodes, run_nodes
+
+    dirty_dates = sorted({dirty_date for dirty_date, _ in dirty})
+    trend_dates = set(dirty_dates)
+    if force and date:
+        trend_dates.add(date)
+
+    conn = get_connection()
+    try:
+        lead_lag_dates = affected_lead_lag_dates(conn, dirty_dates, date)
+    finally:
+        conn.close()
+    if force and date and date not in lead_lag_dates:
+        lead_lag_dates.append(date)
+
+    nodes = report_nodes(
+        date,
+        sorted(trend_dates),
+        [lead_lag_date for lead_lag_date in lead_lag_dates if lead_lag_date != date],
+        score_report_date=date in lead_lag_dates,
+        mode=leadlag_mode,
+        cross_sector=cross_sector,
+    )
+    runs = run_nodes(nodes, key=date or "", force=force)
+
+    conn = get_connection()
+    try:
+        clear_dirty_sector_dates(conn, dirty)
+        conn.commit()
+    finally:
+        conn.close()
+    logger.info(
+        f"리포트용 파생 데이터 준비 완료: 더티 {len(dirty)}건, "
+        f"트렌드 {len(trend_dates)}일, lead-lag {len(lead_lag_dates)}일"
+    )
+    return {
+        "dirty": len(dirty),
+        "trend_dates": sorted(trend_dates),
+        "lead_lag_dates": sorted(lead_lag_dates),
+        "nodes": {run["node"]: run["status"] for run in runs},
+    }
+
+
+def print_node_runs(date: str | None = None) -> None:
+    """파생 데이터 DAG 노드별 마지막 실행 기록을 출력한다."""
+    from src.database import get_connection, get_derived_node_runs, init_db
+
+    init_db()
+    conn = get_connection()
+    try:
+        runs = get_derived_node_runs(conn, date)
+    finally:
+        conn.close()
+    if not runs:
+        print("실행 기록 없음")
+        return
+    for run in runs:
+        print(
+            f"{run['date']}  {run['node']:<20} {run['status']:<8} "
+            f"run {run['run_seconds']:8.3f}s  fingerprint {run['fingerprint_seconds']:7.3f}s  "
+            f"{run['fingerprint'][:12]}  {run['updated_at']}"
+        )
 
 
 def configure_stdout() -> None:
@@ -52,16 +151,63 @@ async def main():
     parser.add_argument(
         "--prepare-only",
         action="store_true",
-        help="리포트 전송 없이 파생 데이터만 계산하고 종료",
+        help="리포트 전송 없이 파생 데이터를 계산하고 봇 명령 텍스트를 미리 렌더링한 뒤 종료",
+    )
+    parser.add_argument(
+        "--leadlag-mode",
+        choices=("incremental", "full", "verify"),
+        default=LEADLAG_SCORE_MODE,
+        help="lead-lag 점수 계산 방식 (누적 상태 갱신 / 전체 재계산 / 비교 검증)",
+    )
+    parser.add_argument(
+        "--cross-sector",
+        choices=("off", "direct", "fft"),
+        default=LEADLAG_CROSS_SECTOR,
+        help="섹터 교차 lead-lag 계산 방식 (끄기 / 시차별 곱 / FFT)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="바뀐 날짜가 없어도 리포트 날짜 파생 데이터를 다시 계산",
+    )
+    parser.add_argument(
+        "--show-runs",
+        action="store_true",
+        help="리포트 날짜(기본: 최근)의 파생 데이터 노드별 실행 기록을 출력하고 종료",
+    )
+    parser.add_argument(
+        "--backfill-trends",
+        nargs=2,
+        metavar=("START", "END"),
+        default=None,
+        help="구간 전체 트렌드 스코어를 일괄 재계산하고 종료 (YYYY-MM-DD YYYY-MM-DD)",
     )
     args = parser.parse_args()
     report_date = args.date or None
 
+    if args.show_runs:
+        print_node_runs(report_date)
+        return
+
+    if args.backfill_trends:
+        from src.analyzer import compute_trend_scores_range
+
+        compute_trend_scores_range(*args.backfill_trends)
+        return
+
     # 트렌드 스코어 계산
     if not args.skip_analyze:
-        prepare_report_data(date=report_date)
+        prepare_report_data(
+            date=report_date,
+            leadlag_mode=args.leadlag_mode,
+            cross_sector=args.cross_sector,
+            force=args.force,
+        )
 
     if args.prepare_only:
+        from src.reporter import prerender_reports
+
+        prerender_reports()
         return
 
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
@@ -0,0 +1,68 @@
+"""종목 단위 lead-lag 오프라인 계산.
+
+raw stock_daily(봉인 파티션 포함)에서 시장별 거래대금 상위 종목을 골라 다른 시장 종목
+사이의 시차 상관 상위 페어를 summary DB stock_lead_lag_scores에 저장한다.
+/flow 리포트의 "종목 선행 페어" 섹션이 이 결과를 보여준다.
+
+사용법:
+    python scripts/stock_leadlag.py
+    python scripts/stock_leadlag.py --date 2026-04-20 --days 365 --top-per-market 500
+    python scripts/stock_leadlag.py --top-pairs 100 --tile 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.config import (
+    STOCK_LEADLAG_LOOKBACK_DAYS,
+    STOCK_LEADLAG_TILE,
+    STOCK_LEADLAG_TOP_PAIRS,
+    STOCK_LEADLAG_TOP_PER_MARKET,
+)
+from src.stock_leadlag import run_stock_lead_lag
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="종목 단위 lead-lag 계산")
+    parser.add_argument("--date", default=None, help="기준일 (기본: 최신 섹터 성과 날짜)")
+    parser.add_argument("--days", type=int, default=STOCK_LEADLAG_LOOKBACK_DAYS, help="캘린더 일수")
+    parser.add_argument(
+        "--top-per-market", type=int, default=STOCK_LEADLAG_TOP_PER_MARKET, help="시장별 거래대금 상위 종목 수"
+    )
+    parser.add_argument("--top-pairs", type=int, default=STOCK_LEADLAG_TOP_PAIRS, help="저장할 페어 수")
+    parser.add_argument("--tile", type=int, default=STOCK_LEADLAG_TILE, help="상관 행렬 타일 한 변 크기")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows = run_stock_lead_lag(
+        args.date,
+        top_per_market=args.top_per_market,
+        top_pairs=args.top_pairs,
+        tile=args.tile,
+        lookback_days=args.days,
+    )
+    for row in rows[:10]:
+        print(
+            f"{row['leader_country']} {row['leader_ticker']} → "
+            f"{row['follower_country']} {row['follower_ticker']}  lag={row['lag']}  "
+            f"ρ={row['correlation']:+.3f}  n={row['n_obs']}"
+        )
+    logger.info(f"종목 lead-lag 완료: {len(rows)}개 페어, {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
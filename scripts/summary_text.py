@@ -0,0 +1,64 @@
+"""summary DB ↔ 정렬된 NDJSON 샤드 변환.
+
+워크플로는 바이너리 data/marketbot.db 대신 data/summary_export/를 커밋하고,
+실행 시작 때 import로 DB를 다시 만든다.
+
+사용법:
+    python -m scripts.summary_text export
+    python -m scripts.summary_text import
+    python -m scripts.summary_text import --if-present
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.summary_export import MANIFEST_NAME, export_dir, export_summary_db, import_summary_db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MarketBot summary DB 텍스트 내보내기/가져오기")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=None,
+        help="샤드 디렉터리 (기본: data/summary_export)",
+    )
+    parser.add_argument(
+        "--if-present",
+        action="store_true",
+        help="import: 내보낸 샤드가 없으면 기존 DB를 그대로 둔다",
+    )
+    args = parser.parse_args()
+
+    if args.command == "export":
+        result = export_summary_db(args.dir)
+        logger.info(
+            "Summary export: rows=%s written=%s removed=%s",
+            result["rows"],
+            result["shards_written"],
+            result["shards_removed"],
+        )
+        return
+
+    source = args.dir or export_dir()
+    if args.if_present and not (source / MANIFEST_NAME).exists():
+        logger.info("No summary export at %s, keeping existing DB", source)
+        return
+    result = import_summary_db(source)
+    logger.info("Summary import: rows=%s db=%s", result["rows"], result["db_path"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""stock_daily / sector_performance를 컬럼형 Arrow 아카이브로 동기화한다.
+
+소스 지문이 바뀐 국가·월 파티션만 data/archive/ 아래에 다시 쓴다.
+pyarrow가 필요하다 (pip install pyarrow).
+
+사용법:
+    python scripts/sync_archive.py
+    python scripts/sync_archive.py --table stock_daily
+    python scripts/sync_archive.py --dry-run
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.archive import ARCHIVE_TABLES, plan_archive_sync, sync_archive
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MarketBot 컬럼형 아카이브 동기화")
+    parser.add_argument(
+        "--table",
+        choices=sorted(ARCHIVE_TABLES),
+        action="append",
+        help="동기화할 테이블 (기본: 전체)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="다시 쓸 파티션만 출력",
+    )
+    args = parser.parse_args()
+
+    for table in args.table or list(ARCHIVE_TABLES):
+        if args.dry_run:
+            stale = plan_archive_sync(table)
+            logger.info("%s: %d개 파티션 갱신 필요 %s", table, len(stale), sorted(stale))
+            continue
+        result = sync_archive(table)
+        logger.info(
+            "%s: %d개 파티션 / %d행 기록, %d개 삭제 (전체 %d개 파티션)",
+            table,
+            len(result["partitions_written"]),
+            result["rows_written"],
+            len(result["partitions_removed"]),
+            result["partitions_total"],
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""CI warm-start 번들 저장/복원.
+
+잡 시작 때 restore로 live raw DB와 최근 봉인 파티션을 data/ 아래에 풀고,
+잡 끝(checkpoint 뒤)에 save로 바뀐 파일만 다시 압축한다.
+
+사용법:
+    python -m scripts.warm_start restore
+    python -m scripts.warm_start save
+    python -m scripts.warm_start save --codec gzip --dir /tmp/bundle
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.config import WARM_START_BUNDLE_DIR, WARM_START_CODEC
+from src.warm_start import CODEC_SUFFIX, restore_bundle, save_bundle
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="MarketBot CI warm-start 번들")
+    parser.add_argument("command", choices=["save", "restore"])
+    parser.add_argument(
+        "--dir",
+        type=Path,
+        default=WARM_START_BUNDLE_DIR,
+        help="번들 디렉터리 (기본: .cache/warm_start)",
+    )
+    parser.add_argument(
+        "--codec",
+        choices=sorted(CODEC_SUFFIX),
+        default=WARM_START_CODEC,
+        help="save 압축 코덱 (기본: zstd)",
+    )
+    args = parser.parse_args()
+
+    if args.command == "save":
+        stats = save_bundle(args.dir, args.codec)
+        logger.info(
+            "Warm-start save: files=%s written=%s skipped=%s bundle_bytes=%s seconds=%.2f",
+            stats["files"],
+            stats["written"],
+            stats["skipped"],
+            stats["bytes_out"],
+            stats["seconds"],
+        )
+        return
+
+    stats = restore_bundle(args.dir)
+    logger.info(
+        "Warm-start restore: files=%s restored=%s skipped=%s bytes_read=%s seconds=%.2f",
+        stats["files"],
+        stats["restored"],
+        stats["skipped"],
+        stats["bytes_read"],
+        stats["seconds"],
+    )
+
+
+if __name__ == "__main__":
+    main()
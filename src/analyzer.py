@@ -3,10 +3,13 @@
 - 각 국가의 섹터 성과를 기반으로 글로벌 트렌드 스코어 계산
 - 섹터별 국가 확산도(breadth) 분석
 - 모멘텀 시그널 생성
+- 날짜 구간 일괄 재계산 (수집기 추가·가중치 변경 뒤 히스토리 백필)
 """
 
 import logging
 
+import numpy as np
+
 from src.config import (
     COUNTRIES,
     SECTORS,
@@ -17,13 +20,31 @@ from src.config import (
 from src.database import (
     get_connection,
     get_latest_sector_performance,
+    get_sector_performance_range,
     init_db,
+    summary_write,
     upsert_trend_scores,
 )
 
 logger = logging.getLogger(__name__)
 
 
+# 트렌드 스코어 하한 → 시그널 (위에서부터 처음 넘는 구간)
+_SIGNAL_THRESHOLDS = (
+    (60, "STRONG_UP"),
+    (30, "UP"),
+    (-30, "NEUTRAL"),
+    (-60, "DOWN"),
+)
+
+
+def _momentum_signal(trend_score: float) -> str:
+    for threshold, signal in _SIGNAL_THRESHOLDS:
+        if trend_score > threshold:
+            return signal
+    return "STRONG_DOWN"
+
+
 def _resolve_analysis_date(conn, date: str | None) -> str | None:
     if date is not None:
         return date
@@ -106,16 +127,7 @@ def compute_trend_scores(date: str | None = None):
         )
 
         # 7) 시그널 분류
-        if trend_score > 60:
-            signal = "STRONG_UP"
-        elif trend_score > 30:
-            signal = "UP"
-        elif trend_score > -30:
-            signal = "NEUTRAL"
-        elif trend_score > -60:
-            signal = "DOWN"
-        else:
-            signal = "STRONG_DOWN"
+        signal = _momentum_signal(trend_score)
 
         trend_rows.append({
             "date": date,
@@ -129,9 +141,97 @@ def compute_trend_scores(date: str | None = None):
         })
 
     if trend_rows:
-        upsert_trend_scores(conn, trend_rows)
-        conn.commit()
+        with summary_write(conn):
+            upsert_trend_scores(conn, trend_rows)
         logger.info(f"트렌드 스코어 저장: {len(trend_rows)}개 섹터")
 
     conn.close()
     return trend_rows
+
+
+def _group_sums(group: np.ndarray, values: np.ndarray, mask: np.ndarray, n_groups: int):
+    """그룹별 합과 개수. bincount는 행 순서대로 더하므로 단일 날짜 루프의 sum()과 같은 값이 나온다."""
+    sums = np.bincount(group[mask], weights=values[mask], minlength=n_groups)
+    counts = np.bincount(group[mask], minlength=n_groups)
+    return sums, counts
+
+
+def compute_trend_scores_range(
+    start_date: str,
+    end_date: str,
+    dates: set[str] | None = None,
+) -> list[dict]:
+    """[start_date, end_date]의 모든 날짜 트렌드 스코어를 한 번에 다시 계산해 저장한다.
+
+    sector_performance를 구간 전체로 한 번 읽고 (날짜, 섹터) 그룹 단위 배열 연산으로
+    점수를 낸 뒤 한 번의 bulk upsert로 쓴다. 날짜마다 ``compute_trend_scores``를
+    부른 결과와 값이 정확히 같다. dates를 주면 구간 안에서 그 날짜만 계산한다.
+    """
+    init_db()
+    conn = get_connection()
+    try:
+        rows = get_sector_performance_range(conn, start_date, end_date)
+        if dates is not None:
+            rows = [row for row in rows if row[0] in dates]
+        if not rows:
+            logger.warning(f"트렌드 스코어 계산 불가: {start_date} ~ {end_date} 데이터 없음")
+            return []
+
+        dates = np.array([row[0] for row in rows], dtype=object)
+        sectors = np.array([row[1] for row in rows], dtype=object)
+        daily = np.array([row[3] for row in rows], dtype=float)  # None → NaN
+        weekly = np.array([row[4] for row in rows], dtype=float)
+
+        # 행이 (date, sector, country) 순이라 그룹 경계만 찾으면 된다
+        starts = np.ones(len(rows), dtype=bool)
+        starts[1:] = (dates[1:] != dates[:-1]) | (sectors[1:] != sectors[:-1])
+        group = np.cumsum(starts) - 1
+        n_groups = int(group[-1]) + 1
+
+        observed = ~np.isnan(daily)
+        return_sum, total = _group_sums(group, daily, observed, n_groups)
+        positive = np.bincount(group[observed & (daily > 0)], minlength=n_groups)
+        negative = np.bincount(group[observed & (daily < 0)], minlength=n_groups)
+        weekly_sum, weekly_count = _group_sums(group, weekly, ~np.isnan(weekly), n_groups)
+
+        scored = total > 0
+        avg_return = np.divide(return_sum, total, out=np.zeros(n_groups), where=scored)
+        breadth = np.divide(positive, total, out=np.full(n_groups, 0.5), where=scored)
+        norm_return = np.maximum(np.minimum(avg_return / 5.0 * 100, 100), -100)
+        norm_breadth = (breadth - 0.5) * 200
+        avg_weekly = np.divide(
+            weekly_sum, weekly_count, out=np.zeros(n_groups), where=weekly_count > 0
+        )
+        norm_momentum = np.where(
+            weekly_count > 0, np.maximum(np.minimum(avg_weekly / 10.0 * 100, 100), -100), 0.0
+        )
+        trend_score = (
+            norm_return * TREND_WEIGHT_RETURN
+            + norm_breadth * TREND_WEIGHT_BREADTH
+            + norm_momentum * TREND_WEIGHT_MOMENTUM
+        )
+
+        first_row = np.flatnonzero(starts)
+        trend_rows = [
+            {
+                "date": dates[first_row[index]],
+                "sector": sectors[first_row[index]],
+                "trend_score": round(float(trend_score[index]), 2),
+                "countries_positive": int(positive[index]),
+                "countries_negative": int(negative[index]),
+                "global_avg_return": round(float(avg_return[index]), 4),
+                "global_breadth": round(float(breadth[index]), 4),
+                "momentum_signal": _momentum_signal(float(trend_score[index])),
+            }
+            for index in np.flatnonzero(scored)
+        ]
+
+        with summary_write(conn):
+            upsert_trend_scores(conn, trend_rows)
+        logger.info(
+            f"트렌드 스코어 일괄 저장: {start_date} ~ {end_date}, "
+            f"{len(set(dates))}일 {len(trend_rows)}개 (날짜, 섹터)"
+        )
+        return trend_rows
+    finally:
+        conn.close()
@@ -0,0 +1,439 @@
+"""raw/summary 히스토리의 컬럼형(Arrow IPC) 아카이브.
+
+SQLite를 ``sqlite3.Row`` 단위로 훑지 않고 여러 해 분량을 분석할 수 있도록
+``stock_daily``와 ``sector_performance``를 국가·월 단위 Arrow IPC 파일로 내보낸다.
+
+    data/archive/<table>/country=<CC>/<YYYY-MM>.arrow
+    data/archive/<table>/manifest.json
+
+- 파일은 압축 없는 Arrow IPC라서 ``pyarrow.memory_map``으로 복사 없이 읽힌다.
+- manifest에 파티션별 소스 지문을 기록하고, 지문이 바뀐 파티션만 다시 쓴다.
+  ``stock_daily`` 지문은 종목별 행 수·합계와 이름·섹터·플래그를 해시한 값이다.
+- raw 파티션이 보관 기간으로 지워지거나 summary 연도가 동결돼 월 전체가 소스에서
+  빠져도 아카이브 파티션은 남는다. 소스에 남은 월에서 사라진 국가 파티션은
+  ``sync_archive``가 manifest와 파일에서 지운다.
+- pyarrow는 선택 의존성이다. 동기화 계획(``plan_archive_sync``)은 SQLite만 쓴다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from datetime import date as date_cls
+from itertools import groupby
+from pathlib import Path
+
+import pandas as pd
+
+from src import database
+from src.config import ARCHIVE_DIRNAME
+from src.database import (
+    RAW_FACT_DATE_SQL,
+    _raw_partition_bounds,
+    get_connection,
+    get_raw_connection,
+    init_db,
+    init_raw_db,
+    list_raw_partitions,
+    open_raw_range,
+    raw_fact_query,
+    raw_partition_key,
+)
+
+logger = logging.getLogger(__name__)
+
+# (컬럼, 종류) 순서가 곧 Arrow 스키마 순서다. 종류: date/string/float/int/flag
+ARCHIVE_TABLES: dict[str, tuple[tuple[str, str], ...]] = {
+    "stock_daily": (
+        ("date", "date"),
+        ("country", "string"),
+        ("ticker", "string"),
+        ("name", "string"),
+        ("sector", "string"),
+        ("market_cap", "float"),
+        ("close_price", "float"),
+        ("daily_return", "float"),
+        ("volume", "float"),
+        ("avg_volume_20d", "float"),
+        ("is_filtered", "flag"),
+        ("is_abnormal", "flag"),
+    ),
+    "sector_performance": (
+        ("date", "date"),
+        ("country", "string"),
+        ("sector", "string"),
+        ("daily_return", "float"),
+        ("weekly_return", "float"),
+        ("breadth", "float"),
+        ("volume_change", "float"),
+        ("stock_count", "int"),
+        ("top_gainers", "string"),
+        ("top_losers", "string"),
+        ("collected_at", "string"),
+    ),
+}
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError("pyarrow 미설치: pip install pyarrow") from exc
+    return pa, pc
+
+
+def _arrow_schema(table: str):
+    pa, _ = _require_pyarrow()
+    types = {
+        "date": pa.date32(),
+        "string": pa.string(),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "flag": pa.int8(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in ARCHIVE_TABLES[table]])
+
+
+def _table_dir(table: str) -> Path:
+    if table not in ARCHIVE_TABLES:
+        raise ValueError(f"unknown archive table: {table}")
+    return database.DATA_DIR / ARCHIVE_DIRNAME / table
+
+
+def _partition_relpath(country: str, month: str) -> str:
+    return f"country={country}/{month}.arrow"
+
+
+def _month_range(month: str) -> tuple[str, str]:
+    first, last = _raw_partition_bounds(month)
+    return (
+        f"{first // 10000:04d}-{first // 100 % 100:02d}-01",
+        f"{last // 10000:04d}-{last // 100 % 100:02d}-31",
+    )
+
+
+def load_manifest(table: str) -> dict:
+    path = _table_dir(table) / MANIFEST_NAME
+    if not path.exists():
+        return {"table": table, "partitions": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_manifest(table: str, manifest: dict) -> None:
+    path = _table_dir(table) / MANIFEST_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+def _fingerprint(row) -> str:
+    return ":".join(
+        f"{value:.6f}" if isinstance(value, float) else str(value)
+        for value in tuple(row)[1:]
+    )
+
+
+def _hash_rows(rows) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(_fingerprint((None, *row)).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _raw_months() -> list[str]:
+    """live raw DB와 봉인 파티션에 들어 있는 월 목록."""
+    init_raw_db()
+    months: set[int] = set()
+    conn = get_raw_connection()
+    try:
+        months.update(
+            row[0] for row in conn.execute("SELECT DISTINCT date / 100 FROM stock_daily_fact")
+        )
+    finally:
+        conn.close()
+
+    for _, path in list_raw_partitions():
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            months.update(
+                row[0] for row in conn.execute("SELECT DISTINCT date / 100 FROM stock_daily_fact")
+            )
+        finally:
+            conn.close()
+
+    return sorted(
+        raw_partition_key(f"{month // 100:04d}-{month % 100:02d}-01", "month")
+        for month in months
+    )
+
+
+def _source_fingerprints(table: str) -> dict[str, str]:
+    """소스 DB의 파티션별 지문. 키는 ``"<country>/<YYYY-MM>"``."""
+    fingerprints: dict[str, str] = {}
+
+    if table == "stock_daily":
+        # 종목·월 단위 집계(이름·섹터·플래그 포함)를 파티션별로 해시한다.
+        # 합계만 보면 이름·섹터 변경이나 플래그 재계산을 놓친다.
+        for month in _raw_months():
+            start, end = _month_range(month)
+            with open_raw_range(start, end) as conn:
+                source, params = raw_fact_query(
+                    conn,
+                    """
+                    i.country, i.ticker, i.name, i.sector, f.market_cap, f.close_price,
+                    f.daily_return, f.volume, f.avg_volume_20d, f.is_filtered, f.is_abnormal
+                    """,
+                    start,
+                    end,
+                )
+                rows = conn.execute(
+                    f"""
+                    SELECT country, ticker, name, sector, COUNT(*),
+                           TOTAL(market_cap), TOTAL(close_price), TOTAL(daily_return),
+                           TOTAL(volume), TOTAL(avg_volume_20d),
+                           TOTAL(is_filtered), TOTAL(is_abnormal)
+                    FROM ({source})
+                    GROUP BY country, ticker
+                    ORDER BY country, ticker
+                    """,
+                    params,
+                ).fetchall()
+            for country, group in groupby(rows, key=lambda row: row[0]):
+                fingerprints[f"{country}/{month}"] = _hash_rows(group)
+        return fingerprints
+
+    _table_dir(table)
+    init_db()
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            """
+            SELECT country || '/' || substr(date, 1, 7) AS partition,
+                   COUNT(*), MAX(collected_at), TOTAL(daily_return), TOTAL(breadth)
+            FROM sector_performance
+            GROUP BY partition
+            """
+        ).fetchall()
+    finally:
+        conn.close()
+    for row in rows:
+        fingerprints[row[0]] = _fingerprint(row)
+    return fingerprints
+
+
+def _plan(table: str, manifest: dict) -> tuple[dict[str, str], list[str]]:
+    """(다시 쓸 파티션과 새 지문, manifest에서 지울 파티션)."""
+    archived = manifest.get("partitions", {})
+    table_dir = _table_dir(table)
+    fingerprints = _source_fingerprints(table)
+    stale = {}
+    for partition, fingerprint in fingerprints.items():
+        entry = archived.get(partition)
+        if (
+            entry is None
+            or entry.get("fingerprint") != fingerprint
+            or not (table_dir / entry["path"]).exists()
+        ):
+            stale[partition] = fingerprint
+
+    # 소스에 아직 있는 월인데 그 국가 행만 사라졌거나, 파일도 소스도 없는 파티션은
+    # 지운다. 월 전체가 소스에서 빠진 경우(raw 보관 기간, summary 연도 동결)는 남긴다.
+    source_months = {partition.split("/")[1] for partition in fingerprints}
+    orphaned = [
+        partition
+        for partition, entry in sorted(archived.items())
+        if partition not in fingerprints
+        and (
+            partition.split("/")[1] in source_months
+            or not (table_dir / entry["path"]).exists()
+        )
+    ]
+    return stale, orphaned
+
+
+def plan_archive_sync(table: str) -> dict[str, str]:
+    """다시 써야 하는 파티션과 새 지문을 반환한다 (pyarrow 불필요)."""
+    return _plan(table, load_manifest(table))[0]
+
+
+def _load_partition_frame(table: str, country: str, month: str) -> pd.DataFrame:
+    start, end = _month_range(month)
+    names = [name for name, _ in ARCHIVE_TABLES[table]]
+    if table == "stock_daily":
+        with open_raw_range(start, end) as conn:
+            source, params = raw_fact_query(
+                conn,
+                f"{RAW_FACT_DATE_SQL} AS date, i.country, i.ticker, i.name, i.sector, "
+                + ", ".join(f"f.{name}" for name in names[5:]),
+                start,
+                end,
+                where="i.country = ?",
+                params=(country,),
+            )
+            return pd.read_sql_query(
+                f"SELECT {', '.join(names)} FROM ({source}) ORDER BY date, ticker",
+                conn,
+                params=params,
+            )
+
+    conn = get_connection()
+    try:
+        return pd.read_sql_query(
+            f"""
+            SELECT {", ".join(names)}
+            FROM {table}
+            WHERE country = ? AND date BETWEEN ? AND ?
+            ORDER BY date, sector
+            """,
+            conn,
+            params=(country, start, end),
+        )
+    finally:
+        conn.close()
+
+
+def _frame_to_arrow(table: str, frame: pd.DataFrame):
+    pa, _ = _require_pyarrow()
+    schema = _arrow_schema(table)
+    arrays = []
+    for field, (name, kind) in zip(schema, ARCHIVE_TABLES[table]):
+        values = frame[name]
+        if kind == "date":
+            arrays.append(pa.array(values.to_numpy().astype("datetime64[D]"), type=field.type))
+        elif kind in ("int", "flag"):
+            arrays.append(pa.array(values.astype("Int64"), type=field.type))
+        else:
+            arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _write_arrow(path: Path, arrow_table) -> None:
+    pa, _ = _require_pyarrow()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink:
+        with pa.ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+    os.replace(tmp_path, path)
+
+
+def sync_archive(table: str) -> dict:
+    """소스가 바뀐 국가·월 파티션만 Arrow 파일로 다시 쓴다."""
+    _require_pyarrow()
+    manifest = load_manifest(table)
+    stale, orphaned = _plan(table, manifest)
+    partitions = manifest.setdefault("partitions", {})
+    table_dir = _table_dir(table)
+
+    for partition in orphaned:
+        (table_dir / partitions.pop(partition)["path"]).unlink(missing_ok=True)
+
+    written_rows = 0
+    for partition, fingerprint in sorted(stale.items()):
+        country, month = partition.split("/")
+        frame = _load_partition_frame(table, country, month)
+        relpath = _partition_relpath(country, month)
+        _write_arrow(table_dir / relpath, _frame_to_arrow(table, frame))
+        partitions[partition] = {
+            "path": relpath,
+            "fingerprint": fingerprint,
+            "rows": len(frame),
+        }
+        written_rows += len(frame)
+
+    if stale or orphaned:
+        _save_manifest(table, manifest)
+        logger.info(
+            f"archive sync {table}: {len(stale)}개 파티션, {written_rows}행, "
+            f"{len(orphaned)}개 삭제"
+        )
+    return {
+        "table": table,
+        "partitions_written": sorted(stale),
+        "partitions_removed": orphaned,
+        "rows_written": written_rows,
+        "partitions_total": len(partitions),
+    }
+
+
+def read_archive(
+    table: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    columns: list[str] | None = None,
+    countries: list[str] | None = None,
+):
+    """기간·컬럼 부분집합을 ``pyarrow.Table``로 반환한다.
+
+    각 파티션은 메모리 맵으로 열리므로 기간 안쪽 파티션의 버퍼는 복사되지 않는다.
+    기간 경계에 걸친 파티션만 필터링 결과가 새로 만들어진다.
+    """
+    pa, pc = _require_pyarrow()
+    schema = _arrow_schema(table)
+    selected = columns or schema.names
+    table_dir = _table_dir(table)
+    start_month = start_date[:7] if start_date else None
+    end_month = end_date[:7] if end_date else None
+
+    parts = []
+    for partition, entry in sorted(load_manifest(table).get("partitions", {}).items()):
+        country, month = partition.split("/")
+        if countries and country not in countries:
+            continue
+        if (start_month and month < start_month) or (end_month and month > end_month):
+            continue
+
+        source = pa.memory_map(str(table_dir / entry["path"]), "r")
+        part = pa.ipc.open_file(source).read_all()
+        if start_date and month == start_month:
+            part = part.filter(
+                pc.greater_equal(part["date"], pa.scalar(date_cls.fromisoformat(start_date), pa.date32()))
+            )
+        if end_date and month == end_month:
+            part = part.filter(
+                pc.less_equal(part["date"], pa.scalar(date_cls.fromisoformat(end_date), pa.date32()))
+            )
+        parts.append(part.select(selected))
+
+    if not parts:
+        return schema.empty_table().select(selected)
+    return pa.concat_tables(parts)
+
+
+def read_archive_numpy(
+    table: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    columns: list[str] | None = None,
+    countries: list[str] | None = None,
+) -> dict:
+    """``read_archive`` 결과를 컬럼별 NumPy 배열로 반환한다.
+
+    결과가 한 청크이고 null이 없는 숫자 컬럼은 메모리 맵을 그대로 가리키는
+    읽기 전용 배열이다. 여러 파티션에 걸치면 컬럼별로 한 번 이어 붙인다.
+    """
+    arrow_table = read_archive(table, start_date, end_date, columns, countries)
+    arrays = {}
+    for name in arrow_table.column_names:
+        column = arrow_table.column(name)
+        if column.num_chunks == 1 and column.null_count == 0:
+            chunk = column.chunk(0)
+            try:
+                arrays[name] = chunk.to_numpy(zero_copy_only=True)
+                continue
+            except Exception:
+                pass
+        arrays[name] = column.to_numpy()
+    return arrays
@@ -0,0 +1,245 @@
+"""lead-lag 파라미터 walk-forward 백테스트.
+
+섹터 수익률 패널(``src/panel.py``, 얼린 연도 샤드 포함) 전체 히스토리를 한 번 읽고,
+날짜마다 그날까지의 데이터만으로 점수 계산 → 시그널 생성 → 후행국 채점을
+메모리에서 재현한다. ``get_flow_signal_stats``가 현재 설정 하나의 운영 기간만
+보는 것과 달리, 설정 그리드 전체의 적중률을 같은 기간으로 비교한다.
+
+- 점수는 (lookback, max_lag)에만 의존하므로 그 조합마다 한 번만 walk-forward 하고,
+  min_correlation/min_leader_move 조합은 같은 후보 시그널 목록에 필터만 달리 적용한다.
+- (lookback, max_lag) 조합은 프로세스 풀에서 나눠 돌리고, 패널은 워커마다 한 번만 받는다.
+- 채점은 운영과 같이 created_date 뒤 lag번째 후행국 거래일 수익률로 한다.
+  수익률이 비어 있는 날은 패널에 없으므로 건너뛰고, 만료는 없다.
+- 운영의 p-value 필터(``LEADLAG_MAX_P_VALUE``)는 날짜마다 재표본이 필요해 재현하지 않는다.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import product
+
+import numpy as np
+
+from src.config import LEADLAG_BACKTEST_GRID, LEADLAG_MIN_OVERLAP
+from src.database import open_summary_range
+from src.leadlag import _VARIANCE_FLOOR, _close_minutes, _compact_pairs
+from src.panel import SectorReturnPanel, load_sector_return_panel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    lookback_days: int
+    max_lag: int
+    min_correlation: float
+    min_leader_move: float
+
+
+_worker_panel: SectorReturnPanel | None = None
+
+
+def load_panel(start_date: str | None = None, end_date: str | None = None) -> SectorReturnPanel:
+    """얼린 연도 샤드까지 포함한 섹터 수익률 패널을 읽는다."""
+    with open_summary_range(start_date, end_date) as conn:
+        return load_sector_return_panel(conn).window(start_date, end_date)
+
+
+def build_grid(
+    lookback_days=None,
+    max_lag=None,
+    min_correlation=None,
+    min_leader_move=None,
+) -> list[BacktestConfig]:
+    """축별 값 목록으로 설정 그리드를 만든다. 비운 축은 ``LEADLAG_BACKTEST_GRID`` 값을 쓴다."""
+    axes = {
+        "lookback_days": lookback_days or LEADLAG_BACKTEST_GRID["lookback_days"],
+        "max_lag": max_lag or LEADLAG_BACKTEST_GRID["max_lag"],
+        "min_correlation": min_correlation or LEADLAG_BACKTEST_GRID["min_correlation"],
+        "min_leader_move": min_leader_move or LEADLAG_BACKTEST_GRID["min_leader_move"],
+    }
+    return [BacktestConfig(*values) for values in product(*(sorted(set(axis)) for axis in axes.values()))]
+
+
+def _walk_forward_scores(
+    values: np.ndarray,
+    countries: list[str],
+    window_start: np.ndarray,
+    max_lag: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """한 섹터의 모든 날짜·페어에 대해 그날 창 기준 최적 시차와 상관을 한 번에 구한다.
+
+    날짜마다 ``_score_sector_panel``을 부르는 것과 같은 결과다. 공통 거래일 압축 시계열의
+    시차별 관측 합계(n, Σx, Σy, Σx², Σy², Σxy)를 누적합으로 만들어 두면 날짜 t의 창
+    [window_start[t], t]에 든 관측의 합은 누적합 두 값의 차이다.
+    반환값은 (C×C×T) 최적 시차(없으면 -1)와 반올림된 상관이다.
+    """
+    n_countries, n_dates = values.shape
+    pair_mask, leader_values, follower_values = _compact_pairs(values)
+    overlap = pair_mask.sum(axis=2)
+    common = np.concatenate(
+        [np.zeros((n_countries, n_countries, 1), dtype=int), np.cumsum(pair_mask, axis=2)],
+        axis=2,
+    )
+    # 날짜 t의 창에 든 공통 거래일은 압축 시계열 위치 [before, through)
+    before = common[:, :, window_start]
+    through = common[:, :, 1:]
+
+    close = np.array([_close_minutes(country) for country in countries])
+    min_lag = np.where(close[:, None] < close[None, :], 0, 1)
+    off_diagonal = ~np.eye(n_countries, dtype=bool)[:, :, None]
+
+    best_lag = np.full((n_countries, n_countries, n_dates), -1)
+    best_corr = np.zeros((n_countries, n_countries, n_dates))
+    best_abs = np.full((n_countries, n_countries, n_dates), -1.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for lag in range(min(max_lag, n_dates - 1) + 1):
+            # 관측 (x[q - lag], y[q])의 q 누적합. 날짜 t의 창 안 관측은 q in [before + lag, through).
+            valid = np.arange(lag, n_dates) < overlap[:, :, None]
+            lead = np.where(valid, leader_values[:, :, : n_dates - lag], 0.0)
+            follow = np.where(valid, follower_values[:, :, lag:], 0.0)
+            prefix = np.zeros((6, n_countries, n_countries, n_dates + 1))
+            for index, term in enumerate((valid, lead, follow, lead * lead, follow * follow, lead * follow)):
+                prefix[index, :, :, lag + 1 :] = np.cumsum(term, axis=2)
+            low = np.minimum(before + lag, n_dates)
+            high = np.maximum(through, low)
+            n_obs, sum_x, sum_y, sum_xx, sum_yy, sum_xy = np.take_along_axis(
+                prefix, high[None], axis=3
+            ) - np.take_along_axis(prefix, low[None], axis=3)
+
+            var_x = sum_xx - sum_x * sum_x / n_obs
+            var_y = sum_yy - sum_y * sum_y / n_obs
+            correlation = np.round((sum_xy - sum_x * sum_y / n_obs) / np.sqrt(var_x * var_y), 4)
+            better = (
+                off_diagonal
+                & (lag >= min_lag)[:, :, None]
+                & (n_obs >= LEADLAG_MIN_OVERLAP)
+                & (var_x > _VARIANCE_FLOOR * sum_xx)
+                & (var_y > _VARIANCE_FLOOR * sum_yy)
+                & (np.abs(correlation) > best_abs)
+            )
+            best_abs = np.where(better, np.abs(correlation), best_abs)
+            best_corr = np.where(better, correlation, best_corr)
+            best_lag = np.where(better, lag, best_lag)
+    return best_lag, best_corr
+
+
+def _candidate_signals(panel: SectorReturnPanel, lookback_days: int, max_lag: int) -> dict[str, np.ndarray]:
+    """한 (lookback, max_lag) 조합의 walk-forward 후보 시그널.
+
+    날짜마다 lag >= 1 페어 중 선행국 수익률이 있는 것을 모두 모은다. 임계값 필터는
+    호출자가 적용한다. 후행국 데이터가 아직 없으면 follower_return이 NaN이다.
+    """
+    day = timedelta(days=1)
+    window_start = np.searchsorted(
+        panel.dates,
+        [
+            (datetime.strptime(date, "%Y-%m-%d") - lookback_days * day).strftime("%Y-%m-%d")
+            for date in panel.dates
+        ],
+        side="left",
+    )
+    n_dates = len(panel.dates)
+    columns: dict[str, list[np.ndarray]] = {
+        "correlation": [], "leader_move": [], "follower_return": [], "date_index": [],
+    }
+    for sector_index in range(len(panel.sectors)):
+        values = panel.values[sector_index]
+        present = np.flatnonzero(~np.isnan(values).all(axis=1))
+        if len(present) < 2:
+            continue
+        values = values[present]
+        best_lag, best_corr = _walk_forward_scores(
+            values, [panel.countries[index] for index in present], window_start, max_lag
+        )
+
+        # follower_at[c, t, lag]: t 뒤 lag번째로 값이 있는 날의 수익률
+        follower_at = np.full((len(present), n_dates, max_lag + 1), np.nan)
+        for country_index, row in enumerate(values):
+            observed = np.flatnonzero(~np.isnan(row))
+            for lag in range(1, max_lag + 1):
+                position = np.searchsorted(observed, np.arange(n_dates), side="right") + lag - 1
+                found = position < len(observed)
+                follower_at[country_index, found, lag] = row[observed[position[found]]]
+
+        leader, follower, date_index = np.nonzero((best_lag >= 1) & ~np.isnan(values)[:, None, :])
+        lags = best_lag[leader, follower, date_index]
+        columns["correlation"].append(best_corr[leader, follower, date_index])
+        columns["leader_move"].append(values[leader, date_index])
+        columns["follower_return"].append(follower_at[follower, date_index, lags])
+        columns["date_index"].append(date_index)
+    return {
+        name: np.concatenate(parts).astype(float) if parts else np.array([])
+        for name, parts in columns.items()
+    }
+
+
+def _summarize(config: BacktestConfig, candidates: dict[str, np.ndarray], dates: np.ndarray) -> dict:
+    selected = (candidates["correlation"] >= config.min_correlation) & (
+        np.abs(candidates["leader_move"]) >= config.min_leader_move
+    )
+    follower_return = candidates["follower_return"][selected]
+    direction = np.sign(candidates["leader_move"][selected])
+    verified = ~np.isnan(follower_return)
+    signed = follower_return[verified] * direction[verified]
+    hits = int((signed > 0).sum())
+    signal_dates = candidates["date_index"][selected].astype(int)
+    return {
+        **asdict(config),
+        "signals": int(selected.sum()),
+        "verified": int(verified.sum()),
+        "hits": hits,
+        "hit_rate": hits / int(verified.sum()) if verified.any() else None,
+        "mean_signed_return": float(signed.mean()) if verified.any() else None,
+        "first_signal": str(dates[signal_dates.min()]) if len(signal_dates) else None,
+        "last_signal": str(dates[signal_dates.max()]) if len(signal_dates) else None,
+    }
+
+
+def _init_worker(panel: SectorReturnPanel) -> None:
+    global _worker_panel
+    _worker_panel = panel
+
+
+def _run_group(
+    lookback_days: int,
+    max_lag: int,
+    configs: list[BacktestConfig],
+    panel: SectorReturnPanel | None = None,
+) -> list[dict]:
+    panel = panel or _worker_panel
+    candidates = _candidate_signals(panel, lookback_days, max_lag)
+    return [_summarize(config, candidates, panel.dates) for config in configs]
+
+
+def run_backtest(panel: SectorReturnPanel, grid: list[BacktestConfig], jobs: int = 1) -> list[dict]:
+    """설정 그리드 전체를 walk-forward로 재현해 설정별 적중률을 적중률 내림차순으로 반환한다."""
+    groups: dict[tuple[int, int], list[BacktestConfig]] = {}
+    for config in grid:
+        groups.setdefault((config.lookback_days, config.max_lag), []).append(config)
+
+    results: list[dict] = []
+    if jobs <= 1 or len(groups) == 1:
+        for (lookback_days, max_lag), configs in groups.items():
+            results.extend(_run_group(lookback_days, max_lag, configs, panel))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(groups)),
+            initializer=_init_worker,
+            initargs=(panel,),
+        ) as executor:
+            futures = [
+                executor.submit(_run_group, lookback_days, max_lag, configs)
+                for (lookback_days, max_lag), configs in groups.items()
+            ]
+            for future in futures:
+                results.extend(future.result())
+
+    logger.info(f"lead-lag 백테스트: 설정 {len(results)}개, (lookback, max_lag) 조합 {len(groups)}개")
+    return sorted(
+        results,
+        key=lambda row: (row["hit_rate"] is None, -(row["hit_rate"] or 0), -row["verified"]),
+    )
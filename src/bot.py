@@ -11,6 +11,7 @@ from telegram.ext import (
 
 from src.config import COUNTRIES, SECTORS, TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
 from src.monitor import format_status_report
+from src.report_context import get_report_context
 from src.reporter import (
     format_abnormal_report,
     format_country_detail,
@@ -19,6 +20,9 @@ from src.reporter import (
     format_sector_detail,
     format_trending_report,
     format_watchlist_report,
+    get_prerendered_report,
+    prerender_reports,
+    report_render_key,
 )
 
 logger = logging.getLogger(__name__)
@@ -37,6 +41,37 @@ for kr, en in SECTORS.items():
     SECTOR_NAME_MAP[en.lower()] = kr
 
 
+# 이 프로세스가 rendered_reports를 채운 (리비전, 날짜 입력 키, watchlist)
+_prerendered_keys: set[tuple] = set()
+
+
+def _render(command: str, render, argument: str = "") -> list[str]:
+    """미리 렌더링해 둔 텍스트를 쓰고, 없을 때만 새로 렌더링한다.
+
+    prepare가 다른 호스트에서 돌았거나 데이터·날짜 입력이 바뀌어 캐시가 비면,
+    봇이 그 컨텍스트로 모든 명령을 한 번 렌더링해 rendered_reports를 채운다.
+    """
+    messages = get_prerendered_report(command, argument)
+    if messages is not None:
+        return messages
+
+    report_context = get_report_context()
+    key = (
+        report_context.data_version,
+        report_render_key(report_context),
+        tuple(report_context.watch_items),
+    )
+    if key not in _prerendered_keys:
+        _prerendered_keys.add(key)
+        if prerender_reports(report_context):
+            messages = get_prerendered_report(command, argument)
+            if messages is not None:
+                return messages
+
+    rendered = render(context=report_context)
+    return rendered if isinstance(rendered, list) else [rendered]
+
+
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """봇 시작. 채팅 ID 알려줌."""
     chat_id = update.effective_chat.id
@@ -59,7 +94,7 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def cmd_report(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """종합 리포트 전송."""
-    messages = format_daily_report()
+    messages = _render("report", format_daily_report)
     for msg in messages:
         if msg.strip():
             await update.message.reply_text(msg)
@@ -77,7 +112,11 @@ async def cmd_sector(update: Update, context: ContextTypes.DEFAULT_TYPE):
     sector_input = " ".join(context.args)
     sector_name = SECTOR_NAME_MAP.get(sector_input, sector_input)
 
-    msg = format_sector_detail(sector_name)
+    (msg,) = _render(
+        "sector",
+        lambda context: format_sector_detail(sector_name, context=context),
+        sector_name,
+    )
     await update.message.reply_text(msg)
 
 
@@ -96,31 +135,35 @@ async def cmd_country(update: Update, context: ContextTypes.DEFAULT_TYPE):
     country_input = " ".join(context.args)
     country_code = COUNTRY_NAME_MAP.get(country_input, country_input.upper())
 
-    msg = format_country_detail(country_code)
+    (msg,) = _render(
+        "country",
+        lambda context: format_country_detail(country_code, context=context),
+        country_code,
+    )
     await update.message.reply_text(msg)
 
 
 async def cmd_trending(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """글로벌 트렌딩 섹터 TOP 5."""
-    msg = format_trending_report()
+    (msg,) = _render("trending", format_trending_report)
     await update.message.reply_text(msg)
 
 
 async def cmd_flow(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """글로벌 자금 흐름 lead-lag 리포트."""
-    msg = format_flow_report()
+    (msg,) = _render("flow", format_flow_report)
     await update.message.reply_text(msg)
 
 
 async def cmd_abnormal(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """비정상 급등/급락 종목."""
-    msg = format_abnormal_report()
+    (msg,) = _render("abnormal", format_abnormal_report)
     await update.message.reply_text(msg)
 
 
 async def cmd_watch(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """개인 watchlist 요약."""
-    msg = format_watchlist_report()
+    msg = format_watchlist_report(context=get_report_context())
     await update.message.reply_text(msg)
 
 
@@ -184,6 +227,9 @@ def run_bot():
     app.add_handler(CommandHandler("status", cmd_status))
     app.add_handler(CommandHandler("help", cmd_help))
 
+    # 봇 호스트의 DB를 최신 스키마로 올리고 렌더링 캐시를 채운다
+    prerender_reports()
+
     print("\U0001f916 MarketBot 실행 중... (Ctrl+C로 종료)")
     app.run_polling()
 
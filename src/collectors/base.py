@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime
 
 import pandas as pd
@@ -15,11 +16,8 @@ from src.config import (
     INSTRUMENT_METADATA_STALE_AFTER_DAYS,
 )
 from src.database import (
-    get_connection,
+    DatabaseSession,
     get_instrument_metadata,
-    get_raw_connection,
-    init_db,
-    init_raw_db,
     log_collection,
     replace_abnormal_stocks,
     upsert_instrument_metadata,
@@ -37,6 +35,7 @@ class BaseCollector(ABC):
 
     country_code: str
     metadata_source: str = ""
+    _session: DatabaseSession | None = None
 
     @abstractmethod
     def fetch_all_stocks(self, date: str) -> pd.DataFrame:
@@ -47,6 +46,19 @@ class BaseCollector(ABC):
         """Validate prerequisites before the collector hits external providers."""
         return None
 
+    @contextmanager
+    def _db_session(self):
+        """Yield the run's DB session, or a short-lived one outside ``run()``."""
+        if self._session is not None:
+            yield self._session
+            return
+
+        session = DatabaseSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
     def get_run_mode(self) -> str:
         """Return the current collection mode for logging."""
         return getattr(self, "run_mode", "standard")
@@ -101,6 +113,12 @@ class BaseCollector(ABC):
             raw_error_excerpt=failure.raw_error_excerpt,
         )
 
+    def _record_failure(self, failure: CollectionFailure) -> None:
+        """Persist one failure log in its own summary transaction."""
+        with self._db_session() as session:
+            with session.summary_transaction() as summary_conn:
+                self._log_failure(summary_conn, failure)
+
     def run_preflight(self, date: str | None = None) -> bool:
         """Run only the validation stage and persist structured failures."""
         if date is None:
@@ -111,26 +129,24 @@ class BaseCollector(ABC):
         info = COUNTRIES[country]
         logger.info(f"[{info['flag']} {info['name_kr']}] preflight started: {date}")
 
-        init_db()
-        summary_conn = get_connection()
+        self._session = DatabaseSession()
         try:
             self.preflight(date)
             logger.info(f"[{country}] preflight passed")
             return True
         except SystemExit as exc:
             failure = self._to_collection_failure(exc, default_stage="preflight")
-            self._log_failure(summary_conn, failure)
-            summary_conn.commit()
+            self._record_failure(failure)
             logger.error(f"[{country}] preflight failed: {failure}", exc_info=True)
             raise failure
         except Exception as exc:
             failure = self._to_collection_failure(exc, default_stage="preflight")
-            self._log_failure(summary_conn, failure)
-            summary_conn.commit()
+            self._record_failure(failure)
             logger.error(f"[{country}] preflight failed: {failure}", exc_info=True)
             raise failure
         finally:
-            summary_conn.close()
+            self._session.close()
+            self._session = None
 
     def run(self, date: str | None = None) -> bool:
         """Run the end-to-end collection pipeline for one market."""
@@ -142,15 +158,12 @@ class BaseCollector(ABC):
         info = COUNTRIES[country]
         logger.info(f"[{info['flag']} {info['name_kr']}] collection started: {date}")
 
-        init_db()
-        summary_conn = get_connection()
-        raw_conn = None
+        self._session = DatabaseSession()
+        session = self._session
 
         try:
             self.preflight(date)
 
-            init_raw_db()
-            raw_conn = get_raw_connection()
             df = self.fetch_all_stocks(date)
             if df.empty:
                 failure = CollectionFailure(
@@ -161,8 +174,7 @@ class BaseCollector(ABC):
                     run_mode=self.get_run_mode(),
                     raw_error_excerpt="collector returned an empty dataframe",
                 )
-                self._log_failure(summary_conn, failure)
-                summary_conn.commit()
+                self._record_failure(failure)
                 logger.warning(f"[{country}] no data returned")
                 return False
 
@@ -202,26 +214,27 @@ class BaseCollector(ABC):
                     }
                 )
 
-            upsert_stock_daily(raw_conn, stock_rows)
-            replace_abnormal_stocks(summary_conn, effective_date, country, stock_rows)
-            upsert_instrument_universe(summary_conn, country, stock_rows)
-
             active = df[(df["is_filtered"] == 0) & (df["is_abnormal"] == 0)]
             sector_rows = self._aggregate_sectors(active, effective_date, country)
-            upsert_sector_performance(summary_conn, sector_rows)
-
-            log_collection(
-                summary_conn,
-                country,
-                "success",
-                total=total,
-                filtered=filtered_count,
-                abnormal=abnormal_count,
-                run_mode=self.get_run_mode(),
-                provider=self.get_provider_name(),
-            )
-            raw_conn.commit()
-            summary_conn.commit()
+
+            with session.raw_transaction() as raw_conn:
+                upsert_stock_daily(raw_conn, stock_rows)
+                with session.summary_transaction() as summary_conn:
+                    replace_abnormal_stocks(
+                        summary_conn, effective_date, country, stock_rows
+                    )
+                    upsert_instrument_universe(summary_conn, country, stock_rows)
+                    upsert_sector_performance(summary_conn, sector_rows)
+                    log_collection(
+                        summary_conn,
+                        country,
+                        "success",
+                        total=total,
+                        filtered=filtered_count,
+                        abnormal=abnormal_count,
+                        run_mode=self.get_run_mode(),
+                        provider=self.get_provider_name(),
+                    )
             logger.info(
                 f"[{country}] saved {len(sector_rows)} sectors and "
                 f"{len(stock_rows)} stocks"
@@ -230,20 +243,17 @@ class BaseCollector(ABC):
 
         except SystemExit as exc:
             failure = self._to_collection_failure(exc, default_stage="run")
-            self._log_failure(summary_conn, failure)
-            summary_conn.commit()
+            self._record_failure(failure)
             logger.error(f"[{country}] collection failed: {failure}", exc_info=True)
             raise failure
         except Exception as exc:
             failure = self._to_collection_failure(exc, default_stage="run")
-            self._log_failure(summary_conn, failure)
-            summary_conn.commit()
+            self._record_failure(failure)
             logger.error(f"[{country}] collection failed: {failure}", exc_info=True)
             raise failure
         finally:
-            summary_conn.close()
-            if raw_conn is not None:
-                raw_conn.close()
+            session.close()
+            self._session = None
 
     def _is_metadata_refresh_due(self, date: str) -> bool:
         """Return True when the weekly metadata refresh should run."""
@@ -278,11 +288,10 @@ class BaseCollector(ABC):
         if not tickers:
             return {}
 
-        conn = get_connection()
-        try:
-            rows = get_instrument_metadata(conn, self.country_code, tickers=tickers)
-        finally:
-            conn.close()
+        with self._db_session() as session:
+            rows = get_instrument_metadata(
+                session.summary, self.country_code, tickers=tickers
+            )
 
         return {row["ticker"]: row for row in rows}
 
@@ -291,17 +300,14 @@ class BaseCollector(ABC):
         if not rows:
             return
 
-        conn = get_connection()
-        try:
-            upsert_instrument_metadata(
-                conn,
-                self.country_code,
-                rows,
-                source=source or self.metadata_source or self.country_code.lower(),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        with self._db_session() as session:
+            with session.summary_transaction() as conn:
+                upsert_instrument_metadata(
+                    conn,
+                    self.country_code,
+                    rows,
+                    source=source or self.metadata_source or self.country_code.lower(),
+                )
 
     def _aggregate_sectors(
         self,
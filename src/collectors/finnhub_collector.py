@@ -27,7 +27,7 @@ from src.config import (
     UNIVERSE_PREFILTER_FULL_REFRESH_WEEKDAY,
     UNIVERSE_PREFILTER_TARGET_COUNT,
 )
-from src.database import get_connection, get_instrument_universe
+from src.database import get_instrument_universe
 
 logger = logging.getLogger(__name__)
 
@@ -124,11 +124,8 @@ class FinnhubCollector(BaseCollector):
             return stocks
 
         try:
-            conn = get_connection()
-            try:
-                cached_rows = get_instrument_universe(conn, self.country_code)
-            finally:
-                conn.close()
+            with self._db_session() as session:
+                cached_rows = get_instrument_universe(session.summary, self.country_code)
         except Exception as exc:
             logger.warning(
                 f"[{self.country_code}] universe cache unavailable, use full fetch: {exc}"
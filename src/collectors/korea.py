@@ -19,7 +19,7 @@ from pykrx import stock as krx
 from src.collectors.base import BaseCollector
 from src.collectors.date_utils import compute_return_pct, recent_dates
 from src.config import KR_SECTOR_MAP, SECTORS
-from src.database import get_connection, get_instrument_universe, get_raw_connection
+from src.database import get_instrument_universe, raw_fact_query
 
 logger = logging.getLogger(__name__)
 
@@ -134,11 +134,8 @@ class KoreaCollector(BaseCollector):
     def _load_cached_universe_map(self) -> dict[str, dict]:
         """Load cached KR universe rows keyed by ticker."""
         try:
-            conn = get_connection()
-            try:
-                rows = get_instrument_universe(conn, self.country_code)
-            finally:
-                conn.close()
+            with self._db_session() as session:
+                rows = get_instrument_universe(session.summary, self.country_code)
         except Exception as exc:
             logger.warning(f"[KR] cached universe unavailable: {exc}")
             return {}
@@ -163,21 +160,20 @@ class KoreaCollector(BaseCollector):
         start_date = (end_dt - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
         placeholders = ", ".join("?" for _ in tickers)
 
-        conn = get_raw_connection()
-        try:
-            rows = conn.execute(
-                f"""
-                SELECT ticker, date, close_price
-                FROM stock_daily
-                WHERE country = ?
-                  AND date BETWEEN ? AND ?
-                  AND ticker IN ({placeholders})
-                ORDER BY date DESC
-                """,
-                [self.country_code, start_date, end_date, *tickers],
+        # 조회 구간이 월 경계를 넘으면 봉인된 이전 파티션도 실행 세션의 raw 연결에
+        # 잠시 ATTACH해 함께 읽는다.
+        with self._db_session() as session, session.raw_range(start_date, end_date) as raw_conn:
+            query, params = raw_fact_query(
+                raw_conn,
+                "i.ticker AS ticker, f.date AS date, f.close_price AS close_price",
+                start_date,
+                end_date,
+                where=f"i.country = ? AND i.ticker IN ({placeholders})",
+                params=(self.country_code, *tickers),
+            )
+            rows = raw_conn.execute(
+                f"SELECT * FROM ({query}) ORDER BY date DESC", params
             ).fetchall()
-        finally:
-            conn.close()
 
         close_map: dict[str, float] = {}
         for row in rows:
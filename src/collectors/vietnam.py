@@ -30,11 +30,9 @@ from src.config import (
 from src.database import (
     delete_collection_checkpoint,
     get_collection_checkpoint,
-    get_connection,
     get_instrument_universe,
     get_recent_collection_logs,
     get_recent_abnormal_tickers,
-    init_db,
     upsert_collection_checkpoint,
 )
 
@@ -244,16 +242,12 @@ class VietnamCollector(BaseCollector):
         return None
 
     def _load_recent_failure_policy(self) -> dict[str, object]:
-        init_db()
-        conn = get_connection()
-        try:
+        with self._db_session() as session:
             logs = get_recent_collection_logs(
-                conn,
+                session.summary,
                 limit=VN_FAILURE_POLICY_LOOKBACK_RUNS,
                 market=self.country_code,
             )
-        finally:
-            conn.close()
 
         consecutive_failures: list[dict] = []
         stage_source_penalties: dict[str, set[str]] = {}
@@ -476,9 +470,7 @@ class VietnamCollector(BaseCollector):
         rows: list[dict],
         used_dates: list[str],
     ) -> None:
-        init_db()
-        conn = get_connection()
-        try:
+        with self._db_session() as session, session.summary_transaction() as conn:
             batch_size = max(1, VN_CHECKPOINT_BATCH_SIZE)
             upsert_collection_checkpoint(
                 conn,
@@ -500,32 +492,23 @@ class VietnamCollector(BaseCollector):
                     "effective_date": max(used_dates) if used_dates else None,
                 },
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def _clear_checkpoint(
         self,
         requested_date: str,
         run_mode: str | None = None,
     ) -> None:
-        init_db()
-        conn = get_connection()
-        try:
+        with self._db_session() as session, session.summary_transaction() as conn:
             delete_collection_checkpoint(
                 conn,
                 self.country_code,
                 requested_date=requested_date,
                 run_mode=run_mode or self.get_run_mode(),
             )
-            conn.commit()
-        finally:
-            conn.close()
 
     def _load_pending_checkpoint(self, requested_date: str) -> dict | None:
-        init_db()
-        conn = get_connection()
-        try:
+        with self._db_session() as session:
+            conn = session.summary
             if self.resume_from_checkpoint:
                 checkpoint = get_collection_checkpoint(
                     conn,
@@ -552,8 +535,6 @@ class VietnamCollector(BaseCollector):
                     run_mode="seed",
                 )
             return None
-        finally:
-            conn.close()
 
     def _restore_checkpoint_state(
         self,
@@ -593,11 +574,8 @@ class VietnamCollector(BaseCollector):
     def _load_listing_from_cached_universe(self) -> pd.DataFrame:
         """Fall back to the last cached universe when vnstock listing APIs fail."""
         try:
-            conn = get_connection()
-            try:
-                rows = get_instrument_universe(conn, self.country_code)
-            finally:
-                conn.close()
+            with self._db_session() as session:
+                rows = get_instrument_universe(session.summary, self.country_code)
         except Exception as exc:
             logger.warning(f"[VN] cached listing unavailable: {exc}")
             return pd.DataFrame()
@@ -904,19 +882,18 @@ class VietnamCollector(BaseCollector):
             return listing
 
         try:
-            conn = get_connection()
-            try:
-                universe_rows = get_instrument_universe(conn, self.country_code)
+            with self._db_session() as session:
+                universe_rows = get_instrument_universe(
+                    session.summary, self.country_code
+                )
                 abnormal_tickers = set(
                     get_recent_abnormal_tickers(
-                        conn,
+                        session.summary,
                         self.country_code,
                         date,
                         lookback_days=VN_INCREMENTAL_ABNORMAL_LOOKBACK_DAYS,
                     )
                 )
-            finally:
-                conn.close()
         except Exception as exc:
             self._set_selection_context("full", "cache_unavailable")
             logger.warning(f"[VN] incremental universe unavailable, use full rebuild: {exc}")
@@ -10,6 +10,75 @@ DB_PATH = DATA_DIR / "marketbot.db"
 SUMMARY_DB_PATH = DB_PATH
 RAW_DB_PATH = DATA_DIR / "marketbot_raw.db"
 
+# ── SQLite 성능 프로파일 ──
+# page_size는 새 DB 파일을 만들 때만 적용된다 (WAL 모드에서는 VACUUM으로도 못 바꾼다).
+# cache_size 음수는 KiB 단위.
+# busy_timeout_ms: 다른 연결이 쓰기 잠금을 쥐고 있을 때 SQLITE_BUSY를 내기 전에 기다리는 시간.
+# 리포트 준비 DAG처럼 한 프로세스에서 여러 연결이 쓰면 잠깐 겹치는 쓰기가 바로 실패하지 않는다.
+SQLITE_PROFILES = {
+    # raw DB: 대량 upsert 위주, 언제든 다시 받을 수 있는 캐시라 fsync를 생략한다.
+    "bulk_load": {
+        "synchronous": "OFF",
+        "cache_size": -65536,
+        "mmap_size": 268_435_456,
+        "temp_store": "MEMORY",
+        "page_size": 8192,
+        "busy_timeout_ms": 30_000,
+    },
+    # 리포트/봇: 읽기 전용 조회 위주.
+    "read_mostly": {
+        "synchronous": "NORMAL",
+        "cache_size": -32768,
+        "mmap_size": 268_435_456,
+        "temp_store": "MEMORY",
+        "page_size": 4096,
+        "busy_timeout_ms": 5_000,
+    },
+    # summary DB 쓰기: Git에 커밋되므로 커밋마다 fsync한다.
+    "durable": {
+        "synchronous": "FULL",
+        "cache_size": -8192,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "page_size": 4096,
+        "busy_timeout_ms": 30_000,
+    },
+}
+SUMMARY_DB_PROFILE = "durable"
+RAW_DB_PROFILE = "bulk_load"
+REPORT_DB_PROFILE = "read_mostly"
+
+# ── raw DB 파티션 ──
+# 지난 기간의 raw 행은 checkpoint 때 data/raw_partitions/ 아래 기간별 파일로 봉인하고,
+# data/marketbot_raw.db에는 현재 기간만 남긴다. 봉인된 파일은 다시 쓰지 않는다(늦게 온 행 병합 제외).
+RAW_PARTITION_DIRNAME = "raw_partitions"
+RAW_PARTITION_GRANULARITY = "month"  # "month" 또는 "quarter"
+RAW_PARTITION_RETENTION = 24  # 보관할 봉인 파티션 수
+
+# 닫힌 해의 sector_performance/trend_scores/lead_lag_scores/flow_signals는 checkpoint 때
+# data/summary_years/marketbot_<YYYY>.db로 얼리고 live summary DB에서 지운다.
+# 해가 바뀐 뒤에도 SUMMARY_LIVE_DAYS 동안은 live에 남겨 lookback 계산이 live DB만 보게 한다.
+SUMMARY_YEAR_DIRNAME = "summary_years"
+SUMMARY_LIVE_DAYS = 180
+
+# Git에 커밋하는 summary DB의 텍스트 형태. data/summary_export/<table>/... 정렬된 NDJSON 샤드
+# (scripts/summary_text.py export/import)
+SUMMARY_EXPORT_DIRNAME = "summary_export"
+
+# 분석용 컬럼형 아카이브. data/archive/<table>/country=<CC>/<YYYY-MM>.arrow
+# (scripts/sync_archive.py로 갱신, pyarrow 필요)
+ARCHIVE_DIRNAME = "archive"
+
+# CI 잡 시작용 warm-start 번들: live raw DB + 최근 봉인 파티션을 파일별로 압축해
+# 내용 해시 이름으로 저장한다 (scripts/warm_start.py save/restore).
+WARM_START_BUNDLE_DIR = BASE_DIR / ".cache" / "warm_start"
+WARM_START_RAW_PARTITIONS = 3  # 번들에 넣을 최근 봉인 파티션 수
+WARM_START_CODEC = "zstd"  # "zstd"(zstandard 필요) 또는 "gzip"
+WARM_START_ZSTD_LEVEL = 10
+
+# 이 행 수 이상이면 upsert를 TEMP staging 테이블 + INSERT ... SELECT 한 번으로 처리한다.
+BULK_UPSERT_THRESHOLD = 2000
+
 # ── .env 파일 로딩 (로컬 개발용) ──
 try:
     from dotenv import load_dotenv
@@ -283,3 +352,33 @@ LEADLAG_MIN_CORRELATION = 0.35     # 시그널 생성에 쓰는 최소 상관계
 LEADLAG_SIGNAL_MIN_LEADER_MOVE = 1.0   # 선행국 섹터 등락 임계값 (%)
 LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS = 7   # 후행국 데이터가 안 오면 만료
 LEADLAG_SCOREBOARD_WINDOW_DAYS = 30    # 가설 스코어보드 집계 구간
+# 점수 계산 방식: "incremental"(누적 합계 상태 갱신), "full"(창 전체 재계산),
+# "verify"(둘 다 계산해 비교하고 어긋나면 상태를 다시 만든다)
+LEADLAG_SCORE_MODE = os.getenv("LEADLAG_SCORE_MODE", "incremental")
+LEADLAG_STATE_SETTLE_DAYS = 5      # 이 기간 안의 최근 날짜는 늦게 도착할 수 있어 상태에 넣지 않는다
+LEADLAG_STATE_EDGE_DAYS = 14       # 창 가장자리 갱신 때 시차 짝을 찾으려고 더 읽는 캘린더 일수
+# 페어 점수의 순열검정 p-value·부트스트랩 신뢰구간 (0이면 계산하지 않는다)
+LEADLAG_SIGNIFICANCE_RESAMPLES = int(os.getenv("LEADLAG_SIGNIFICANCE_RESAMPLES", "1000"))
+LEADLAG_SIGNIFICANCE_JOBS = int(os.getenv("LEADLAG_SIGNIFICANCE_JOBS", "1"))  # 재표본 묶음 병렬 프로세스 수
+LEADLAG_CONFIDENCE_LEVEL = 0.95    # 부트스트랩 신뢰구간 수준
+LEADLAG_MAX_P_VALUE = 0.05         # 시그널 생성에 쓰는 최대 p-value (p-value가 없는 점수는 거르지 않는다)
+# 섹터 교차 lead-lag (예: 미국 IT → 한국 소재): "off", "direct"(시차별 곱의 합), "fft"(FFT 교차상관)
+LEADLAG_CROSS_SECTOR = os.getenv("LEADLAG_CROSS_SECTOR", "off")
+LEADLAG_CROSS_SECTOR_MIN_CORRELATION = 0.35  # 이 |상관| 미만 교차 페어는 저장하지 않는다
+# scripts/backtest_leadlag.py 기본 그리드 (축마다 값 목록)
+LEADLAG_BACKTEST_GRID = {
+    "lookback_days": (60, 120, 250),
+    "max_lag": (1, 2, 3),
+    "min_correlation": (0.25, 0.35, 0.5),
+    "min_leader_move": (0.5, 1.0, 2.0),
+}
+
+# ── 종목 단위 lead-lag (scripts/stock_leadlag.py, raw 히스토리로 도는 오프라인 작업) ──
+STOCK_LEADLAG_LOOKBACK_DAYS = 365      # 약 250거래일
+STOCK_LEADLAG_TOP_PER_MARKET = 500     # 시장별 평균 거래대금 상위 종목 수
+STOCK_LEADLAG_MIN_OVERLAP = 120        # 페어당 최소 공통 관측 수
+STOCK_LEADLAG_TOP_PAIRS = 50           # 저장할 상위 페어 수
+STOCK_LEADLAG_TILE = 1024              # 상관 행렬 타일 한 변 (종목 수)
+
+# ── 리포트용 파생 데이터 DAG (src/pipeline.py) ──
+REPORT_PIPELINE_JOBS = int(os.getenv("REPORT_PIPELINE_JOBS", "3"))  # 서로 의존하지 않는 노드를 동시에 돌리는 스레드 수
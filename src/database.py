@@ -4,33 +4,177 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 
-from src.config import DATA_DIR, DB_PATH, RAW_DB_PATH
+from src.config import (
+    BULK_UPSERT_THRESHOLD,
+    DATA_DIR,
+    DB_PATH,
+    RAW_DB_PATH,
+    RAW_DB_PROFILE,
+    RAW_PARTITION_DIRNAME,
+    RAW_PARTITION_GRANULARITY,
+    RAW_PARTITION_RETENTION,
+    SQLITE_PROFILES,
+    SUMMARY_DB_PROFILE,
+    SUMMARY_LIVE_DAYS,
+    SUMMARY_YEAR_DIRNAME,
+)
+
+
+def _apply_profile(
+    conn: sqlite3.Connection,
+    profile: str,
+    *,
+    is_new_file: bool,
+) -> None:
+    settings = SQLITE_PROFILES.get(profile)
+    if settings is None:
+        raise ValueError(f"unknown SQLite profile: {profile}")
+
+    if is_new_file:
+        conn.execute(f"PRAGMA page_size={int(settings['page_size'])}")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={settings['synchronous']}")
+    conn.execute(f"PRAGMA cache_size={int(settings['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size={int(settings['mmap_size'])}")
+    conn.execute(f"PRAGMA temp_store={settings['temp_store']}")
+    conn.execute(f"PRAGMA busy_timeout={int(settings['busy_timeout_ms'])}")
 
 
-def _connect(path) -> sqlite3.Connection:
+def _connect(path, profile: str = SUMMARY_DB_PROFILE) -> sqlite3.Connection:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
+    is_new_file = not Path(path).exists() or Path(path).stat().st_size == 0
     conn = sqlite3.connect(str(path))
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    _apply_profile(conn, profile, is_new_file=is_new_file)
     return conn
 
 
-def get_connection() -> sqlite3.Connection:
-    """Return the summary DB connection."""
-    return _connect(DB_PATH)
+def get_connection(profile: str | None = None) -> sqlite3.Connection:
+    """Return the summary DB connection tuned with one SQLITE_PROFILES entry."""
+    return _connect(DB_PATH, profile or SUMMARY_DB_PROFILE)
 
 
-def get_raw_connection() -> sqlite3.Connection:
-    """Return the raw DB connection."""
-    return _connect(RAW_DB_PATH)
+def get_raw_connection(profile: str | None = None) -> sqlite3.Connection:
+    """Return the raw DB connection tuned with one SQLITE_PROFILES entry."""
+    return _connect(RAW_DB_PATH, profile or RAW_DB_PROFILE)
 
 
-def init_db() -> None:
-    """Create the summary schema if it does not exist yet."""
-    conn = get_connection()
+_summary_write_lock = threading.Lock()
+
+
+@contextmanager
+def summary_write(conn: sqlite3.Connection):
+    """Run one summary DB write transaction, one thread of this process at a time.
+
+    Threads that compute in parallel (src/pipeline.py) funnel their writes
+    through this lock, so they queue here instead of racing for SQLite's
+    write lock. The transaction starts with BEGIN IMMEDIATE, commits on
+    success and rolls back on error. Keep only the writes inside.
+    """
+    with _summary_write_lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+
+class DatabaseSession:
+    """Unit of work holding one summary and one raw connection.
+
+    Connections open lazily on first use and stay open until ``close()``.
+    ``summary_transaction()``/``raw_transaction()`` scope writes: the
+    outermost scope commits on success and rolls back on error, while nested
+    scopes join it, so related writes share a single commit.
+    """
+
+    def __init__(self) -> None:
+        self._summary: sqlite3.Connection | None = None
+        self._raw: sqlite3.Connection | None = None
+        self._depth = {"summary": 0, "raw": 0}
+
+    @property
+    def summary(self) -> sqlite3.Connection:
+        if self._summary is None:
+            init_db()
+            self._summary = get_connection()
+        return self._summary
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        if self._raw is None:
+            init_raw_db()
+            self._raw = get_raw_connection()
+        return self._raw
+
+    @contextmanager
+    def _transaction(self, name: str, conn: sqlite3.Connection):
+        self._depth[name] += 1
+        try:
+            yield conn
+        except BaseException:
+            if self._depth[name] == 1:
+                conn.rollback()
+            raise
+        else:
+            if self._depth[name] == 1:
+                conn.commit()
+        finally:
+            self._depth[name] -= 1
+
+    def summary_transaction(self):
+        """Scope summary DB writes; the outermost scope commits once."""
+        return self._transaction("summary", self.summary)
+
+    def raw_transaction(self):
+        """Scope raw DB writes; the outermost scope commits once."""
+        return self._transaction("raw", self.raw)
+
+    @contextmanager
+    def raw_range(self, start_date: Optional[str] = None, end_date: Optional[str] = None):
+        """Yield the raw connection with partitions for [start_date, end_date] attached.
+
+        Read it with ``raw_fact_query``; the partitions are DETACHed on exit.
+        SQLite cannot ATTACH inside a transaction, so call this outside
+        ``raw_transaction()``.
+        """
+        conn = self.raw
+        if conn.in_transaction:
+            raise RuntimeError("raw_range() cannot ATTACH partitions inside a raw transaction")
+        aliases = _attach_raw_partitions(conn, start_date, end_date)
+        try:
+            yield conn
+        finally:
+            _detach_raw_partitions(conn, aliases)
+
+    def close(self) -> None:
+        for conn in (self._summary, self._raw):
+            if conn is not None:
+                conn.close()
+        self._summary = None
+        self._raw = None
+
+    def __enter__(self) -> "DatabaseSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+SCHEMA_VERSION_TABLE = "schema_version"
+
+
+def _summary_v1_base_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS sector_performance (
@@ -207,18 +351,44 @@ def init_db() -> None:
             ON flow_signals(status, created_date);
         """
     )
+
+
+def _summary_v2_collection_failure_columns(conn: sqlite3.Connection) -> None:
     _ensure_column(conn, "collection_log", "failure_code", "TEXT")
     _ensure_column(conn, "collection_log", "failure_stage", "TEXT")
     _ensure_column(conn, "collection_log", "run_mode", "TEXT")
     _ensure_column(conn, "collection_log", "provider", "TEXT")
     _ensure_column(conn, "collection_log", "raw_error_excerpt", "TEXT")
-    conn.commit()
-    conn.close()
 
 
-def init_raw_db() -> None:
-    """Create the raw schema if it does not exist yet."""
-    conn = get_raw_connection()
+def _summary_v3_hot_query_indexes(conn: sqlite3.Connection) -> None:
+    # Each index is shaped for one entry in HOT_QUERIES; keep them in sync.
+    # None of them is covering for the SELECT * queries: the trailing
+    # daily_return column lets sector_detail read rows in ORDER BY order
+    # without a sort, but each match still costs a table lookup.
+    # universe_snapshot needs none: UNIQUE(country, ticker) already pins it
+    # to a single row.
+    conn.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_sector_perf_date_sector
+            ON sector_performance(date, sector, daily_return);
+        CREATE INDEX IF NOT EXISTS idx_sector_perf_series
+            ON sector_performance(country, sector, date, daily_return);
+        CREATE INDEX IF NOT EXISTS idx_benchmark_daily_ticker_date
+            ON benchmark_daily(ticker, date);
+        CREATE INDEX IF NOT EXISTS idx_benchmark_daily_country_ticker_date
+            ON benchmark_daily(country, ticker, date);
+        CREATE INDEX IF NOT EXISTS idx_collection_log_timestamp
+            ON collection_log(timestamp, id);
+        CREATE INDEX IF NOT EXISTS idx_collection_log_market_timestamp
+            ON collection_log(market, timestamp, id);
+        CREATE INDEX IF NOT EXISTS idx_collection_log_status_timestamp
+            ON collection_log(status, timestamp, id);
+        """
+    )
+
+
+def _raw_v1_base_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
         CREATE TABLE IF NOT EXISTS stock_daily (
@@ -244,11 +414,572 @@ def init_raw_db() -> None:
             ON stock_daily(country, date);
         """
     )
-    conn.commit()
-    conn.close()
 
 
-def _table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
+_RAW_INSTRUMENT_CONFLICT = """
+    ON CONFLICT(country, ticker) DO UPDATE SET
+        name = CASE
+            WHEN excluded.name IS NULL OR TRIM(excluded.name) = ''
+                THEN raw_instrument.name
+            ELSE excluded.name
+        END,
+        sector = CASE
+            WHEN excluded.sector IS NULL
+              OR TRIM(excluded.sector) = ''
+              OR excluded.sector = '기타'
+                THEN raw_instrument.sector
+            ELSE excluded.sector
+        END,
+        as_of = excluded.as_of
+    WHERE excluded.as_of >= raw_instrument.as_of
+"""
+
+
+def _raw_v2_normalized_stock_daily(conn: sqlite3.Connection) -> None:
+    """Split stock_daily into an instrument dimension and a narrow fact table.
+
+    Name/sector/country/ticker live once per instrument in ``raw_instrument``;
+    ``stock_daily_fact`` keeps only integer keys (date as YYYYMMDD) and
+    numeric columns. ``stock_daily`` becomes a view with the old columns so
+    existing readers keep working. Name and sector in the view are the latest
+    known values for the instrument, not the values on each historical date.
+    """
+    has_legacy = table_exists(conn, "stock_daily")
+    if has_legacy:
+        conn.execute("ALTER TABLE stock_daily RENAME TO stock_daily_legacy")
+
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS raw_instrument (
+            id INTEGER PRIMARY KEY,
+            country TEXT NOT NULL,
+            ticker TEXT NOT NULL,
+            name TEXT,
+            sector TEXT,
+            as_of INTEGER NOT NULL,
+            UNIQUE(country, ticker)
+        );
+
+        CREATE TABLE IF NOT EXISTS stock_daily_fact (
+            instrument_id INTEGER NOT NULL REFERENCES raw_instrument(id),
+            date INTEGER NOT NULL,
+            market_cap REAL,
+            close_price REAL,
+            daily_return REAL,
+            volume REAL,
+            avg_volume_20d REAL,
+            is_filtered INTEGER DEFAULT 0,
+            is_abnormal INTEGER DEFAULT 0,
+            PRIMARY KEY (instrument_id, date)
+        ) WITHOUT ROWID;
+
+        CREATE VIEW IF NOT EXISTS stock_daily AS
+        SELECT
+            printf('%04d-%02d-%02d', f.date / 10000, f.date / 100 % 100, f.date % 100) AS date,
+            i.ticker,
+            i.name,
+            i.country,
+            i.sector,
+            f.market_cap,
+            f.close_price,
+            f.daily_return,
+            f.volume,
+            f.avg_volume_20d,
+            f.is_filtered,
+            f.is_abnormal
+        FROM stock_daily_fact f
+        JOIN raw_instrument i ON i.id = f.instrument_id;
+        """
+    )
+
+    if not has_legacy:
+        return
+
+    conn.execute(
+        f"""
+        INSERT INTO raw_instrument (country, ticker, name, sector, as_of)
+        SELECT country, ticker, name, sector, CAST(REPLACE(date, '-', '') AS INTEGER)
+        FROM stock_daily_legacy
+        WHERE true
+        ORDER BY date
+        {_RAW_INSTRUMENT_CONFLICT}
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO stock_daily_fact (
+            instrument_id, date, market_cap, close_price, daily_return,
+            volume, avg_volume_20d, is_filtered, is_abnormal
+        )
+        SELECT
+            i.id, CAST(REPLACE(l.date, '-', '') AS INTEGER), l.market_cap,
+            l.close_price, l.daily_return, l.volume, l.avg_volume_20d,
+            l.is_filtered, l.is_abnormal
+        FROM stock_daily_legacy l
+        JOIN raw_instrument i ON i.country = l.country AND i.ticker = l.ticker
+        """
+    )
+    conn.execute("DROP TABLE stock_daily_legacy")
+
+
+def _raw_v3_fact_collected_at(conn: sqlite3.Connection) -> None:
+    """Stamp fact rows with their collection time (unix seconds, 0 = unknown).
+
+    Merging raw DBs from several runs keeps the most recently collected copy
+    of each (instrument, date) row.
+    """
+    _ensure_column(conn, "stock_daily_fact", "collected_at", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _summary_v4_lead_lag_state(conn: sqlite3.Connection) -> None:
+    # Running sums behind the incremental lead-lag update (src/leadlag.py).
+    # One row per (sector, leader, follower, lag) plus a single window row
+    # recording which dates the sums cover.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS lead_lag_state (
+            sector TEXT NOT NULL,
+            leader TEXT NOT NULL,
+            follower TEXT NOT NULL,
+            lag INTEGER NOT NULL,
+            n_obs INTEGER NOT NULL,
+            sum_x REAL NOT NULL,
+            sum_y REAL NOT NULL,
+            sum_xx REAL NOT NULL,
+            sum_yy REAL NOT NULL,
+            sum_xy REAL NOT NULL,
+            agree INTEGER NOT NULL,
+            nonzero INTEGER NOT NULL,
+            PRIMARY KEY (sector, leader, follower, lag)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS lead_lag_state_window (
+            state TEXT PRIMARY KEY,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            max_lag INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            return_total REAL NOT NULL,
+            rebuilt_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        """
+    )
+
+
+def _summary_v5_lead_lag_significance(conn: sqlite3.Connection) -> None:
+    # Permutation p-value and bootstrap confidence interval of each pair's
+    # correlation; NULL when the significance stage is disabled.
+    _ensure_column(conn, "lead_lag_scores", "p_value", "REAL")
+    _ensure_column(conn, "lead_lag_scores", "ci_low", "REAL")
+    _ensure_column(conn, "lead_lag_scores", "ci_high", "REAL")
+
+
+# One column per country in sector_return_panel, sorted like the arrays
+# src/panel.py builds. Spelled out rather than derived from config.COUNTRIES
+# so released migrations stay fixed: a new market needs a new migration
+# adding its column and recreating the triggers below, and
+# tests/test_sector_panel.py fails until the two lists match again.
+SECTOR_PANEL_COUNTRIES = ("CN", "DE", "IN", "JP", "KR", "US", "VN")
+
+
+def _sector_panel_cell_sql(row: str, value: str) -> str:
+    """Trigger statements setting one country's cell of the (sector, date) panel row.
+
+    The row is created with INSERT ... WHERE NOT EXISTS rather than INSERT OR
+    IGNORE: inside a trigger the firing statement's conflict policy wins, so
+    OR IGNORE would still abort under a plain INSERT or an upsert.
+    """
+    assignments = ",\n            ".join(
+        f'"{country}" = CASE WHEN {row}.country = \'{country}\' THEN {value} ELSE "{country}" END'
+        for country in SECTOR_PANEL_COUNTRIES
+    )
+    empty = " AND ".join(f'"{country}" IS NULL' for country in SECTOR_PANEL_COUNTRIES)
+    return f"""
+        INSERT INTO sector_return_panel (sector, date)
+        SELECT {row}.sector, {row}.date
+        WHERE NOT EXISTS (
+            SELECT 1 FROM sector_return_panel WHERE sector = {row}.sector AND date = {row}.date
+        );
+        UPDATE sector_return_panel SET
+            {assignments}
+        WHERE sector = {row}.sector AND date = {row}.date;
+        DELETE FROM sector_return_panel
+        WHERE sector = {row}.sector AND date = {row}.date AND {empty};
+    """
+
+
+def _summary_v6_sector_return_panel(conn: sqlite3.Connection) -> None:
+    # Wide (sector, date) x country copy of sector_performance.daily_return
+    # for the analytics in src/panel.py, kept in step by triggers so every
+    # write path (upserts, shard import, year freezing) updates it. Each
+    # write also bumps data_revision, which keys the in-process array cache.
+    # The triggers are row-level: every sector_performance row written costs
+    # three panel statements (create the cell row, set the cell, drop an
+    # all-NULL row) plus the revision bump. Writes are about one row per
+    # sector per market per day, so that cost stays small next to keeping
+    # every write path (including imports and freezing) in step.
+    columns = ", ".join(f'"{country}" REAL' for country in SECTOR_PANEL_COUNTRIES)
+    pivot = ", ".join(
+        f"MAX(CASE WHEN country = '{country}' THEN daily_return END)"
+        for country in SECTOR_PANEL_COUNTRIES
+    )
+    bump = "UPDATE data_revision SET revision = revision + 1 WHERE name = 'sector_performance';"
+    conn.executescript(
+        f"""
+        CREATE TABLE IF NOT EXISTS sector_return_panel (
+            sector TEXT NOT NULL,
+            date TEXT NOT NULL,
+            {columns},
+            PRIMARY KEY (sector, date)
+        ) WITHOUT ROWID;
+
+        CREATE TABLE IF NOT EXISTS data_revision (
+            name TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO data_revision (name, revision) VALUES ('sector_performance', 0);
+
+        INSERT OR REPLACE INTO sector_return_panel
+        SELECT sector, date, {pivot}
+        FROM sector_performance
+        WHERE country IN ({", ".join(f"'{country}'" for country in SECTOR_PANEL_COUNTRIES)})
+          AND daily_return IS NOT NULL
+        GROUP BY sector, date;
+
+        CREATE TRIGGER IF NOT EXISTS sector_return_panel_insert
+        AFTER INSERT ON sector_performance
+        BEGIN
+            {_sector_panel_cell_sql("NEW", "NEW.daily_return")}
+            {bump}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS sector_return_panel_update
+        AFTER UPDATE OF date, country, sector, daily_return ON sector_performance
+        BEGIN
+            {_sector_panel_cell_sql("OLD", "NULL")}
+            {_sector_panel_cell_sql("NEW", "NEW.daily_return")}
+            {bump}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS sector_return_panel_delete
+        AFTER DELETE ON sector_performance
+        BEGIN
+            {_sector_panel_cell_sql("OLD", "NULL")}
+            {bump}
+        END;
+        """
+    )
+
+
+def _summary_v7_cross_sector_lead_lag(conn: sqlite3.Connection) -> None:
+    # Cross-sector pairs (e.g. US IT -> KR Materials) share lead_lag_scores.
+    # `sector` stays the leader's sector and follower_sector is the
+    # follower's; same-sector rows repeat `sector`. The UNIQUE key is part of
+    # the table definition, so the table is rebuilt.
+    if _column_exists(conn, "lead_lag_scores", "follower_sector"):
+        return
+    conn.executescript(
+        """
+        ALTER TABLE lead_lag_scores RENAME TO lead_lag_scores_v6;
+
+        CREATE TABLE lead_lag_scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT NOT NULL,
+            sector TEXT NOT NULL,
+            follower_sector TEXT NOT NULL,
+            leader TEXT NOT NULL,
+            follower TEXT NOT NULL,
+            lag INTEGER NOT NULL,
+            correlation REAL,
+            direction_agreement REAL,
+            n_obs INTEGER,
+            p_value REAL,
+            ci_low REAL,
+            ci_high REAL,
+            UNIQUE(date, sector, leader, follower, follower_sector)
+        );
+
+        INSERT INTO lead_lag_scores (
+            date, sector, follower_sector, leader, follower, lag,
+            correlation, direction_agreement, n_obs, p_value, ci_low, ci_high
+        )
+        SELECT
+            date, sector, sector, leader, follower, lag,
+            correlation, direction_agreement, n_obs, p_value, ci_low, ci_high
+        FROM lead_lag_scores_v6;
+
+        DROP TABLE lead_lag_scores_v6;
+        CREATE INDEX IF NOT EXISTS idx_lead_lag_date ON lead_lag_scores(date);
+        """
+    )
+
+
+def _summary_v8_stock_lead_lag(conn: sqlite3.Connection) -> None:
+    # Top stock pairs found by the offline stock-level lead-lag job
+    # (src/stock_leadlag.py). Names and sectors are copied from the raw DB so
+    # /flow can show them from the summary DB alone.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS stock_lead_lag_scores (
+            date TEXT NOT NULL,
+            leader_country TEXT NOT NULL,
+            leader_ticker TEXT NOT NULL,
+            leader_name TEXT,
+            leader_sector TEXT,
+            follower_country TEXT NOT NULL,
+            follower_ticker TEXT NOT NULL,
+            follower_name TEXT,
+            follower_sector TEXT,
+            lag INTEGER NOT NULL,
+            correlation REAL NOT NULL,
+            direction_agreement REAL,
+            n_obs INTEGER NOT NULL,
+            PRIMARY KEY (date, leader_country, leader_ticker, follower_country, follower_ticker)
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _summary_v9_sector_performance_dirty(conn: sqlite3.Connection) -> None:
+    # (date, country) pairs whose sector returns changed since report data was
+    # last prepared. upsert_sector_performance() records a pair when a row is
+    # new or its daily/weekly return differs; scripts/report.py recomputes the
+    # derived rows for those dates and clears the pairs it handled. Exported
+    # with the text shards so marks made by a collect job reach the report job.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS sector_performance_dirty (
+            date TEXT NOT NULL,
+            country TEXT NOT NULL,
+            PRIMARY KEY (date, country)
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _summary_v10_derived_node_runs(conn: sqlite3.Connection) -> None:
+    # Last run of each report-preparation DAG node (src/pipeline.py) per report
+    # date: the fingerprint of the input rows it saw, whether it ran or was
+    # skipped as unchanged, and how long the fingerprint and the run took.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS derived_node_runs (
+            date TEXT NOT NULL,
+            node TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            status TEXT NOT NULL,
+            run_seconds REAL NOT NULL,
+            fingerprint_seconds REAL NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (date, node)
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+# Summary tables the Telegram reports render from. Any write to one of them
+# bumps the 'report' data_revision, which keys the in-process ReportContext
+# cache in src/report_context.py. Since v13 the write helpers bump it once per
+# statement batch (_report_write); v11's per-row triggers are dropped.
+REPORT_SOURCE_TABLES = (
+    "sector_performance",
+    "trend_scores",
+    "benchmark_daily",
+    "abnormal_stock_summary",
+    "instrument_universe",
+    "flow_signals",
+    "lead_lag_scores",
+    "stock_lead_lag_scores",
+)
+
+
+_REPORT_REVISION_BUMP = "UPDATE data_revision SET revision = revision + 1 WHERE name = 'report'"
+
+
+@contextmanager
+def _report_write(conn: sqlite3.Connection):
+    """Bump the 'report' data_revision once if the wrapped statements changed rows.
+
+    Wrap every write to a REPORT_SOURCE_TABLES table. Only main-table
+    statements belong inside: staging and TEMP writes count as changes too.
+    """
+    before = conn.total_changes
+    yield
+    if conn.total_changes != before:
+        conn.execute(_REPORT_REVISION_BUMP)
+
+
+def _summary_v11_report_revision(conn: sqlite3.Connection) -> None:
+    # Superseded by v13: a trigger per row made bulk upserts (thousands of
+    # instrument_universe rows) run one extra UPDATE per row.
+    bump = "UPDATE data_revision SET revision = revision + 1 WHERE name = 'report';"
+    triggers = "\n".join(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS report_revision_{table}_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            {bump}
+        END;
+        """
+        for table in REPORT_SOURCE_TABLES
+        for event in ("INSERT", "UPDATE", "DELETE")
+    )
+    conn.executescript(
+        f"""
+        INSERT OR IGNORE INTO data_revision (name, revision) VALUES ('report', 0);
+        {triggers}
+        """
+    )
+
+
+def _summary_v12_rendered_reports(conn: sqlite3.Connection) -> None:
+    # Bot command texts rendered by scripts/report.py --prepare-only for the
+    # latest report date. data_version is the 'report' data_revision the text
+    # was rendered from, so a row is stale as soon as a source table changes.
+    # Local cache only: not exported with the text shards.
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS rendered_reports (
+            command TEXT NOT NULL,
+            argument TEXT NOT NULL,
+            date TEXT NOT NULL,
+            data_version INTEGER NOT NULL,
+            body TEXT NOT NULL,
+            rendered_at TEXT NOT NULL,
+            PRIMARY KEY (command, argument, date, data_version)
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _summary_v13_report_revision_per_write(conn: sqlite3.Connection) -> None:
+    # Drop v11's per-row triggers; the write helpers bump 'report' once per
+    # batch through _report_write instead.
+    for table in REPORT_SOURCE_TABLES:
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS report_revision_{table}_{event}")
+
+
+def _summary_v14_rendered_report_key(conn: sqlite3.Connection) -> None:
+    # Rendered texts also depend on today's date (the stale-date warning and
+    # the scoreboard window). render_key records those inputs so a text stays
+    # valid across midnight until one of them actually changes.
+    _ensure_column(conn, "rendered_reports", "render_key", "TEXT NOT NULL DEFAULT ''")
+
+
+# Columns added after a table was first exported or frozen, and the column
+# whose value older rows take. Readers of NDJSON shards and frozen year files
+# written before the column existed fill it in from here (NULL otherwise).
+SUMMARY_LEGACY_COLUMNS: dict[str, dict[str, str]] = {
+    "lead_lag_scores": {"follower_sector": "sector"},
+}
+
+
+# Ordered (version, name, migration) lists. Append new steps at the end and
+# never edit a released step: applied versions are recorded per DB file.
+# Early steps are written idempotently so DBs created before versioning
+# existed upgrade cleanly.
+SUMMARY_MIGRATIONS = [
+    (1, "base_schema", _summary_v1_base_schema),
+    (2, "collection_failure_columns", _summary_v2_collection_failure_columns),
+    (3, "hot_query_indexes", _summary_v3_hot_query_indexes),
+    (4, "lead_lag_state", _summary_v4_lead_lag_state),
+    (5, "lead_lag_significance", _summary_v5_lead_lag_significance),
+    (6, "sector_return_panel", _summary_v6_sector_return_panel),
+    (7, "cross_sector_lead_lag", _summary_v7_cross_sector_lead_lag),
+    (8, "stock_lead_lag", _summary_v8_stock_lead_lag),
+    (9, "sector_performance_dirty", _summary_v9_sector_performance_dirty),
+    (10, "derived_node_runs", _summary_v10_derived_node_runs),
+    (11, "report_revision", _summary_v11_report_revision),
+    (12, "rendered_reports", _summary_v12_rendered_reports),
+    (13, "report_revision_per_write", _summary_v13_report_revision_per_write),
+    (14, "rendered_report_key", _summary_v14_rendered_report_key),
+]
+
+RAW_MIGRATIONS = [
+    (1, "base_schema", _raw_v1_base_schema),
+    (2, "normalized_stock_daily", _raw_v2_normalized_stock_daily),
+    (3, "fact_collected_at", _raw_v3_fact_collected_at),
+]
+
+_schema_ready: set[str] = set()
+_schema_lock = threading.Lock()
+
+
+def _reset_schema_guard() -> None:
+    """Forget which DB files were migrated in this process (tests/benchmarks)."""
+    with _schema_lock:
+        _schema_ready.clear()
+
+
+def _get_schema_version(conn: sqlite3.Connection) -> int:
+    if not table_exists(conn, SCHEMA_VERSION_TABLE):
+        return 0
+    row = conn.execute(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}").fetchone()
+    return int(row[0] or 0)
+
+
+def _apply_migrations(conn: sqlite3.Connection, migrations: list) -> int:
+    """Apply pending migrations in order and return the resulting version."""
+    current = _get_schema_version(conn)
+    latest = migrations[-1][0]
+    if current >= latest:
+        return current
+
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    for version, name, migrate in migrations:
+        if version <= current:
+            continue
+        migrate(conn)
+        conn.execute(
+            f"""
+            INSERT INTO {SCHEMA_VERSION_TABLE} (version, name, applied_at)
+            VALUES (?, ?, ?)
+            """,
+            (version, name, datetime.utcnow().isoformat()),
+        )
+        conn.commit()
+        current = version
+    return current
+
+
+def _ensure_schema(path, migrations: list, profile: str) -> None:
+    key = str(Path(path).resolve())
+    if key in _schema_ready and Path(path).exists():
+        return
+
+    with _schema_lock:
+        if key in _schema_ready and Path(path).exists():
+            return
+        conn = _connect(path, profile)
+        try:
+            _apply_migrations(conn, migrations)
+        finally:
+            conn.close()
+        _schema_ready.add(key)
+
+
+def init_db() -> None:
+    """Migrate the summary schema once per process and DB file."""
+    _ensure_schema(DB_PATH, SUMMARY_MIGRATIONS, SUMMARY_DB_PROFILE)
+
+
+def init_raw_db() -> None:
+    """Migrate the raw schema once per process and DB file."""
+    _ensure_schema(RAW_DB_PATH, RAW_MIGRATIONS, RAW_DB_PROFILE)
+
+
+def table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
+    """True if the main schema has the table (readers of DBs that may predate a migration)."""
     row = conn.execute(
         """
         SELECT name
@@ -260,6 +991,14 @@ def _table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
     return row is not None
 
 
+def _schema_has_table(conn: sqlite3.Connection, schema: str, table_name: str) -> bool:
+    row = conn.execute(
+        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?",
+        (table_name,),
+    ).fetchone()
+    return row is not None
+
+
 def _column_exists(
     conn: sqlite3.Connection,
     table_name: str,
@@ -310,6 +1049,24 @@ def _vacuum_summary_db() -> None:
         conn.close()
 
 
+# Free pages above this share of the raw DB trigger a VACUUM at checkpoint,
+# e.g. after the normalized-storage migration drops the legacy table.
+RAW_VACUUM_FREE_RATIO = 0.25
+
+
+def _vacuum_raw_db_if_fragmented() -> bool:
+    conn = sqlite3.connect(str(RAW_DB_PATH))
+    try:
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not page_count or free_pages / page_count <= RAW_VACUUM_FREE_RATIO:
+            return False
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
 def checkpoint_db() -> dict:
     """Checkpoint both DBs and migrate any legacy raw data out of the summary DB."""
     init_db()
@@ -322,7 +1079,7 @@ def checkpoint_db() -> dict:
     summary_conn = get_connection()
     raw_conn = get_raw_connection()
     try:
-        if _table_exists(summary_conn, "stock_daily"):
+        if table_exists(summary_conn, "stock_daily"):
             legacy_rows = [
                 dict(row)
                 for row in summary_conn.execute(
@@ -355,8 +1112,13 @@ def checkpoint_db() -> dict:
         summary_conn.close()
         raw_conn.close()
 
-    if vacuumed_summary:
+    frozen_years = freeze_summary_years()
+    if vacuumed_summary or frozen_years:
         _vacuum_summary_db()
+        vacuumed_summary = True
+    sealed_partitions = seal_raw_partitions()
+    pruned_partitions = prune_raw_partitions()
+    vacuumed_raw = _vacuum_raw_db_if_fragmented()
 
     return {
         "summary_db": str(DB_PATH),
@@ -364,107 +1126,1058 @@ def checkpoint_db() -> dict:
         "migrated_rows": migrated_rows,
         "backfilled_abnormal_rows": backfilled_abnormal_rows,
         "vacuumed_summary": vacuumed_summary,
+        "vacuumed_raw": vacuumed_raw,
+        "sealed_partitions": sealed_partitions,
+        "pruned_partitions": pruned_partitions,
+        "frozen_years": frozen_years,
     }
 
 
-def upsert_stock_daily(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert raw stock rows."""
-    if not rows:
-        return
+# ── Raw partitions ──
+# Closed periods of stock_daily live in one SQLite file each under
+# DATA_DIR/raw_partitions (stock_daily_2026-03.db, stock_daily_2026Q1.db).
+# Each file carries the full raw schema, so instrument ids are file-local.
 
-    conn.executemany(
-        """
-        INSERT INTO stock_daily (
-            date, ticker, name, country, sector, market_cap,
-            close_price, daily_return, volume, avg_volume_20d,
-            is_filtered, is_abnormal
-        )
-        VALUES (
-            :date, :ticker, :name, :country, :sector, :market_cap,
-            :close_price, :daily_return, :volume, :avg_volume_20d,
-            :is_filtered, :is_abnormal
-        )
-        ON CONFLICT(date, ticker) DO UPDATE SET
-            name = excluded.name,
-            sector = excluded.sector,
-            market_cap = excluded.market_cap,
-            close_price = excluded.close_price,
-            daily_return = excluded.daily_return,
-            volume = excluded.volume,
-            avg_volume_20d = excluded.avg_volume_20d,
-            is_filtered = excluded.is_filtered,
-            is_abnormal = excluded.is_abnormal
-        """,
-        rows,
-    )
+RAW_PARTITION_PREFIX = "stock_daily_"
 
 
-def upsert_sector_performance(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert sector aggregates into the summary DB."""
-    for row in rows:
-        if isinstance(row.get("top_gainers"), list):
-            row["top_gainers"] = json.dumps(row["top_gainers"], ensure_ascii=False)
-        if isinstance(row.get("top_losers"), list):
-            row["top_losers"] = json.dumps(row["top_losers"], ensure_ascii=False)
+def raw_partition_key(date: str, granularity: str = RAW_PARTITION_GRANULARITY) -> str:
+    """Return the partition key ('2026-04' or '2026Q2') for a YYYY-MM-DD date."""
+    year, month = int(date[:4]), int(date[5:7])
+    if granularity == "quarter":
+        return f"{year}Q{(month - 1) // 3 + 1}"
+    if granularity == "month":
+        return f"{year}-{month:02d}"
+    raise ValueError(f"unknown raw partition granularity: {granularity}")
 
-    conn.executemany(
-        """
-        INSERT INTO sector_performance (
-            date, country, sector, daily_return, weekly_return,
-            breadth, volume_change, stock_count,
-            top_gainers, top_losers, collected_at
-        )
-        VALUES (
-            :date, :country, :sector, :daily_return, :weekly_return,
-            :breadth, :volume_change, :stock_count,
-            :top_gainers, :top_losers, :collected_at
-        )
-        ON CONFLICT(date, country, sector) DO UPDATE SET
-            daily_return = excluded.daily_return,
-            weekly_return = excluded.weekly_return,
-            breadth = excluded.breadth,
-            volume_change = excluded.volume_change,
-            stock_count = excluded.stock_count,
-            top_gainers = excluded.top_gainers,
-            top_losers = excluded.top_losers,
-            collected_at = excluded.collected_at
-        """,
-        rows,
-    )
 
+def _raw_partition_bounds(key: str) -> tuple[int, int]:
+    """Inclusive YYYYMMDD bounds of one partition key."""
+    if "Q" in key:
+        year, quarter = key.split("Q")
+        first_month = (int(quarter) - 1) * 3 + 1
+        last_month = first_month + 2
+    else:
+        year, month = key.split("-")
+        first_month = last_month = int(month)
+    return int(f"{year}{first_month:02d}01"), int(f"{year}{last_month:02d}31")
 
-def upsert_abnormal_stocks(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert abnormal stock summaries into the summary DB."""
-    if not rows:
-        return
 
-    conn.executemany(
-        """
-        INSERT INTO abnormal_stock_summary (
-            date, ticker, name, country, sector,
-            market_cap, close_price, daily_return, volume, avg_volume_20d
-        )
-        VALUES (
-            :date, :ticker, :name, :country, :sector,
-            :market_cap, :close_price, :daily_return, :volume, :avg_volume_20d
-        )
-        ON CONFLICT(date, ticker) DO UPDATE SET
-            name = excluded.name,
-            country = excluded.country,
-            sector = excluded.sector,
-            market_cap = excluded.market_cap,
-            close_price = excluded.close_price,
-            daily_return = excluded.daily_return,
-            volume = excluded.volume,
-            avg_volume_20d = excluded.avg_volume_20d
-        """,
-        rows,
-    )
+def _raw_partition_dir() -> Path:
+    return DATA_DIR / RAW_PARTITION_DIRNAME
 
 
-def upsert_instrument_universe(
-    conn: sqlite3.Connection,
-    country: str,
+def _raw_partition_path(key: str) -> Path:
+    return _raw_partition_dir() / f"{RAW_PARTITION_PREFIX}{key}.db"
+
+
+def list_raw_partitions(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> list[tuple[str, Path]]:
+    """Return sealed partitions overlapping [start_date, end_date], oldest first."""
+    directory = _raw_partition_dir()
+    if not directory.exists():
+        return []
+
+    low = _date_key(start_date) if start_date else None
+    high = _date_key(end_date) if end_date else None
+    partitions = []
+    for path in directory.glob(f"{RAW_PARTITION_PREFIX}*.db"):
+        key = path.stem[len(RAW_PARTITION_PREFIX):]
+        try:
+            first, last = _raw_partition_bounds(key)
+        except ValueError:
+            continue
+        if (high is not None and first > high) or (low is not None and last < low):
+            continue
+        partitions.append((first, key, path))
+    return [(key, path) for _, key, path in sorted(partitions)]
+
+
+def _live_fact_rows(conn: sqlite3.Connection, first: int, last: int) -> list[dict]:
+    rows = conn.execute(
+        """
+        SELECT
+            printf('%04d-%02d-%02d', f.date / 10000, f.date / 100 % 100, f.date % 100) AS date,
+            i.ticker, i.name, i.country, i.sector,
+            f.market_cap, f.close_price, f.daily_return, f.volume,
+            f.avg_volume_20d, f.is_filtered, f.is_abnormal, f.collected_at
+        FROM stock_daily_fact f
+        JOIN raw_instrument i ON i.id = f.instrument_id
+        WHERE f.date BETWEEN ? AND ?
+        """,
+        (first, last),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def _write_raw_partition(key: str, rows: list[dict]) -> None:
+    """Merge rows into one sealed partition file and compact it."""
+    path = _raw_partition_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_schema(path, RAW_MIGRATIONS, RAW_DB_PROFILE)
+
+    conn = _connect(path, RAW_DB_PROFILE)
+    try:
+        upsert_stock_daily(conn, rows)
+        conn.commit()
+        _compact_sealed_file(conn)
+    finally:
+        conn.close()
+
+
+def _compact_sealed_file(conn: sqlite3.Connection) -> None:
+    # Sealed files are read-only from here on: rollback journal instead of
+    # WAL so readers never leave -wal/-shm files next to a cached partition.
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.execute("VACUUM")
+
+
+def seal_raw_partitions(as_of: Optional[str] = None) -> list[str]:
+    """Move closed periods out of the live raw DB into partition files.
+
+    Every period that ends before the partition containing ``as_of`` (UTC
+    today by default) is merged into its partition file, then deleted from
+    the live DB. Late rows for an already sealed period are merged the same
+    way on the next checkpoint and win over the sealed values.
+    """
+    as_of = as_of or datetime.utcnow().strftime("%Y-%m-%d")
+    current_first, _ = _raw_partition_bounds(raw_partition_key(as_of))
+
+    init_raw_db()
+    conn = get_raw_connection()
+    sealed: list[str] = []
+    try:
+        months = [
+            row[0]
+            for row in conn.execute(
+                "SELECT DISTINCT date / 100 FROM stock_daily_fact WHERE date < ? ORDER BY 1",
+                (current_first,),
+            ).fetchall()
+        ]
+        keys = sorted(
+            {raw_partition_key(f"{month // 100:04d}-{month % 100:02d}-01") for month in months}
+        )
+        for key in keys:
+            first, last = _raw_partition_bounds(key)
+            _write_raw_partition(key, _live_fact_rows(conn, first, last))
+            conn.execute(
+                "DELETE FROM stock_daily_fact WHERE date BETWEEN ? AND ?",
+                (first, last),
+            )
+            conn.commit()
+            sealed.append(key)
+    finally:
+        conn.close()
+    return sealed
+
+
+def prune_raw_partitions(keep: int = RAW_PARTITION_RETENTION) -> list[str]:
+    """Delete the oldest sealed partitions beyond the newest ``keep`` files."""
+    partitions = list_raw_partitions()
+    expired = partitions[: max(len(partitions) - keep, 0)]
+    for key, path in expired:
+        path.unlink()
+    return [key for key, _ in expired]
+
+
+@contextmanager
+def open_raw_range(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+):
+    """Yield a raw DB connection whose ``stock_daily`` spans sealed partitions.
+
+    Only partitions overlapping [start_date, end_date] are ATTACHed. A TEMP
+    view named ``stock_daily`` shadows the live view for unqualified queries
+    and UNIONs the live rows with each partition; a row present in both
+    (a late row not sealed yet) is read from the live DB.
+    """
+    init_raw_db()
+    conn = get_raw_connection()
+    try:
+        selects = ["SELECT * FROM main.stock_daily"]
+        for alias in _attach_raw_partitions(conn, start_date, end_date):
+            selects.append(
+                f"""
+                SELECT
+                    printf('%04d-%02d-%02d', f.date / 10000, f.date / 100 % 100, f.date % 100),
+                    i.ticker, i.name, i.country, i.sector,
+                    f.market_cap, f.close_price, f.daily_return, f.volume,
+                    f.avg_volume_20d, f.is_filtered, f.is_abnormal
+                FROM {alias}.stock_daily_fact f
+                JOIN {alias}.raw_instrument i ON i.id = f.instrument_id
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM main.raw_instrument mi
+                    JOIN main.stock_daily_fact mf
+                      ON mf.instrument_id = mi.id AND mf.date = f.date
+                    WHERE mi.country = i.country AND mi.ticker = i.ticker
+                )
+                """
+            )
+        if len(selects) > 1:
+            conn.execute(
+                "CREATE TEMP VIEW stock_daily AS " + "\nUNION ALL\n".join(selects)
+            )
+        yield conn
+    finally:
+        conn.close()
+
+
+def _attach_raw_partitions(
+    conn: sqlite3.Connection,
+    start_date: Optional[str],
+    end_date: Optional[str],
+) -> list[str]:
+    """ATTACH partitions overlapping [start_date, end_date] as p0..pN; return the aliases."""
+    partitions = list_raw_partitions(start_date, end_date)
+    limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    if len(partitions) > limit:
+        raise ValueError(
+            f"date range needs {len(partitions)} raw partitions; "
+            f"SQLite can ATTACH at most {limit}. Narrow the range or read "
+            "it in chunks from raw_range_chunks()."
+        )
+
+    aliases = []
+    try:
+        for index, (_, path) in enumerate(partitions):
+            alias = f"p{index}"
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+            aliases.append(alias)
+    except BaseException:
+        _detach_raw_partitions(conn, aliases)
+        raise
+    return aliases
+
+
+def _detach_raw_partitions(conn: sqlite3.Connection, aliases: list[str]) -> None:
+    for alias in aliases:
+        conn.execute(f"DETACH DATABASE {alias}")
+
+
+def raw_range_chunks(
+    start_date: str,
+    end_date: str,
+    max_partitions: Optional[int] = None,
+) -> list[tuple[str, str]]:
+    """Split [start_date, end_date] into consecutive ranges for open_raw_range.
+
+    Each range overlaps at most ``max_partitions`` sealed partitions (SQLite's
+    ATTACH limit by default), so a window longer than the limit can be read
+    one chunk at a time. The ranges cover the window without gaps or overlap,
+    so live rows are read exactly once.
+    """
+    if max_partitions is None:
+        probe = sqlite3.connect(":memory:")
+        try:
+            max_partitions = probe.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        finally:
+            probe.close()
+
+    partitions = list_raw_partitions(start_date, end_date)
+    chunks = []
+    chunk_start = start_date
+    for index in range(max_partitions, len(partitions), max_partitions):
+        first, _ = _raw_partition_bounds(partitions[index][0])
+        next_start = datetime.strptime(str(first), "%Y%m%d")
+        chunks.append((chunk_start, (next_start - timedelta(days=1)).strftime("%Y-%m-%d")))
+        chunk_start = next_start.strftime("%Y-%m-%d")
+    chunks.append((chunk_start, end_date))
+    return chunks
+
+
+# 'YYYY-MM-DD' text for f.date in raw_fact_query selects.
+RAW_FACT_DATE_SQL = "printf('%04d-%02d-%02d', f.date / 10000, f.date / 100 % 100, f.date % 100)"
+
+
+def raw_fact_query(
+    conn: sqlite3.Connection,
+    select: str,
+    start_date: str,
+    end_date: str,
+    where: Optional[str] = None,
+    params: tuple = (),
+) -> tuple[str, list]:
+    """Build a [start_date, end_date] read over the live DB and attached partitions.
+
+    ``select`` and ``where`` refer to ``i`` (raw_instrument) and ``f``
+    (stock_daily_fact). Unlike the ``stock_daily`` view, the date filter is
+    on the integer ``f.date`` and the instrument is the outer loop, so each
+    instrument is one primary-key range seek instead of a scan that formats
+    every date. Use it on a connection from ``open_raw_range``; a partition
+    row shadowed by a live row is skipped as in the TEMP view. Returns
+    (sql, params).
+    """
+    schemas = [
+        row[1]
+        for row in conn.execute("PRAGMA database_list").fetchall()
+        if row[1] not in ("main", "temp")
+    ]
+    condition = "f.date BETWEEN ? AND ?" + (f" AND ({where})" if where else "")
+    branch_params = [_date_key(start_date), _date_key(end_date), *params]
+
+    selects = [
+        f"""
+        SELECT {select}
+        FROM main.raw_instrument i
+        CROSS JOIN main.stock_daily_fact f ON f.instrument_id = i.id
+        WHERE {condition}
+        """
+    ]
+    for schema in schemas:
+        selects.append(
+            f"""
+            SELECT {select}
+            FROM {schema}.raw_instrument i
+            CROSS JOIN {schema}.stock_daily_fact f ON f.instrument_id = i.id
+            WHERE {condition}
+              AND NOT EXISTS (
+                SELECT 1
+                FROM main.raw_instrument mi
+                JOIN main.stock_daily_fact mf
+                  ON mf.instrument_id = mi.id AND mf.date = f.date
+                WHERE mi.country = i.country AND mi.ticker = i.ticker
+              )
+            """
+        )
+    return "\nUNION ALL\n".join(selects), branch_params * len(selects)
+
+
+# Merging raw DB files from several runs (e.g. one Actions artifact per
+# market) keeps the most recently collected copy of each fact row.
+def raw_db_partition_keys(path: Path) -> set[str]:
+    """Partition keys with fact rows in a raw DB file (normalized or legacy)."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        if "stock_daily_fact" in tables:
+            months = [
+                f"{row[0] // 100:04d}-{row[0] % 100:02d}"
+                for row in conn.execute("SELECT DISTINCT date / 100 FROM stock_daily_fact")
+            ]
+        elif "stock_daily" in tables:
+            months = [
+                row[0]
+                for row in conn.execute("SELECT DISTINCT substr(date, 1, 7) FROM stock_daily")
+            ]
+        else:
+            months = []
+    finally:
+        conn.close()
+    return {raw_partition_key(f"{month}-01") for month in months}
+
+
+def _merge_raw_source(conn: sqlite3.Connection, mtime: int, first: int, last: int) -> int:
+    """Merge rows dated [first, last] from the DB ATTACHed as ``src`` into main.
+
+    Returns the number of fact rows inserted or updated.
+    """
+    tables = {
+        row[0]
+        for row in conn.execute("SELECT name FROM src.sqlite_master WHERE type = 'table'")
+    }
+    params = {"first": first, "last": last, "mtime": mtime}
+    fact_columns = ", ".join(_STOCK_DAILY_FACT_COLUMNS)
+
+    if "stock_daily_fact" not in tables:
+        # Legacy artifact: one wide stock_daily table with text dates.
+        if "stock_daily" not in tables:
+            return 0
+        conn.execute(
+            f"""
+            INSERT INTO main.raw_instrument (country, ticker, name, sector, as_of)
+            SELECT country, ticker, name, sector, CAST(REPLACE(date, '-', '') AS INTEGER)
+            FROM src.stock_daily
+            WHERE CAST(REPLACE(date, '-', '') AS INTEGER) BETWEEN :first AND :last
+            ORDER BY date
+            {_RAW_INSTRUMENT_CONFLICT}
+            """,
+            params,
+        )
+        return conn.execute(
+            f"""
+            INSERT INTO main.stock_daily_fact ({fact_columns})
+            SELECT
+                ti.id, CAST(REPLACE(l.date, '-', '') AS INTEGER), l.market_cap,
+                l.close_price, l.daily_return, l.volume, l.avg_volume_20d,
+                l.is_filtered, l.is_abnormal, :mtime
+            FROM src.stock_daily l
+            JOIN main.raw_instrument ti ON ti.country = l.country AND ti.ticker = l.ticker
+            WHERE CAST(REPLACE(l.date, '-', '') AS INTEGER) BETWEEN :first AND :last
+            {_RAW_FACT_MERGE_CONFLICT}
+            """,
+            params,
+        ).rowcount
+
+    source_columns = {row[1] for row in conn.execute("PRAGMA src.table_info(stock_daily_fact)")}
+    collected_sql = (
+        "COALESCE(NULLIF(f.collected_at, 0), :mtime)"
+        if "collected_at" in source_columns
+        else ":mtime"
+    )
+    conn.execute(
+        f"""
+        INSERT INTO main.raw_instrument (country, ticker, name, sector, as_of)
+        SELECT si.country, si.ticker, si.name, si.sector, si.as_of
+        FROM src.raw_instrument si
+        WHERE EXISTS (
+            SELECT 1
+            FROM src.stock_daily_fact f
+            WHERE f.instrument_id = si.id AND f.date BETWEEN :first AND :last
+        )
+        {_RAW_INSTRUMENT_CONFLICT}
+        """,
+        params,
+    )
+    return conn.execute(
+        f"""
+        INSERT INTO main.stock_daily_fact ({fact_columns})
+        SELECT
+            ti.id, f.date, f.market_cap, f.close_price, f.daily_return, f.volume,
+            f.avg_volume_20d, f.is_filtered, f.is_abnormal, {collected_sql}
+        FROM src.stock_daily_fact f
+        JOIN src.raw_instrument si ON si.id = f.instrument_id
+        JOIN main.raw_instrument ti ON ti.country = si.country AND ti.ticker = si.ticker
+        WHERE f.date BETWEEN :first AND :last
+        {_RAW_FACT_MERGE_CONFLICT}
+        """,
+        params,
+    ).rowcount
+
+
+def merge_raw_db_files(
+    target: Path,
+    sources: list[Path],
+    keys: list[str],
+    *,
+    seal: bool = False,
+) -> int:
+    """Merge the given partition keys from raw DB files into ``target``.
+
+    Each source is ATTACHed in turn and merged with set-based
+    ``INSERT ... SELECT ... ON CONFLICT``, so memory stays flat no matter how
+    large the sources are. For every (country, ticker, date) the copy with
+    the newest ``collected_at`` wins; sources without that column count as
+    collected at their file mtime. ``seal=True`` compacts the target like a
+    sealed partition. Returns the number of fact rows inserted or updated.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_schema(target, RAW_MIGRATIONS, RAW_DB_PROFILE)
+
+    conn = _connect(target, RAW_DB_PROFILE)
+    changed = 0
+    try:
+        for source in sources:
+            if Path(source).resolve() == target.resolve():
+                continue
+            conn.execute("ATTACH DATABASE ? AS src", (str(source),))
+            try:
+                mtime = int(Path(source).stat().st_mtime)
+                for key in keys:
+                    first, last = _raw_partition_bounds(key)
+                    changed += _merge_raw_source(conn, mtime, first, last)
+                conn.commit()
+            finally:
+                conn.execute("DETACH DATABASE src")
+        if seal:
+            _compact_sealed_file(conn)
+    finally:
+        conn.close()
+    return changed
+
+
+# ── Summary year shards ──
+# Closed years of the history tables below move into one frozen SQLite file
+# per year under DATA_DIR/summary_years (marketbot_2025.db). Each file carries
+# the full summary schema; only these tables are filled.
+
+SUMMARY_YEAR_PREFIX = "marketbot_"
+
+# table -> (date column, natural key columns)
+SUMMARY_YEAR_TABLES = {
+    "sector_performance": ("date", ("date", "country", "sector")),
+    "trend_scores": ("date", ("date", "sector")),
+    "lead_lag_scores": ("date", ("date", "sector", "leader", "follower", "follower_sector")),
+    "flow_signals": ("created_date", ("created_date", "sector", "leader", "follower")),
+}
+
+
+def _summary_year_dir() -> Path:
+    return DATA_DIR / SUMMARY_YEAR_DIRNAME
+
+
+def _summary_year_path(year: int) -> Path:
+    return _summary_year_dir() / f"{SUMMARY_YEAR_PREFIX}{year}.db"
+
+
+def list_summary_years(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> list[tuple[int, Path]]:
+    """Return frozen summary years overlapping [start_date, end_date], oldest first."""
+    directory = _summary_year_dir()
+    if not directory.exists():
+        return []
+
+    years = []
+    for path in directory.glob(f"{SUMMARY_YEAR_PREFIX}*.db"):
+        suffix = path.stem[len(SUMMARY_YEAR_PREFIX):]
+        if not suffix.isdigit():
+            continue
+        year = int(suffix)
+        if (start_date and year < int(start_date[:4])) or (end_date and year > int(end_date[:4])):
+            continue
+        years.append((year, path))
+    return sorted(years)
+
+
+def _freezable_rows_sql(table: str, alias: str = "") -> str:
+    date_column, _ = SUMMARY_YEAR_TABLES[table]
+    prefix = f"{alias}." if alias else ""
+    condition = f"{prefix}{date_column} >= ? AND {prefix}{date_column} < ?"
+    if table == "flow_signals":
+        # Pending signals are still resolved in place by verify_flow_signals().
+        condition += f" AND {prefix}status != 'pending'"
+    return condition
+
+
+def freeze_summary_years(as_of: Optional[str] = None) -> list[int]:
+    """Move closed years of the history tables into frozen per-year files.
+
+    A year is frozen once it ended more than ``SUMMARY_LIVE_DAYS`` before
+    ``as_of`` (UTC today by default), so rolling lookbacks keep reading the
+    live DB only. Late rows for a frozen year are merged into its file on
+    the next checkpoint and replace the frozen values.
+    """
+    as_of_date = datetime.strptime(
+        as_of or datetime.utcnow().strftime("%Y-%m-%d"), "%Y-%m-%d"
+    )
+    live_from_year = (as_of_date - timedelta(days=SUMMARY_LIVE_DAYS)).year
+
+    init_db()
+    conn = get_connection()
+    frozen: list[int] = []
+    try:
+        years: set[int] = set()
+        for table, (date_column, _) in SUMMARY_YEAR_TABLES.items():
+            years.update(
+                int(row[0])
+                for row in conn.execute(
+                    f"""
+                    SELECT DISTINCT substr({date_column}, 1, 4)
+                    FROM {table}
+                    WHERE {_freezable_rows_sql(table)}
+                    """,
+                    ("0000", f"{live_from_year:04d}"),
+                ).fetchall()
+            )
+
+        for year in sorted(years):
+            bounds = (f"{year:04d}", f"{year + 1:04d}")
+            path = _summary_year_path(year)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _ensure_schema(path, SUMMARY_MIGRATIONS, SUMMARY_DB_PROFILE)
+
+            conn.execute("ATTACH DATABASE ? AS frozen", (str(path),))
+            try:
+                for table in SUMMARY_YEAR_TABLES:
+                    columns = ", ".join(
+                        row["name"]
+                        for row in conn.execute(f"PRAGMA main.table_info({table})")
+                        if row["name"] != "id"
+                    )
+                    condition = _freezable_rows_sql(table)
+                    conn.execute(
+                        f"""
+                        INSERT OR REPLACE INTO frozen.{table} ({columns})
+                        SELECT {columns} FROM main.{table} WHERE {condition}
+                        """,
+                        bounds,
+                    )
+                    with _report_write(conn) if table in REPORT_SOURCE_TABLES else nullcontext():
+                        conn.execute(f"DELETE FROM main.{table} WHERE {condition}", bounds)
+                conn.commit()
+            finally:
+                conn.execute("DETACH DATABASE frozen")
+
+            frozen_conn = sqlite3.connect(str(path))
+            try:
+                # Frozen years are read-only from here on, like sealed raw partitions.
+                frozen_conn.execute("PRAGMA journal_mode=DELETE")
+                frozen_conn.execute("VACUUM")
+            finally:
+                frozen_conn.close()
+            frozen.append(year)
+    finally:
+        conn.close()
+    return frozen
+
+
+def _frozen_column_sql(
+    conn: sqlite3.Connection,
+    schema: str,
+    table: str,
+    columns: list[str],
+) -> dict[str, str]:
+    # Year files are only migrated when a checkpoint writes to them again, so
+    # an older file may lack columns added since; see SUMMARY_LEGACY_COLUMNS.
+    present = {row["name"] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")}
+    fills = SUMMARY_LEGACY_COLUMNS.get(table, {})
+    return {
+        column: f"f.{column}" if column in present
+        else f"f.{fills[column]}" if column in fills
+        else "NULL"
+        for column in columns
+    }
+
+
+def _summary_year_panel_sql(conn: sqlite3.Connection, year_count: int) -> str:
+    # Panel rows are keyed by (sector, date) rather than by country, so a late
+    # row landing in live for a frozen year must not hide the frozen file's
+    # other countries. Merge cell by cell, preferring the live value. Years
+    # frozen before the panel existed are pivoted from sector_performance.
+    pivot = ", ".join(
+        f"MAX(CASE WHEN country = '{country}' THEN daily_return END) AS \"{country}\""
+        for country in SECTOR_PANEL_COUNTRIES
+    )
+    sources = ["SELECT 0 AS source, * FROM main.sector_return_panel"]
+    for index in range(year_count):
+        if _schema_has_table(conn, f"y{index}", "sector_return_panel"):
+            sources.append(f"SELECT 1 AS source, * FROM y{index}.sector_return_panel")
+        else:
+            sources.append(
+                f"SELECT 1 AS source, sector, date, {pivot} "
+                f"FROM y{index}.sector_performance GROUP BY sector, date"
+            )
+    cells = ", ".join(
+        f'COALESCE(MAX(CASE WHEN source = 0 THEN "{country}" END), MAX("{country}")) AS "{country}"'
+        for country in SECTOR_PANEL_COUNTRIES
+    )
+    return (
+        f"SELECT sector, date, {cells} FROM ("
+        + "\nUNION ALL\n".join(sources)
+        + ") GROUP BY sector, date"
+    )
+
+
+@contextmanager
+def open_summary_range(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    profile: Optional[str] = None,
+):
+    """Yield a read-only summary connection whose history tables span frozen years.
+
+    Frozen years overlapping [start_date, end_date] are ATTACHed and a TEMP
+    view per ``SUMMARY_YEAR_TABLES`` entry shadows the live table, so the
+    usual readers (``get_latest_sector_performance``, ``get_lead_lag_scores``,
+    ...) work unchanged. A row present in both files is read from the live DB.
+    ``sector_return_panel`` gets the same treatment, merged per country cell.
+    """
+    init_db()
+    conn = get_connection(profile)
+    try:
+        years = list_summary_years(start_date, end_date)
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if len(years) > limit:
+            raise ValueError(
+                f"date range needs {len(years)} frozen summary years; "
+                f"SQLite can ATTACH at most {limit}. Narrow the range."
+            )
+
+        for index, (_, path) in enumerate(years):
+            conn.execute(f"ATTACH DATABASE ? AS y{index}", (str(path),))
+        if years:
+            for table, (_, key_columns) in SUMMARY_YEAR_TABLES.items():
+                columns = [row["name"] for row in conn.execute(f"PRAGMA main.table_info({table})")]
+                selects = [f"SELECT {', '.join(columns)} FROM main.{table}"]
+                for index in range(len(years)):
+                    frozen = _frozen_column_sql(conn, f"y{index}", table, columns)
+                    match = " AND ".join(f"m.{column} = {frozen[column]}" for column in key_columns)
+                    selects.append(
+                        f"""
+                        SELECT {", ".join(f"{frozen[column]} AS {column}" for column in columns)}
+                        FROM y{index}.{table} f
+                        WHERE NOT EXISTS (SELECT 1 FROM main.{table} m WHERE {match})
+                        """
+                    )
+                conn.execute(
+                    f"CREATE TEMP VIEW {table} AS " + "\nUNION ALL\n".join(selects)
+                )
+            conn.execute(
+                f"CREATE TEMP VIEW sector_return_panel AS {_summary_year_panel_sql(conn, len(years))}"
+            )
+        yield conn
+    finally:
+        conn.close()
+
+
+_STOCK_DAILY_FACT_COLUMNS = (
+    "instrument_id", "date", "market_cap", "close_price", "daily_return",
+    "volume", "avg_volume_20d", "is_filtered", "is_abnormal", "collected_at",
+)
+
+_STOCK_DAILY_FACT_CONFLICT = """
+    ON CONFLICT(instrument_id, date) DO UPDATE SET
+        market_cap = excluded.market_cap,
+        close_price = excluded.close_price,
+        daily_return = excluded.daily_return,
+        volume = excluded.volume,
+        avg_volume_20d = excluded.avg_volume_20d,
+        is_filtered = excluded.is_filtered,
+        is_abnormal = excluded.is_abnormal,
+        collected_at = excluded.collected_at
+"""
+
+_RAW_FACT_MERGE_CONFLICT = (
+    _STOCK_DAILY_FACT_CONFLICT
+    + "    WHERE excluded.collected_at >= stock_daily_fact.collected_at\n"
+)
+
+
+def _date_key(date: str) -> int:
+    """'YYYY-MM-DD' -> YYYYMMDD, the integer date stored in raw fact tables."""
+    return int(date.replace("-", ""))
+
+
+def _create_staging_table(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: tuple[str, ...],
+    key_columns: tuple[str, ...],
+) -> str:
+    declared = {
+        row["name"]: row["type"]
+        for row in conn.execute(f"PRAGMA main.table_info({table})").fetchall()
+    }
+    column_defs = ", ".join(f"{column} {declared.get(column, '')}".rstrip() for column in columns)
+    conn.execute(
+        f"""
+        CREATE TEMP TABLE IF NOT EXISTS stage_{table} (
+            {column_defs},
+            PRIMARY KEY ({", ".join(key_columns)})
+        ) WITHOUT ROWID
+        """
+    )
+    return f"temp.stage_{table}"
+
+
+def _upsert_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    columns: tuple[str, ...],
+    key_columns: tuple[str, ...],
+    rows: list[dict],
+    conflict_sql: str,
+    changed_sql: Optional[str] = None,
+) -> None:
+    """Upsert dict rows, switching to a staging table for large batches.
+
+    Small batches go through ``executemany`` with the conflict clause applied
+    per row. From ``BULK_UPSERT_THRESHOLD`` rows on, rows are streamed into a
+    TEMP table keyed like the target (``INSERT OR REPLACE`` keeps the last row
+    per key, matching the row-by-row result) and merged in key order with one
+    ``INSERT ... SELECT``.
+
+    ``changed_sql`` is a predicate over the staged row ``s`` and the stored
+    row ``u``; the bulk path drops rows that would not change anything before
+    they reach the INSERT. The conflict clause alone cannot do that because an
+    AUTOINCREMENT table still bumps ``sqlite_sequence`` on every conflict.
+    """
+    column_sql = ", ".join(columns)
+    placeholders = ", ".join(f":{column}" for column in columns)
+
+    if len(rows) < BULK_UPSERT_THRESHOLD:
+        with _report_write(conn) if table in REPORT_SOURCE_TABLES else nullcontext():
+            conn.executemany(
+                f"INSERT INTO {table} ({column_sql}) VALUES ({placeholders}) {conflict_sql}",
+                rows,
+            )
+        return
+
+    staging = _create_staging_table(conn, table, columns, key_columns)
+    conn.execute(f"DELETE FROM {staging}")
+    try:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {staging} ({column_sql}) VALUES ({placeholders})",
+            rows,
+        )
+        if changed_sql:
+            join_sql = " AND ".join(f"u.{column} = s.{column}" for column in key_columns)
+            source = f"""
+                SELECT {", ".join(f"s.{column}" for column in columns)}
+                FROM {staging} s
+                LEFT JOIN main.{table} u ON {join_sql}
+                WHERE u.rowid IS NULL OR {changed_sql}
+            """
+        else:
+            # WHERE true keeps the parser from reading ON CONFLICT as a join clause.
+            source = f"SELECT {column_sql} FROM {staging} WHERE true"
+        with _report_write(conn) if table in REPORT_SOURCE_TABLES else nullcontext():
+            conn.execute(f"INSERT INTO main.{table} ({column_sql}) {source} {conflict_sql}")
+    finally:
+        conn.execute(f"DELETE FROM {staging}")
+
+
+def _resolve_instrument_ids(
+    conn: sqlite3.Connection,
+    rows: list[dict],
+) -> dict[tuple[str, str], int]:
+    # Collapse the batch to one row per instrument with the same rules as
+    # _RAW_INSTRUMENT_CONFLICT: newest date wins, blank name/sector fall back.
+    latest: dict[tuple[str, str], dict] = {}
+    for row in sorted(rows, key=lambda item: item["date"]):
+        key = (row["country"], row["ticker"])
+        name = row.get("name")
+        sector = row.get("sector")
+        current = latest.get(key)
+        if current is not None:
+            if name is None or not str(name).strip():
+                name = current["name"]
+            if sector is None or not str(sector).strip() or sector == "기타":
+                sector = current["sector"]
+        latest[key] = {
+            "country": row["country"],
+            "ticker": row["ticker"],
+            "name": name,
+            "sector": sector,
+            "as_of": _date_key(row["date"]),
+        }
+
+    conn.executemany(
+        f"""
+        INSERT INTO raw_instrument (country, ticker, name, sector, as_of)
+        VALUES (:country, :ticker, :name, :sector, :as_of)
+        {_RAW_INSTRUMENT_CONFLICT}
+        """,
+        latest.values(),
+    )
+
+    ids: dict[tuple[str, str], int] = {}
+    for country in {country for country, _ in latest}:
+        for row in conn.execute(
+            "SELECT id, ticker FROM raw_instrument WHERE country = ?",
+            (country,),
+        ):
+            ids[(country, row["ticker"])] = row["id"]
+    return ids
+
+
+def upsert_stock_daily(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert raw stock rows into the instrument dimension and fact table."""
+    if not rows:
+        return
+
+    instrument_ids = _resolve_instrument_ids(conn, rows)
+    collected_at = int(time.time())
+    fact_rows = [
+        {
+            "instrument_id": instrument_ids[(row["country"], row["ticker"])],
+            "date": _date_key(row["date"]),
+            "market_cap": row.get("market_cap"),
+            "close_price": row.get("close_price"),
+            "daily_return": row.get("daily_return"),
+            "volume": row.get("volume"),
+            "avg_volume_20d": row.get("avg_volume_20d"),
+            "is_filtered": int(row.get("is_filtered", 0)),
+            "is_abnormal": int(row.get("is_abnormal", 0)),
+            "collected_at": row.get("collected_at") or collected_at,
+        }
+        for row in rows
+    ]
+    _upsert_rows(
+        conn,
+        "stock_daily_fact",
+        _STOCK_DAILY_FACT_COLUMNS,
+        ("instrument_id", "date"),
+        fact_rows,
+        _STOCK_DAILY_FACT_CONFLICT,
+    )
+
+
+def _changed_sector_dates(conn: sqlite3.Connection, rows: list[dict]) -> set[tuple[str, str]]:
+    """(date, country) pairs where a row is new or its daily/weekly return differs."""
+    dates = sorted({row["date"] for row in rows})
+    current = {
+        (date, country, sector): (daily_return, weekly_return)
+        for date, country, sector, daily_return, weekly_return in conn.execute(
+            f"""
+            SELECT date, country, sector, daily_return, weekly_return
+            FROM sector_performance
+            WHERE date IN ({", ".join("?" for _ in dates)})
+            """,
+            dates,
+        ).fetchall()
+    }
+    return {
+        (row["date"], row["country"])
+        for row in rows
+        if current.get((row["date"], row["country"], row["sector"]))
+        != (row.get("daily_return"), row.get("weekly_return"))
+    }
+
+
+def mark_sector_dates_dirty(conn: sqlite3.Connection, keys) -> None:
+    """Record (date, country) pairs whose derived report data must be recomputed."""
+    conn.executemany(
+        """
+        INSERT INTO sector_performance_dirty (date, country) VALUES (?, ?)
+        ON CONFLICT(date, country) DO NOTHING
+        """,
+        sorted(keys),
+    )
+
+
+def get_dirty_sector_dates(conn: sqlite3.Connection) -> list[tuple[str, str]]:
+    """Read pending (date, country) marks, oldest first."""
+    return [
+        (row[0], row[1])
+        for row in conn.execute(
+            "SELECT date, country FROM sector_performance_dirty ORDER BY date, country"
+        ).fetchall()
+    ]
+
+
+def clear_dirty_sector_dates(conn: sqlite3.Connection, keys) -> None:
+    """Drop the marks a report preparation handled; newer marks stay."""
+    conn.executemany(
+        "DELETE FROM sector_performance_dirty WHERE date = ? AND country = ?",
+        sorted(keys),
+    )
+
+
+def upsert_sector_performance(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert sector aggregates into the summary DB.
+
+    Pairs whose returns actually change are marked in
+    ``sector_performance_dirty`` so report preparation revisits them.
+    """
+    if not rows:
+        return
+
+    mark_sector_dates_dirty(conn, _changed_sector_dates(conn, rows))
+    for row in rows:
+        if isinstance(row.get("top_gainers"), list):
+            row["top_gainers"] = json.dumps(row["top_gainers"], ensure_ascii=False)
+        if isinstance(row.get("top_losers"), list):
+            row["top_losers"] = json.dumps(row["top_losers"], ensure_ascii=False)
+
+    with _report_write(conn):
+        conn.executemany(
+            """
+            INSERT INTO sector_performance (
+                date, country, sector, daily_return, weekly_return,
+                breadth, volume_change, stock_count,
+                top_gainers, top_losers, collected_at
+            )
+            VALUES (
+                :date, :country, :sector, :daily_return, :weekly_return,
+                :breadth, :volume_change, :stock_count,
+                :top_gainers, :top_losers, :collected_at
+            )
+            ON CONFLICT(date, country, sector) DO UPDATE SET
+                daily_return = excluded.daily_return,
+                weekly_return = excluded.weekly_return,
+                breadth = excluded.breadth,
+                volume_change = excluded.volume_change,
+                stock_count = excluded.stock_count,
+                top_gainers = excluded.top_gainers,
+                top_losers = excluded.top_losers,
+                collected_at = excluded.collected_at
+            """,
+            rows,
+        )
+
+
+def upsert_abnormal_stocks(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert abnormal stock summaries into the summary DB."""
+    if not rows:
+        return
+
+    with _report_write(conn):
+        conn.executemany(
+            """
+            INSERT INTO abnormal_stock_summary (
+                date, ticker, name, country, sector,
+                market_cap, close_price, daily_return, volume, avg_volume_20d
+            )
+            VALUES (
+                :date, :ticker, :name, :country, :sector,
+                :market_cap, :close_price, :daily_return, :volume, :avg_volume_20d
+            )
+            ON CONFLICT(date, ticker) DO UPDATE SET
+                name = excluded.name,
+                country = excluded.country,
+                sector = excluded.sector,
+                market_cap = excluded.market_cap,
+                close_price = excluded.close_price,
+                daily_return = excluded.daily_return,
+                volume = excluded.volume,
+                avg_volume_20d = excluded.avg_volume_20d
+            """,
+            rows,
+        )
+
+
+_UNIVERSE_COLUMNS = (
+    "country", "ticker", "name", "sector", "market_cap",
+    "last_close_price", "last_volume", "avg_volume_20d",
+    "last_seen_date", "last_is_filtered", "last_is_abnormal", "updated_at",
+)
+
+# Merged value per column when a ticker is already cached; {new} is the
+# incoming row and {old} the stored one. Blank names/sectors and missing caps
+# keep the cached value so a sparse provider response never erases it.
+_UNIVERSE_MERGE = {
+    "name": """CASE
+            WHEN {new}.name IS NULL OR TRIM({new}.name) = ''
+                THEN {old}.name
+            ELSE {new}.name
+        END""",
+    "sector": """CASE
+            WHEN {new}.sector IS NULL
+              OR TRIM({new}.sector) = ''
+              OR {new}.sector = '기타'
+                THEN {old}.sector
+            ELSE {new}.sector
+        END""",
+    "market_cap": "COALESCE({new}.market_cap, {old}.market_cap)",
+    "last_close_price": "{new}.last_close_price",
+    "last_volume": "{new}.last_volume",
+    "avg_volume_20d": "COALESCE({new}.avg_volume_20d, {old}.avg_volume_20d)",
+    "last_seen_date": "{new}.last_seen_date",
+    "last_is_filtered": "{new}.last_is_filtered",
+    "last_is_abnormal": "{new}.last_is_abnormal",
+}
+
+
+def _universe_changed_sql(new: str, old: str) -> str:
+    return "\n   OR ".join(
+        f"({expr.format(new=new, old=old)}) IS NOT {old}.{column}"
+        for column, expr in _UNIVERSE_MERGE.items()
+    )
+
+
+# Unchanged rows are skipped so re-saving the same snapshot leaves the
+# Git-tracked summary DB untouched (updated_at only moves on real changes).
+_UNIVERSE_CONFLICT = (
+    "ON CONFLICT(country, ticker) DO UPDATE SET\n"
+    + ",\n".join(
+        f"    {column} = {expr.format(new='excluded', old='instrument_universe')}"
+        for column, expr in _UNIVERSE_MERGE.items()
+    )
+    + ",\n    updated_at = excluded.updated_at\nWHERE "
+    + _universe_changed_sql("excluded", "instrument_universe")
+)
+
+
+def upsert_instrument_universe(
+    conn: sqlite3.Connection,
+    country: str,
     rows: list[dict],
 ) -> None:
     """Persist the latest instrument snapshot for future prefiltering."""
@@ -490,44 +2203,14 @@ def upsert_instrument_universe(
         for row in rows
     ]
 
-    conn.executemany(
-        """
-        INSERT INTO instrument_universe (
-            country, ticker, name, sector, market_cap,
-            last_close_price, last_volume, avg_volume_20d,
-            last_seen_date, last_is_filtered, last_is_abnormal, updated_at
-        )
-        VALUES (
-            :country, :ticker, :name, :sector, :market_cap,
-            :last_close_price, :last_volume, :avg_volume_20d,
-            :last_seen_date, :last_is_filtered, :last_is_abnormal, :updated_at
-        )
-        ON CONFLICT(country, ticker) DO UPDATE SET
-            name = CASE
-                WHEN excluded.name IS NULL OR TRIM(excluded.name) = ''
-                    THEN instrument_universe.name
-                ELSE excluded.name
-            END,
-            sector = CASE
-                WHEN excluded.sector IS NULL
-                  OR TRIM(excluded.sector) = ''
-                  OR excluded.sector = '기타'
-                    THEN instrument_universe.sector
-                ELSE excluded.sector
-            END,
-            market_cap = COALESCE(excluded.market_cap, instrument_universe.market_cap),
-            last_close_price = excluded.last_close_price,
-            last_volume = excluded.last_volume,
-            avg_volume_20d = COALESCE(
-                excluded.avg_volume_20d,
-                instrument_universe.avg_volume_20d
-            ),
-            last_seen_date = excluded.last_seen_date,
-            last_is_filtered = excluded.last_is_filtered,
-            last_is_abnormal = excluded.last_is_abnormal,
-            updated_at = excluded.updated_at
-        """,
+    _upsert_rows(
+        conn,
+        "instrument_universe",
+        _UNIVERSE_COLUMNS,
+        ("country", "ticker"),
         universe_rows,
+        _UNIVERSE_CONFLICT,
+        changed_sql=_universe_changed_sql("s", "u"),
     )
 
 
@@ -711,155 +2394,488 @@ def delete_collection_checkpoint(
     )
 
 
-def replace_abnormal_stocks(
+def replace_abnormal_stocks(
+    conn: sqlite3.Connection,
+    date: str,
+    country: str,
+    stock_rows: list[dict],
+) -> None:
+    """Replace one market's abnormal snapshot for the given date."""
+    with _report_write(conn):
+        conn.execute(
+            "DELETE FROM abnormal_stock_summary WHERE date = ? AND country = ?",
+            (date, country),
+        )
+    upsert_abnormal_stocks(conn, _build_abnormal_rows(stock_rows))
+
+
+def upsert_benchmark_daily(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert benchmark rows into the summary DB."""
+    if not rows:
+        return
+
+    with _report_write(conn):
+        conn.executemany(
+            """
+            INSERT INTO benchmark_daily (
+                date, ticker, name, country, sector,
+                close_price, daily_return, weekly_return
+            )
+            VALUES (
+                :date, :ticker, :name, :country, :sector,
+                :close_price, :daily_return, :weekly_return
+            )
+            ON CONFLICT(date, ticker) DO UPDATE SET
+                name = excluded.name,
+                close_price = excluded.close_price,
+                daily_return = excluded.daily_return,
+                weekly_return = excluded.weekly_return
+            """,
+            rows,
+        )
+
+
+def upsert_trend_scores(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert trend score rows into the summary DB."""
+    if not rows:
+        return
+
+    with _report_write(conn):
+        conn.executemany(
+            """
+            INSERT INTO trend_scores (
+                date, sector, trend_score, countries_positive,
+                countries_negative, global_avg_return,
+                global_breadth, momentum_signal
+            )
+            VALUES (
+                :date, :sector, :trend_score, :countries_positive,
+                :countries_negative, :global_avg_return,
+                :global_breadth, :momentum_signal
+            )
+            ON CONFLICT(date, sector) DO UPDATE SET
+                trend_score = excluded.trend_score,
+                countries_positive = excluded.countries_positive,
+                countries_negative = excluded.countries_negative,
+                global_avg_return = excluded.global_avg_return,
+                global_breadth = excluded.global_breadth,
+                momentum_signal = excluded.momentum_signal
+            """,
+            rows,
+        )
+
+
+def upsert_lead_lag_scores(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert lead-lag pair scores into the summary DB.
+
+    ``p_value``/``ci_low``/``ci_high`` are optional and stored as NULL when
+    a row has no significance result. ``follower_sector`` defaults to the
+    row's ``sector`` (a same-sector pair).
+    """
+    if not rows:
+        return
+
+    with _report_write(conn):
+        conn.executemany(
+            """
+            INSERT INTO lead_lag_scores (
+                date, sector, follower_sector, leader, follower, lag,
+                correlation, direction_agreement, n_obs,
+                p_value, ci_low, ci_high
+            )
+            VALUES (
+                :date, :sector, :follower_sector, :leader, :follower, :lag,
+                :correlation, :direction_agreement, :n_obs,
+                :p_value, :ci_low, :ci_high
+            )
+            ON CONFLICT(date, sector, leader, follower, follower_sector) DO UPDATE SET
+                lag = excluded.lag,
+                correlation = excluded.correlation,
+                direction_agreement = excluded.direction_agreement,
+                n_obs = excluded.n_obs,
+                p_value = excluded.p_value,
+                ci_low = excluded.ci_low,
+                ci_high = excluded.ci_high
+            """,
+            (
+                {
+                    "p_value": None,
+                    "ci_low": None,
+                    "ci_high": None,
+                    **row,
+                    "follower_sector": row.get("follower_sector") or row["sector"],
+                }
+                for row in rows
+            ),
+        )
+
+
+def replace_cross_sector_lead_lag_scores(
+    conn: sqlite3.Connection,
+    date: str,
+    rows: list[dict],
+) -> None:
+    """Replace one date's cross-sector pair scores.
+
+    Only pairs passing the correlation cut are stored, so a rerun must drop
+    the pairs that no longer pass instead of upserting over them.
+    """
+    with _report_write(conn):
+        conn.execute(
+            "DELETE FROM lead_lag_scores WHERE date = ? AND follower_sector != sector",
+            (date,),
+        )
+    upsert_lead_lag_scores(conn, rows)
+
+
+def get_lead_lag_scores(
+    conn: sqlite3.Connection,
+    date: Optional[str] = None,
+    cross_sector: bool = False,
+) -> list[dict]:
+    """Read the latest lead-lag pair scores up to the requested date.
+
+    Same-sector pairs by default; ``cross_sector=True`` reads the pairs whose
+    follower is in another sector instead.
+    """
+    kind = "follower_sector != sector" if cross_sector else "follower_sector = sector"
+    if date is None:
+        row = conn.execute(f"SELECT MAX(date) FROM lead_lag_scores WHERE {kind}").fetchone()
+        date = row[0] if row and row[0] else None
+        if date is None:
+            return []
+    else:
+        row = conn.execute(
+            f"SELECT MAX(date) FROM lead_lag_scores WHERE date <= ? AND {kind}",
+            (date,),
+        ).fetchone()
+        date = row[0] if row and row[0] else None
+        if date is None:
+            return []
+
+    rows = conn.execute(
+        f"""
+        SELECT *
+        FROM lead_lag_scores
+        WHERE date = ? AND {kind}
+        ORDER BY correlation DESC
+        """,
+        (date,),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+_STOCK_LEAD_LAG_COLUMNS = (
+    "date", "leader_country", "leader_ticker", "leader_name", "leader_sector",
+    "follower_country", "follower_ticker", "follower_name", "follower_sector",
+    "lag", "correlation", "direction_agreement", "n_obs",
+)
+
+
+def replace_stock_lead_lag_scores(
     conn: sqlite3.Connection,
     date: str,
-    country: str,
-    stock_rows: list[dict],
+    rows: list[dict],
 ) -> None:
-    """Replace one market's abnormal snapshot for the given date."""
-    conn.execute(
-        "DELETE FROM abnormal_stock_summary WHERE date = ? AND country = ?",
-        (date, country),
-    )
-    upsert_abnormal_stocks(conn, _build_abnormal_rows(stock_rows))
+    """Replace one date's stock-level lead-lag pairs (only the top pairs are kept)."""
+    with _report_write(conn):
+        conn.execute("DELETE FROM stock_lead_lag_scores WHERE date = ?", (date,))
+        conn.executemany(
+            f"""
+            INSERT INTO stock_lead_lag_scores ({", ".join(_STOCK_LEAD_LAG_COLUMNS)})
+            VALUES ({", ".join(f":{column}" for column in _STOCK_LEAD_LAG_COLUMNS)})
+            """,
+            ({"date": date, **row} for row in rows),
+        )
 
 
-def upsert_benchmark_daily(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert benchmark rows into the summary DB."""
-    if not rows:
-        return
+def get_lead_lag_score_dates(
+    conn: sqlite3.Connection,
+    start_date: str,
+    end_date: str,
+) -> list[str]:
+    """Analysis dates with stored lead-lag scores in [start_date, end_date]."""
+    return [
+        row[0]
+        for row in conn.execute(
+            "SELECT DISTINCT date FROM lead_lag_scores WHERE date BETWEEN ? AND ? ORDER BY date",
+            (start_date, end_date),
+        ).fetchall()
+    ]
 
-    conn.executemany(
-        """
-        INSERT INTO benchmark_daily (
-            date, ticker, name, country, sector,
-            close_price, daily_return, weekly_return
-        )
-        VALUES (
-            :date, :ticker, :name, :country, :sector,
-            :close_price, :daily_return, :weekly_return
-        )
-        ON CONFLICT(date, ticker) DO UPDATE SET
-            name = excluded.name,
-            close_price = excluded.close_price,
-            daily_return = excluded.daily_return,
-            weekly_return = excluded.weekly_return
-        """,
-        rows,
-    )
 
+def get_stock_lead_lag_scores(
+    conn: sqlite3.Connection,
+    date: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Read the latest stock-level lead-lag pairs up to the requested date."""
+    if date is None:
+        row = conn.execute("SELECT MAX(date) FROM stock_lead_lag_scores").fetchone()
+    else:
+        row = conn.execute(
+            "SELECT MAX(date) FROM stock_lead_lag_scores WHERE date <= ?",
+            (date,),
+        ).fetchone()
+    date = row[0] if row and row[0] else None
+    if date is None:
+        return []
+
+    query = """
+        SELECT *
+        FROM stock_lead_lag_scores
+        WHERE date = ?
+        ORDER BY correlation DESC
+    """
+    params: tuple = (date,)
+    if limit is not None:
+        query += " LIMIT ?"
+        params += (limit,)
+    return [dict(row) for row in conn.execute(query, params).fetchall()]
 
-def upsert_trend_scores(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert trend score rows into the summary DB."""
-    if not rows:
-        return
 
-    conn.executemany(
+def get_derived_node_fingerprint(
+    conn: sqlite3.Connection,
+    date: str,
+    node: str,
+) -> Optional[str]:
+    """Input fingerprint a DAG node last recorded for one report date."""
+    row = conn.execute(
+        "SELECT fingerprint FROM derived_node_runs WHERE date = ? AND node = ?",
+        (date, node),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def record_derived_node_run(conn: sqlite3.Connection, row: dict) -> None:
+    """Upsert one DAG node run (date, node, fingerprint, status, timings)."""
+    conn.execute(
         """
-        INSERT INTO trend_scores (
-            date, sector, trend_score, countries_positive,
-            countries_negative, global_avg_return,
-            global_breadth, momentum_signal
+        INSERT INTO derived_node_runs (
+            date, node, fingerprint, status, run_seconds, fingerprint_seconds, updated_at
         )
         VALUES (
-            :date, :sector, :trend_score, :countries_positive,
-            :countries_negative, :global_avg_return,
-            :global_breadth, :momentum_signal
+            :date, :node, :fingerprint, :status, :run_seconds, :fingerprint_seconds,
+            :updated_at
         )
-        ON CONFLICT(date, sector) DO UPDATE SET
-            trend_score = excluded.trend_score,
-            countries_positive = excluded.countries_positive,
-            countries_negative = excluded.countries_negative,
-            global_avg_return = excluded.global_avg_return,
-            global_breadth = excluded.global_breadth,
-            momentum_signal = excluded.momentum_signal
+        ON CONFLICT(date, node) DO UPDATE SET
+            fingerprint = excluded.fingerprint,
+            status = excluded.status,
+            run_seconds = excluded.run_seconds,
+            fingerprint_seconds = excluded.fingerprint_seconds,
+            updated_at = excluded.updated_at
         """,
-        rows,
+        row,
     )
 
 
-def upsert_lead_lag_scores(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert lead-lag pair scores into the summary DB."""
-    if not rows:
-        return
+def get_derived_node_runs(conn: sqlite3.Connection, date: Optional[str] = None) -> list[dict]:
+    """Read DAG node runs for one report date (default: the latest one)."""
+    if date is None:
+        row = conn.execute("SELECT MAX(date) FROM derived_node_runs").fetchone()
+        date = row[0] if row else None
+    if date is None:
+        return []
+    return [
+        dict(row)
+        for row in conn.execute(
+            "SELECT * FROM derived_node_runs WHERE date = ? ORDER BY updated_at, node",
+            (date,),
+        ).fetchall()
+    ]
+
+
+RENDERED_REPORT_QUERY = """
+    SELECT body, rendered_at
+    FROM rendered_reports
+    WHERE command = ? AND argument = ? AND date = ? AND data_version = ? AND render_key = ?
+"""
+
+FIRST_VERIFIED_SIGNAL_QUERY = """
+    SELECT MIN(created_date)
+    FROM flow_signals
+    WHERE status = 'verified' AND created_date >= ?
+"""
 
+
+def replace_rendered_reports(
+    conn: sqlite3.Connection,
+    date: str,
+    data_version: int,
+    render_key: str,
+    rows: list[dict],
+) -> None:
+    """Replace the rendered report cache with one (date, data_version, render_key) set.
+
+    Each row has ``command``, ``argument`` and ``messages`` (list of texts).
+    """
+    rendered_at = datetime.utcnow().isoformat(timespec="seconds")
+    conn.execute("DELETE FROM rendered_reports")
     conn.executemany(
         """
-        INSERT INTO lead_lag_scores (
-            date, sector, leader, follower, lag,
-            correlation, direction_agreement, n_obs
+        INSERT INTO rendered_reports (
+            command, argument, date, data_version, render_key, body, rendered_at
         )
-        VALUES (
-            :date, :sector, :leader, :follower, :lag,
-            :correlation, :direction_agreement, :n_obs
-        )
-        ON CONFLICT(date, sector, leader, follower) DO UPDATE SET
-            lag = excluded.lag,
-            correlation = excluded.correlation,
-            direction_agreement = excluded.direction_agreement,
-            n_obs = excluded.n_obs
+        VALUES (?, ?, ?, ?, ?, ?, ?)
         """,
-        rows,
+        [
+            (
+                row["command"],
+                row["argument"],
+                date,
+                data_version,
+                render_key,
+                json.dumps(row["messages"], ensure_ascii=False),
+                rendered_at,
+            )
+            for row in rows
+        ],
     )
 
 
-def get_lead_lag_scores(
+def get_rendered_report(
     conn: sqlite3.Connection,
-    date: Optional[str] = None,
-) -> list[dict]:
-    """Read the latest lead-lag pair scores up to the requested date."""
-    if date is None:
-        row = conn.execute("SELECT MAX(date) FROM lead_lag_scores").fetchone()
-        date = row[0] if row and row[0] else None
-        if date is None:
-            return []
-    else:
-        row = conn.execute(
-            "SELECT MAX(date) FROM lead_lag_scores WHERE date <= ?",
-            (date,),
-        ).fetchone()
-        date = row[0] if row and row[0] else None
-        if date is None:
-            return []
+    command: str,
+    argument: str,
+    date: str,
+    data_version: int,
+    render_key: str,
+) -> Optional[dict]:
+    """Read one rendered report: ``messages`` and ``rendered_at``, or None."""
+    row = conn.execute(
+        RENDERED_REPORT_QUERY,
+        (command, argument, date, data_version, render_key),
+    ).fetchone()
+    if row is None:
+        return None
+    return {"messages": json.loads(row["body"]), "rendered_at": row["rendered_at"]}
+
+
+def get_first_verified_signal_date(conn: sqlite3.Connection, since_date: str) -> Optional[str]:
+    """Oldest created_date of a verified flow signal on or after ``since_date``."""
+    if not table_exists(conn, "flow_signals"):
+        return None
+    row = conn.execute(FIRST_VERIFIED_SIGNAL_QUERY, (since_date,)).fetchone()
+    return row[0] if row else None
+
+
+def get_data_revision(
+    conn: sqlite3.Connection,
+    name: str = "sector_performance",
+    schema: str = "main",
+) -> int:
+    """Return the write counter of one table (0 if unknown).
+
+    Unlike ``PRAGMA data_version`` it is stored in the file, so values read
+    from different connections and processes are comparable.
+    """
+    if not _schema_has_table(conn, schema, "data_revision"):
+        return 0
+    row = conn.execute(
+        f"SELECT revision FROM {schema}.data_revision WHERE name = ?",
+        (name,),
+    ).fetchone()
+    return int(row[0]) if row else 0
+
 
+def get_sector_return_panel_rows(conn: sqlite3.Connection) -> list[tuple]:
+    """Read the wide sector return panel: (sector, date, *SECTOR_PANEL_COUNTRIES) rows."""
+    columns = ", ".join(f'"{country}"' for country in SECTOR_PANEL_COUNTRIES)
     rows = conn.execute(
+        f"""
+        SELECT sector, date, {columns}
+        FROM sector_return_panel
+        WHERE sector != '기타'
+        ORDER BY sector, date
         """
-        SELECT *
-        FROM lead_lag_scores
-        WHERE date = ?
-        ORDER BY correlation DESC
-        """,
-        (date,),
     ).fetchall()
-    return [dict(row) for row in rows]
+    return [tuple(row) for row in rows]
 
 
-def upsert_flow_signals(conn: sqlite3.Connection, rows: list[dict]) -> None:
-    """Bulk-upsert pending flow signals (idempotent across reruns)."""
-    if not rows:
-        return
+LEAD_LAG_STATE_SUMS = (
+    "n_obs", "sum_x", "sum_y", "sum_xx", "sum_yy", "sum_xy", "agree", "nonzero",
+)
+
+
+def get_lead_lag_state(
+    conn: sqlite3.Connection,
+    state: str = "sector",
+) -> tuple[Optional[dict], list[dict]]:
+    """Read the lead-lag running-sum window and its per-pair rows."""
+    window = conn.execute(
+        "SELECT * FROM lead_lag_state_window WHERE state = ?",
+        (state,),
+    ).fetchone()
+    if window is None:
+        return None, []
+    rows = conn.execute("SELECT * FROM lead_lag_state").fetchall()
+    return dict(window), [dict(row) for row in rows]
 
+
+def replace_lead_lag_state(
+    conn: sqlite3.Connection,
+    window: dict,
+    rows: list[dict],
+    state: str = "sector",
+) -> None:
+    """Swap in a new lead-lag state window and its running sums."""
+    conn.execute("DELETE FROM lead_lag_state")
     conn.executemany(
+        f"""
+        INSERT INTO lead_lag_state (sector, leader, follower, lag, {", ".join(LEAD_LAG_STATE_SUMS)})
+        VALUES (:sector, :leader, :follower, :lag, {", ".join(f":{name}" for name in LEAD_LAG_STATE_SUMS)})
+        """,
+        rows,
+    )
+    conn.execute(
         """
-        INSERT INTO flow_signals (
-            created_date, sector, leader, follower, lag,
-            leader_return, predicted_direction, correlation, status
+        INSERT INTO lead_lag_state_window (
+            state, start_date, end_date, max_lag,
+            row_count, return_total, rebuilt_at, updated_at
         )
         VALUES (
-            :created_date, :sector, :leader, :follower, :lag,
-            :leader_return, :predicted_direction, :correlation, 'pending'
+            :state, :start_date, :end_date, :max_lag,
+            :row_count, :return_total, :rebuilt_at, :updated_at
         )
-        ON CONFLICT(created_date, sector, leader, follower) DO UPDATE SET
-            lag = excluded.lag,
-            leader_return = excluded.leader_return,
-            predicted_direction = excluded.predicted_direction,
-            correlation = excluded.correlation
+        ON CONFLICT(state) DO UPDATE SET
+            start_date = excluded.start_date,
+            end_date = excluded.end_date,
+            max_lag = excluded.max_lag,
+            row_count = excluded.row_count,
+            return_total = excluded.return_total,
+            rebuilt_at = excluded.rebuilt_at,
+            updated_at = excluded.updated_at
         """,
-        rows,
+        {**window, "state": state},
     )
 
 
+def upsert_flow_signals(conn: sqlite3.Connection, rows: list[dict]) -> None:
+    """Bulk-upsert pending flow signals (idempotent across reruns)."""
+    if not rows:
+        return
+
+    with _report_write(conn):
+        conn.executemany(
+            """
+            INSERT INTO flow_signals (
+                created_date, sector, leader, follower, lag,
+                leader_return, predicted_direction, correlation, status
+            )
+            VALUES (
+                :created_date, :sector, :leader, :follower, :lag,
+                :leader_return, :predicted_direction, :correlation, 'pending'
+            )
+            ON CONFLICT(created_date, sector, leader, follower) DO UPDATE SET
+                lag = excluded.lag,
+                leader_return = excluded.leader_return,
+                predicted_direction = excluded.predicted_direction,
+                correlation = excluded.correlation
+            """,
+            rows,
+        )
+
+
 def get_flow_signals(
     conn: sqlite3.Connection,
     status: Optional[str] = None,
@@ -893,14 +2909,71 @@ def resolve_flow_signal(
     hit: Optional[int] = None,
 ) -> None:
     """Mark one flow signal as verified or expired."""
+    with _report_write(conn):
+        conn.execute(
+            """
+            UPDATE flow_signals
+            SET status = ?, target_date = ?, follower_return = ?, hit = ?
+            WHERE id = ?
+            """,
+            (status, target_date, follower_return, hit, signal_id),
+        )
+
+
+def resolve_pending_flow_signals(
+    conn: sqlite3.Connection,
+    expire_before: str,
+) -> dict:
+    """Verify or expire every pending flow signal in one set-based pass.
+
+    ``FLOW_SIGNAL_OUTCOMES_QUERY`` resolves all pending signals at once into a
+    TEMP table, which is applied with a single ``UPDATE ... FROM``. Signals
+    whose follower row has not arrived stay pending unless they were created
+    before ``expire_before``.
+
+    The write lock is taken up front: the pass reads main before updating it,
+    and a deferred transaction whose snapshot went stale under a concurrent
+    writer would fail the upgrade at once instead of waiting.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
     conn.execute(
         """
-        UPDATE flow_signals
-        SET status = ?, target_date = ?, follower_return = ?, hit = ?
-        WHERE id = ?
-        """,
-        (status, target_date, follower_return, hit, signal_id),
+        CREATE TEMP TABLE IF NOT EXISTS flow_signal_outcomes (
+            id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL,
+            target_date TEXT,
+            follower_return REAL,
+            hit INTEGER
+        )
+        """
     )
+    conn.execute("DELETE FROM temp.flow_signal_outcomes")
+    try:
+        conn.execute(
+            f"INSERT INTO temp.flow_signal_outcomes {FLOW_SIGNAL_OUTCOMES_QUERY}",
+            (expire_before,),
+        )
+        with _report_write(conn):
+            conn.execute(
+                """
+                UPDATE main.flow_signals
+                SET status = o.status,
+                    target_date = o.target_date,
+                    follower_return = o.follower_return,
+                    hit = o.hit
+                FROM temp.flow_signal_outcomes o
+                WHERE flow_signals.id = o.id
+                """
+            )
+        counts = dict(
+            conn.execute(
+                "SELECT status, COUNT(*) FROM temp.flow_signal_outcomes GROUP BY status"
+            ).fetchall()
+        )
+    finally:
+        conn.execute("DELETE FROM temp.flow_signal_outcomes")
+    return {"verified": counts.get("verified", 0), "expired": counts.get("expired", 0)}
 
 
 def get_flow_signal_stats(
@@ -999,33 +3072,232 @@ def get_latest_sector_performance(
 
     query += " ORDER BY country, daily_return DESC"
     rows = conn.execute(query, params).fetchall()
+    if not rows and date and list_summary_years(date, date):
+        with open_summary_range(date, date) as range_conn:
+            rows = range_conn.execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
 
-def get_latest_benchmarks(
+SECTOR_RANGE_QUERY = """
+    SELECT date, sector, country, daily_return, weekly_return
+    FROM sector_performance
+    WHERE date BETWEEN ? AND ? AND sector != '기타'
+    ORDER BY date, sector, country
+"""
+
+
+def get_sector_performance_range(
     conn: sqlite3.Connection,
-    date: Optional[str] = None,
-    country: Optional[str] = None,
+    start_date: str,
+    end_date: str,
+) -> list[tuple]:
+    """Read (date, sector, country, daily_return, weekly_return) rows for a date range.
+
+    Rows come sorted by (date, sector, country). A date with no live rows is
+    read from the frozen summary years, the same per-date fallback
+    ``get_latest_sector_performance`` applies.
+    """
+    params = (start_date, end_date)
+    rows = [tuple(row) for row in conn.execute(SECTOR_RANGE_QUERY, params).fetchall()]
+    if not list_summary_years(start_date, end_date):
+        return rows
+
+    live_dates = {row[0] for row in rows}
+    with open_summary_range(start_date, end_date) as range_conn:
+        frozen = [
+            tuple(row)
+            for row in range_conn.execute(SECTOR_RANGE_QUERY, params).fetchall()
+            if row[0] not in live_dates
+        ]
+    return sorted(rows + frozen, key=lambda row: row[:3])
+
+
+SECTOR_DETAIL_QUERY = """
+    SELECT * FROM sector_performance
+    WHERE date = ? AND sector = ?
+    ORDER BY daily_return DESC
+"""
+
+SECTOR_RETURN_AFTER_QUERY = """
+    SELECT date, daily_return
+    FROM sector_performance
+    WHERE country = ? AND sector = ? AND date > ?
+    ORDER BY date ASC
+    LIMIT 1 OFFSET ?
+"""
+
+# Pairs every pending flow signal with the (lag)-th sector_performance row
+# strictly after its created_date for the same (follower, sector). Signals are
+# merged into each (country, sector) date stream as markers sorted after that
+# day's row, so a running count of data rows gives each marker the sequence
+# number of the last row on or before created_date; the target is that number
+# plus the lag. Matches SECTOR_RETURN_AFTER_QUERY with OFFSET = lag - 1.
+FLOW_SIGNAL_OUTCOMES_QUERY = """
+    WITH pending AS (
+        SELECT
+            id, follower AS country, sector, created_date, predicted_direction,
+            MAX(COALESCE(lag, 1) - 1, 0) AS target_offset
+        FROM flow_signals
+        WHERE status = 'pending'
+    ),
+    series AS (
+        SELECT country, sector, MIN(created_date) AS first_date
+        FROM pending
+        GROUP BY country, sector
+    ),
+    stream AS (
+        SELECT
+            sp.country, sp.sector, sp.date, sp.daily_return,
+            NULL AS signal_id, NULL AS predicted_direction, 0 AS target_offset, 0 AS marker
+        FROM series f
+        JOIN sector_performance sp
+          ON sp.country = f.country
+         AND sp.sector = f.sector
+         AND sp.date > f.first_date
+        UNION ALL
+        SELECT country, sector, created_date, NULL, id, predicted_direction, target_offset, 1
+        FROM pending
+    ),
+    numbered AS (
+        SELECT
+            *,
+            SUM(1 - marker) OVER (
+                PARTITION BY country, sector
+                ORDER BY date, marker
+                ROWS UNBOUNDED PRECEDING
+            ) AS seq
+        FROM stream
+    )
+    SELECT
+        s.signal_id AS id,
+        CASE WHEN t.daily_return IS NOT NULL THEN 'verified' ELSE 'expired' END AS status,
+        CASE WHEN t.daily_return IS NOT NULL THEN t.date END AS target_date,
+        t.daily_return AS follower_return,
+        CASE
+            WHEN t.daily_return IS NOT NULL
+            THEN t.daily_return * s.predicted_direction > 0
+        END AS hit
+    FROM numbered s
+    LEFT JOIN numbered t
+      ON t.marker = 0
+     AND t.country = s.country
+     AND t.sector = s.sector
+     AND t.seq = s.seq + s.target_offset + 1
+    WHERE s.marker = 1
+      AND (t.daily_return IS NOT NULL OR s.date < ?)
+"""
+
+LATEST_SECTOR_DATES_QUERY = """
+    SELECT country, MAX(date) AS latest_date
+    FROM sector_performance
+    GROUP BY country
+"""
+
+UNIVERSE_SNAPSHOT_QUERY = """
+    SELECT *
+    FROM instrument_universe
+    WHERE country = ?
+      AND ticker = ?
+      AND last_seen_date <= ?
+    ORDER BY last_seen_date DESC
+    LIMIT 1
+"""
+
+
+def _universe_snapshots_query(count: int) -> str:
+    keys = ", ".join("(?, ?)" for _ in range(count))
+    # CROSS JOIN keeps the key list as the outer loop, one unique-index probe per key
+    return f"""
+        SELECT u.*
+        FROM (VALUES {keys}) AS k
+        CROSS JOIN instrument_universe u
+            ON u.country = k.column1 AND u.ticker = k.column2
+        WHERE u.last_seen_date <= ?
+    """
+
+
+REPORT_FLOW_SIGNALS_QUERY = """
+    SELECT *
+    FROM flow_signals
+    WHERE status = 'verified'
+       OR (status = 'pending' AND created_date = ?)
+    ORDER BY created_date DESC, ABS(COALESCE(correlation, 0)) DESC
+"""
+
+
+def get_sector_rows_for_sector(
+    conn: sqlite3.Connection,
+    date: str,
+    sector: str,
 ) -> list[dict]:
-    """Read the latest benchmark snapshot up to the requested date."""
-    if date is None:
-        row = conn.execute("SELECT MAX(date) FROM benchmark_daily").fetchone()
-        date = row[0] if row and row[0] else None
-        if date is None:
-            return []
+    """Return one sector's rows across countries for a date, best first."""
+    rows = conn.execute(SECTOR_DETAIL_QUERY, (date, sector)).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_sector_return_after(
+    conn: sqlite3.Connection,
+    country: str,
+    sector: str,
+    after_date: str,
+    offset: int = 0,
+) -> Optional[dict]:
+    """Return the (offset+1)-th sector row strictly after ``after_date``."""
+    row = conn.execute(
+        SECTOR_RETURN_AFTER_QUERY,
+        (country, sector, after_date, offset),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_universe_snapshot(
+    conn: sqlite3.Connection,
+    country: str,
+    ticker: str,
+    as_of_date: str,
+) -> Optional[dict]:
+    """Return the latest universe row for one ticker seen on or before a date."""
+    row = conn.execute(
+        UNIVERSE_SNAPSHOT_QUERY,
+        (country, ticker, as_of_date),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def get_universe_snapshots(
+    conn: sqlite3.Connection,
+    keys: list[tuple[str, str]],
+    as_of_date: str,
+) -> dict[tuple[str, str], dict]:
+    """Batch form of get_universe_snapshot, keyed by (country, ticker)."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    params = [value for key in keys for value in key] + [as_of_date]
+    rows = conn.execute(_universe_snapshots_query(len(keys)), params).fetchall()
+    return {(row["country"], row["ticker"]): dict(row) for row in rows}
+
+
+def get_report_flow_signals(conn: sqlite3.Connection, created_date: str) -> list[dict]:
+    """Verified flow signals plus the ones still pending from ``created_date``.
+
+    Ordered like get_flow_signals, so filtering by status keeps its order.
+    """
+    rows = conn.execute(REPORT_FLOW_SIGNALS_QUERY, (created_date,)).fetchall()
+    return [dict(row) for row in rows]
+
 
+def _latest_benchmarks_query(by_country: bool) -> str:
     subquery = """
         SELECT ticker, MAX(date) AS latest_date
         FROM benchmark_daily
         WHERE date <= ?
     """
-    params: list[object] = [date]
-    if country:
+    if by_country:
         subquery += " AND country = ?"
-        params.append(country)
     subquery += " GROUP BY ticker"
 
-    query = f"""
+    return f"""
         SELECT b.*
         FROM benchmark_daily b
         JOIN (
@@ -1038,6 +3310,24 @@ def get_latest_benchmarks(
                  b.sector,
                  b.name
     """
+
+
+def get_latest_benchmarks(
+    conn: sqlite3.Connection,
+    date: Optional[str] = None,
+    country: Optional[str] = None,
+) -> list[dict]:
+    """Read the latest benchmark snapshot up to the requested date."""
+    if date is None:
+        row = conn.execute("SELECT MAX(date) FROM benchmark_daily").fetchone()
+        date = row[0] if row and row[0] else None
+        if date is None:
+            return []
+
+    params: list[object] = [date]
+    if country:
+        params.append(country)
+    query = _latest_benchmarks_query(bool(country))
     rows = conn.execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
@@ -1083,29 +3373,37 @@ def get_abnormal_stocks(
     date: Optional[str] = None,
 ) -> list[dict]:
     """Read abnormal stock summaries, with fallback for legacy DBs."""
-    if _table_exists(conn, "abnormal_stock_summary"):
+    if table_exists(conn, "abnormal_stock_summary"):
         rows = _get_abnormal_from_summary(conn, date=date)
-        if rows or not _table_exists(conn, "stock_daily"):
+        if rows or not table_exists(conn, "stock_daily"):
             return rows
 
-    if _table_exists(conn, "stock_daily"):
+    if table_exists(conn, "stock_daily"):
         return _get_abnormal_from_legacy_stock_daily(conn, date=date)
 
     return []
 
 
+def _recent_collection_logs_query(*, by_status: bool, by_market: bool) -> str:
+    query = "SELECT * FROM collection_log WHERE 1=1"
+    if by_market:
+        query += " AND market = ?"
+    if by_status:
+        query += " AND status = ?"
+    return query + " ORDER BY timestamp DESC, id DESC LIMIT ?"
+
+
 def get_latest_collection_log(
     conn: sqlite3.Connection,
     market: str,
     status: Optional[str] = None,
 ) -> Optional[dict]:
     """Return the latest collection log for one market."""
-    query = "SELECT * FROM collection_log WHERE market = ?"
     params: list[object] = [market]
     if status:
-        query += " AND status = ?"
         params.append(status)
-    query += " ORDER BY timestamp DESC, id DESC LIMIT 1"
+    params.append(1)
+    query = _recent_collection_logs_query(by_status=bool(status), by_market=True)
     row = conn.execute(query, params).fetchone()
     return dict(row) if row else None
 
@@ -1183,31 +3481,65 @@ def get_recent_collection_logs(
     market: Optional[str] = None,
 ) -> list[dict]:
     """Return recent collection logs, optionally filtered by status."""
-    query = "SELECT * FROM collection_log WHERE 1=1"
     params: list[object] = []
-    if status:
-        query += " AND status = ?"
-        params.append(status)
     if market:
-        query += " AND market = ?"
         params.append(market)
-    query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+    if status:
+        params.append(status)
     params.append(limit)
+    query = _recent_collection_logs_query(by_status=bool(status), by_market=bool(market))
     rows = conn.execute(query, params).fetchall()
     return [dict(row) for row in rows]
 
 
 def get_latest_sector_dates_by_country(conn: sqlite3.Connection) -> dict[str, str]:
     """Return the latest sector date recorded for each market."""
-    rows = conn.execute(
-        """
-        SELECT country, MAX(date) AS latest_date
-        FROM sector_performance
-        GROUP BY country
-        """
-    ).fetchall()
+    rows = conn.execute(LATEST_SECTOR_DATES_QUERY).fetchall()
     return {
         row["country"]: row["latest_date"]
         for row in rows
         if row["latest_date"]
     }
+
+
+# Queries on the report/bot/monitor path, with representative parameters.
+# tests/test_query_plans.py runs EXPLAIN QUERY PLAN on each one against a
+# seeded multi-year DB and fails on a full table scan, so register new hot
+# queries here together with the index that serves them.
+HOT_QUERIES: dict[str, tuple[str, tuple]] = {
+    "sector_detail": (SECTOR_DETAIL_QUERY, ("2026-04-20", "Technology")),
+    "sector_return_after": (
+        SECTOR_RETURN_AFTER_QUERY,
+        ("US", "Technology", "2026-04-20", 0),
+    ),
+    "universe_snapshot": (UNIVERSE_SNAPSHOT_QUERY, ("US", "AAPL", "2026-04-20")),
+    "universe_snapshots": (
+        _universe_snapshots_query(2),
+        ("US", "AAPL", "KR", "005930", "2026-04-20"),
+    ),
+    "report_flow_signals": (REPORT_FLOW_SIGNALS_QUERY, ("2026-04-20",)),
+    "rendered_report": (RENDERED_REPORT_QUERY, ("sector", "정보기술", "2026-04-20", 1, "0:")),
+    "latest_benchmarks": (_latest_benchmarks_query(False), ("2026-04-20",)),
+    "latest_benchmarks_by_country": (
+        _latest_benchmarks_query(True),
+        ("2026-04-20", "US"),
+    ),
+    "recent_collection_logs": (
+        _recent_collection_logs_query(by_status=False, by_market=False),
+        (10,),
+    ),
+    "recent_collection_logs_by_status": (
+        _recent_collection_logs_query(by_status=True, by_market=False),
+        ("failed", 5),
+    ),
+    "latest_collection_log_by_market": (
+        _recent_collection_logs_query(by_status=False, by_market=True),
+        ("US", 1),
+    ),
+    "latest_collection_log_by_market_status": (
+        _recent_collection_logs_query(by_status=True, by_market=True),
+        ("US", "success", 1),
+    ),
+    "latest_sector_dates_by_country": (LATEST_SECTOR_DATES_QUERY, ()),
+    "flow_signal_outcomes": (FLOW_SIGNAL_OUTCOMES_QUERY, ("2026-04-13",)),
+}
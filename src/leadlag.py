@@ -7,6 +7,11 @@
 1. 섹터별 국가 페어의 시차 상관(lead-lag correlation) 계산
    - 같은 캘린더 날짜라도 장 마감 순서(JP→KR→CN→VN→IN→DE→US)를 반영해서
      look-ahead 없는 시차만 허용한다.
+   - 매일 창 전체를 다시 읽지 않고, 페어·시차별 누적 합계(``lead_lag_state``)에
+     창에 새로 들어온 관측을 더하고 빠진 관측을 빼서 갱신한다.
+   - 페어마다 순열검정 p-value와 부트스트랩 신뢰구간을 함께 저장한다.
+   - 다른 섹터로 이어지는 페어(예: 미국 정보기술 → 한국 소재)는 (국가, 섹터)
+     계열 전체를 한 번에 채점하는 교차 모드로 따로 계산한다.
 2. 선행국의 큰 움직임으로부터 후행국의 다음 거래일 방향을 예측하는
    flow signal 생성
 3. 후행국 데이터가 도착하면 과거 예측을 채점해서 가설 적중률을 누적
@@ -15,33 +20,64 @@
 
 from __future__ import annotations
 
+import bisect
 import logging
+import math
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from itertools import permutations
 
+import numpy as np
 import pandas as pd
 
 from src.config import (
     COUNTRIES,
+    LEADLAG_CONFIDENCE_LEVEL,
+    LEADLAG_CROSS_SECTOR,
+    LEADLAG_CROSS_SECTOR_MIN_CORRELATION,
     LEADLAG_LOOKBACK_DAYS,
     LEADLAG_MAX_LAG,
+    LEADLAG_MAX_P_VALUE,
     LEADLAG_MIN_CORRELATION,
     LEADLAG_MIN_OVERLAP,
+    LEADLAG_SCORE_MODE,
+    LEADLAG_SIGNIFICANCE_JOBS,
+    LEADLAG_SIGNIFICANCE_RESAMPLES,
     LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS,
     LEADLAG_SIGNAL_MIN_LEADER_MOVE,
+    LEADLAG_STATE_EDGE_DAYS,
+    LEADLAG_STATE_SETTLE_DAYS,
 )
 from src.database import (
+    LEAD_LAG_STATE_SUMS,
     get_connection,
-    get_flow_signals,
+    get_lead_lag_score_dates,
     get_lead_lag_scores,
+    get_lead_lag_state,
     init_db,
-    resolve_flow_signal,
+    replace_cross_sector_lead_lag_scores,
+    replace_lead_lag_state,
+    resolve_pending_flow_signals,
+    summary_write,
     upsert_flow_signals,
     upsert_lead_lag_scores,
 )
+from src.panel import SectorReturnPanel, load_sector_return_panel
 
 logger = logging.getLogger(__name__)
 
+LEADLAG_SCORE_MODES = ("incremental", "full", "verify")
+LEADLAG_CROSS_SECTOR_METHODS = ("direct", "fft")
+
+# 누적 합계에서 분산을 구할 때 상수 시계열의 반올림 잔차를 0으로 보는 상대 임계값
+_VARIANCE_FLOOR = 1e-12
+
+# 재표본 한 묶음의 (재표본 × 페어 × 위치) 원소 수 상한. 메모리를 수십 MB로 묶는다.
+_RESAMPLE_CHUNK_ELEMENTS = 2_000_000
+
+# 섹터 교차 채점 한 묶음의 (leader 계열 × 계열 × 위치) 원소 수 상한
+_CROSS_SECTOR_CHUNK_ELEMENTS = 2_000_000
+
 
 def _close_minutes(country: str) -> int:
     """국가 장 마감 시각(UTC)을 분 단위로 반환. 알 수 없으면 하루 끝 취급."""
@@ -72,22 +108,16 @@ def _resolve_analysis_date(conn, date: str | None) -> str | None:
     return row[0] if row and row[0] else None
 
 
-def _load_return_history(conn, end_date: str) -> pd.DataFrame:
-    start_date = (
-        datetime.strptime(end_date, "%Y-%m-%d")
-        - timedelta(days=LEADLAG_LOOKBACK_DAYS)
-    ).strftime("%Y-%m-%d")
-    rows = conn.execute(
-        """
-        SELECT date, country, sector, daily_return
-        FROM sector_performance
-        WHERE date BETWEEN ? AND ?
-          AND sector != '기타'
-          AND daily_return IS NOT NULL
-        """,
-        (start_date, end_date),
-    ).fetchall()
-    return pd.DataFrame([dict(row) for row in rows])
+def _shift_date(date: str, days: int) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _load_lookback_panel(conn, end_date: str) -> SectorReturnPanel:
+    return _load_panel_range(conn, _shift_date(end_date, -LEADLAG_LOOKBACK_DAYS), end_date)
+
+
+def _load_panel_range(conn, start_date: str, end_date: str) -> SectorReturnPanel:
+    return load_sector_return_panel(conn).window(start_date, end_date)
 
 
 def _score_pair(
@@ -95,7 +125,11 @@ def _score_pair(
     leader: str,
     follower: str,
 ) -> dict | None:
-    """한 섹터에서 leader→follower 페어의 최적 시차와 상관을 계산."""
+    """한 섹터에서 leader→follower 페어의 최적 시차와 상관을 계산.
+
+    페어 하나씩 도는 참조 구현이다. 저장 경로는 ``_score_sector_panel``을 쓰고,
+    테스트와 ``scripts/bench_leadlag.py``가 두 결과를 비교한다.
+    """
     aligned = pivot[[leader, follower]].dropna()
     if len(aligned) < LEADLAG_MIN_OVERLAP:
         return None
@@ -141,8 +175,768 @@ def _score_pair(
     return best
 
 
-def compute_lead_lag_scores(date: str | None = None) -> list[dict]:
-    """섹터별 국가 페어 lead-lag 점수를 계산해 저장한다."""
+def _compact_pairs(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """국가×날짜 패널을 (leader, follower)마다 공통 거래일만 앞으로 모은 시계열로 바꾼다.
+
+    반환값은 공통 거래일 마스크와 정렬된 leader/follower 값 (모두 C×C×T, 뒤쪽은 무효).
+    """
+    finite = ~np.isnan(values)
+    pair_mask = finite[:, None, :] & finite[None, :, :]
+    order = np.argsort(~pair_mask, axis=2, kind="stable")
+    leader_values = np.take_along_axis(
+        np.broadcast_to(values[:, None, :], pair_mask.shape), order, axis=2
+    )
+    follower_values = np.take_along_axis(
+        np.broadcast_to(values[None, :, :], pair_mask.shape), order, axis=2
+    )
+    return pair_mask, leader_values, follower_values
+
+
+def _score_sector_panel(values: np.ndarray, countries: list[str]) -> list[tuple[str, str, dict]]:
+    """한 섹터의 국가×날짜 패널에서 모든 leader→follower 페어를 한 번에 채점한다.
+
+    ``_score_pair``와 같은 규칙을 따른다. 두 나라가 모두 값이 있는 날만 이어 붙인
+    시계열에서 시차를 주고, 시차는 ``_allowed_lags`` 범위만, 동률이면 짧은 시차를 고른다.
+    페어마다 공통 거래일을 앞으로 모으는 정렬을 (leader, follower, 날짜) 배열에 한 번 적용하고,
+    시차별 상관·방향 일치율은 마스크된 합으로 모든 페어에 대해 동시에 계산한다.
+    """
+    n_countries, n_dates = values.shape
+    if n_countries < 2:
+        return []
+
+    eligible = (~np.isnan(values)).sum(axis=1) >= LEADLAG_MIN_OVERLAP
+    pair_mask, leader_values, follower_values = _compact_pairs(values)
+    overlap = pair_mask.sum(axis=2)
+
+    close = np.array([_close_minutes(country) for country in countries])
+    min_lag = np.where(close[:, None] < close[None, :], 0, 1)
+    candidates = (
+        eligible[:, None]
+        & eligible[None, :]
+        & ~np.eye(n_countries, dtype=bool)
+        & (overlap >= LEADLAG_MIN_OVERLAP)
+    )
+
+    best_abs = np.full((n_countries, n_countries), -1.0)
+    best = {
+        "lag": np.zeros((n_countries, n_countries), dtype=int),
+        "correlation": np.zeros((n_countries, n_countries)),
+        "agree": np.zeros((n_countries, n_countries)),
+        "nonzero": np.zeros((n_countries, n_countries), dtype=int),
+        "n_obs": np.zeros((n_countries, n_countries), dtype=int),
+    }
+    positions = np.arange(n_dates)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for lag in range(min(LEADLAG_MAX_LAG, n_dates - 1) + 1):
+            n_obs = overlap - lag
+            lead = leader_values[:, :, : n_dates - lag]
+            follow = follower_values[:, :, lag:]
+            valid = positions[: n_dates - lag] + lag < overlap[:, :, None]
+
+            lead_mean = np.where(valid, lead, 0.0).sum(axis=2) / n_obs
+            follow_mean = np.where(valid, follow, 0.0).sum(axis=2) / n_obs
+            lead_dev = np.where(valid, lead - lead_mean[:, :, None], 0.0)
+            follow_dev = np.where(valid, follow - follow_mean[:, :, None], 0.0)
+            correlation = (lead_dev * follow_dev).sum(axis=2) / np.sqrt(
+                (lead_dev**2).sum(axis=2) * (follow_dev**2).sum(axis=2)
+            )
+
+            nonzero = valid & (lead != 0) & (follow != 0)
+            agree = (nonzero & (lead * follow > 0)).sum(axis=2)
+
+            rounded_abs = np.abs(np.round(correlation, 4))
+            better = (
+                candidates
+                & (lag >= min_lag)
+                & (n_obs >= LEADLAG_MIN_OVERLAP)
+                & np.isfinite(correlation)
+                & (rounded_abs > best_abs)
+            )
+            best_abs = np.where(better, rounded_abs, best_abs)
+            for key, current in (
+                ("lag", lag),
+                ("correlation", correlation),
+                ("agree", agree),
+                ("nonzero", nonzero.sum(axis=2)),
+                ("n_obs", n_obs),
+            ):
+                best[key] = np.where(better, current, best[key])
+
+    scored = []
+    for leader_index, follower_index in zip(*np.nonzero(best_abs >= 0)):
+        nonzero = int(best["nonzero"][leader_index, follower_index])
+        agreement = (
+            round(float(best["agree"][leader_index, follower_index]) / nonzero, 4)
+            if nonzero
+            else None
+        )
+        scored.append(
+            (
+                countries[leader_index],
+                countries[follower_index],
+                {
+                    "lag": int(best["lag"][leader_index, follower_index]),
+                    "correlation": round(float(best["correlation"][leader_index, follower_index]), 4),
+                    "direction_agreement": agreement,
+                    "n_obs": int(best["n_obs"][leader_index, follower_index]),
+                },
+            )
+        )
+    return scored
+
+
+def score_lead_lag_panel(panel: SectorReturnPanel) -> list[dict]:
+    """섹터 수익률 패널 전체 구간의 lead-lag 페어 점수 (date 키 제외)."""
+    rows = []
+    for sector_index, sector in enumerate(panel.sectors):
+        values = panel.values[sector_index]
+        present = ~np.isnan(values).all(axis=1)
+        sector_countries = [country for country, keep in zip(panel.countries, present) if keep]
+        for leader, follower, scored in _score_sector_panel(values[present], sector_countries):
+            rows.append({"sector": sector, "leader": leader, "follower": follower, **scored})
+    return rows
+
+
+def score_lead_lag_history(history: pd.DataFrame) -> list[dict]:
+    """(date, country, sector, daily_return) 행 목록으로 ``score_lead_lag_panel``을 부른다."""
+    return score_lead_lag_panel(SectorReturnPanel.from_history(history))
+
+
+def _compact_lag_sums(
+    leader_values: np.ndarray,
+    follower_values: np.ndarray,
+    overlap: np.ndarray,
+    max_lag: int,
+    method: str = "direct",
+) -> dict[str, np.ndarray]:
+    """공통 거래일로 압축한 (…, 위치) 시계열의 시차별 합계. 값마다 (시차, …) 배열이다.
+
+    압축 시계열은 overlap 뒤쪽이 0이라 x[t]·y[t + lag]를 모두 더해도 공통 구간의 관측만
+    남는다. Σx·Σx²는 x 앞쪽 overlap - lag개, Σy·Σy²는 y의 lag번째 이후 합이라 누적합
+    하나로 모든 시차를 구한다. 곱의 합(Σxy, 방향 일치·0 아닌 관측 수)은 "direct"면
+    시차마다 잘라 곱하고, "fft"면 FFT 교차상관으로 모든 시차를 한 번에 구한다.
+    """
+    n_dates = leader_values.shape[-1]
+    lags = np.arange(max_lag + 1).reshape(-1, *([1] * overlap.ndim))
+
+    def prefix(values: np.ndarray) -> np.ndarray:
+        return np.concatenate(
+            [np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1
+        )
+
+    def leading(values: np.ndarray) -> np.ndarray:
+        ends = np.clip(overlap - lags, 0, n_dates)
+        return np.take_along_axis(prefix(values)[None], ends[..., None], axis=-1)[..., 0]
+
+    def trailing(values: np.ndarray) -> np.ndarray:
+        heads = np.moveaxis(prefix(values)[..., : max_lag + 1], -1, 0)
+        return values.sum(axis=-1)[None] - heads
+
+    def lagged_products(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        if method == "fft":
+            size = 1 << (n_dates + max_lag - 1).bit_length()
+            spectrum = np.conj(np.fft.rfft(x, size)) * np.fft.rfft(y, size)
+            return np.moveaxis(np.fft.irfft(spectrum, size)[..., : max_lag + 1], -1, 0)
+        return np.stack(
+            [
+                (x[..., : n_dates - lag] * y[..., lag:]).sum(axis=-1)
+                for lag in range(max_lag + 1)
+            ]
+        )
+
+    def lagged_counts(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.rint(lagged_products(x.astype(float), y.astype(float))).astype(int)
+
+    lead_sign, follow_sign = np.sign(leader_values), np.sign(follower_values)
+    return {
+        "n_obs": overlap[None] - lags,
+        "sum_x": leading(leader_values),
+        "sum_y": trailing(follower_values),
+        "sum_xx": leading(leader_values * leader_values),
+        "sum_yy": trailing(follower_values * follower_values),
+        "sum_xy": lagged_products(leader_values, follower_values),
+        "agree": lagged_counts(lead_sign > 0, follow_sign > 0)
+        + lagged_counts(lead_sign < 0, follow_sign < 0),
+        "nonzero": lagged_counts(lead_sign != 0, follow_sign != 0),
+    }
+
+
+def _score_series(
+    series: np.ndarray,
+    countries: list[str],
+    allowed: np.ndarray,
+    method: str = "direct",
+) -> list[tuple[int, int, dict]]:
+    """(계열, 날짜) 배열에서 ``allowed[i, j]``인 모든 i→j 페어를 채점한다.
+
+    계열은 (국가, 섹터) 하나의 수익률이고 countries는 계열별 국가다. 규칙은
+    ``_score_sector_panel``과 같다(공통 거래일 압축, 허용 시차, 동률이면 짧은 시차).
+    leader 계열을 ``_CROSS_SECTOR_CHUNK_ELEMENTS`` 크기 묶음으로 나눠 묶음마다 모든
+    follower와의 시차별 합계를 ``_compact_lag_sums``로 한 번에 구한다.
+    """
+    n_series, n_dates = series.shape
+    max_lag = min(LEADLAG_MAX_LAG, max(n_dates - 1, 0))
+    finite = ~np.isnan(series)
+    filled = np.where(finite, series, 0.0)
+    close = np.array([_close_minutes(country) for country in countries])
+    positions = np.arange(n_dates)
+    block = max(1, _CROSS_SECTOR_CHUNK_ELEMENTS // max(n_series * n_dates, 1))
+
+    scored = []
+    for start in range(0, n_series, block):
+        leaders = np.arange(start, min(start + block, n_series))
+        if not allowed[leaders].any():
+            continue
+        pair_mask = finite[leaders][:, None, :] & finite[None, :, :]
+        overlap = pair_mask.sum(axis=2)
+        order = np.argsort(~pair_mask, axis=2, kind="stable")
+        valid = positions < overlap[:, :, None]
+        leader_values = np.where(
+            valid, np.take_along_axis(np.broadcast_to(filled[leaders][:, None, :], order.shape), order, axis=2), 0.0
+        )
+        follower_values = np.where(
+            valid, np.take_along_axis(np.broadcast_to(filled[None, :, :], order.shape), order, axis=2), 0.0
+        )
+        sums = _compact_lag_sums(leader_values, follower_values, overlap, max_lag, method)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            correlation = _sum_correlation(
+                *(sums[name] for name in ("n_obs", "sum_x", "sum_y", "sum_xx", "sum_yy", "sum_xy"))
+            )
+        min_lag = np.where(close[leaders][:, None] < close[None, :], 0, 1)
+        lags = np.arange(max_lag + 1).reshape(-1, 1, 1)
+        usable = (
+            allowed[leaders][None]
+            & (lags >= min_lag[None])
+            & (sums["n_obs"] >= LEADLAG_MIN_OVERLAP)
+            & np.isfinite(correlation)
+        )
+        rounded_abs = np.where(usable, np.abs(np.round(correlation, 4)), -1.0)
+        best_lag = rounded_abs.argmax(axis=0)  # 동률이면 앞(짧은 시차)
+
+        def pick(values: np.ndarray) -> np.ndarray:
+            return np.take_along_axis(values, best_lag[None], axis=0)[0]
+
+        for leader_index, follower_index in zip(*np.nonzero(pick(rounded_abs) >= 0)):
+            at = (slice(None), leader_index, follower_index)
+            lag = int(best_lag[leader_index, follower_index])
+            nonzero = int(sums["nonzero"][at][lag])
+            scored.append(
+                (
+                    int(leaders[leader_index]),
+                    int(follower_index),
+                    {
+                        "lag": lag,
+                        "correlation": round(float(correlation[at][lag]), 4),
+                        "direction_agreement": (
+                            round(int(sums["agree"][at][lag]) / nonzero, 4) if nonzero else None
+                        ),
+                        "n_obs": int(sums["n_obs"][at][lag]),
+                    },
+                )
+            )
+    return scored
+
+
+def score_cross_sector_panel(panel: SectorReturnPanel, method: str = "direct") -> list[dict]:
+    """다른 섹터·다른 나라로 이어지는 lead-lag 페어 점수 (date 키 제외).
+
+    (국가, 섹터) 계열 전체를 한 배열로 펼쳐 ``_score_series``로 채점한다. 같은 섹터 페어는
+    ``score_lead_lag_panel``이, 같은 나라 안의 섹터 순환은 이 가설 밖이라 뺀다.
+    |상관|이 ``LEADLAG_CROSS_SECTOR_MIN_CORRELATION`` 미만인 페어는 돌려주지 않는다.
+    """
+    if method not in LEADLAG_CROSS_SECTOR_METHODS:
+        raise ValueError(f"unknown cross-sector method: {method}")
+    if panel.empty:
+        return []
+    n_sectors, n_countries, n_dates = panel.values.shape
+    sector_of = np.repeat(np.arange(n_sectors), n_countries)
+    country_of = np.tile(np.arange(n_countries), n_sectors)
+    allowed = (sector_of[:, None] != sector_of[None, :]) & (country_of[:, None] != country_of[None, :])
+    rows = []
+    for leader, follower, scored in _score_series(
+        panel.values.reshape(n_sectors * n_countries, n_dates),
+        [panel.countries[index] for index in country_of],
+        allowed,
+        method,
+    ):
+        if abs(scored["correlation"]) < LEADLAG_CROSS_SECTOR_MIN_CORRELATION:
+            continue
+        rows.append(
+            {
+                "sector": panel.sectors[sector_of[leader]],
+                "follower_sector": panel.sectors[sector_of[follower]],
+                "leader": panel.countries[country_of[leader]],
+                "follower": panel.countries[country_of[follower]],
+                **scored,
+            }
+        )
+    return rows
+
+
+def _sum_correlation(n_obs, sum_x, sum_y, sum_xx, sum_yy, sum_xy) -> np.ndarray:
+    """합계로 구한 상관. 분산이 반올림 잔차 수준이면 NaN이다."""
+    var_x = sum_xx - sum_x * sum_x / n_obs
+    var_y = sum_yy - sum_y * sum_y / n_obs
+    correlation = (sum_xy - sum_x * sum_y / n_obs) / np.sqrt(var_x * var_y)
+    flat = (var_x <= _VARIANCE_FLOOR * sum_xx) | (var_y <= _VARIANCE_FLOOR * sum_yy)
+    return np.where(flat, np.nan, correlation)
+
+
+def _significance_inputs(panel: SectorReturnPanel, scores: list[dict]) -> dict[str, np.ndarray]:
+    """점수 행마다 공통 거래일 압축 시계열을 (페어, 위치) 배열로 쌓는다.
+
+    - leader/follower: 페어의 압축 시계열 (길이 overlap, 뒤쪽은 0)
+    - lag_ok: 페어가 점수 계산 때 고를 수 있었던 시차 (허용 범위 + 최소 관측 수)
+    - chosen_x/chosen_y: 저장된 시차로 맞춘 관측 (x[q - lag], y[q]), 길이 n_obs
+
+    섹터 교차 페어는 follower 계열을 ``follower_sector``에서 꺼낸다.
+    """
+    sector_index = {sector: index for index, sector in enumerate(panel.sectors)}
+    country_index = {country: index for index, country in enumerate(panel.countries)}
+    n_pairs, n_dates = len(scores), len(panel.dates)
+    inputs = {
+        "leader": np.zeros((n_pairs, n_dates)),
+        "follower": np.zeros((n_pairs, n_dates)),
+        "overlap": np.zeros(n_pairs, dtype=int),
+        "lag_ok": np.zeros((n_pairs, LEADLAG_MAX_LAG + 1), dtype=bool),
+        "chosen_x": np.zeros((n_pairs, n_dates)),
+        "chosen_y": np.zeros((n_pairs, n_dates)),
+        "n_obs": np.zeros(n_pairs, dtype=int),
+    }
+    for index, row in enumerate(scores):
+        leader_series = panel.values[sector_index[row["sector"]], country_index[row["leader"]]]
+        follower_series = panel.values[
+            sector_index[row.get("follower_sector") or row["sector"]], country_index[row["follower"]]
+        ]
+        common = ~np.isnan(leader_series) & ~np.isnan(follower_series)
+        leader_values, follower_values = leader_series[common], follower_series[common]
+        overlap = len(leader_values)
+        lag, n_obs = row["lag"], overlap - row["lag"]
+        inputs["leader"][index, :overlap] = leader_values
+        inputs["follower"][index, :overlap] = follower_values
+        inputs["overlap"][index] = overlap
+        for allowed in _allowed_lags(row["leader"], row["follower"]):
+            inputs["lag_ok"][index, allowed] = overlap - allowed >= LEADLAG_MIN_OVERLAP
+        inputs["chosen_x"][index, :n_obs] = leader_values[:n_obs]
+        inputs["chosen_y"][index, :n_obs] = follower_values[lag:]
+        inputs["n_obs"][index] = n_obs
+    return inputs
+
+
+def _best_abs_correlation(follower: np.ndarray, inputs: dict) -> np.ndarray:
+    """허용 시차 중 가장 큰 |상관|.
+
+    follower는 (재표본, 페어, 위치) 배열이고 페어 구간 밖은 0이다. leader 쪽 합계는
+    재표본과 무관하니 시차마다 한 번만 구하고, 재표본마다 새로 드는 것은 Σxy와
+    창 앞쪽 lag개 값뿐이다.
+    """
+    leader, overlap = inputs["leader"], inputs["overlap"]
+    n_dates = leader.shape[1]
+    positions = np.arange(n_dates)
+    sum_y = follower.sum(axis=2)
+    sum_yy = (follower * follower).sum(axis=2)
+    best = np.zeros(follower.shape[:2])
+    for lag in range(min(LEADLAG_MAX_LAG, n_dates - 1) + 1):
+        n_obs = overlap - lag
+        lead = np.where(positions[: n_dates - lag] < n_obs[:, None], leader[:, : n_dates - lag], 0.0)
+        head = follower[:, :, :lag]
+        correlation = np.abs(
+            _sum_correlation(
+                n_obs,
+                lead.sum(axis=1),
+                sum_y - head.sum(axis=2),
+                (lead * lead).sum(axis=1),
+                sum_yy - (head * head).sum(axis=2),
+                np.einsum("bpt,pt->bp", follower[:, :, lag:], lead),
+            )
+        )
+        usable = inputs["lag_ok"][:, lag] & np.isfinite(correlation)
+        best = np.where(usable & (correlation > best), correlation, best)
+    return best
+
+
+def _resample_chunk(inputs: dict, n_resamples: int, seed: np.random.SeedSequence) -> tuple:
+    """재표본 한 묶음: 순열 귀무분포가 관측값 이상인 횟수와 부트스트랩 상관들.
+
+    순열검정은 페어마다 follower 압축 시계열을 섞어 시차 정렬을 끊고, 점수 계산과 같게
+    허용 시차 중 최대 |상관|을 통계량으로 써서 시차 선택까지 귀무분포에 반영한다.
+    부트스트랩은 저장된 시차의 관측 쌍을 복원추출하고, 뽑힌 횟수를 가중치로 합계를 낸다.
+    모든 페어를 한 배열로 섞는다.
+    """
+    rng = np.random.default_rng(seed)
+    n_pairs, n_dates = inputs["leader"].shape
+    positions = np.arange(n_dates)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # 페어 구간 밖 위치는 키를 1보다 크게 둬 정렬 뒤에도 제자리(0)에 남긴다.
+        keys = rng.random((n_resamples, n_pairs, n_dates))
+        keys[:, positions[None, :] >= inputs["overlap"][:, None]] = 2.0
+        shuffled = np.take_along_axis(
+            np.broadcast_to(inputs["follower"], keys.shape), np.argsort(keys, axis=2), axis=2
+        )
+        exceed = (_best_abs_correlation(shuffled, inputs) >= inputs["observed"] - 1e-9).sum(axis=0)
+
+        # n_obs번 넘는 추출은 마지막 버림 칸(n_dates)으로 보낸다.
+        n_obs = inputs["n_obs"]
+        picks = np.minimum((rng.random(keys.shape) * n_obs[:, None]).astype(int), n_dates - 1)
+        picks = np.where(positions < n_obs[:, None], picks, n_dates)
+        offsets = np.arange(n_resamples * n_pairs).reshape(n_resamples, n_pairs, 1) * (n_dates + 1)
+        weights = np.bincount(
+            (offsets + picks).ravel(), minlength=n_resamples * n_pairs * (n_dates + 1)
+        ).reshape(n_resamples, n_pairs, n_dates + 1)[:, :, :n_dates].astype(float)
+        x, y = inputs["chosen_x"], inputs["chosen_y"]
+        bootstrap = _sum_correlation(
+            n_obs,
+            *(np.einsum("bpt,pt->bp", weights, term) for term in (x, y, x * x, y * y, x * y)),
+        )
+    return exceed, bootstrap
+
+
+_significance_worker_inputs: dict | None = None
+
+
+def _init_significance_worker(inputs: dict) -> None:
+    global _significance_worker_inputs
+    _significance_worker_inputs = inputs
+
+
+def _run_resample_chunk(n_resamples: int, seed: np.random.SeedSequence) -> tuple:
+    return _resample_chunk(_significance_worker_inputs, n_resamples, seed)
+
+
+def score_significance(
+    panel: SectorReturnPanel,
+    scores: list[dict],
+    n_resamples: int = LEADLAG_SIGNIFICANCE_RESAMPLES,
+    seed: int = 0,
+    jobs: int = LEADLAG_SIGNIFICANCE_JOBS,
+) -> list[dict]:
+    """점수 행마다 순열검정 p-value와 부트스트랩 신뢰구간을 붙여 반환한다.
+
+    panel은 점수를 계산한 창 전체다. 재표본은 페어 × 위치 원소 수에 맞춘 묶음으로
+    나눠 계산하고(묶음마다 ``seed``에서 파생한 난수열), jobs > 1이면 묶음을 프로세스
+    풀에 나눠 보낸다. 묶음 구성이 jobs와 무관해 결과도 jobs와 무관하다.
+    p-value는 (1 + 귀무 통계량 >= 관측값 횟수) / (1 + n_resamples)다.
+    """
+    if not scores or n_resamples <= 0 or panel.empty:
+        return scores
+    inputs = _significance_inputs(panel, scores)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        inputs["observed"] = _best_abs_correlation(inputs["follower"][None], inputs)[0]
+
+    chunk_size = max(1, _RESAMPLE_CHUNK_ELEMENTS // inputs["leader"].size)
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if jobs > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(sizes)),
+            initializer=_init_significance_worker,
+            initargs=(inputs,),
+        ) as executor:
+            chunks = list(executor.map(_run_resample_chunk, sizes, seeds))
+    else:
+        chunks = [_resample_chunk(inputs, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    exceed = sum(chunk[0] for chunk in chunks)
+    bootstrap = np.concatenate([chunk[1] for chunk in chunks])
+    tail = (1 - LEADLAG_CONFIDENCE_LEVEL) / 2
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # 부트스트랩이 모두 NaN인 페어
+        ci_low, ci_high = np.nanquantile(bootstrap, [tail, 1 - tail], axis=0)
+
+    rows = []
+    for index, row in enumerate(scores):
+        rows.append(
+            {
+                **row,
+                "p_value": round(float((1 + exceed[index]) / (1 + n_resamples)), 4),
+                "ci_low": round(float(ci_low[index]), 4) if np.isfinite(ci_low[index]) else None,
+                "ci_high": round(float(ci_high[index]), 4) if np.isfinite(ci_high[index]) else None,
+            }
+        )
+    return rows
+
+
+def _lag_sums(
+    leader_values: np.ndarray,
+    follower_values: np.ndarray,
+    lag: int,
+    low: np.ndarray,
+    high: np.ndarray,
+) -> np.ndarray:
+    """압축 시계열의 시차 관측 (x[q - lag], y[q]) 중 low <= q < high인 것들의 합계.
+
+    ``LEAD_LAG_STATE_SUMS`` 순서로 쌓은 (8, C, C) 배열을 반환한다.
+    """
+    n_dates = leader_values.shape[2]
+    if lag >= n_dates:
+        return np.zeros((len(LEAD_LAG_STATE_SUMS), *leader_values.shape[:2]))
+    follower_positions = np.arange(lag, n_dates)
+    valid = (follower_positions >= low[:, :, None]) & (follower_positions < high[:, :, None])
+    lead = np.where(valid, leader_values[:, :, : n_dates - lag], 0.0)
+    follow = np.where(valid, follower_values[:, :, lag:], 0.0)
+    nonzero = (lead != 0) & (follow != 0)
+    return np.stack(
+        [
+            valid.sum(axis=2),
+            lead.sum(axis=2),
+            follow.sum(axis=2),
+            (lead * lead).sum(axis=2),
+            (follow * follow).sum(axis=2),
+            (lead * follow).sum(axis=2),
+            (nonzero & (lead * follow > 0)).sum(axis=2),
+            nonzero.sum(axis=2),
+        ]
+    ).astype(float)
+
+
+def _pair_sums(
+    panel: SectorReturnPanel,
+    split: str | None = None,
+    side: str = "tail",
+) -> tuple[dict[tuple, np.ndarray], bool]:
+    """panel 구간의 (sector, leader, follower, lag)별 충분통계량.
+
+    - ``side="tail"``: follower 날짜가 split보다 뒤인 관측만 (split이 없으면 전부).
+      창에 새로 들어오는 관측이다.
+    - ``side="head"``: leader 날짜가 split보다 앞인 관측만. 창에서 빠지는 관측이다.
+
+    두 번째 값은 구간 경계 밖에 짝이 있을 수 있는 관측이 있었는지 여부다.
+    구간이 창 가장자리 일부만 읽은 것이면 호출자가 더 넓게 다시 읽는다.
+    """
+    sums: dict[tuple, np.ndarray] = {}
+    if panel.empty:
+        return sums, False
+    if split is None:
+        boundary = 0
+    else:
+        boundary = int(np.searchsorted(panel.dates, split, side="left" if side == "head" else "right"))
+
+    truncated = False
+    for sector_index, sector in enumerate(panel.sectors):
+        values = panel.values[sector_index]
+        present = ~np.isnan(values).all(axis=1)
+        sector_countries = [country for country, keep in zip(panel.countries, present) if keep]
+        if len(sector_countries) < 2:
+            continue
+        pair_mask, leader_values, follower_values = _compact_pairs(values[present])
+        overlap = pair_mask.sum(axis=2)
+        before = pair_mask[:, :, :boundary].sum(axis=2)
+        off_diagonal = ~np.eye(len(sector_countries), dtype=bool)
+        for lag in range(LEADLAG_MAX_LAG + 1):
+            if side == "head":
+                low = np.full_like(overlap, lag)
+                high = np.minimum(before + lag, overlap)
+                missing = (before > 0) & (before + lag > overlap)
+            else:
+                low = np.maximum(before, lag)
+                high = overlap
+                missing = (overlap > before) & (before < lag)
+            truncated |= bool((missing & off_diagonal).any())
+            lag_sums = _lag_sums(leader_values, follower_values, lag, low, high)
+            for leader_index, follower_index in zip(*np.nonzero((lag_sums[0] > 0) & off_diagonal)):
+                key = (sector, sector_countries[leader_index], sector_countries[follower_index], lag)
+                sums[key] = lag_sums[:, leader_index, follower_index]
+    return sums, truncated
+
+
+def _merge_sums(
+    base: dict[tuple, np.ndarray],
+    delta: dict[tuple, np.ndarray],
+    sign: int = 1,
+) -> dict[tuple, np.ndarray]:
+    for key, values in delta.items():
+        merged = base.get(key, 0.0) + sign * values
+        if merged[0] > 0:
+            base[key] = merged
+        else:
+            base.pop(key, None)
+    return base
+
+
+def _score_sums(sums: dict[tuple, np.ndarray]) -> list[dict]:
+    """누적 합계에서 페어별 최적 시차를 고른다. ``_score_pair``와 같은 규칙이다."""
+    by_pair: dict[tuple, dict[int, np.ndarray]] = {}
+    for (sector, leader, follower, lag), values in sums.items():
+        by_pair.setdefault((sector, leader, follower), {})[lag] = values
+
+    rows = []
+    for (sector, leader, follower), lags in sorted(by_pair.items()):
+        min_lag = _allowed_lags(leader, follower)[0]
+        best: dict | None = None
+        for lag in sorted(lags):
+            n_obs, sum_x, sum_y, sum_xx, sum_yy, sum_xy, agree, nonzero = lags[lag]
+            if lag < min_lag or n_obs < LEADLAG_MIN_OVERLAP:
+                continue
+            var_x = sum_xx - sum_x * sum_x / n_obs
+            var_y = sum_yy - sum_y * sum_y / n_obs
+            if var_x <= _VARIANCE_FLOOR * sum_xx or var_y <= _VARIANCE_FLOOR * sum_yy:
+                continue
+            correlation = (sum_xy - sum_x * sum_y / n_obs) / math.sqrt(var_x * var_y)
+            candidate = {
+                "lag": lag,
+                "correlation": round(float(correlation), 4),
+                "direction_agreement": round(agree / nonzero, 4) if nonzero else None,
+                "n_obs": int(n_obs),
+            }
+            if best is None or abs(candidate["correlation"]) > abs(best["correlation"]):
+                best = candidate
+        if best is not None:
+            rows.append({"sector": sector, "leader": leader, "follower": follower, **best})
+    return rows
+
+
+def _head_sums(conn, old_start: str, old_end: str, start: str) -> dict[tuple, np.ndarray]:
+    """[old_start, start) 날짜가 leader인 관측 (창에서 빠질 것)."""
+    edge_end = min(_shift_date(start, LEADLAG_STATE_EDGE_DAYS), old_end)
+    sums, truncated = _pair_sums(_load_panel_range(conn, old_start, edge_end), start, "head")
+    if truncated and edge_end < old_end:
+        sums, _ = _pair_sums(_load_panel_range(conn, old_start, old_end), start, "head")
+    return sums
+
+
+def _tail_sums(conn, start: str, old_end: str, end: str) -> dict[tuple, np.ndarray]:
+    """(old_end, end] 날짜가 follower인 관측 (창에 새로 들어올 것)."""
+    edge_start = max(_shift_date(old_end, -LEADLAG_STATE_EDGE_DAYS), start)
+    sums, truncated = _pair_sums(_load_panel_range(conn, edge_start, end), old_end, "tail")
+    if truncated and edge_start > start:
+        sums, _ = _pair_sums(_load_panel_range(conn, start, end), old_end, "tail")
+    return sums
+
+
+def _window_fingerprint(conn, start: str, end: str) -> tuple[int, float]:
+    row = conn.execute(
+        """
+        SELECT COUNT(*), TOTAL(daily_return)
+        FROM sector_performance
+        WHERE date BETWEEN ? AND ?
+          AND sector != '기타'
+          AND daily_return IS NOT NULL
+        """,
+        (start, end),
+    ).fetchone()
+    return int(row[0]), round(float(row[1]), 6)
+
+
+def _state_rebuild_reason(conn, window: dict | None, start: str, end: str) -> str | None:
+    if window is None:
+        return "상태 없음"
+    if window["max_lag"] != LEADLAG_MAX_LAG:
+        return "최대 시차 변경"
+    if start < window["start_date"] or end < window["end_date"] or start > window["end_date"]:
+        return "창 불연속"
+    fingerprint = _window_fingerprint(conn, window["start_date"], window["end_date"])
+    if fingerprint != (window["row_count"], window["return_total"]):
+        return "창 안의 과거 데이터 변경"
+    return None
+
+
+def _save_state(
+    conn,
+    sums: dict[tuple, np.ndarray],
+    start: str,
+    end: str,
+    rebuilt_at: str,
+) -> None:
+    row_count, return_total = _window_fingerprint(conn, start, end)
+    rows = []
+    for (sector, leader, follower, lag), values in sorted(sums.items()):
+        row = {"sector": sector, "leader": leader, "follower": follower, "lag": lag}
+        for name, value in zip(LEAD_LAG_STATE_SUMS, values):
+            row[name] = float(value)
+        for name in ("n_obs", "agree", "nonzero"):
+            row[name] = int(round(row[name]))
+        rows.append(row)
+    replace_lead_lag_state(
+        conn,
+        {
+            "start_date": start,
+            "end_date": end,
+            "max_lag": LEADLAG_MAX_LAG,
+            "row_count": row_count,
+            "return_total": return_total,
+            "rebuilt_at": rebuilt_at,
+            "updated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        rows,
+    )
+
+
+def rebuild_lead_lag_state(conn, date: str) -> dict[tuple, np.ndarray]:
+    """date 기준 안정 구간 전체를 다시 읽어 누적 합계 상태를 새로 만든다."""
+    start = _shift_date(date, -LEADLAG_LOOKBACK_DAYS)
+    settled = max(_shift_date(date, -LEADLAG_STATE_SETTLE_DAYS), start)
+    sums, _ = _pair_sums(_load_panel_range(conn, start, settled))
+    _save_state(conn, sums, start, settled, datetime.utcnow().isoformat(timespec="seconds"))
+    return sums
+
+
+def _incremental_scores(conn, date: str) -> list[dict]:
+    """누적 합계 상태를 date 기준 창으로 옮기고 점수를 낸다.
+
+    상태는 ``LEADLAG_STATE_SETTLE_DAYS``보다 오래된 날짜까지만 담는다. 그보다 최근은
+    시장별 수집이 늦게 도착할 수 있어 매번 가장자리만 새로 읽어 이번 점수에만 더한다.
+    상태가 없거나, 창이 이어지지 않거나, 상태에 담긴 구간의 데이터가 바뀌었으면
+    (행 수·수익률 합 지문으로 확인) 전체를 다시 만든다.
+    """
+    start = _shift_date(date, -LEADLAG_LOOKBACK_DAYS)
+    settled = max(_shift_date(date, -LEADLAG_STATE_SETTLE_DAYS), start)
+    window, state_rows = get_lead_lag_state(conn)
+
+    reason = _state_rebuild_reason(conn, window, start, settled)
+    if reason is not None:
+        logger.info(f"lead-lag 상태 재구성 ({reason}): {start} ~ {settled}")
+        sums = rebuild_lead_lag_state(conn, date)
+    else:
+        sums = {
+            (row["sector"], row["leader"], row["follower"], row["lag"]): np.array(
+                [row[name] for name in LEAD_LAG_STATE_SUMS], dtype=float
+            )
+            for row in state_rows
+        }
+        if start > window["start_date"]:
+            _merge_sums(sums, _head_sums(conn, window["start_date"], window["end_date"], start), -1)
+        if settled > window["end_date"]:
+            _merge_sums(sums, _tail_sums(conn, start, window["end_date"], settled))
+        _save_state(conn, sums, start, settled, window["rebuilt_at"])
+
+    recent = _tail_sums(conn, start, settled, date) if date > settled else {}
+    return _score_sums(_merge_sums(dict(sums), recent))
+
+
+def _score_mismatches(rows: list[dict], expected: list[dict], tolerance: float = 1e-4) -> list[tuple]:
+    """두 점수 목록에서 페어·시차·관측 수가 다르거나 값이 tolerance보다 벌어진 페어."""
+    def keyed(items):
+        return {(row["sector"], row["leader"], row["follower"]): row for row in items}
+
+    left, right = keyed(rows), keyed(expected)
+    mismatches = []
+    for key in sorted(left.keys() | right.keys()):
+        a, b = left.get(key), right.get(key)
+        if a is None or b is None or (a["lag"], a["n_obs"]) != (b["lag"], b["n_obs"]):
+            mismatches.append(key)
+            continue
+        for name in ("correlation", "direction_agreement"):
+            if (a[name] is None) != (b[name] is None) or (
+                a[name] is not None and abs(a[name] - b[name]) > tolerance
+            ):
+                mismatches.append(key)
+                break
+    return mismatches
+
+
+def compute_lead_lag_scores(
+    date: str | None = None,
+    mode: str = LEADLAG_SCORE_MODE,
+) -> list[dict]:
+    """섹터별 국가 페어 lead-lag 점수를 계산해 저장한다.
+
+    mode는 ``LEADLAG_SCORE_MODES`` 중 하나다. "full"은 창 전체를 읽어 패널 엔진으로
+    다시 계산하고, "verify"는 누적 상태 결과를 전체 재계산과 비교해 어긋나면
+    경고를 남기고 상태를 다시 만든 뒤 전체 재계산 결과를 저장한다.
+    ``LEADLAG_SIGNIFICANCE_RESAMPLES``가 0보다 크면 페어마다 p-value와 신뢰구간을 붙인다.
+    """
+    if mode not in LEADLAG_SCORE_MODES:
+        raise ValueError(f"unknown lead-lag score mode: {mode}")
     init_db()
     conn = get_connection()
     try:
@@ -151,37 +945,86 @@ def compute_lead_lag_scores(date: str | None = None) -> list[dict]:
             logger.warning("lead-lag 계산 불가: 섹터 성과 데이터 없음")
             return []
 
-        history = _load_return_history(conn, date)
-        if history.empty:
+        panel = None
+        if mode == "full":
+            panel = _load_lookback_panel(conn, date)
+            scores = score_lead_lag_panel(panel)
+        else:
+            with summary_write(conn):
+                scores = _incremental_scores(conn, date)
+            if mode == "verify":
+                panel = _load_lookback_panel(conn, date)
+                expected = score_lead_lag_panel(panel)
+                mismatches = _score_mismatches(scores, expected)
+                if mismatches:
+                    logger.warning(
+                        f"lead-lag 상태 검증 실패: {len(mismatches)}개 페어 불일치 "
+                        f"(예: {mismatches[0]}), 상태를 다시 만든다"
+                    )
+                    with summary_write(conn):
+                        rebuild_lead_lag_state(conn, date)
+                else:
+                    logger.info(f"lead-lag 상태 검증 통과: {len(expected)}개 페어")
+                scores = expected
+
+        if not scores:
             logger.warning(f"lead-lag 계산 불가: {date} 기준 데이터 없음")
             return []
 
-        score_rows: list[dict] = []
-        for sector, sector_frame in history.groupby("sector"):
-            pivot = sector_frame.pivot_table(
-                index="date",
-                columns="country",
-                values="daily_return",
-            ).sort_index()
-            countries = [c for c in pivot.columns if pivot[c].notna().sum() >= LEADLAG_MIN_OVERLAP]
-            for leader, follower in permutations(countries, 2):
-                scored = _score_pair(pivot, leader, follower)
-                if scored is None:
-                    continue
-                score_rows.append(
-                    {
-                        "date": date,
-                        "sector": sector,
-                        "leader": leader,
-                        "follower": follower,
-                        **scored,
-                    }
-                )
+        if LEADLAG_SIGNIFICANCE_RESAMPLES > 0:
+            # 재표본에는 원 시계열이 필요해 누적 상태 모드에서도 창 패널을 꺼낸다.
+            if panel is None:
+                panel = _load_lookback_panel(conn, date)
+            scores = score_significance(
+                panel,
+                scores,
+                n_resamples=LEADLAG_SIGNIFICANCE_RESAMPLES,
+                seed=int(date.replace("-", "")),
+                jobs=LEADLAG_SIGNIFICANCE_JOBS,
+            )
 
-        if score_rows:
+        score_rows = [{"date": date, **row} for row in scores]
+        with summary_write(conn):
             upsert_lead_lag_scores(conn, score_rows)
-            conn.commit()
-            logger.info(f"lead-lag 점수 저장: {len(score_rows)}개 페어 ({date})")
+        logger.info(f"lead-lag 점수 저장: {len(score_rows)}개 페어 ({date}, {mode})")
+        return score_rows
+    finally:
+        conn.close()
+
+
+def compute_cross_sector_scores(
+    date: str | None = None,
+    method: str = "direct",
+) -> list[dict]:
+    """다른 섹터로 이어지는 lead-lag 점수를 계산해 그날의 교차 페어를 교체 저장한다.
+
+    창 패널 전체를 ``score_cross_sector_panel``로 채점하고, 유의성 단계는 같은 섹터
+    페어와 같은 설정으로 붙인다. 교차 페어는 아직 흐름 시그널로 만들지 않는다.
+    """
+    if method not in LEADLAG_CROSS_SECTOR_METHODS:
+        raise ValueError(f"unknown cross-sector method: {method}")
+    init_db()
+    conn = get_connection()
+    try:
+        date = _resolve_analysis_date(conn, date)
+        if date is None:
+            return []
+
+        panel = _load_lookback_panel(conn, date)
+        scores = score_cross_sector_panel(panel, method=method)
+        if scores and LEADLAG_SIGNIFICANCE_RESAMPLES > 0:
+            scores = score_significance(
+                panel,
+                scores,
+                n_resamples=LEADLAG_SIGNIFICANCE_RESAMPLES,
+                seed=int(date.replace("-", "")),
+                jobs=LEADLAG_SIGNIFICANCE_JOBS,
+            )
+
+        score_rows = [{"date": date, **row} for row in scores]
+        with summary_write(conn):
+            replace_cross_sector_lead_lag_scores(conn, date, score_rows)
+        logger.info(f"섹터 교차 lead-lag 점수 저장: {len(score_rows)}개 페어 ({date}, {method})")
         return score_rows
     finally:
         conn.close()
@@ -192,6 +1035,7 @@ def generate_flow_signals(date: str | None = None) -> list[dict]:
 
     예측 가능해야 하므로 lag >= 1 관계만 사용한다. lag 0(같은 날 추종)은
     리포트 시점에 이미 실현돼 있어 검증 대상이 아니다.
+    p-value가 있는 페어는 ``LEADLAG_MAX_P_VALUE`` 이하인 것만 쓴다.
     """
     init_db()
     conn = get_connection()
@@ -208,6 +1052,7 @@ def generate_flow_signals(date: str | None = None) -> list[dict]:
             and row["correlation"] is not None
             and row["correlation"] >= LEADLAG_MIN_CORRELATION
             and (row["n_obs"] or 0) >= LEADLAG_MIN_OVERLAP
+            and (row["p_value"] is None or row["p_value"] <= LEADLAG_MAX_P_VALUE)
         ]
         if not candidates:
             return []
@@ -247,8 +1092,8 @@ def generate_flow_signals(date: str | None = None) -> list[dict]:
             )
 
         if signal_rows:
-            upsert_flow_signals(conn, signal_rows)
-            conn.commit()
+            with summary_write(conn):
+                upsert_flow_signals(conn, signal_rows)
             logger.info(f"flow signal 생성: {len(signal_rows)}개 ({date})")
         return signal_rows
     finally:
@@ -256,73 +1101,86 @@ def generate_flow_signals(date: str | None = None) -> list[dict]:
 
 
 def verify_flow_signals() -> dict:
-    """후행국 데이터가 도착한 pending 시그널을 채점한다."""
+    """후행국 데이터가 도착한 pending 시그널을 채점한다.
+
+    pending 시그널 전체를 쿼리 한 번으로 후행국의 lag번째 다음 거래일과 맞추고,
+    적중 채점과 만료(``LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS`` 경과)를 UPDATE 한 번으로 반영한다.
+    """
     init_db()
     conn = get_connection()
-    verified = 0
-    expired = 0
     try:
-        pending = get_flow_signals(conn, status="pending")
-        today = datetime.utcnow().date()
-        for signal in pending:
-            target_offset = max(int(signal.get("lag") or 1) - 1, 0)
-            outcome = conn.execute(
-                """
-                SELECT date, daily_return
-                FROM sector_performance
-                WHERE country = ? AND sector = ? AND date > ?
-                ORDER BY date ASC
-                LIMIT 1 OFFSET ?
-                """,
-                (
-                    signal["follower"],
-                    signal["sector"],
-                    signal["created_date"],
-                    target_offset,
-                ),
-            ).fetchone()
-
-            if outcome is not None and outcome["daily_return"] is not None:
-                follower_return = float(outcome["daily_return"])
-                hit = int(follower_return * signal["predicted_direction"] > 0)
-                resolve_flow_signal(
-                    conn,
-                    signal["id"],
-                    status="verified",
-                    target_date=outcome["date"],
-                    follower_return=follower_return,
-                    hit=hit,
-                )
-                verified += 1
-                continue
-
-            try:
-                created = datetime.strptime(
-                    signal["created_date"], "%Y-%m-%d"
-                ).date()
-            except ValueError:
-                continue
-            if (today - created).days > LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS:
-                resolve_flow_signal(conn, signal["id"], status="expired")
-                expired += 1
-
-        if verified or expired:
-            conn.commit()
+        expire_before = (
+            datetime.utcnow().date() - timedelta(days=LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS)
+        ).isoformat()
+        with summary_write(conn):
+            outcome = resolve_pending_flow_signals(conn, expire_before)
+        if outcome["verified"] or outcome["expired"]:
             logger.info(
-                f"flow signal 채점: verified={verified}, expired={expired}"
+                f"flow signal 채점: verified={outcome['verified']}, expired={outcome['expired']}"
             )
-        return {"verified": verified, "expired": expired}
+        return outcome
     finally:
         conn.close()
 
 
-def update_lead_lag(date: str | None = None) -> dict:
-    """일일 파이프라인 진입점: 채점 → 점수 갱신 → 신규 시그널 생성."""
+def affected_lead_lag_dates(conn, dirty_dates: list[str], report_date: str | None) -> list[str]:
+    """lookback 창에 dirty_dates 중 하나라도 들어가는 lead-lag 기준일.
+
+    점수가 저장된 기준일과 report_date가 후보다. 기준일 d의 창은
+    [d - ``LEADLAG_LOOKBACK_DAYS``, d]라 그보다 오래된 변경은 d에 영향이 없다.
+    """
+    if not dirty_dates:
+        return []
+    dirty_dates = sorted(dirty_dates)
+    candidates = set(
+        get_lead_lag_score_dates(
+            conn, dirty_dates[0], _shift_date(dirty_dates[-1], LEADLAG_LOOKBACK_DAYS)
+        )
+    )
+    if report_date is not None:
+        candidates.add(report_date)
+    return sorted(
+        date
+        for date in candidates
+        if bisect.bisect_right(dirty_dates, date)
+        > bisect.bisect_left(dirty_dates, _shift_date(date, -LEADLAG_LOOKBACK_DAYS))
+    )
+
+
+def rescore_lead_lag_dates(dates: list[str], cross_sector: str = LEADLAG_CROSS_SECTOR) -> int:
+    """지난 기준일들의 점수를 창 전체로 다시 계산한다 (늦게 도착한 데이터 반영).
+
+    누적 상태는 리포트 날짜 기준이라 건드리지 않고("full"), 이미 지난 날짜의
+    시그널은 다시 만들지 않는다. 다시 저장한 페어 수를 반환한다.
+    """
+    pairs = 0
+    for date in dates:
+        pairs += len(compute_lead_lag_scores(date=date, mode="full"))
+        if cross_sector != "off":
+            pairs += len(compute_cross_sector_scores(date=date, method=cross_sector))
+    return pairs
+
+
+def update_lead_lag(
+    date: str | None = None,
+    mode: str = LEADLAG_SCORE_MODE,
+    cross_sector: str = LEADLAG_CROSS_SECTOR,
+) -> dict:
+    """일일 파이프라인 진입점: 채점 → 점수 갱신 → 신규 시그널 생성.
+
+    cross_sector가 "off"가 아니면 그 방식으로 섹터 교차 점수도 갱신한다.
+    """
     outcomes = verify_flow_signals()
-    scores = compute_lead_lag_scores(date=date)
+    scores = compute_lead_lag_scores(date=date, mode=mode)
+    cross_scores = (
+        compute_cross_sector_scores(date=date, method=cross_sector)
+        if cross_sector != "off"
+        else []
+    )
     signals = generate_flow_signals(date=date)
     return {
         "outcomes": outcomes,
         "pairs_scored": len(scores),
+        "cross_sector_pairs": len(cross_scores),
         "signals_created": len(signals),
     }
@@ -11,6 +11,7 @@ from telegram import Bot
 from src.collection_status import get_failure_label
 from src.config import (
     COUNTRIES,
+    REPORT_DB_PROFILE,
     STATUS_STALE_AFTER_DAYS,
     TELEGRAM_ALERT_CHAT_ID,
     TELEGRAM_BOT_TOKEN,
@@ -44,7 +45,7 @@ def get_operational_status(
     """Build an operational health snapshot from collection logs and DB dates."""
     reference_date = _parse_date(as_of_date) or datetime.utcnow().date()
 
-    conn = get_connection()
+    conn = get_connection(REPORT_DB_PROFILE)
     try:
         latest_dates = get_latest_sector_dates_by_country(conn)
         recent_failures = get_recent_collection_logs(conn, limit=5, status="failed")
@@ -0,0 +1,118 @@
+"""섹터 수익률 패널 (섹터 × 국가 × 거래일) 캐시.
+
+``sector_return_panel`` 테이블은 ``sector_performance``의 daily_return을 (섹터, 거래일)
+행 × 국가 열로 펼친 복사본이고, 트리거가 쓰기마다 갱신한다. 여기서는 그 테이블을
+NumPy 배열로 한 번 읽어 두고, DB의 ``data_revision``이 바뀔 때만 다시 읽는다.
+lead-lag 점수·유의성·백테스트는 날짜 구간을 잘라 쓰기만 하고 다시 pivot하지 않는다.
+
+- 거래일 축은 어느 섹터든 한 나라라도 값이 있는 날짜다. 시장별 거래일이 달라 생기는
+  빈칸은 NaN이다.
+- '기타' 섹터는 분석 대상이 아니라 읽지 않는다.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.database import SECTOR_PANEL_COUNTRIES, get_data_revision, get_sector_return_panel_rows
+
+
+@dataclass(frozen=True)
+class SectorReturnPanel:
+    sectors: list[str]
+    countries: list[str]
+    dates: np.ndarray
+    values: np.ndarray  # 섹터×국가×날짜, 없는 값은 NaN
+
+    @property
+    def empty(self) -> bool:
+        return not len(self.dates)
+
+    def window(self, start_date: str | None = None, end_date: str | None = None) -> SectorReturnPanel:
+        """[start_date, end_date] 거래일만 자른 패널 (배열은 원본의 view)."""
+        low = np.searchsorted(self.dates, start_date, side="left") if start_date else 0
+        high = np.searchsorted(self.dates, end_date, side="right") if end_date else len(self.dates)
+        return SectorReturnPanel(self.sectors, self.countries, self.dates[low:high], self.values[:, :, low:high])
+
+    @classmethod
+    def from_history(cls, history: pd.DataFrame) -> SectorReturnPanel:
+        """(date, country, sector, daily_return) 행 목록을 패널로 쌓는다. 합성 데이터용."""
+        if history.empty:
+            return _EMPTY_PANEL
+        pivot = history.pivot_table(
+            index="date",
+            columns=["sector", "country"],
+            values="daily_return",
+        ).sort_index()
+        sectors = sorted(pivot.columns.get_level_values(0).unique())
+        countries = sorted(pivot.columns.get_level_values(1).unique())
+        pivot = pivot.reindex(columns=pd.MultiIndex.from_product([sectors, countries]))
+        values = pivot.to_numpy(dtype=float).T.reshape(len(sectors), len(countries), len(pivot))
+        return cls(sectors, countries, pivot.index.to_numpy(), values)
+
+
+_EMPTY_PANEL = SectorReturnPanel([], [], np.array([], dtype=object), np.empty((0, 0, 0)))
+
+# DB 파일 → (리비전 키, 패널). 파일마다 최신 하나만 둔다.
+_panel_cache: dict[str, tuple[tuple, SectorReturnPanel]] = {}
+_panel_cache_lock = threading.Lock()
+
+
+def _revision_key(conn) -> tuple:
+    """연결에 붙은 DB 파일별 (이름, 경로, inode, data_revision).
+
+    얼린 연도 샤드가 붙어 있으면 함께 들어간다. summary import처럼 파일을 통째로
+    바꾸면 리비전이 우연히 같을 수 있어 inode도 본다.
+    """
+    key = []
+    for _, name, path in conn.execute("PRAGMA database_list").fetchall():
+        if name == "temp":
+            continue
+        inode = os.stat(path).st_ino if path else None
+        key.append((name, path, inode, get_data_revision(conn, schema=name)))
+    return tuple(key)
+
+
+def _build_panel(rows: list[tuple]) -> SectorReturnPanel:
+    if not rows:
+        return _EMPTY_PANEL
+    sectors, sector_index = np.unique([row[0] for row in rows], return_inverse=True)
+    dates, date_index = np.unique([row[1] for row in rows], return_inverse=True)
+    cells = np.array([row[2:] for row in rows], dtype=float)  # None → NaN
+    values = np.full((len(sectors), len(SECTOR_PANEL_COUNTRIES), len(dates)), np.nan)
+    values[sector_index, :, date_index] = cells
+    return SectorReturnPanel(
+        [str(sector) for sector in sectors],
+        list(SECTOR_PANEL_COUNTRIES),
+        dates.astype(object),
+        values,
+    )
+
+
+def load_sector_return_panel(conn) -> SectorReturnPanel:
+    """연결이 보는 ``sector_return_panel`` 전체를 배열로 반환한다.
+
+    DB 파일의 ``data_revision``이 지난 읽기와 같으면 캐시된 배열을 그대로 돌려준다.
+    ``open_summary_range`` 연결이면 붙은 연도 샤드까지 합친 패널이다.
+    반환된 배열은 공유되므로 호출자가 고치면 안 된다.
+    """
+    key = _revision_key(conn)
+    with _panel_cache_lock:
+        cached = _panel_cache.get(key[0][1])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    panel = _build_panel(get_sector_return_panel_rows(conn))
+    panel.values.setflags(write=False)
+    with _panel_cache_lock:
+        _panel_cache[key[0][1]] = (key, panel)
+    return panel
+
+
+def clear_sector_return_panel_cache() -> None:
+    with _panel_cache_lock:
+        _panel_cache.clear()
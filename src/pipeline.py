@@ -0,0 +1,294 @@
+"""리포트용 파생 데이터 DAG.
+
+파생 테이블 하나가 노드 하나다. 노드는 자기가 읽는 입력 행 집합을 (SQL, 파라미터)
+목록으로 선언하고, 러너는 실행 전에 그 행들과 설정값을 해시한 fingerprint를 만든다.
+
+- 같은 리포트 날짜에서 지난 실행과 fingerprint가 같으면 노드를 건너뛴다.
+- 의존 노드가 끝나야 fingerprint를 계산하므로, 앞 노드가 쓴 행(예: 점수 → 시그널)도
+  입력으로 반영된다.
+- 서로 의존하지 않는 노드(트렌드 스코어, lead-lag 점수, 시그널 채점)는 스레드로
+  동시에 돌린다. 노드마다 자기 연결을 쓰고 WAL이라 읽기는 서로 막지 않는다.
+  계산은 병렬이고 쓰기는 ``database.summary_write``로 한 번에 한 스레드씩 한다.
+  다른 프로세스와 겹치는 쓰기는 프로파일의 ``busy_timeout_ms``만큼 기다린다.
+- 노드별 상태·fingerprint·소요 시간은 summary DB ``derived_node_runs``에 남는다
+  (``python -m scripts.report --show-runs``로 확인).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable
+
+from src import analyzer, leadlag
+from src.config import (
+    LEADLAG_CONFIDENCE_LEVEL,
+    LEADLAG_CROSS_SECTOR_MIN_CORRELATION,
+    LEADLAG_LOOKBACK_DAYS,
+    LEADLAG_MAX_LAG,
+    LEADLAG_MAX_P_VALUE,
+    LEADLAG_MIN_CORRELATION,
+    LEADLAG_MIN_OVERLAP,
+    LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS,
+    LEADLAG_SIGNAL_MIN_LEADER_MOVE,
+    LEADLAG_SIGNIFICANCE_RESAMPLES,
+    REPORT_PIPELINE_JOBS,
+    TREND_WEIGHT_BREADTH,
+    TREND_WEIGHT_MOMENTUM,
+    TREND_WEIGHT_RETURN,
+)
+from src.database import (
+    get_connection,
+    get_derived_node_fingerprint,
+    init_db,
+    record_derived_node_run,
+    summary_write,
+)
+
+logger = logging.getLogger(__name__)
+
+PANEL_WINDOW_QUERY = """
+    SELECT * FROM sector_return_panel
+    WHERE date BETWEEN ? AND ?
+    ORDER BY sector, date
+"""
+
+SECTOR_DATES_QUERY = """
+    SELECT date, country, sector, daily_return, weekly_return
+    FROM sector_performance
+    WHERE date IN ({placeholders})
+    ORDER BY date, country, sector
+"""
+
+PENDING_SIGNAL_INPUTS_QUERY = """
+    SELECT s.id, s.created_date, s.sector, s.follower, s.lag, p.date, p.daily_return
+    FROM flow_signals s
+    LEFT JOIN sector_performance p
+        ON p.country = s.follower AND p.sector = s.sector AND p.date > s.created_date
+    WHERE s.status = 'pending'
+    ORDER BY s.id, p.date
+"""
+
+SIGNAL_SCORES_QUERY = """
+    SELECT sector, leader, follower, lag, correlation, n_obs, p_value
+    FROM lead_lag_scores
+    WHERE date = ? AND follower_sector = sector
+    ORDER BY sector, leader, follower
+"""
+
+SIGNAL_LEADER_MOVES_QUERY = """
+    SELECT country, sector, daily_return
+    FROM sector_performance
+    WHERE date = ?
+    ORDER BY country, sector
+"""
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    run: Callable[[], object]
+    inputs: Callable[[], list[tuple[str, tuple]]]  # 읽는 행 집합 (SQL, 파라미터) 목록
+    params: tuple = ()  # 결과에 영향을 주는 설정값
+    deps: tuple[str, ...] = ()
+
+
+def fingerprint_inputs(conn, node: Node) -> str:
+    """노드 입력 행과 설정값의 SHA-256."""
+    digest = hashlib.sha256(repr(node.params).encode("utf-8"))
+    for sql, params in node.inputs():
+        digest.update(b"\x1e")
+        for row in conn.execute(sql, params):
+            digest.update(repr(tuple(row)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _run_node(node: Node, key: str, force: bool) -> dict:
+    conn = get_connection()
+    try:
+        started = time.perf_counter()
+        fingerprint = fingerprint_inputs(conn, node)
+        fingerprint_seconds = time.perf_counter() - started
+
+        run_seconds = 0.0
+        status = "skipped"
+        if force or get_derived_node_fingerprint(conn, key, node.name) != fingerprint:
+            started = time.perf_counter()
+            node.run()
+            run_seconds = time.perf_counter() - started
+            status = "ran"
+            # 자기 입력을 바꾸는 노드(시그널 채점)도 다음 실행에서 건너뛸 수 있게 실행 뒤 값을 남긴다
+            fingerprint = fingerprint_inputs(conn, node)
+
+        row = {
+            "date": key,
+            "node": node.name,
+            "fingerprint": fingerprint,
+            "status": status,
+            "run_seconds": round(run_seconds, 4),
+            "fingerprint_seconds": round(fingerprint_seconds, 4),
+            "updated_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        with summary_write(conn):
+            record_derived_node_run(conn, row)
+        logger.info(
+            f"[{node.name}] {status} (실행 {run_seconds:.2f}s, fingerprint {fingerprint_seconds:.3f}s)"
+        )
+        return row
+    finally:
+        conn.close()
+
+
+def run_nodes(
+    nodes: list[Node],
+    key: str,
+    jobs: int = REPORT_PIPELINE_JOBS,
+    force: bool = False,
+) -> list[dict]:
+    """의존 순서대로 노드를 돌리고 노드별 실행 기록을 끝난 순서로 반환한다.
+
+    key(리포트 날짜)마다 노드의 지난 fingerprint와 비교한다. force면 모두 실행한다.
+    노드가 실패하면 이미 시작한 노드가 끝나길 기다린 뒤 예외를 그대로 올린다.
+    """
+    by_name = {node.name: node for node in nodes}
+    for node in nodes:
+        unknown = set(node.deps) - set(by_name)
+        if unknown:
+            raise ValueError(f"node {node.name} depends on unknown nodes: {sorted(unknown)}")
+
+    init_db()
+    waiting = dict(by_name)
+    done: set[str] = set()
+    results = []
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        running = {}
+        while waiting or running:
+            for name, node in list(waiting.items()):
+                if set(node.deps) <= done:
+                    del waiting[name]
+                    running[pool.submit(_run_node, node, key, force)] = name
+            if not running:
+                raise ValueError(f"dependency cycle among nodes: {sorted(waiting)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                results.append(future.result())
+                done.add(name)
+    return results
+
+
+def _shift(date: str, days: int) -> str:
+    return (datetime.strptime(date, "%Y-%m-%d") + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _lead_lag_params(*extra) -> tuple:
+    return (
+        LEADLAG_LOOKBACK_DAYS,
+        LEADLAG_MAX_LAG,
+        LEADLAG_MIN_OVERLAP,
+        LEADLAG_SIGNIFICANCE_RESAMPLES,
+        LEADLAG_CONFIDENCE_LEVEL,
+        *extra,
+    )
+
+
+def report_nodes(
+    date: str | None,
+    trend_dates: list[str],
+    past_lead_lag_dates: list[str],
+    score_report_date: bool,
+    mode: str,
+    cross_sector: str,
+) -> list[Node]:
+    """리포트 준비 DAG.
+
+    trend_dates의 트렌드 스코어, 지난 기준일 lead-lag 재채점, 시그널 채점은 늘 후보다.
+    score_report_date면 리포트 날짜의 lead-lag 점수(·교차 점수)와 그 점수로 만드는
+    시그널을 더한다. 시그널 생성은 점수와 채점이 끝난 뒤에 돈다.
+    """
+    nodes = []
+    if trend_dates:
+        trend_dates = sorted(trend_dates)
+        nodes.append(
+            Node(
+                "trend_scores",
+                run=lambda: analyzer.compute_trend_scores_range(
+                    trend_dates[0], trend_dates[-1], dates=set(trend_dates)
+                ),
+                inputs=lambda: [
+                    (
+                        SECTOR_DATES_QUERY.format(placeholders=", ".join("?" for _ in trend_dates)),
+                        tuple(trend_dates),
+                    )
+                ],
+                params=(TREND_WEIGHT_RETURN, TREND_WEIGHT_BREADTH, TREND_WEIGHT_MOMENTUM),
+            )
+        )
+    if past_lead_lag_dates:
+        past = sorted(past_lead_lag_dates)
+        nodes.append(
+            Node(
+                "lead_lag_history",
+                run=lambda: leadlag.rescore_lead_lag_dates(past, cross_sector=cross_sector),
+                inputs=lambda: [
+                    (PANEL_WINDOW_QUERY, (_shift(past[0], -LEADLAG_LOOKBACK_DAYS), past[-1]))
+                ],
+                params=_lead_lag_params(tuple(past), cross_sector),
+            )
+        )
+
+    expire_before = (
+        datetime.utcnow().date() - timedelta(days=LEADLAG_SIGNAL_EXPIRE_AFTER_DAYS)
+    ).isoformat()
+    nodes.append(
+        Node(
+            "flow_verification",
+            run=leadlag.verify_flow_signals,
+            inputs=lambda: [(PENDING_SIGNAL_INPUTS_QUERY, ())],
+            params=(expire_before,),
+        )
+    )
+    if not (score_report_date and date):
+        return nodes
+
+    window = (_shift(date, -LEADLAG_LOOKBACK_DAYS), date)
+    nodes.append(
+        Node(
+            "lead_lag_scores",
+            run=lambda: leadlag.compute_lead_lag_scores(date=date, mode=mode),
+            inputs=lambda: [(PANEL_WINDOW_QUERY, window)],
+            params=_lead_lag_params(date, mode),
+        )
+    )
+    if cross_sector != "off":
+        nodes.append(
+            Node(
+                "cross_sector_scores",
+                run=lambda: leadlag.compute_cross_sector_scores(date=date, method=cross_sector),
+                inputs=lambda: [(PANEL_WINDOW_QUERY, window)],
+                params=_lead_lag_params(date, cross_sector, LEADLAG_CROSS_SECTOR_MIN_CORRELATION),
+            )
+        )
+    nodes.append(
+        Node(
+            "flow_signals",
+            run=lambda: leadlag.generate_flow_signals(date=date),
+            inputs=lambda: [
+                (SIGNAL_SCORES_QUERY, (date,)),
+                (SIGNAL_LEADER_MOVES_QUERY, (date,)),
+            ],
+            params=(
+                date,
+                LEADLAG_MIN_CORRELATION,
+                LEADLAG_MIN_OVERLAP,
+                LEADLAG_MAX_P_VALUE,
+                LEADLAG_SIGNAL_MIN_LEADER_MOVE,
+            ),
+            deps=("lead_lag_scores", "flow_verification"),
+        )
+    )
+    return nodes
@@ -0,0 +1,250 @@
+"""리포트 한 기준일의 데이터 스냅샷.
+
+``ReportContext``는 리포트 날짜 하나에 필요한 summary DB 행을 한 읽기 트랜잭션에서
+테이블당 한 번씩 읽어 메모리 인덱스로 들고 있다. ``src/reporter.py``의 ``format_*``
+함수는 모두 여기서만 읽는다.
+
+- 섹터 행의 ``top_gainers``/``top_losers`` JSON은 읽을 때 한 번만 파싱한다.
+- 관심 종목 스냅샷은 (국가, 티커) 목록으로 한 번에 읽는다.
+- 시그널 스코어보드 통계는 검증된 시그널 행에서 메모리로 집계한다.
+- ``get_report_context``는 DB 파일의 ``data_revision('report')``와 inode, watchlist가
+  지난 읽기와 같으면 캐시된 컨텍스트를 돌려준다. 리포트가 읽는 테이블의 쓰기
+  헬퍼가 쓰기마다 리비전을 한 번 올리므로 봇은 DB가 바뀔 때까지 한 컨텍스트를 재사용한다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.config import REPORT_DB_PROFILE
+from src.database import (
+    get_abnormal_stocks,
+    get_connection,
+    get_data_revision,
+    get_latest_benchmarks,
+    get_latest_sector_dates_by_country,
+    get_latest_sector_performance,
+    get_lead_lag_scores,
+    get_report_flow_signals,
+    get_stock_lead_lag_scores,
+    get_universe_snapshots,
+    table_exists,
+)
+from src.watchlist import WatchItem, load_watchlist
+
+_CONTEXT_CACHE_SIZE = 8
+
+_context_cache: dict[tuple, tuple[tuple, ReportContext]] = {}
+_context_cache_lock = threading.Lock()
+
+
+def _parse_stock_list(value) -> list[dict]:
+    if not value:
+        return []
+    try:
+        return json.loads(value) if isinstance(value, str) else value
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+@dataclass
+class ReportContext:
+    date: str
+    requested_date: bool  # 날짜를 지정해 읽었는지 (최신 날짜면 데이터 품질 경고를 붙인다)
+    data_version: int  # 읽을 때의 data_revision('report'), 마이그레이션 전 DB면 0
+    sector_rows: list[dict]  # country, daily_return DESC 순
+    trend_rows: list[dict]  # trend_score DESC 순
+    benchmarks: dict[tuple[str, str | None], dict]
+    latest_dates: dict[str, str]
+    abnormals: list[dict]
+    has_flow_signals: bool
+    flow_signals: list[dict]  # 검증된 시그널 전체 + 기준일 대기 시그널
+    has_lead_lag: bool
+    lead_lag_pairs: list[dict]
+    cross_sector_pairs: list[dict]
+    stock_pairs: list[dict]
+    watch_items: list[WatchItem]
+    watch_snapshots: dict[tuple[str, str], dict]
+    by_country: dict[str, list[dict]] = field(init=False, repr=False)
+    by_sector: dict[str, list[dict]] = field(init=False, repr=False)
+    _sector_lookup: dict[tuple[str, str], dict] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.by_country = defaultdict(list)
+        by_sector = defaultdict(list)
+        self._sector_lookup = {}
+        for row in self.sector_rows:
+            self.by_country[row["country"]].append(row)
+            by_sector[row["sector"]].append(row)
+            self._sector_lookup.setdefault((row["country"], row["sector"]), row)
+        # SECTOR_DETAIL_QUERY 순서: daily_return DESC, NULL은 마지막
+        self.by_sector = {
+            sector: sorted(
+                rows,
+                key=lambda row: (row["daily_return"] is None, -(row["daily_return"] or 0)),
+            )
+            for sector, rows in by_sector.items()
+        }
+
+    def sector_row(self, country: str, sector: str | None) -> dict | None:
+        if not sector:
+            return None
+        return self._sector_lookup.get((country, sector))
+
+    def pending_signals(self, limit: int | None = None) -> list[dict]:
+        rows = [
+            row
+            for row in self.flow_signals
+            if row["status"] == "pending" and row["created_date"] == self.date
+        ]
+        return rows[:limit]
+
+    def verified_signals(self, limit: int | None = None) -> list[dict]:
+        return [row for row in self.flow_signals if row["status"] == "verified"][:limit]
+
+    def signal_stats(self, since_date: str | None = None) -> dict:
+        """``get_flow_signal_stats``와 같은 집계를 메모리에서 계산한다."""
+        rows = [
+            row
+            for row in self.flow_signals
+            if row["status"] == "verified"
+            and (not since_date or row["created_date"] >= since_date)
+        ]
+        up = [row for row in rows if (row["predicted_direction"] or 0) > 0]
+        down = [row for row in rows if (row["predicted_direction"] or 0) < 0]
+        hits = sum(row["hit"] or 0 for row in rows)
+        return {
+            "total": len(rows),
+            "hits": hits,
+            "hit_rate": hits / len(rows) if rows else None,
+            "up_total": len(up),
+            "up_hits": sum(row["hit"] or 0 for row in up),
+            "down_total": len(down),
+            "down_hits": sum(row["hit"] or 0 for row in down),
+        }
+
+
+def _resolve_report_date(conn, date: str | None) -> str:
+    if date is not None:
+        return date
+
+    row = conn.execute("SELECT MAX(date) FROM sector_performance").fetchone()
+    return row[0] if row and row[0] else datetime.utcnow().strftime("%Y-%m-%d")
+
+
+def _read_context(conn, date: str | None, watch_items: list[WatchItem]) -> ReportContext:
+    report_date = _resolve_report_date(conn, date)
+
+    sector_rows = get_latest_sector_performance(conn, date=report_date)
+    for row in sector_rows:
+        row["top_gainers"] = _parse_stock_list(row.get("top_gainers"))
+        row["top_losers"] = _parse_stock_list(row.get("top_losers"))
+
+    trend_rows = [
+        dict(row)
+        for row in conn.execute(
+            """
+            SELECT sector, trend_score, countries_positive, countries_negative,
+                   global_avg_return, momentum_signal
+            FROM trend_scores
+            WHERE date = ?
+            ORDER BY trend_score DESC
+            """,
+            (report_date,),
+        ).fetchall()
+    ]
+
+    has_flow_signals = table_exists(conn, "flow_signals")
+    has_lead_lag = table_exists(conn, "lead_lag_scores")
+    has_stock_pairs = table_exists(conn, "stock_lead_lag_scores")
+    return ReportContext(
+        date=report_date,
+        requested_date=date is not None,
+        data_version=get_data_revision(conn, "report"),
+        sector_rows=sector_rows,
+        trend_rows=trend_rows,
+        benchmarks={
+            (row["country"], row["sector"]): row
+            for row in get_latest_benchmarks(conn, date=report_date)
+        },
+        latest_dates=get_latest_sector_dates_by_country(conn),
+        abnormals=get_abnormal_stocks(conn, date=report_date),
+        has_flow_signals=has_flow_signals,
+        flow_signals=get_report_flow_signals(conn, report_date) if has_flow_signals else [],
+        has_lead_lag=has_lead_lag,
+        lead_lag_pairs=get_lead_lag_scores(conn, date=report_date) if has_lead_lag else [],
+        cross_sector_pairs=(
+            get_lead_lag_scores(conn, date=report_date, cross_sector=True) if has_lead_lag else []
+        ),
+        stock_pairs=get_stock_lead_lag_scores(conn, date=report_date) if has_stock_pairs else [],
+        watch_items=watch_items,
+        watch_snapshots=get_universe_snapshots(
+            conn, [(item.country, item.ticker) for item in watch_items], report_date
+        ),
+    )
+
+
+def _revision_key(conn) -> tuple | None:
+    """(DB 경로, inode, report 리비전). 리비전을 모르면(마이그레이션 전 DB) None."""
+    revision = get_data_revision(conn, "report")
+    if not revision:
+        return None
+    path = conn.execute("PRAGMA database_list").fetchone()[2]
+    return (path, os.stat(path).st_ino if path else None, revision)
+
+
+def _load(date: str | None, watch_items: list[WatchItem]) -> tuple[tuple | None, ReportContext]:
+    conn = get_connection(REPORT_DB_PROFILE)
+    try:
+        # 모든 읽기가 같은 WAL 스냅샷을 보도록 한 읽기 트랜잭션으로 묶는다
+        conn.execute("BEGIN")
+        try:
+            return _revision_key(conn), _read_context(conn, date, watch_items)
+        finally:
+            conn.rollback()
+    finally:
+        conn.close()
+
+
+def load_report_context(date: str | None = None) -> ReportContext:
+    """기준일(기본: 최신 섹터 날짜)의 컨텍스트를 DB에서 새로 읽는다."""
+    return _load(date, load_watchlist())[1]
+
+
+def get_report_context(date: str | None = None) -> ReportContext:
+    """``load_report_context``의 캐시판. DB와 watchlist가 그대로면 같은 객체를 돌려준다.
+
+    반환된 컨텍스트는 공유되므로 호출자가 고치면 안 된다.
+    """
+    watch_items = load_watchlist()
+    conn = get_connection(REPORT_DB_PROFILE)
+    try:
+        key = _revision_key(conn)
+    finally:
+        conn.close()
+
+    cache_key = (date, tuple(watch_items))
+    if key is not None:
+        with _context_cache_lock:
+            cached = _context_cache.get(cache_key)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+    key, context = _load(date, watch_items)
+    if key is not None:
+        with _context_cache_lock:
+            _context_cache.pop(cache_key, None)
+            while len(_context_cache) >= _CONTEXT_CACHE_SIZE:
+                del _context_cache[next(iter(_context_cache))]
+            _context_cache[cache_key] = (key, context)
+    return context
+
+
+def clear_report_context_cache() -> None:
+    with _context_cache_lock:
+        _context_cache.clear()
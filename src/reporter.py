@@ -2,28 +2,30 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-from collections import defaultdict
 from datetime import datetime, timedelta
 
 from src.config import (
     COUNTRIES,
+    LEADLAG_MAX_P_VALUE,
     LEADLAG_MIN_CORRELATION,
     LEADLAG_SCOREBOARD_WINDOW_DAYS,
+    REPORT_DB_PROFILE,
+    SECTORS,
     STATUS_STALE_AFTER_DAYS,
 )
 from src.database import (
-    _table_exists,
-    get_abnormal_stocks,
     get_connection,
-    get_flow_signal_stats,
-    get_flow_signals,
-    get_latest_benchmarks,
-    get_latest_sector_dates_by_country,
-    get_latest_sector_performance,
-    get_lead_lag_scores,
+    get_data_revision,
+    get_first_verified_signal_date,
+    get_rendered_report,
+    init_db,
+    replace_rendered_reports,
+    table_exists,
 )
+from src.report_context import ReportContext, load_report_context
 from src.watchlist import WatchItem, load_watchlist
 
 logger = logging.getLogger(__name__)
@@ -41,19 +43,6 @@ COUNTRY_ORDER = ["US", "KR", "CN", "JP", "VN", "IN", "DE"]
 UNSTABLE_COVERAGE_MARKETS = {"CN", "VN"}
 
 
-def _resolve_report_date(conn, date: str | None) -> str:
-    if date is not None:
-        return date
-
-    row = conn.execute("SELECT MAX(date) FROM sector_performance").fetchone()
-    return row[0] if row and row[0] else datetime.utcnow().strftime("%Y-%m-%d")
-
-
-def _build_benchmark_lookup(conn, date: str) -> dict[tuple[str, str | None], dict]:
-    rows = get_latest_benchmarks(conn, date=date)
-    return {(row["country"], row["sector"]): row for row in rows}
-
-
 def _get_benchmark_row(
     lookup: dict[tuple[str, str | None], dict],
     country: str,
@@ -78,6 +67,17 @@ def _parse_report_date(value: str) -> datetime.date | None:
         return None
 
 
+def _report_age_days(report_date: str) -> int | None:
+    report_dt = _parse_report_date(report_date)
+    return (datetime.utcnow().date() - report_dt).days if report_dt else None
+
+
+def _scoreboard_window_start() -> str:
+    return (
+        datetime.utcnow() - timedelta(days=LEADLAG_SCOREBOARD_WINDOW_DAYS)
+    ).strftime("%Y-%m-%d")
+
+
 def _country_label(code: str) -> str:
     info = COUNTRIES.get(code, {})
     flag = info.get("flag", "")
@@ -218,21 +218,14 @@ def _format_sector_brief(
     return "\n".join(lines)
 
 
-def _build_data_quality_lines(
-    conn,
-    report_date: str,
-    by_country: dict[str, list[dict]],
-    *,
-    include_auto_warning: bool,
-) -> tuple[list[str], bool]:
-    if not include_auto_warning:
+def _build_data_quality_lines(context: ReportContext) -> tuple[list[str], bool]:
+    if context.requested_date:
         return [], False
 
-    latest_dates = get_latest_sector_dates_by_country(conn)
-    report_dt = _parse_report_date(report_date)
-    age_days = None
-    if report_dt:
-        age_days = (datetime.utcnow().date() - report_dt).days
+    report_date = context.date
+    by_country = context.by_country
+    latest_dates = context.latest_dates
+    age_days = _report_age_days(report_date)
 
     available_codes = [code for code in COUNTRY_ORDER if code in by_country]
     lagging = [
@@ -493,41 +486,6 @@ def _build_watch_sections(
     return watch_candidates, caution_candidates
 
 
-def _find_watch_snapshot(conn, item: WatchItem, report_date: str) -> dict | None:
-    row = conn.execute(
-        """
-        SELECT *
-        FROM instrument_universe
-        WHERE country = ?
-          AND ticker = ?
-          AND last_seen_date <= ?
-        ORDER BY last_seen_date DESC
-        LIMIT 1
-        """,
-        (item.country, item.ticker, report_date),
-    ).fetchone()
-    if row:
-        return dict(row)
-
-    return None
-
-
-def _find_sector_row(conn, report_date: str, country: str, sector: str | None) -> dict | None:
-    if not sector:
-        return None
-
-    row = conn.execute(
-        """
-        SELECT *
-        FROM sector_performance
-        WHERE date = ? AND country = ? AND sector = ?
-        LIMIT 1
-        """,
-        (report_date, country, sector),
-    ).fetchone()
-    return dict(row) if row else None
-
-
 def _watch_signal(sector_row: dict | None) -> str:
     if not sector_row:
         return "데이터 없음"
@@ -541,16 +499,12 @@ def _watch_signal(sector_row: dict | None) -> str:
     return "중립"
 
 
-def _format_watchlist_line(
-    conn,
-    item: WatchItem,
-    report_date: str,
-    benchmark_lookup: dict[tuple[str, str | None], dict],
-) -> str:
-    snapshot = _find_watch_snapshot(conn, item, report_date)
+def _format_watchlist_line(context: ReportContext, item: WatchItem) -> str:
+    report_date = context.date
+    snapshot = context.watch_snapshots.get((item.country, item.ticker))
     name = item.name or (snapshot or {}).get("name") or item.ticker
     sector = item.sector or (snapshot or {}).get("sector")
-    sector_row = _find_sector_row(conn, report_date, item.country, sector)
+    sector_row = context.sector_row(item.country, sector)
 
     details = []
     if sector_row:
@@ -558,7 +512,7 @@ def _format_watchlist_line(
         details.append(f"섹터 {_format_signed_pct(sector_row.get('daily_return'))}")
         details.append(f"확산 {(sector_row.get('breadth') or 0) * 100:.0f}%")
 
-        benchmark = _get_benchmark_row(benchmark_lookup, item.country, sector)
+        benchmark = _get_benchmark_row(context.benchmarks, item.country, sector)
         if benchmark and benchmark.get("daily_return") is not None:
             alpha = (sector_row.get("daily_return") or 0) - benchmark["daily_return"]
             details.append(f"벤치 대비 {_format_signed_pct(alpha)}")
@@ -587,34 +541,8 @@ def _format_watchlist_line(
     )
 
 
-def _build_watchlist_lines(
-    conn,
-    report_date: str,
-    benchmark_lookup: dict[tuple[str, str | None], dict],
-    limit: int = 8,
-) -> list[str]:
-    items = load_watchlist()
-    if not items:
-        return []
-
-    return [
-        _format_watchlist_line(conn, item, report_date, benchmark_lookup)
-        for item in items[:limit]
-    ]
-
-
-def _get_trend_rows(conn, report_date: str) -> list[dict]:
-    rows = conn.execute(
-        """
-        SELECT sector, trend_score, countries_positive, countries_negative,
-               global_avg_return, momentum_signal
-        FROM trend_scores
-        WHERE date = ?
-        ORDER BY trend_score DESC
-        """,
-        (report_date,),
-    ).fetchall()
-    return [dict(row) for row in rows]
+def _build_watchlist_lines(context: ReportContext, limit: int = 8) -> list[str]:
+    return [_format_watchlist_line(context, item) for item in context.watch_items[:limit]]
 
 
 def _build_trend_section_lines(
@@ -717,12 +645,9 @@ def _scoreboard_verdict(stats: dict) -> str:
     return f"{verdict} · 적중률 {rate * 100:.0f}% ({stats['hits']}/{total})"
 
 
-def _build_flow_scoreboard_lines(conn) -> list[str]:
-    window_start = (
-        datetime.utcnow() - timedelta(days=LEADLAG_SCOREBOARD_WINDOW_DAYS)
-    ).strftime("%Y-%m-%d")
-    recent = get_flow_signal_stats(conn, since_date=window_start)
-    all_time = get_flow_signal_stats(conn)
+def _build_flow_scoreboard_lines(context: ReportContext) -> list[str]:
+    recent = context.signal_stats(since_date=_scoreboard_window_start())
+    all_time = context.signal_stats()
 
     lines = [f"가설 검증 (최근 {LEADLAG_SCOREBOARD_WINDOW_DAYS}일): {_scoreboard_verdict(recent)}"]
     if all_time["total"] > recent["total"]:
@@ -764,21 +689,20 @@ def _build_leader_ranking_lines(pair_rows: list[dict], limit: int = 4) -> list[s
     return lines
 
 
-def _build_flow_section_lines(conn, date: str) -> list[str]:
+def _build_flow_section_lines(context: ReportContext) -> list[str]:
     """일간 리포트에 붙는 압축된 자금 흐름 섹션."""
-    if not _table_exists(conn, "flow_signals"):
+    if not context.has_flow_signals:
         return []
 
     lines: list[str] = []
-    signals = get_flow_signals(conn, status="pending", created_date=date, limit=3)
+    signals = context.pending_signals(limit=3)
     if signals:
         lines.append("🌊 자금 흐름 시그널 (다음 거래일)")
         for signal in signals:
             lines.append(f"• {_format_signal_line(signal)}")
 
-    scoreboard = _build_flow_scoreboard_lines(conn)
-    stats_total = get_flow_signal_stats(conn)["total"]
-    if signals or stats_total:
+    scoreboard = _build_flow_scoreboard_lines(context)
+    if signals or context.verified_signals(limit=1):
         if not signals:
             lines.append("🌊 자금 흐름 시그널: 오늘은 임계값을 넘는 선행 신호 없음")
         lines.append(scoreboard[0])
@@ -786,352 +710,458 @@ def _build_flow_section_lines(conn, date: str) -> list[str]:
     return lines
 
 
-def format_flow_report(date: str | None = None) -> str:
+def format_flow_report(date: str | None = None, context: ReportContext | None = None) -> str:
     """글로벌 자금 흐름 lead-lag 리포트 (/flow 명령)."""
-    conn = get_connection()
-    try:
-        if not _table_exists(conn, "lead_lag_scores"):
-            return "🌊 자금 흐름 데이터가 아직 없습니다. 다음 리포트 사이클 이후 다시 시도하세요."
+    context = context or load_report_context(date)
+    if not context.has_lead_lag:
+        return "🌊 자금 흐름 데이터가 아직 없습니다. 다음 리포트 사이클 이후 다시 시도하세요."
 
-        date = _resolve_report_date(conn, date)
-        pair_rows = get_lead_lag_scores(conn, date=date)
+    date = context.date
+    pair_rows = context.lead_lag_pairs
 
-        lines = [
-            "🌊 글로벌 자금 흐름 (lead-lag)",
-            f"기준일 {date}",
-            "",
-        ]
-        lines.extend(_build_flow_scoreboard_lines(conn))
-
-        if not pair_rows:
-            lines.extend(["", "아직 계산된 lead-lag 페어가 없습니다."])
-            return "\n".join(lines).strip()
-
-        ranking = _build_leader_ranking_lines(pair_rows)
-        if ranking:
-            lines.extend(["", *ranking])
-
-        strong_pairs = [
-            row
-            for row in pair_rows
-            if row["correlation"] is not None
-            and row["correlation"] >= LEADLAG_MIN_CORRELATION
-        ][:7]
-        if strong_pairs:
-            lines.extend(["", "🔗 강한 선행 관계"])
-            for row in strong_pairs:
-                lag_label = "당일" if row["lag"] == 0 else f"+{row['lag']}일"
-                agreement = row.get("direction_agreement")
-                agreement_text = (
-                    f" · 방향 일치 {agreement * 100:.0f}%" if agreement is not None else ""
-                )
-                lines.append(
-                    f"• {row['sector']}: {_country_label(row['leader'])} → "
-                    f"{_country_label(row['follower'])} {lag_label}"
-                    f" ρ{_format_signed_number(row['correlation'], 2)}"
-                    f"{agreement_text} (n={row['n_obs']})"
-                )
-
-        pending = get_flow_signals(conn, status="pending", created_date=date, limit=5)
-        if pending:
-            lines.extend(["", "📌 다음 거래일 주목 흐름"])
-            for signal in pending:
-                lines.append(f"• {_format_signal_line(signal)}")
-
-        recent_verified = [
-            signal
-            for signal in get_flow_signals(conn, status="verified", limit=5)
-        ]
-        if recent_verified:
-            lines.extend(["", "🧾 최근 검증 결과"])
-            for signal in recent_verified:
-                lines.append(
-                    f"• {_format_signal_line(signal, with_status=True)}"
-                )
+    lines = [
+        "🌊 글로벌 자금 흐름 (lead-lag)",
+        f"기준일 {date}",
+        "",
+    ]
+    lines.extend(_build_flow_scoreboard_lines(context))
 
+    if not pair_rows:
+        lines.extend(["", "아직 계산된 lead-lag 페어가 없습니다."])
         return "\n".join(lines).strip()
-    finally:
-        conn.close()
 
+    ranking = _build_leader_ranking_lines(pair_rows)
+    if ranking:
+        lines.extend(["", *ranking])
 
-def format_daily_report(date: str | None = None) -> list[str]:
-    """일간 종합 리포트 생성. 텔레그램 메시지 길이 제한 때문에 분할 반환."""
-    conn = get_connection()
-    try:
-        requested_date = date is not None
-        date = _resolve_report_date(conn, date)
-        benchmark_lookup = _build_benchmark_lookup(conn, date)
-        messages = []
-        all_perf = get_latest_sector_performance(conn, date=date)
-        by_country: dict[str, list[dict]] = defaultdict(list)
-        for row in all_perf:
-            by_country[row["country"]].append(row)
-
-        trend_rows = _get_trend_rows(conn, date)
-
-        quality_lines, is_low_quality = _build_data_quality_lines(
-            conn,
-            date,
-            by_country,
-            include_auto_warning=not requested_date,
-        )
+    strong_pairs = [
+        row
+        for row in pair_rows
+        if row["correlation"] is not None
+        and row["correlation"] >= LEADLAG_MIN_CORRELATION
+    ][:7]
+    if strong_pairs:
+        lines.extend(["", "🔗 강한 선행 관계"])
+        for row in strong_pairs:
+            lag_label = "당일" if row["lag"] == 0 else f"+{row['lag']}일"
+            agreement = row.get("direction_agreement")
+            agreement_text = (
+                f" · 방향 일치 {agreement * 100:.0f}%" if agreement is not None else ""
+            )
+            p_value = row.get("p_value")
+            p_value_text = f", p={p_value:.3f}" if p_value is not None else ""
+            lines.append(
+                f"• {row['sector']}: {_country_label(row['leader'])} → "
+                f"{_country_label(row['follower'])} {lag_label}"
+                f" ρ{_format_signed_number(row['correlation'], 2)}"
+                f"{agreement_text} (n={row['n_obs']}{p_value_text})"
+            )
 
-        header_lines = [
-            "📊 글로벌 섹터 데일리 리포트",
-            f"기준일 {date}",
-            "",
-        ]
-        if quality_lines:
-            header_lines.extend(quality_lines)
-            header_lines.append("")
-
-        header_lines.extend(
-            _build_takeaway_lines(
-                trend_rows,
-                all_perf,
-                is_low_quality=is_low_quality,
+    cross_pairs = [
+        row
+        for row in context.cross_sector_pairs
+        if row["correlation"] is not None
+        and row["correlation"] >= LEADLAG_MIN_CORRELATION
+        and (row["p_value"] is None or row["p_value"] <= LEADLAG_MAX_P_VALUE)
+    ][:5]
+    if cross_pairs:
+        lines.extend(["", "🔀 섹터 교차 선행"])
+        for row in cross_pairs:
+            lag_label = "당일" if row["lag"] == 0 else f"+{row['lag']}일"
+            lines.append(
+                f"• {_country_label(row['leader'])} {row['sector']} → "
+                f"{_country_label(row['follower'])} {row['follower_sector']} {lag_label}"
+                f" ρ{_format_signed_number(row['correlation'], 2)} (n={row['n_obs']})"
             )
-        )
 
-        flow_lines = _build_flow_section_lines(conn, date)
-        if flow_lines:
-            header_lines.extend(["", *flow_lines])
+    stock_pairs = [
+        row
+        for row in context.stock_pairs[:5]
+        if row["correlation"] >= LEADLAG_MIN_CORRELATION
+    ]
+    if stock_pairs:
+        lines.extend(["", "🧩 종목 선행 페어"])
+        for row in stock_pairs:
+            lag_label = "당일" if row["lag"] == 0 else f"+{row['lag']}일"
+            lines.append(
+                f"• {_country_label(row['leader_country'])} {row['leader_name']} → "
+                f"{_country_label(row['follower_country'])} {row['follower_name']} {lag_label}"
+                f" ρ{_format_signed_number(row['correlation'], 2)} (n={row['n_obs']})"
+            )
 
-        watchlist_lines = _build_watchlist_lines(conn, date, benchmark_lookup)
-        if watchlist_lines:
-            header_lines.extend(["", "🎯 내 관심 종목"])
-            for line in watchlist_lines:
-                header_lines.append(f"• {line}")
+    pending = context.pending_signals(limit=5)
+    if pending:
+        lines.extend(["", "📌 다음 거래일 주목 흐름"])
+        for signal in pending:
+            lines.append(f"• {_format_signal_line(signal)}")
+
+    recent_verified = context.verified_signals(limit=5)
+    if recent_verified:
+        lines.extend(["", "🧾 최근 검증 결과"])
+        for signal in recent_verified:
+            lines.append(
+                f"• {_format_signal_line(signal, with_status=True)}"
+            )
+
+    return "\n".join(lines).strip()
 
-        header_lines.extend(["", *_build_trend_section_lines(trend_rows)])
 
-        watch_candidates, caution_candidates = _build_watch_sections(
+def format_daily_report(
+    date: str | None = None,
+    context: ReportContext | None = None,
+) -> list[str]:
+    """일간 종합 리포트 생성. 텔레그램 메시지 길이 제한 때문에 분할 반환."""
+    context = context or load_report_context(date)
+    date = context.date
+    benchmark_lookup = context.benchmarks
+    messages = []
+    all_perf = context.sector_rows
+    by_country = context.by_country
+    trend_rows = context.trend_rows
+
+    quality_lines, is_low_quality = _build_data_quality_lines(context)
+
+    header_lines = [
+        "📊 글로벌 섹터 데일리 리포트",
+        f"기준일 {date}",
+        "",
+    ]
+    if quality_lines:
+        header_lines.extend(quality_lines)
+        header_lines.append("")
+
+    header_lines.extend(
+        _build_takeaway_lines(
+            trend_rows,
             all_perf,
-            benchmark_lookup,
-            date,
+            is_low_quality=is_low_quality,
         )
-        if watch_candidates:
-            header_lines.extend(["", "👀 관심 후보"])
-            for candidate in watch_candidates:
-                header_lines.append(f"• {candidate}")
-        if caution_candidates:
-            header_lines.extend(["", "⚠️ 제외/주의 신호"])
-            for candidate in caution_candidates:
-                header_lines.append(f"• {candidate}")
-
-        messages.append("\n".join(header_lines).strip())
-
-        for code in COUNTRY_ORDER:
-            if code not in by_country:
-                continue
+    )
 
-            info = COUNTRIES.get(code, {})
-            flag = info.get("flag", "")
-            name = info.get("name_kr", code)
-            entries = by_country[code]
-            total_stocks = sum(entry.get("stock_count", 0) for entry in entries)
+    flow_lines = _build_flow_section_lines(context)
+    if flow_lines:
+        header_lines.extend(["", *flow_lines])
 
-            msg_lines = [f"{flag} {name} · 분석 {total_stocks:,}종목" if total_stocks else f"{flag} {name}"]
-            benchmark_summary = _format_country_benchmark_summary(
-                benchmark_lookup, code, date
-            )
-            if benchmark_summary:
-                msg_lines.append(benchmark_summary)
+    watchlist_lines = _build_watchlist_lines(context)
+    if watchlist_lines:
+        header_lines.extend(["", "🎯 내 관심 종목"])
+        for line in watchlist_lines:
+            header_lines.append(f"• {line}")
 
-            sorted_entries = sorted(
-                entries,
-                key=lambda entry: entry.get("daily_return") or 0,
-                reverse=True,
-            )
+    header_lines.extend(["", *_build_trend_section_lines(trend_rows)])
 
-            for entry in sorted_entries:
-                if entry["sector"] == "기타":
-                    continue
-                msg_lines.extend(["", _format_sector_brief(entry, benchmark_lookup, date)])
+    watch_candidates, caution_candidates = _build_watch_sections(
+        all_perf,
+        benchmark_lookup,
+        date,
+    )
+    if watch_candidates:
+        header_lines.extend(["", "👀 관심 후보"])
+        for candidate in watch_candidates:
+            header_lines.append(f"• {candidate}")
+    if caution_candidates:
+        header_lines.extend(["", "⚠️ 제외/주의 신호"])
+        for candidate in caution_candidates:
+            header_lines.append(f"• {candidate}")
+
+    messages.append("\n".join(header_lines).strip())
+
+    for code in COUNTRY_ORDER:
+        if code not in by_country:
+            continue
 
-            messages.append("\n".join(msg_lines).strip())
+        info = COUNTRIES.get(code, {})
+        flag = info.get("flag", "")
+        name = info.get("name_kr", code)
+        entries = by_country[code]
+        total_stocks = sum(entry.get("stock_count", 0) for entry in entries)
 
-        abnormals = get_abnormal_stocks(conn, date=date)
-        if abnormals:
-            msg_lines = [f"⚠️ 비정상 급등/급락 {len(abnormals)}종목"]
-            msg_lines.extend(_format_abnormal_stock_lines(abnormals))
-            messages.append("\n".join(msg_lines).strip())
+        msg_lines = [f"{flag} {name} · 분석 {total_stocks:,}종목" if total_stocks else f"{flag} {name}"]
+        benchmark_summary = _format_country_benchmark_summary(
+            benchmark_lookup, code, date
+        )
+        if benchmark_summary:
+            msg_lines.append(benchmark_summary)
 
-        return messages
-    finally:
-        conn.close()
+        sorted_entries = sorted(
+            entries,
+            key=lambda entry: entry.get("daily_return") or 0,
+            reverse=True,
+        )
 
+        for entry in sorted_entries:
+            if entry["sector"] == "기타":
+                continue
+            msg_lines.extend(["", _format_sector_brief(entry, benchmark_lookup, date)])
+
+        messages.append("\n".join(msg_lines).strip())
+
+    abnormals = context.abnormals
+    if abnormals:
+        msg_lines = [f"⚠️ 비정상 급등/급락 {len(abnormals)}종목"]
+        msg_lines.extend(_format_abnormal_stock_lines(abnormals))
+        messages.append("\n".join(msg_lines).strip())
 
-def format_trending_report(date: str | None = None) -> str:
+    return messages
+
+
+def format_trending_report(date: str | None = None, context: ReportContext | None = None) -> str:
     """Concise global trend summary for the /trending command."""
-    conn = get_connection()
-    try:
-        requested_date = date is not None
-        date = _resolve_report_date(conn, date)
-        all_perf = get_latest_sector_performance(conn, date=date)
-        by_country: dict[str, list[dict]] = defaultdict(list)
-        for row in all_perf:
-            by_country[row["country"]].append(row)
-
-        trend_rows = _get_trend_rows(conn, date)
-        quality_lines, _ = _build_data_quality_lines(
-            conn,
-            date,
-            by_country,
-            include_auto_warning=not requested_date,
-        )
+    context = context or load_report_context(date)
+    quality_lines, _ = _build_data_quality_lines(context)
 
-        lines = [
-            "🔥 글로벌 트렌딩 섹터",
-            f"기준일 {date}",
-            "",
-        ]
-        if quality_lines:
-            lines.extend(quality_lines)
-            lines.append("")
-        lines.extend(_build_trend_section_lines(trend_rows))
-        return "\n".join(lines).strip()
-    finally:
-        conn.close()
+    lines = [
+        "🔥 글로벌 트렌딩 섹터",
+        f"기준일 {context.date}",
+        "",
+    ]
+    if quality_lines:
+        lines.extend(quality_lines)
+        lines.append("")
+    lines.extend(_build_trend_section_lines(context.trend_rows))
+    return "\n".join(lines).strip()
 
 
-def format_watchlist_report(date: str | None = None) -> str:
+def format_watchlist_report(date: str | None = None, context: ReportContext | None = None) -> str:
     """Personal watchlist summary for the latest report date."""
-    conn = get_connection()
-    try:
-        date = _resolve_report_date(conn, date)
-        benchmark_lookup = _build_benchmark_lookup(conn, date)
-        lines = _build_watchlist_lines(conn, date, benchmark_lookup)
-        if not lines:
-            return (
-                "🎯 내 관심 종목\n"
-                "설정된 watchlist가 없습니다.\n"
-                "MARKETBOT_WATCHLIST 환경변수 또는 data/watchlist.json에 "
-                "종목을 추가하세요."
-            )
+    context = context or load_report_context(date)
+    lines = _build_watchlist_lines(context)
+    if not lines:
+        return (
+            "🎯 내 관심 종목\n"
+            "설정된 watchlist가 없습니다.\n"
+            "MARKETBOT_WATCHLIST 환경변수 또는 data/watchlist.json에 "
+            "종목을 추가하세요."
+        )
 
-        msg_lines = ["🎯 내 관심 종목", f"기준일 {date}"]
-        for line in lines:
-            msg_lines.append(f"• {line}")
-        return "\n".join(msg_lines)
-    finally:
-        conn.close()
+    msg_lines = ["🎯 내 관심 종목", f"기준일 {context.date}"]
+    for line in lines:
+        msg_lines.append(f"• {line}")
+    return "\n".join(msg_lines)
 
 
-def format_abnormal_report(date: str | None = None) -> str:
+def format_abnormal_report(date: str | None = None, context: ReportContext | None = None) -> str:
     """Concise abnormal mover summary for the /abnormal command."""
-    conn = get_connection()
-    try:
-        date = _resolve_report_date(conn, date)
-        abnormals = get_abnormal_stocks(conn, date=date)
-        if not abnormals:
-            return f"✅ 비정상 급등/급락 종목 없음\n기준일 {date}"
-
-        lines = [
-            f"⚠️ 비정상 급등/급락 {len(abnormals)}종목",
-            f"기준일 {date}",
-        ]
-        lines.extend(_format_abnormal_stock_lines(abnormals))
-        return "\n".join(lines).strip()
-    finally:
-        conn.close()
+    context = context or load_report_context(date)
+    abnormals = context.abnormals
+    if not abnormals:
+        return f"✅ 비정상 급등/급락 종목 없음\n기준일 {context.date}"
+
+    lines = [
+        f"⚠️ 비정상 급등/급락 {len(abnormals)}종목",
+        f"기준일 {context.date}",
+    ]
+    lines.extend(_format_abnormal_stock_lines(abnormals))
+    return "\n".join(lines).strip()
 
 
-def format_sector_detail(sector_name: str, date: str | None = None) -> str:
+def format_sector_detail(
+    sector_name: str,
+    date: str | None = None,
+    context: ReportContext | None = None,
+) -> str:
     """특정 섹터의 국가별 상세 리포트."""
-    conn = get_connection()
-    try:
-        date = _resolve_report_date(conn, date)
-        benchmark_lookup = _build_benchmark_lookup(conn, date)
-
-        rows = conn.execute(
-            """
-            SELECT * FROM sector_performance
-            WHERE date = ? AND sector = ?
-            ORDER BY daily_return DESC
-            """,
-            (date, sector_name),
-        ).fetchall()
-
-        if not rows:
-            return f"❌ '{sector_name}' 섹터 데이터를 찾을 수 없습니다."
-
-        msg_lines = [
-            f"🔍 {sector_name} 섹터 상세",
-            f"기준일 {date}",
-        ]
+    context = context or load_report_context(date)
+    date = context.date
+    benchmark_lookup = context.benchmarks
 
-        for row in rows:
-            info = COUNTRIES.get(row["country"], {})
-            flag = info.get("flag", "")
-            name = info.get("name_kr", row["country"])
-            breadth = (row["breadth"] or 0) * 100
-
-            msg_lines.extend(
-                [
-                    "",
-                    f"• {flag} {name} {_format_signed_pct(row['daily_return'])}",
-                ]
-            )
+    rows = context.by_sector.get(sector_name, [])
+
+    if not rows:
+        return f"❌ '{sector_name}' 섹터 데이터를 찾을 수 없습니다."
+
+    msg_lines = [
+        f"🔍 {sector_name} 섹터 상세",
+        f"기준일 {date}",
+    ]
+
+    for row in rows:
+        info = COUNTRIES.get(row["country"], {})
+        flag = info.get("flag", "")
+        name = info.get("name_kr", row["country"])
+        breadth = (row["breadth"] or 0) * 100
 
-            detail_parts = []
-            comparison = _format_benchmark_comparison(
-                row,
-                _get_benchmark_row(benchmark_lookup, row["country"], sector_name),
-                date,
+        msg_lines.extend(
+            [
+                "",
+                f"• {flag} {name} {_format_signed_pct(row['daily_return'])}",
+            ]
+        )
+
+        detail_parts = []
+        comparison = _format_benchmark_comparison(
+            row,
+            _get_benchmark_row(benchmark_lookup, row["country"], sector_name),
+            date,
+        )
+        if comparison:
+            detail_parts.append(comparison)
+        if breadth > 0:
+            detail_parts.append(f"상승 {breadth:.0f}%")
+        detail_parts.append(f"{row['stock_count']}종목")
+        msg_lines.append("  " + " · ".join(detail_parts))
+
+        gainers = _parse_top_gainers(row["top_gainers"])[:3]
+        if gainers:
+            gainers_text = ", ".join(
+                f"{gainer['name']} {_format_signed_pct(gainer['return'], 1)}"
+                for gainer in gainers
             )
-            if comparison:
-                detail_parts.append(comparison)
-            if breadth > 0:
-                detail_parts.append(f"상승 {breadth:.0f}%")
-            detail_parts.append(f"{row['stock_count']}종목")
-            msg_lines.append("  " + " · ".join(detail_parts))
-
-            gainers = _parse_top_gainers(row["top_gainers"])[:3]
-            if gainers:
-                gainers_text = ", ".join(
-                    f"{gainer['name']} {_format_signed_pct(gainer['return'], 1)}"
-                    for gainer in gainers
-                )
-                msg_lines.append(f"  강세 {gainers_text}")
-
-        return "\n".join(msg_lines)
-    finally:
-        conn.close()
+            msg_lines.append(f"  강세 {gainers_text}")
+
+    return "\n".join(msg_lines)
 
 
-def format_country_detail(country_code: str, date: str | None = None) -> str:
+def format_country_detail(
+    country_code: str,
+    date: str | None = None,
+    context: ReportContext | None = None,
+) -> str:
     """특정 국가의 섹터별 상세 리포트."""
-    conn = get_connection()
-    try:
-        date = _resolve_report_date(conn, date)
-        benchmark_lookup = _build_benchmark_lookup(conn, date)
+    context = context or load_report_context(date)
+    date = context.date
+    benchmark_lookup = context.benchmarks
 
-        rows = get_latest_sector_performance(conn, date=date, country=country_code)
-        if not rows:
-            return f"❌ '{country_code}' 데이터를 찾을 수 없습니다."
+    rows = context.by_country.get(country_code, [])
+    if not rows:
+        return f"❌ '{country_code}' 데이터를 찾을 수 없습니다."
 
-        info = COUNTRIES.get(country_code, {})
-        flag = info.get("flag", "")
-        name = info.get("name_kr", country_code)
+    info = COUNTRIES.get(country_code, {})
+    flag = info.get("flag", "")
+    name = info.get("name_kr", country_code)
 
-        msg_lines = [
-            f"{flag} {name} 섹터 상세",
-            f"기준일 {date}",
-        ]
+    msg_lines = [
+        f"{flag} {name} 섹터 상세",
+        f"기준일 {date}",
+    ]
 
-        benchmark_summary = _format_country_benchmark_summary(
-            benchmark_lookup, country_code, date
+    benchmark_summary = _format_country_benchmark_summary(
+        benchmark_lookup, country_code, date
+    )
+    if benchmark_summary:
+        msg_lines.append(benchmark_summary)
+
+    for row in rows:
+        if row["sector"] == "기타":
+            continue
+
+        msg_lines.extend(["", _format_sector_brief(row, benchmark_lookup, date)])
+
+    return "\n".join(msg_lines)
+
+
+def _watchlist_argument(items: list[WatchItem]) -> str:
+    # /report 본문에는 관심 종목 줄이 들어가므로 watchlist별로 따로 저장한다
+    if not items:
+        return ""
+    return hashlib.sha256(repr(tuple(items)).encode("utf-8")).hexdigest()[:16]
+
+
+def render_report_variants(context: ReportContext) -> list[dict]:
+    """봇 명령별 텍스트를 (command, argument, messages) 행으로 렌더링한다.
+
+    섹터는 설정된 섹터와 기준일 데이터에 있는 섹터 전부, 국가는 설정된 국가 전부다.
+    """
+    rows = [
+        {
+            "command": "report",
+            "argument": _watchlist_argument(context.watch_items),
+            "messages": format_daily_report(context=context),
+        },
+        {"command": "trending", "argument": "", "messages": [format_trending_report(context=context)]},
+        {"command": "flow", "argument": "", "messages": [format_flow_report(context=context)]},
+        {"command": "abnormal", "argument": "", "messages": [format_abnormal_report(context=context)]},
+    ]
+    for sector in sorted(set(SECTORS) | set(context.by_sector)):
+        rows.append(
+            {
+                "command": "sector",
+                "argument": sector,
+                "messages": [format_sector_detail(sector, context=context)],
+            }
         )
-        if benchmark_summary:
-            msg_lines.append(benchmark_summary)
+    for country in COUNTRIES:
+        rows.append(
+            {
+                "command": "country",
+                "argument": country,
+                "messages": [format_country_detail(country, context=context)],
+            }
+        )
+    return rows
 
-        for row in rows:
-            if row["sector"] == "기타":
-                continue
 
-            msg_lines.extend(["", _format_sector_brief(row, benchmark_lookup, date)])
+def _render_key(report_date: str, first_recent_signal: str | None) -> str:
+    # 오늘 날짜에 따라 달라지는 렌더링 입력: 기준일 경과 경고(임계 초과 시 경과 일수)와
+    # 스코어보드 최근 구간에 드는 첫 검증 시그널. 둘이 같으면 자정을 넘겨도 같은 텍스트다.
+    age_days = _report_age_days(report_date)
+    stale_days = age_days if age_days is not None and age_days > STATUS_STALE_AFTER_DAYS else 0
+    return f"{stale_days}:{first_recent_signal or ''}"
+
+
+def report_render_key(context: ReportContext) -> str:
+    """컨텍스트로 렌더링한 텍스트의 날짜 입력 키 (``rendered_reports.render_key``)."""
+    window_start = _scoreboard_window_start()
+    first_recent = min(
+        (
+            row["created_date"]
+            for row in context.verified_signals()
+            if row["created_date"] >= window_start
+        ),
+        default=None,
+    )
+    return _render_key(context.date, first_recent)
+
+
+def prerender_reports(context: ReportContext | None = None) -> int:
+    """최신 기준일의 봇 명령 텍스트를 모두 렌더링해 ``rendered_reports``에 저장한다.
+
+    저장한 행 수를 반환한다. data_revision을 모르는 DB면 저장하지 않고,
+    렌더링 도중 날짜 입력 키가 바뀌었으면(자정 경계) 저장하지 않는다.
+    """
+    init_db()
+    context = context or load_report_context()
+    if not context.data_version:
+        return 0
+
+    render_key = report_render_key(context)
+    rows = render_report_variants(context)
+    if report_render_key(context) != render_key:
+        return 0
 
-        return "\n".join(msg_lines)
+    conn = get_connection()
+    try:
+        replace_rendered_reports(conn, context.date, context.data_version, render_key, rows)
+        conn.commit()
     finally:
         conn.close()
+    logger.info(f"봇 리포트 {len(rows)}종 렌더링 완료 (기준일 {context.date}, 버전 {context.data_version})")
+    return len(rows)
+
+
+def get_prerendered_report(command: str, argument: str = "") -> list[str] | None:
+    """미리 렌더링한 최신 기준일 텍스트. 없거나 입력이 바뀌었으면 None.
+
+    ``report``는 argument 대신 현재 watchlist로 찾는다. 저장된 텍스트는 report
+    리비전과 날짜 입력 키(``report_render_key``)가 지금과 같을 때만 쓴다.
+    """
+    if command == "report":
+        argument = _watchlist_argument(load_watchlist())
+
+    conn = get_connection(REPORT_DB_PROFILE)
+    try:
+        if not table_exists(conn, "rendered_reports"):
+            return None
+        row = conn.execute("SELECT MAX(date) FROM sector_performance").fetchone()
+        date = row[0] if row else None
+        data_version = get_data_revision(conn, "report")
+        if not date or not data_version:
+            return None
+        render_key = _render_key(
+            date, get_first_verified_signal_date(conn, _scoreboard_window_start())
+        )
+        cached = get_rendered_report(conn, command, argument, date, data_version, render_key)
+    finally:
+        conn.close()
+
+    return cached["messages"] if cached else None
@@ -0,0 +1,282 @@
+"""종목 단위 lead-lag 탐색 (오프라인 작업).
+
+섹터 평균은 흐름을 실제로 나르는 종목을 가린다. raw ``stock_daily``(봉인 파티션 포함)에서
+시장별 평균 거래대금 상위 종목을 골라, 다른 시장 종목 사이의 시차 상관 상위 페어를
+summary DB ``stock_lead_lag_scores``에 남긴다. ``/flow``가 이 표를 보여준다.
+
+- 날짜 축은 고른 종목들의 거래일 합집합이고 시차도 이 축에서 센다. lag 0 허용 여부는
+  섹터 lead-lag와 같은 장 마감 순서 규칙이다.
+- 수익률은 종목마다 관측일 평균·표준편차로 표준화하고 빈 날은 0으로 둔다. 표준화 행렬 곱
+  Z_leader · Z_followerᵀ를 공통 관측 수(관측 마스크 행렬 곱)로 나누면 모든 페어의 상관
+  근사가 한 번에 나온다. leader × follower 행렬은 ``STOCK_LEADLAG_TILE`` 한 변 타일로
+  나눠 계산해 메모리가 종목 수의 제곱으로 늘지 않는다.
+- 타일마다 근사 상관 상위 후보만 남기고, 끝에 후보 페어의 상관·방향 일치율을 공통
+  관측으로 정확히 다시 계산해 상위 페어를 저장한다.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    LEADLAG_MAX_LAG,
+    STOCK_LEADLAG_LOOKBACK_DAYS,
+    STOCK_LEADLAG_MIN_OVERLAP,
+    STOCK_LEADLAG_TILE,
+    STOCK_LEADLAG_TOP_PAIRS,
+    STOCK_LEADLAG_TOP_PER_MARKET,
+)
+from src.database import (
+    RAW_FACT_DATE_SQL,
+    get_connection,
+    init_db,
+    open_raw_range,
+    raw_fact_query,
+    raw_range_chunks,
+    replace_stock_lead_lag_scores,
+)
+from src.leadlag import _close_minutes, _resolve_analysis_date, _shift_date
+
+logger = logging.getLogger(__name__)
+
+# 정확히 다시 계산할 후보는 저장할 페어 수의 몇 배인가 (근사 순위가 뒤바뀌는 여유)
+_CANDIDATE_FACTOR = 4
+
+
+@dataclass(frozen=True)
+class StockReturnMatrix:
+    countries: np.ndarray
+    tickers: np.ndarray
+    names: np.ndarray
+    sectors: np.ndarray
+    dates: np.ndarray
+    returns: np.ndarray  # 종목×날짜, 없는 값은 NaN
+
+    @property
+    def empty(self) -> bool:
+        return not len(self.tickers)
+
+
+def _select_liquid_stocks(frame: pd.DataFrame, top_per_market: int) -> StockReturnMatrix:
+    """(date, country, ticker, name, sector, daily_return, traded_value) 행에서 시장별 상위 종목 행렬."""
+    empty = np.array([], dtype=object)
+    if frame.empty:
+        return StockReturnMatrix(empty, empty, empty, empty, empty, np.empty((0, 0)))
+
+    frame = frame.sort_values("date")
+    stocks = (
+        frame.groupby(["country", "ticker"])
+        .agg(
+            traded_value=("traded_value", "mean"),
+            n_obs=("daily_return", "size"),
+            name=("name", "last"),
+            sector=("sector", "last"),
+        )
+        .reset_index()
+    )
+    stocks = stocks[stocks["n_obs"] >= STOCK_LEADLAG_MIN_OVERLAP]
+    stocks = (
+        stocks.sort_values(["country", "traded_value", "ticker"], ascending=[True, False, True])
+        .groupby("country")
+        .head(top_per_market)
+        .sort_values(["country", "ticker"])
+    )
+    returns = frame.pivot_table(
+        index=["country", "ticker"], columns="date", values="daily_return"
+    ).reindex(pd.MultiIndex.from_frame(stocks[["country", "ticker"]]))
+    returns = returns.loc[:, returns.notna().any(axis=0)]
+    return StockReturnMatrix(
+        stocks["country"].to_numpy(dtype=object),
+        stocks["ticker"].to_numpy(dtype=object),
+        stocks["name"].to_numpy(dtype=object),
+        stocks["sector"].to_numpy(dtype=object),
+        returns.columns.to_numpy(dtype=object),
+        returns.to_numpy(dtype=float),
+    )
+
+
+def load_stock_returns(
+    start_date: str,
+    end_date: str,
+    top_per_market: int = STOCK_LEADLAG_TOP_PER_MARKET,
+) -> StockReturnMatrix:
+    """[start_date, end_date] raw 히스토리에서 시장별 평균 거래대금 상위 종목의 수익률 행렬.
+
+    1년 구간은 봉인 파티션이 SQLite ATTACH 한도(10개)를 넘으므로 한도 안의 구간으로
+    나눠 읽고 합친다.
+    """
+    frames = []
+    for chunk_start, chunk_end in raw_range_chunks(start_date, end_date):
+        with open_raw_range(chunk_start, chunk_end) as conn:
+            query, params = raw_fact_query(
+                conn,
+                f"""
+                {RAW_FACT_DATE_SQL} AS date, i.country, i.ticker, i.name, i.sector,
+                f.daily_return, f.close_price * f.volume AS traded_value
+                """,
+                chunk_start,
+                chunk_end,
+                where="f.daily_return IS NOT NULL",
+            )
+            frames.append(pd.read_sql_query(query, conn, params=params))
+    return _select_liquid_stocks(pd.concat(frames, ignore_index=True), top_per_market)
+
+
+def _standardize(returns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """종목별 관측일 기준 z-score(빈 날 0)와 관측 마스크(0/1 실수)."""
+    observed = ~np.isnan(returns)
+    count = np.maximum(observed.sum(axis=1, keepdims=True), 1)
+    centered = np.where(observed, returns - np.nansum(returns, axis=1, keepdims=True) / count, 0.0)
+    scale = np.sqrt((centered * centered).sum(axis=1, keepdims=True) / count)
+    standardized = np.divide(centered, scale, out=np.zeros_like(centered), where=scale > 0)
+    return standardized, observed.astype(float)
+
+
+def _candidate_pairs(
+    matrix: StockReturnMatrix,
+    n_candidates: int,
+    tile: int,
+    max_lag: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """근사 상관이 큰 다른 시장 페어 후보 (leader 인덱스, follower 인덱스, 시차).
+
+    페어마다 허용 시차 중 |근사 상관|이 가장 큰 시차를 고르고(동률이면 짧은 시차),
+    그 시차의 상관이 큰 순으로 후보를 남긴다. 타일이 끝날 때마다 후보를 n_candidates개로
+    줄이므로 타일 수와 무관하게 메모리는 타일 한 장 + 후보 목록이다.
+    """
+    standardized, observed = _standardize(matrix.returns)
+    n_stocks, n_dates = standardized.shape
+    close = np.array([_close_minutes(country) for country in matrix.countries])
+    max_lag = min(max_lag, max(n_dates - 1, 0))
+
+    kept_score = np.empty(0)
+    kept = np.empty((0, 3), dtype=int)
+    for lead_start in range(0, n_stocks, tile):
+        leaders = np.arange(lead_start, min(lead_start + tile, n_stocks))
+        for follow_start in range(0, n_stocks, tile):
+            followers = np.arange(follow_start, min(follow_start + tile, n_stocks))
+            cross = matrix.countries[leaders][:, None] != matrix.countries[followers][None, :]
+            if not cross.any():
+                continue
+            min_lag = np.where(close[leaders][:, None] < close[followers][None, :], 0, 1)
+            best_abs = np.full(cross.shape, -np.inf)
+            best_correlation = np.zeros(cross.shape)
+            best_lag = np.zeros(cross.shape, dtype=int)
+            for lag in range(max_lag + 1):
+                lead_window = slice(0, n_dates - lag)
+                follow_window = slice(lag, n_dates)
+                n_obs = observed[leaders, lead_window] @ observed[followers, follow_window].T
+                correlation = (
+                    standardized[leaders, lead_window] @ standardized[followers, follow_window].T
+                ) / np.maximum(n_obs, 1)
+                usable = cross & (lag >= min_lag) & (n_obs >= STOCK_LEADLAG_MIN_OVERLAP)
+                score = np.where(usable, np.abs(correlation), -np.inf)
+                better = score > best_abs
+                best_abs = np.where(better, score, best_abs)
+                best_correlation = np.where(better, correlation, best_correlation)
+                best_lag = np.where(better, lag, best_lag)
+
+            ranked = np.where(np.isfinite(best_abs), best_correlation, -np.inf).ravel()
+            top = np.flatnonzero(np.isfinite(ranked))
+            if len(top) > n_candidates:
+                top = top[np.argpartition(-ranked[top], n_candidates - 1)[:n_candidates]]
+            rows, columns = np.unravel_index(top, cross.shape)
+            kept_score = np.concatenate([kept_score, ranked[top]])
+            kept = np.concatenate(
+                [kept, np.column_stack([leaders[rows], followers[columns], best_lag.ravel()[top]])]
+            )
+            if len(kept_score) > n_candidates:
+                keep = np.argpartition(-kept_score, n_candidates - 1)[:n_candidates]
+                kept_score, kept = kept_score[keep], kept[keep]
+    return kept[:, 0], kept[:, 1], kept[:, 2]
+
+
+def _exact_pair_score(leader: np.ndarray, follower: np.ndarray, lag: int) -> dict | None:
+    """한 페어의 주어진 시차 상관·방향 일치율을 공통 관측으로 정확히 계산한다."""
+    x = leader[: len(leader) - lag]
+    y = follower[lag:]
+    common = ~np.isnan(x) & ~np.isnan(y)
+    x, y = x[common], y[common]
+    if len(x) < STOCK_LEADLAG_MIN_OVERLAP or x.std() == 0 or y.std() == 0:
+        return None
+    nonzero = (x != 0) & (y != 0)
+    agreement = float(((x * y)[nonzero] > 0).mean()) if nonzero.any() else None
+    return {
+        "lag": int(lag),
+        "correlation": round(float(np.corrcoef(x, y)[0, 1]), 4),
+        "direction_agreement": round(agreement, 4) if agreement is not None else None,
+        "n_obs": int(len(x)),
+    }
+
+
+def score_stock_pairs(
+    matrix: StockReturnMatrix,
+    top_pairs: int = STOCK_LEADLAG_TOP_PAIRS,
+    tile: int = STOCK_LEADLAG_TILE,
+    max_lag: int = LEADLAG_MAX_LAG,
+) -> list[dict]:
+    """다른 시장 종목 페어 중 시차 상관이 큰 상위 top_pairs개 (date 키 제외, 상관 내림차순)."""
+    if matrix.empty or top_pairs <= 0:
+        return []
+    leaders, followers, lags = _candidate_pairs(matrix, top_pairs * _CANDIDATE_FACTOR, tile, max_lag)
+    rows = []
+    for leader, follower, lag in zip(leaders, followers, lags):
+        scored = _exact_pair_score(matrix.returns[leader], matrix.returns[follower], int(lag))
+        if scored is None:
+            continue
+        rows.append(
+            {
+                "leader_country": matrix.countries[leader],
+                "leader_ticker": matrix.tickers[leader],
+                "leader_name": matrix.names[leader],
+                "leader_sector": matrix.sectors[leader],
+                "follower_country": matrix.countries[follower],
+                "follower_ticker": matrix.tickers[follower],
+                "follower_name": matrix.names[follower],
+                "follower_sector": matrix.sectors[follower],
+                **scored,
+            }
+        )
+    rows.sort(
+        key=lambda row: (-row["correlation"], row["leader_country"], row["leader_ticker"],
+                         row["follower_country"], row["follower_ticker"])
+    )
+    return rows[:top_pairs]
+
+
+def run_stock_lead_lag(
+    date: str | None = None,
+    top_per_market: int = STOCK_LEADLAG_TOP_PER_MARKET,
+    top_pairs: int = STOCK_LEADLAG_TOP_PAIRS,
+    tile: int = STOCK_LEADLAG_TILE,
+    lookback_days: int = STOCK_LEADLAG_LOOKBACK_DAYS,
+) -> list[dict]:
+    """date(기본: 최신 섹터 성과 날짜)까지 lookback_days 캘린더일의 종목 페어를 저장한다."""
+    init_db()
+    conn = get_connection()
+    try:
+        date = _resolve_analysis_date(conn, date)
+    finally:
+        conn.close()
+    if date is None:
+        logger.warning("종목 lead-lag 계산 불가: 섹터 성과 데이터 없음")
+        return []
+
+    matrix = load_stock_returns(_shift_date(date, -lookback_days), date, top_per_market)
+    rows = score_stock_pairs(matrix, top_pairs=top_pairs, tile=tile)
+
+    conn = get_connection()
+    try:
+        replace_stock_lead_lag_scores(conn, date, rows)
+        conn.commit()
+    finally:
+        conn.close()
+    logger.info(
+        f"종목 lead-lag 저장: {len(rows)}개 페어 ({date}, 종목 {len(matrix.tickers)}개, "
+        f"거래일 {len(matrix.dates)}일)"
+    )
+    return [{"date": date, **row} for row in rows]
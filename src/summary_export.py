@@ -0,0 +1,257 @@
+"""summary DB의 Git 친화적 텍스트 내보내기/가져오기.
+
+Git에 바이너리 ``data/marketbot.db`` 대신 테이블별로 정렬된 NDJSON 샤드를 커밋한다.
+
+    data/summary_export/manifest.json
+    data/summary_export/<table>/<YYYY-MM>/<country>.ndjson   (날짜 + 국가)
+    data/summary_export/<table>/<YYYY-MM>.ndjson             (날짜만)
+    data/summary_export/<table>/<country>.ndjson             (국가만)
+
+- 한 줄이 한 행이고, 샤드 안에서 자연 키 순서로 정렬하므로 같은 DB는 항상
+  같은 바이트로 내보내진다. 한 번의 수집은 자기 시장·월 샤드의 몇 줄만 바꾼다.
+- AUTOINCREMENT ``id``는 내보내지 않는다. 시장별 커밋이 서로 다른 id를 만들어도
+  병합이 충돌하지 않게 하기 위해서다. 가져오기 때 정렬 순서대로 다시 매겨진다.
+- manifest에는 스키마 버전과 테이블별 컬럼만 적는다. 샤드 목록을 적으면 시장별
+  커밋이 같은 줄을 고쳐 rebase가 충돌하고, 한쪽 목록이 이기면 다른 쪽 샤드를
+  가져오기가 건너뛴다. 가져오기는 ``<table>/`` 아래 샤드 파일을 직접 찾는다.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from contextlib import nullcontext
+from pathlib import Path
+
+from src import database
+from src.config import SUMMARY_DB_PROFILE, SUMMARY_EXPORT_DIRNAME
+from src.database import (
+    REPORT_SOURCE_TABLES,
+    SUMMARY_LEGACY_COLUMNS,
+    SUMMARY_MIGRATIONS,
+    _connect,
+    _ensure_schema,
+    _get_schema_version,
+    _report_write,
+)
+
+logger = logging.getLogger(__name__)
+
+# 테이블 → (월 샤드 기준 컬럼, 국가/시장 샤드 컬럼, 자연 키)
+EXPORT_TABLES: dict[str, tuple[str | None, str | None, tuple[str, ...]]] = {
+    "sector_performance": ("date", "country", ("date", "country", "sector")),
+    "sector_performance_dirty": ("date", "country", ("date", "country")),
+    "abnormal_stock_summary": ("date", "country", ("date", "ticker")),
+    "benchmark_daily": ("date", "country", ("date", "ticker")),
+    "trend_scores": ("date", None, ("date", "sector")),
+    "collection_log": ("timestamp", "market", ("timestamp", "market", "status")),
+    "collection_checkpoint": ("requested_date", "market", ("market", "requested_date", "run_mode")),
+    "instrument_universe": (None, "country", ("country", "ticker")),
+    "instrument_metadata": (None, "country", ("country", "ticker")),
+    "lead_lag_scores": ("date", None, ("date", "sector", "leader", "follower", "follower_sector")),
+    "flow_signals": ("created_date", None, ("created_date", "sector", "leader", "follower")),
+    "lead_lag_state": (None, "sector", ("sector", "leader", "follower", "lag")),
+    "lead_lag_state_window": (None, None, ("state",)),
+    "derived_node_runs": ("date", None, ("date", "node")),
+    "stock_lead_lag_scores": (
+        "date",
+        None,
+        ("date", "leader_country", "leader_ticker", "follower_country", "follower_ticker"),
+    ),
+}
+
+# 일부 컬럼만 내보내는 테이블과 가져올 때 나머지 NOT NULL 컬럼에 넣을 값.
+# derived_node_runs의 실행 시간·시각은 매 실행 바뀌므로 Git에 올리지 않고,
+# 노드 건너뛰기에 필요한 fingerprint만 남긴다.
+EXPORT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "derived_node_runs": ("date", "node", "fingerprint"),
+}
+IMPORT_DEFAULTS: dict[str, dict[str, object]] = {
+    "derived_node_runs": {
+        "status": "imported",
+        "run_seconds": 0.0,
+        "fingerprint_seconds": 0.0,
+        "updated_at": "",
+    },
+}
+
+MANIFEST_NAME = "manifest.json"
+SHARD_SUFFIX = ".ndjson"
+
+SUMMARY_SCHEMA_VERSION = max(version for version, *_ in SUMMARY_MIGRATIONS)
+
+
+def export_dir() -> Path:
+    return database.DATA_DIR / SUMMARY_EXPORT_DIRNAME
+
+
+def _export_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    selected = EXPORT_COLUMNS.get(table)
+    return [
+        row["name"]
+        for row in rows
+        if row["name"] != "id" and (selected is None or row["name"] in selected)
+    ]
+
+
+def _shard_path(table: str, month: str | None, group: str | None) -> str:
+    parts = [table]
+    if month and group:
+        parts += [month, group]
+    else:
+        parts.append(month or group or table)
+    return "/".join(parts) + SHARD_SUFFIX
+
+
+def _encode(row: sqlite3.Row, columns: list[str]) -> str:
+    return json.dumps(
+        {column: row[column] for column in columns},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+
+
+def _table_shards(conn: sqlite3.Connection, table: str) -> tuple[list[str], dict[str, list[str]]]:
+    date_column, group_column, key_columns = EXPORT_TABLES[table]
+    columns = _export_columns(conn, table)
+    month_sql = f"substr({date_column}, 1, 7)" if date_column else "NULL"
+    group_sql = group_column or "NULL"
+    order = list(key_columns) + [column for column in columns if column not in key_columns]
+    rows = conn.execute(
+        f"""
+        SELECT {month_sql} AS _month, {group_sql} AS _group, {", ".join(columns)}
+        FROM {table}
+        ORDER BY _month, _group, {", ".join(order)}
+        """
+    )
+
+    shards: dict[str, list[str]] = {}
+    for row in rows:
+        path = _shard_path(table, row["_month"], row["_group"])
+        shards.setdefault(path, []).append(_encode(row, columns))
+    return columns, shards
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    data = content.encode("utf-8")
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def export_summary_db(target: Path | None = None) -> dict:
+    """summary DB를 정렬된 NDJSON 샤드로 내보낸다.
+
+    내용이 바뀐 샤드만 다시 쓰고, 더 이상 행이 없는 샤드 파일은 지운다.
+    """
+    target = Path(target or export_dir())
+    database.init_db()
+    conn = database.get_connection()
+    try:
+        schema_version = _get_schema_version(conn)
+        manifest_tables = {}
+        expected: set[Path] = set()
+        written = 0
+        rows_total = 0
+        for table in EXPORT_TABLES:
+            columns, shards = _table_shards(conn, table)
+            manifest_tables[table] = {"columns": columns}
+            for relpath, lines in shards.items():
+                path = target / relpath
+                expected.add(path)
+                rows_total += len(lines)
+                written += _write_if_changed(path, "\n".join(lines) + "\n")
+    finally:
+        conn.close()
+
+    removed = 0
+    for table in EXPORT_TABLES:
+        for path in sorted((target / table).rglob(f"*{SHARD_SUFFIX}")):
+            if path not in expected:
+                path.unlink()
+                removed += 1
+        for directory in sorted((target / table).glob("*/"), reverse=True):
+            if directory.is_dir() and not any(directory.iterdir()):
+                directory.rmdir()
+
+    manifest = {"schema_version": schema_version, "tables": manifest_tables}
+    _write_if_changed(
+        target / MANIFEST_NAME,
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+    )
+    logger.info(f"summary export: {rows_total}행, 샤드 {written}개 갱신, {removed}개 삭제")
+    return {"rows": rows_total, "shards_written": written, "shards_removed": removed}
+
+
+def import_summary_db(source: Path | None = None, db_path: Path | None = None) -> dict:
+    """NDJSON 샤드로 summary DB를 새로 만든다.
+
+    임시 파일에 현재 마이그레이션으로 스키마를 만들고 한 트랜잭션으로 채운 뒤
+    기존 DB 파일과 교체한다. 내보낸 뒤 추가된 컬럼은 기본값으로 남는다.
+    """
+    source = Path(source or export_dir())
+    db_path = Path(db_path or database.DB_PATH)
+    manifest = json.loads((source / MANIFEST_NAME).read_text(encoding="utf-8"))
+    if manifest["schema_version"] > SUMMARY_SCHEMA_VERSION:
+        raise ValueError(
+            f"export schema v{manifest['schema_version']} is newer than "
+            f"this code (v{SUMMARY_SCHEMA_VERSION})"
+        )
+
+    tmp_path = db_path.with_name(db_path.name + ".import")
+    for path in (tmp_path, Path(f"{tmp_path}-wal"), Path(f"{tmp_path}-shm")):
+        path.unlink(missing_ok=True)
+
+    _ensure_schema(tmp_path, SUMMARY_MIGRATIONS, SUMMARY_DB_PROFILE)
+    conn = _connect(tmp_path, SUMMARY_DB_PROFILE)
+    rows_total = 0
+    try:
+        conn.execute("PRAGMA synchronous = OFF")
+        with conn:
+            for table, spec in manifest["tables"].items():
+                if table not in EXPORT_TABLES:
+                    continue
+                # 예전 내보내기에 없는 컬럼 중 다른 컬럼 값을 물려받는 것은 함께 채운다.
+                fills = {
+                    column: origin
+                    for column, origin in SUMMARY_LEGACY_COLUMNS.get(table, {}).items()
+                    if column not in spec["columns"]
+                }
+                defaults = {
+                    column: value
+                    for column, value in IMPORT_DEFAULTS.get(table, {}).items()
+                    if column not in spec["columns"]
+                }
+                columns = spec["columns"] + list(fills.values())
+                insert_sql = (
+                    f"INSERT INTO {table} "
+                    f"({', '.join(spec['columns'] + list(fills) + list(defaults))}) "
+                    f"VALUES ({', '.join('?' for _ in [*columns, *defaults])})"
+                )
+                for path in sorted((source / table).rglob(f"*{SHARD_SUFFIX}")):
+                    with open(path, encoding="utf-8") as handle:
+                        rows = [
+                            tuple(record[column] for column in columns) + tuple(defaults.values())
+                            for record in map(json.loads, handle)
+                        ]
+                    with _report_write(conn) if table in REPORT_SOURCE_TABLES else nullcontext():
+                        conn.executemany(insert_sql, rows)
+                    rows_total += len(rows)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    for path in (Path(f"{db_path}-wal"), Path(f"{db_path}-shm")):
+        path.unlink(missing_ok=True)
+    os.replace(tmp_path, db_path)
+    for path in (Path(f"{tmp_path}-wal"), Path(f"{tmp_path}-shm")):
+        path.unlink(missing_ok=True)
+    logger.info(f"summary import: {rows_total}행 → {db_path}")
+    return {"rows": rows_total, "db_path": str(db_path)}
@@ -0,0 +1,208 @@
+"""CI 잡 시작용 warm-start 캐시 번들.
+
+Git에는 summary DB만 있으므로 Actions 잡은 raw 히스토리 없이 시작한다.
+잡 끝에 live raw DB와 최근 봉인 파티션을 파일별로 압축해 번들 디렉터리에 저장하고,
+다음 잡 시작 때 스트리밍으로 풀어 제자리에 놓는다.
+
+    .cache/warm_start/manifest.json
+    .cache/warm_start/parts/<sha256>.zst
+
+- 파트 이름이 원본 내용의 SHA-256이라서 바뀌지 않은 파일(봉인 파티션 등)은
+  저장 때 다시 압축하지 않고, 복원 때 로컬 파일 해시가 같으면 건너뛴다.
+- 코덱은 zstd가 기본이고 zstandard가 없으면 gzip을 쓸 수 있다. 파트마다 코덱을 기록한다.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from src import database
+from src.config import (
+    WARM_START_BUNDLE_DIR,
+    WARM_START_CODEC,
+    WARM_START_RAW_PARTITIONS,
+    WARM_START_ZSTD_LEVEL,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+PARTS_DIRNAME = "parts"
+CODEC_SUFFIX = {"zstd": ".zst", "gzip": ".gz"}
+CHUNK_SIZE = 1 << 20
+
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError("zstandard 미설치: pip install zstandard") from exc
+    return zstandard
+
+
+def _open_compressed_writer(path: Path, codec: str):
+    if codec == "zstd":
+        zstandard = _require_zstandard()
+        compressor = zstandard.ZstdCompressor(level=WARM_START_ZSTD_LEVEL, threads=-1)
+        return compressor.stream_writer(open(path, "wb"), closefd=True)
+    if codec == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    raise ValueError(f"unknown warm-start codec: {codec}")
+
+
+def _open_compressed_reader(path: Path, codec: str):
+    if codec == "zstd":
+        zstandard = _require_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    raise ValueError(f"unknown warm-start codec: {codec}")
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def warm_start_files() -> list[Path]:
+    """번들에 넣을 파일: live raw DB와 최근 봉인 파티션."""
+    files = []
+    if database.RAW_DB_PATH.exists():
+        files.append(database.RAW_DB_PATH)
+    if WARM_START_RAW_PARTITIONS > 0:
+        partitions = database.list_raw_partitions()
+        files.extend(path for _, path in partitions[-WARM_START_RAW_PARTITIONS:])
+    return files
+
+
+def _checkpoint_wal(path: Path) -> None:
+    """WAL에 남은 페이지를 DB 파일로 옮겨 파일 하나만 복사해도 되게 한다."""
+    wal_path = Path(f"{path}-wal")
+    if not wal_path.exists() or wal_path.stat().st_size == 0:
+        return
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+
+def load_manifest(bundle_dir: Path) -> dict:
+    path = Path(bundle_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {"files": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_bundle(bundle_dir: Path | None = None, codec: str = WARM_START_CODEC) -> dict:
+    """warm-start 파일을 번들 디렉터리에 저장한다.
+
+    이미 같은 해시의 파트가 있으면 압축을 건너뛰고, 더는 참조되지 않는 파트는 지운다.
+    """
+    bundle_dir = Path(bundle_dir or WARM_START_BUNDLE_DIR)
+    parts_dir = bundle_dir / PARTS_DIRNAME
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    files: dict[str, dict] = {}
+    stats = {"files": 0, "written": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+    for path in warm_start_files():
+        _checkpoint_wal(path)
+        digest = _sha256(path)
+        part_name = f"{digest}{CODEC_SUFFIX[codec]}"
+        part_path = parts_dir / part_name
+        size = path.stat().st_size
+
+        if part_path.exists():
+            stats["skipped"] += 1
+        else:
+            tmp_path = part_path.with_name(part_name + ".tmp")
+            with open(path, "rb") as source, _open_compressed_writer(tmp_path, codec) as sink:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    sink.write(chunk)
+            os.replace(tmp_path, part_path)
+            stats["written"] += 1
+            stats["bytes_in"] += size
+
+        files[path.relative_to(database.DATA_DIR).as_posix()] = {
+            "sha256": digest,
+            "size": size,
+            "part": part_name,
+            "codec": codec,
+        }
+        stats["files"] += 1
+
+    referenced = {entry["part"] for entry in files.values()}
+    for part_path in parts_dir.iterdir():
+        if part_path.name not in referenced:
+            part_path.unlink()
+
+    manifest_path = bundle_dir / MANIFEST_NAME
+    manifest_path.write_text(
+        json.dumps({"files": files}, indent=2, sort_keys=True) + "\n",
+        encoding="utf-8",
+    )
+    stats["bytes_out"] = sum((parts_dir / name).stat().st_size for name in referenced)
+    stats["seconds"] = time.perf_counter() - started
+    logger.info(
+        f"warm-start save: {stats['files']}개 파일, {stats['written']}개 압축, "
+        f"{stats['skipped']}개 재사용, 번들 {stats['bytes_out']:,} bytes"
+    )
+    return stats
+
+
+def restore_bundle(bundle_dir: Path | None = None) -> dict:
+    """번들의 파일을 DATA_DIR 아래 제자리로 풀어 놓는다.
+
+    로컬 파일의 크기와 해시가 manifest와 같으면 건너뛴다. 번들이 없으면 아무것도 하지 않는다.
+    """
+    bundle_dir = Path(bundle_dir or WARM_START_BUNDLE_DIR)
+    started = time.perf_counter()
+    stats = {"files": 0, "restored": 0, "skipped": 0, "bytes_read": 0, "bytes_written": 0}
+
+    for relpath, entry in sorted(load_manifest(bundle_dir).get("files", {}).items()):
+        target = database.DATA_DIR / relpath
+        stats["files"] += 1
+        if (
+            target.exists()
+            and target.stat().st_size == entry["size"]
+            and _sha256(target) == entry["sha256"]
+        ):
+            stats["skipped"] += 1
+            continue
+
+        part_path = bundle_dir / PARTS_DIRNAME / entry["part"]
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(target.name + ".restore")
+        digest = hashlib.sha256()
+        with _open_compressed_reader(part_path, entry["codec"]) as source, open(tmp_path, "wb") as sink:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                sink.write(chunk)
+        if digest.hexdigest() != entry["sha256"]:
+            tmp_path.unlink()
+            raise ValueError(f"warm-start part {entry['part']} does not match {relpath}")
+
+        for stale in (Path(f"{target}-wal"), Path(f"{target}-shm")):
+            stale.unlink(missing_ok=True)
+        os.replace(tmp_path, target)
+        stats["restored"] += 1
+        stats["bytes_read"] += part_path.stat().st_size
+        stats["bytes_written"] += entry["size"]
+
+    stats["seconds"] = time.perf_counter() - started
+    logger.info(
+        f"warm-start restore: {stats['restored']}개 복원, {stats['skipped']}개 최신, "
+        f"{stats['bytes_read']:,} bytes 읽음, {stats['seconds']:.2f}s"
+    )
+    return stats
@@ -0,0 +1,121 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src.analyzer import compute_trend_scores, compute_trend_scores_range
+
+COUNTRIES = ("CN", "HK", "JP", "KR", "TW", "US", "VN")
+SECTORS = ("반도체", "에너지", "금융", "기타")
+
+
+class TrendScoreRangeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write_sector_rows(self, dates: list[str], seed: int = 5) -> None:
+        rng = random.Random(seed)
+        rows = []
+        for date in dates:
+            for country in rng.sample(COUNTRIES, rng.randint(1, len(COUNTRIES))):
+                for sector in SECTORS:
+                    daily = rng.choice([None, 0.0, round(rng.uniform(-9, 9), rng.randint(1, 6))])
+                    weekly = rng.choice([None, round(rng.uniform(-20, 20), rng.randint(1, 6))])
+                    rows.append(
+                        {
+                            "date": date,
+                            "country": country,
+                            "sector": sector,
+                            "daily_return": daily,
+                            "weekly_return": weekly,
+                            "breadth": 0.5,
+                            "volume_change": 0.0,
+                            "stock_count": 10,
+                            "top_gainers": [],
+                            "top_losers": [],
+                            "collected_at": f"{date}T09:00:00",
+                        }
+                    )
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _stored_scores(self) -> list[dict]:
+        conn = database.get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM trend_scores ORDER BY date, sector"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{key: row[key] for key in row.keys() if key != "id"} for row in rows]
+
+    def _clear_scores(self) -> None:
+        conn = database.get_connection()
+        try:
+            conn.execute("DELETE FROM trend_scores")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_range_matches_single_date_scores_exactly(self) -> None:
+        dates = [f"2026-03-{day:02d}" for day in range(2, 28)]
+        self._write_sector_rows(dates)
+
+        expected = []
+        for date in dates:
+            expected.extend(compute_trend_scores(date=date))
+        single_stored = self._stored_scores()
+        self._clear_scores()
+
+        ranged = compute_trend_scores_range(dates[0], dates[-1])
+
+        def key(row):
+            return row["date"], row["sector"]
+
+        self.assertEqual(sorted(ranged, key=key), sorted(expected, key=key))
+        self.assertEqual(self._stored_scores(), single_stored)
+        self.assertFalse(any(row["sector"] == "기타" for row in ranged))
+
+    def test_range_reads_frozen_years(self) -> None:
+        self._write_sector_rows(["2024-05-02", "2024-05-03"])
+        database.freeze_summary_years(as_of="2026-04-20")
+        self._write_sector_rows(["2026-04-20"], seed=6)
+
+        expected = []
+        for date in ("2024-05-02", "2024-05-03", "2026-04-20"):
+            expected.extend(compute_trend_scores(date=date))
+        self._clear_scores()
+
+        ranged = compute_trend_scores_range("2024-01-01", "2026-04-20")
+
+        self.assertEqual(
+            sorted(ranged, key=lambda row: (row["date"], row["sector"])),
+            sorted(expected, key=lambda row: (row["date"], row["sector"])),
+        )
+        self.assertEqual(compute_trend_scores_range("2025-01-01", "2025-12-31"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
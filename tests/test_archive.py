@@ -0,0 +1,217 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src import archive
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def _stock_row(ticker: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "ticker": ticker,
+        "name": f"{ticker} Corp",
+        "country": "KR",
+        "sector": "반도체",
+        "market_cap": 1_000_000_000,
+        "close_price": 100.0,
+        "daily_return": 1.5,
+        "volume": 1_000_000,
+        "avg_volume_20d": 900_000,
+        "is_filtered": 1,
+        "is_abnormal": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+def _sector_row(sector: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "country": "KR",
+        "sector": sector,
+        "daily_return": 1.0,
+        "weekly_return": 2.0,
+        "breadth": 0.5,
+        "volume_change": 0.1,
+        "stock_count": 10,
+        "top_gainers": [],
+        "top_losers": [],
+        "collected_at": f"{date}T09:00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write_stocks(self, rows: list[dict]) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _write_sectors(self, rows: list[dict]) -> None:
+        database.init_db()
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _mark_archived(self, table: str, stale: dict[str, str]) -> None:
+        manifest = {"table": table, "partitions": {}}
+        for partition, fingerprint in stale.items():
+            country, month = partition.split("/")
+            relpath = archive._partition_relpath(country, month)
+            path = archive._table_dir(table) / relpath
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+            manifest["partitions"][partition] = {"path": relpath, "fingerprint": fingerprint, "rows": 0}
+        archive._save_manifest(table, manifest)
+
+    def test_plan_covers_live_and_sealed_months_per_country(self) -> None:
+        self._write_stocks(
+            [
+                _stock_row("005930", "2026-03-31"),
+                _stock_row("005930", "2026-04-01"),
+                _stock_row("AAPL", "2026-04-01", country="US"),
+            ]
+        )
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        self.assertEqual(
+            sorted(archive.plan_archive_sync("stock_daily")),
+            ["KR/2026-03", "KR/2026-04", "US/2026-04"],
+        )
+
+    def test_plan_only_returns_changed_partitions(self) -> None:
+        self._write_sectors(
+            [_sector_row("반도체", "2026-03-31"), _sector_row("반도체", "2026-04-01")]
+        )
+        self._mark_archived("sector_performance", archive.plan_archive_sync("sector_performance"))
+        self.assertEqual(archive.plan_archive_sync("sector_performance"), {})
+
+        self._write_sectors([_sector_row("반도체", "2026-04-02", daily_return=-1.0)])
+
+        self.assertEqual(list(archive.plan_archive_sync("sector_performance")), ["KR/2026-04"])
+
+    def test_plan_rewrites_partitions_with_missing_files(self) -> None:
+        self._write_stocks([_stock_row("005930", "2026-04-01")])
+        self._mark_archived("stock_daily", archive.plan_archive_sync("stock_daily"))
+        (archive._table_dir("stock_daily") / "country=KR" / "2026-04.arrow").unlink()
+
+        self.assertEqual(list(archive.plan_archive_sync("stock_daily")), ["KR/2026-04"])
+
+    def test_plan_detects_name_sector_and_flag_changes(self) -> None:
+        self._write_stocks([_stock_row("005930", "2026-04-01"), _stock_row("000660", "2026-04-01")])
+        self._mark_archived("stock_daily", archive.plan_archive_sync("stock_daily"))
+
+        for overrides in ({"name": "삼성전자"}, {"sector": "IT"}, {"is_abnormal": 1}):
+            self._write_stocks([_stock_row("005930", "2026-04-01", **overrides)])
+            stale = archive.plan_archive_sync("stock_daily")
+            self.assertEqual(list(stale), ["KR/2026-04"], overrides)
+            self._mark_archived("stock_daily", stale)
+
+    def test_plan_removes_partitions_gone_from_covered_months(self) -> None:
+        self._write_stocks(
+            [
+                _stock_row("005930", "2026-04-01"),
+                _stock_row("AAPL", "2026-04-01", country="US"),
+            ]
+        )
+        fingerprints = archive.plan_archive_sync("stock_daily")
+        self._mark_archived(
+            "stock_daily",
+            {**fingerprints, "JP/2026-04": "old", "KR/2026-01": "gone", "KR/2025-12": "kept"},
+        )
+        (archive._table_dir("stock_daily") / "country=KR" / "2026-01.arrow").unlink()
+
+        stale, orphaned = archive._plan("stock_daily", archive.load_manifest("stock_daily"))
+        self.assertEqual(stale, {})
+        # KR/2025-12: 월 전체가 소스에서 빠진 파티션(보관 기간)은 파일이 있으면 남긴다
+        self.assertEqual(orphaned, ["JP/2026-04", "KR/2026-01"])
+
+    def test_raw_fact_query_seeks_per_instrument(self) -> None:
+        self._write_stocks([_stock_row("005930", "2026-03-31"), _stock_row("005930", "2026-04-01")])
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        with database.open_raw_range("2026-03-01", "2026-04-30") as conn:
+            query, params = database.raw_fact_query(
+                conn,
+                "i.ticker, f.date",
+                "2026-03-01",
+                "2026-04-30",
+                where="i.country = ?",
+                params=("KR",),
+            )
+            self.assertEqual(
+                [tuple(row) for row in conn.execute(query, params)],
+                [("005930", 20260401), ("005930", 20260331)],
+            )
+            details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+        self.assertFalse([detail for detail in details if detail.startswith("SCAN f")], details)
+
+    @unittest.skipIf(HAS_PYARROW, "pyarrow installed")
+    def test_sync_requires_pyarrow(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "pyarrow"):
+            archive.sync_archive("stock_daily")
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_round_trip_reads_range_and_columns(self) -> None:
+        self._write_stocks(
+            [
+                _stock_row("005930", "2026-03-30", close_price=98.0),
+                _stock_row("005930", "2026-03-31", close_price=99.0),
+                _stock_row("005930", "2026-04-01", close_price=100.0),
+                _stock_row("AAPL", "2026-04-01", country="US", close_price=180.0),
+            ]
+        )
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        result = archive.sync_archive("stock_daily")
+        self.assertEqual(result["rows_written"], 4)
+        self.assertEqual(archive.sync_archive("stock_daily")["partitions_written"], [])
+
+        arrays = archive.read_archive_numpy(
+            "stock_daily",
+            "2026-03-31",
+            "2026-04-30",
+            columns=["close_price"],
+            countries=["KR"],
+        )
+        self.assertEqual(arrays["close_price"].tolist(), [99.0, 100.0])
+
+        table = archive.read_archive("stock_daily", columns=["ticker", "date"])
+        self.assertEqual(table.column_names, ["ticker", "date"])
+        self.assertEqual(table.num_rows, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
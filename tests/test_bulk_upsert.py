@@ -0,0 +1,171 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+
+
+def _stock_row(ticker: str, date: str = "2026-04-20", **overrides) -> dict:
+    row = {
+        "date": date,
+        "ticker": ticker,
+        "name": f"{ticker} Corp",
+        "country": "US",
+        "sector": "Information Technology",
+        "market_cap": 1_000_000_000,
+        "close_price": 100.0,
+        "daily_return": 1.5,
+        "volume": 1_000_000,
+        "avg_volume_20d": 900_000,
+        "is_filtered": 1,
+        "is_abnormal": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+class BulkUpsertTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+        database.init_raw_db()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _stock_snapshot(self, threshold: int, batches: list[list[dict]]) -> list[tuple]:
+        conn = database.get_raw_connection()
+        try:
+            conn.execute("DELETE FROM stock_daily_fact")
+            with patch.object(database, "BULK_UPSERT_THRESHOLD", threshold):
+                for batch in batches:
+                    database.upsert_stock_daily(conn, batch)
+            conn.commit()
+            rows = conn.execute(
+                """
+                SELECT date, ticker, name, sector, close_price, daily_return
+                FROM stock_daily
+                ORDER BY date, ticker
+                """
+            ).fetchall()
+            return [tuple(row) for row in rows]
+        finally:
+            conn.close()
+
+    def test_staging_path_matches_row_by_row_path(self) -> None:
+        batches = [
+            [_stock_row("AAA"), _stock_row("BBB"), _stock_row("AAA", close_price=101.0)],
+            [_stock_row("BBB", daily_return=-2.0), _stock_row("CCC", date="2026-04-21")],
+        ]
+
+        row_by_row = self._stock_snapshot(10_000, batches)
+        staged = self._stock_snapshot(1, batches)
+
+        self.assertEqual(staged, row_by_row)
+        self.assertIn(
+            ("2026-04-20", "AAA", "AAA Corp", "Information Technology", 101.0, 1.5),
+            staged,
+        )
+
+    def test_staging_table_is_emptied_after_merge(self) -> None:
+        conn = database.get_raw_connection()
+        try:
+            with patch.object(database, "BULK_UPSERT_THRESHOLD", 1):
+                database.upsert_stock_daily(conn, [_stock_row("AAA"), _stock_row("BBB")])
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM temp.stage_stock_daily_fact").fetchone()[0],
+                0,
+            )
+        finally:
+            conn.close()
+
+    def test_universe_bulk_path_keeps_cached_name_and_sector(self) -> None:
+        conn = database.get_connection()
+        try:
+            with patch.object(database, "BULK_UPSERT_THRESHOLD", 1):
+                database.upsert_instrument_universe(conn, "US", [_stock_row("AAA")])
+                database.upsert_instrument_universe(
+                    conn,
+                    "US",
+                    [_stock_row("AAA", date="2026-04-21", name=" ", sector="기타", market_cap=None)],
+                )
+            conn.commit()
+            row = database.get_instrument_universe(conn, "US")[0]
+        finally:
+            conn.close()
+
+        self.assertEqual(row["name"], "AAA Corp")
+        self.assertEqual(row["sector"], "Information Technology")
+        self.assertEqual(row["market_cap"], 1_000_000_000)
+        self.assertEqual(row["last_seen_date"], "2026-04-21")
+
+    def test_universe_skips_rows_without_changes(self) -> None:
+        rows = [_stock_row("AAA"), _stock_row("BBB")]
+        for threshold in (10_000, 1):
+            with self.subTest(threshold=threshold):
+                conn = database.get_connection()
+                try:
+                    conn.execute("DELETE FROM instrument_universe")
+                    with patch.object(database, "BULK_UPSERT_THRESHOLD", threshold):
+                        database.upsert_instrument_universe(conn, "US", rows)
+                        conn.commit()
+                        before = {
+                            row["ticker"]: row["updated_at"]
+                            for row in database.get_instrument_universe(conn, "US")
+                        }
+
+                        with patch.object(database, "datetime") as mock_datetime:
+                            mock_datetime.utcnow.return_value.isoformat.return_value = "later"
+                            database.upsert_instrument_universe(
+                                conn,
+                                "US",
+                                [rows[0], _stock_row("BBB", close_price=99.0)],
+                            )
+                        conn.commit()
+                        after = {
+                            row["ticker"]: row["updated_at"]
+                            for row in database.get_instrument_universe(conn, "US")
+                        }
+                finally:
+                    conn.close()
+
+                self.assertEqual(after["AAA"], before["AAA"])
+                self.assertEqual(after["BBB"], "later")
+
+    def test_universe_bulk_path_leaves_db_untouched_without_changes(self) -> None:
+        rows = [_stock_row("AAA"), _stock_row("BBB")]
+        conn = database.get_connection()
+        observer = database.get_connection()
+        try:
+            with patch.object(database, "BULK_UPSERT_THRESHOLD", 1):
+                database.upsert_instrument_universe(conn, "US", rows)
+                conn.commit()
+                version = observer.execute("PRAGMA data_version").fetchone()[0]
+
+                database.upsert_instrument_universe(conn, "US", rows)
+                conn.commit()
+
+            self.assertEqual(
+                observer.execute("PRAGMA data_version").fetchone()[0],
+                version,
+            )
+        finally:
+            observer.close()
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
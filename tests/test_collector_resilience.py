@@ -103,10 +103,10 @@ class CollectorResilienceTests(unittest.TestCase):
         fake_vnstock.Listing = BrokenListing
         fake_vnstock.Quote = BrokenQuote
         fake_vnstock.Vnstock = BrokenVnstock
-        fake_conn = types.SimpleNamespace(close=lambda: None)
+        fake_session = types.SimpleNamespace(summary=object(), close=lambda: None)
 
         with patch.dict(sys.modules, {"vnstock": fake_vnstock}):
-            with patch("src.collectors.vietnam.get_connection", return_value=fake_conn):
+            with patch("src.collectors.base.DatabaseSession", return_value=fake_session):
                 with patch(
                     "src.collectors.vietnam.get_instrument_universe",
                     return_value=[
@@ -0,0 +1,160 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import src.database as database
+from src.collectors.base import BaseCollector
+from src.collectors.korea import KoreaCollector
+
+
+class CacheReadingCollector(BaseCollector):
+    """Collector that touches the metadata cache helpers mid-run."""
+
+    country_code = "US"
+
+    def __init__(self, rows: list[dict]):
+        self._rows = rows
+
+    def fetch_all_stocks(self, date: str) -> pd.DataFrame:
+        tickers = [row["ticker"] for row in self._rows]
+        self._get_cached_metadata(tickers)
+        self._upsert_metadata(
+            [{"ticker": row["ticker"], "name": row["name"]} for row in self._rows],
+            source="test",
+        )
+        self._get_cached_metadata(tickers)
+        return pd.DataFrame(self._rows)
+
+
+class DatabaseSessionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _count(self, sql: str) -> int:
+        conn = database.get_connection()
+        try:
+            return conn.execute(sql).fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_collection_run_opens_one_connection_per_db(self) -> None:
+        collector = CacheReadingCollector(
+            [
+                {
+                    "ticker": "AAA",
+                    "name": "Alpha",
+                    "sector": "Tech",
+                    "market_cap": 800_000_000,
+                    "close_price": 101.0,
+                    "daily_return": 2.0,
+                    "volume": 1_000_000,
+                    "avg_volume_20d": 900_000,
+                },
+            ]
+        )
+
+        with patch.object(
+            database, "get_connection", wraps=database.get_connection
+        ) as mock_summary, patch.object(
+            database, "get_raw_connection", wraps=database.get_raw_connection
+        ) as mock_raw:
+            self.assertTrue(collector.run(date="2026-04-20"))
+
+        self.assertEqual(mock_summary.call_count, 1)
+        self.assertEqual(mock_raw.call_count, 1)
+        self.assertIsNone(collector._session)
+        self.assertEqual(self._count("SELECT COUNT(*) FROM instrument_metadata"), 1)
+        self.assertEqual(self._count("SELECT COUNT(*) FROM sector_performance"), 1)
+
+    def test_nested_transactions_commit_once(self) -> None:
+        with database.DatabaseSession() as session:
+            with session.summary_transaction() as conn:
+                database.log_collection(conn, "KR", "success")
+                with session.summary_transaction() as inner:
+                    database.log_collection(inner, "VN", "success")
+                self.assertTrue(conn.in_transaction)
+                self.assertEqual(self._count("SELECT COUNT(*) FROM collection_log"), 0)
+
+            self.assertFalse(session.summary.in_transaction)
+
+        self.assertEqual(self._count("SELECT COUNT(*) FROM collection_log"), 2)
+
+    def test_transaction_rolls_back_on_error(self) -> None:
+        with database.DatabaseSession() as session:
+            with self.assertRaises(RuntimeError):
+                with session.summary_transaction() as conn:
+                    database.log_collection(conn, "KR", "success")
+                    raise RuntimeError("boom")
+
+        self.assertEqual(self._count("SELECT COUNT(*) FROM collection_log"), 0)
+
+    def test_raw_range_reads_sealed_partitions_on_the_session_connection(self) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(
+                conn,
+                [
+                    {
+                        "date": date,
+                        "ticker": "005930",
+                        "name": "삼성전자",
+                        "country": "KR",
+                        "sector": "반도체",
+                        "close_price": close_price,
+                    }
+                    for date, close_price in (("2026-03-31", 98.0), ("2026-04-01", 99.0))
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        collector = KoreaCollector()
+        with patch.object(
+            database, "get_raw_connection", wraps=database.get_raw_connection
+        ) as mock_raw, database.DatabaseSession() as session:
+            collector._session = session
+            self.assertEqual(
+                collector._load_cached_close_map(["005930"], "2026-04-01"), {"005930": 99.0}
+            )
+            self.assertEqual(
+                collector._load_cached_close_map(["005930"], "2026-03-31"), {"005930": 98.0}
+            )
+
+            schemas = [row[1] for row in session.raw.execute("PRAGMA database_list")]
+            self.assertEqual(schemas, ["main"])
+            with session.raw_transaction() as raw_conn:
+                database.upsert_stock_daily(
+                    raw_conn,
+                    [{"date": "2026-04-20", "ticker": "005930", "country": "KR", "close_price": 1.0}],
+                )
+                with self.assertRaises(RuntimeError):
+                    with session.raw_range("2026-03-01", "2026-04-20"):
+                        pass
+            collector._session = None
+
+        self.assertEqual(mock_raw.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from scripts import merge_raw_db
+
+
+def _stock_row(ticker: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "ticker": ticker,
+        "name": f"{ticker} Corp",
+        "country": "KR",
+        "sector": "반도체",
+        "market_cap": 1_000_000_000,
+        "close_price": 100.0,
+        "daily_return": 1.5,
+        "volume": 1_000_000,
+        "avg_volume_20d": 900_000,
+        "is_filtered": 1,
+        "is_abnormal": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+class MergeRawDbTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tempdir.name)
+        self.data_dir = self.root / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.artifacts = self.root / "artifacts"
+        self.artifacts.mkdir()
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _artifact(self, name: str, rows: list[dict], mtime: int | None = None) -> Path:
+        path = self.artifacts / name / "marketbot_raw.db"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        database._ensure_schema(path, database.RAW_MIGRATIONS, database.RAW_DB_PROFILE)
+        conn = database._connect(path, database.RAW_DB_PROFILE)
+        try:
+            database.upsert_stock_daily(conn, rows)
+            conn.commit()
+            conn.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            conn.close()
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def _rows(self, start: str, end: str) -> list[tuple]:
+        with database.open_raw_range(start, end) as conn:
+            rows = conn.execute(
+                """
+                SELECT date, country, ticker, close_price
+                FROM stock_daily
+                WHERE date BETWEEN ? AND ?
+                ORDER BY date, country, ticker
+                """,
+                (start, end),
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def test_newest_collected_row_wins_regardless_of_file_order(self) -> None:
+        # Different instrument ids per file: US rows only exist in the newer file.
+        self._artifact(
+            "run2-KR",
+            [
+                _stock_row("AAPL", "2026-04-17", country="US", close_price=180.0, collected_at=50),
+                _stock_row("005930", "2026-04-17", close_price=101.0, collected_at=200),
+            ],
+            mtime=1_000,
+        )
+        self._artifact(
+            "run1-KR",
+            [_stock_row("005930", "2026-04-17", close_price=99.0, collected_at=100)],
+            mtime=2_000,
+        )
+
+        merge_raw_db.merge([self.artifacts], as_of="2026-04-20")
+
+        self.assertEqual(
+            self._rows("2026-04-01", "2026-04-30"),
+            [("2026-04-17", "KR", "005930", 101.0), ("2026-04-17", "US", "AAPL", 180.0)],
+        )
+
+    def test_closed_periods_go_to_sealed_partitions(self) -> None:
+        self._artifact(
+            "run1-KR",
+            [_stock_row("005930", "2026-02-27"), _stock_row("005930", "2026-03-31")],
+        )
+        self._artifact("run2-KR", [_stock_row("005930", "2026-04-01")])
+
+        results = merge_raw_db.merge([self.artifacts], as_of="2026-04-20", jobs=2)
+
+        self.assertEqual(
+            {target.name: rows for target, rows in results.items()},
+            {
+                "stock_daily_2026-02.db": 1,
+                "stock_daily_2026-03.db": 1,
+                "marketbot_raw.db": 1,
+            },
+        )
+        conn = sqlite3.connect(str(database._raw_partition_path("2026-03")))
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+        finally:
+            conn.close()
+        self.assertEqual(len(self._rows("2026-01-01", "2026-04-30")), 3)
+
+    def test_legacy_artifact_uses_file_mtime(self) -> None:
+        legacy_path = self.artifacts / "legacy" / "marketbot_raw.db"
+        legacy_path.parent.mkdir(parents=True)
+        conn = sqlite3.connect(str(legacy_path))
+        try:
+            database._raw_v1_base_schema(conn)
+            conn.execute(
+                """
+                INSERT INTO stock_daily (
+                    date, ticker, name, country, sector, market_cap, close_price,
+                    daily_return, volume, avg_volume_20d, is_filtered, is_abnormal
+                )
+                VALUES ('2026-04-17', '005930', '삼성전자', 'KR', '반도체', 1, 97.0, 0, 1, 1, 1, 0)
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.utime(legacy_path, (5_000, 5_000))
+        self._artifact(
+            "newer",
+            [_stock_row("005930", "2026-04-17", close_price=99.0, collected_at=4_000)],
+        )
+
+        merge_raw_db.merge([self.artifacts], as_of="2026-04-20")
+
+        self.assertEqual(self._rows("2026-04-17", "2026-04-17"), [("2026-04-17", "KR", "005930", 97.0)])
+
+    def test_migration_stamps_collection_time_on_new_rows(self) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(conn, [_stock_row("005930", "2026-04-17")])
+            collected_at = conn.execute("SELECT collected_at FROM stock_daily_fact").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertGreater(collected_at, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src.pipeline import Node, run_nodes
+
+SECTOR_QUERY = "SELECT date, country, sector, daily_return FROM sector_performance ORDER BY date, country, sector"
+
+
+def _sector_row(date: str, country: str, daily_return: float) -> dict:
+    return {
+        "date": date,
+        "country": country,
+        "sector": "반도체",
+        "daily_return": daily_return,
+        "weekly_return": 0.0,
+        "breadth": 0.5,
+        "volume_change": 0.0,
+        "stock_count": 10,
+        "top_gainers": [],
+        "top_losers": [],
+        "collected_at": f"{date}T09:00:00",
+    }
+
+
+class PipelineRunnerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+        self._write([_sector_row("2026-04-20", "KR", 1.0)])
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write(self, rows: list[dict]) -> None:
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_nodes_with_unchanged_inputs_are_skipped(self) -> None:
+        calls = []
+        nodes = [
+            Node("sectors", run=lambda: calls.append("sectors"), inputs=lambda: [(SECTOR_QUERY, ())]),
+            Node(
+                "weighted",
+                run=lambda: calls.append("weighted"),
+                inputs=lambda: [(SECTOR_QUERY, ())],
+                params=(0.4,),
+                deps=("sectors",),
+            ),
+        ]
+
+        first = run_nodes(nodes, key="2026-04-20")
+        self.assertEqual(calls, ["sectors", "weighted"])
+        self.assertEqual([run["status"] for run in first], ["ran", "ran"])
+
+        second = run_nodes(nodes, key="2026-04-20")
+        self.assertEqual(calls, ["sectors", "weighted"])
+        self.assertEqual({run["status"] for run in second}, {"skipped"})
+
+        # 다른 키는 따로 기록하고, 입력 행이 바뀌면 다시 돈다
+        run_nodes(nodes[:1], key="2026-04-21")
+        self._write([_sector_row("2026-04-20", "US", -1.0)])
+        run_nodes(nodes, key="2026-04-20")
+        self.assertEqual(calls, ["sectors", "weighted", "sectors", "sectors", "weighted"])
+
+        # 설정값이 바뀐 노드만 다시 돈다
+        changed = [nodes[0], Node("weighted", run=nodes[1].run, inputs=nodes[1].inputs, params=(0.5,))]
+        run_nodes(changed, key="2026-04-20")
+        self.assertEqual(calls[-1], "weighted")
+        self.assertEqual(len(calls), 6)
+
+        run_nodes(nodes, key="2026-04-20", force=True)
+        self.assertEqual(len(calls), 8)
+
+    def test_independent_nodes_run_in_parallel_and_timings_are_stored(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+        order = []
+
+        def meet(name):
+            def run():
+                barrier.wait()
+                order.append(name)
+
+            return run
+
+        nodes = [
+            Node("signals", run=lambda: order.append("signals"), inputs=lambda: [], deps=("trend", "lead_lag")),
+            Node("trend", run=meet("trend"), inputs=lambda: [(SECTOR_QUERY, ())]),
+            Node("lead_lag", run=meet("lead_lag"), inputs=lambda: [(SECTOR_QUERY, ())]),
+        ]
+        runs = run_nodes(nodes, key="2026-04-20", jobs=2)
+
+        self.assertEqual(sorted(order[:2]), ["lead_lag", "trend"])
+        self.assertEqual(order[2], "signals")
+        self.assertEqual(runs[-1]["node"], "signals")
+
+        conn = database.get_connection()
+        try:
+            stored = {row["node"]: row for row in database.get_derived_node_runs(conn)}
+        finally:
+            conn.close()
+        self.assertEqual(set(stored), {"signals", "trend", "lead_lag"})
+        self.assertTrue(all(row["date"] == "2026-04-20" for row in stored.values()))
+        self.assertTrue(all(row["run_seconds"] >= 0 for row in stored.values()))
+        self.assertEqual(len(stored["trend"]["fingerprint"]), 64)
+
+    def test_parallel_node_writes_are_serialized(self) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+
+        def writer(country):
+            def run():
+                barrier.wait()
+                conn = database.get_connection()
+                try:
+                    for day in range(1, 21):
+                        with database.summary_write(conn):
+                            database.upsert_sector_performance(
+                                conn, [_sector_row(f"2026-03-{day:02d}", country, 0.5)]
+                            )
+                finally:
+                    conn.close()
+
+            return run
+
+        nodes = [
+            Node(country, run=writer(country), inputs=lambda: []) for country in ("KR", "US", "JP")
+        ]
+        self.assertEqual({run["status"] for run in run_nodes(nodes, key="2026-04-20", jobs=3)}, {"ran"})
+
+        conn = database.get_connection()
+        try:
+            with self.assertRaises(RuntimeError):
+                with database.summary_write(conn):
+                    database.upsert_sector_performance(conn, [_sector_row("2026-03-31", "DE", 1.0)])
+                    raise RuntimeError("boom")
+            count = conn.execute(
+                "SELECT COUNT(*) FROM sector_performance WHERE date LIKE '2026-03-%'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(count, 60)
+
+    def test_unknown_dependencies_and_cycles_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            run_nodes([Node("a", run=lambda: None, inputs=lambda: [], deps=("missing",))], key="k")
+        with self.assertRaises(ValueError):
+            run_nodes(
+                [
+                    Node("a", run=lambda: None, inputs=lambda: [], deps=("b",)),
+                    Node("b", run=lambda: None, inputs=lambda: [], deps=("a",)),
+                ],
+                key="k",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import re
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src.config import COUNTRIES, SECTORS
+
+SEED_YEARS = 3
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+class HotQueryPlanTests(unittest.TestCase):
+    """Hot queries must stay on an index as the summary DB grows."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.tempdir = tempfile.TemporaryDirectory()
+        cls.data_dir = Path(cls.tempdir.name) / "data"
+        cls.data_dir.mkdir(parents=True, exist_ok=True)
+
+        cls.patchers = [
+            patch.object(database, "DATA_DIR", cls.data_dir),
+            patch.object(database, "DB_PATH", cls.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", cls.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in cls.patchers:
+            patcher.start()
+
+        database.init_db()
+        cls.conn = database.get_connection()
+        cls._seed(cls.conn)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.conn.close()
+        for patcher in reversed(cls.patchers):
+            patcher.stop()
+        cls.tempdir.cleanup()
+
+    @staticmethod
+    def _seed(conn) -> None:
+        start = date(2026, 4, 20) - timedelta(days=365 * SEED_YEARS)
+        days = [
+            (start + timedelta(days=offset)).isoformat()
+            for offset in range(365 * SEED_YEARS)
+            if (start + timedelta(days=offset)).weekday() < 5
+        ]
+        sectors = list(SECTORS.values())
+
+        conn.executemany(
+            """
+            INSERT INTO sector_performance (
+                date, country, sector, daily_return, breadth, stock_count, collected_at
+            )
+            VALUES (?, ?, ?, ?, 0.5, 10, ?)
+            """,
+            (
+                (day, country, sector, 0.1, day)
+                for day in days
+                for country in COUNTRIES
+                for sector in sectors
+            ),
+        )
+        conn.executemany(
+            """
+            INSERT INTO benchmark_daily (date, ticker, name, country, sector, daily_return)
+            VALUES (?, ?, ?, ?, ?, 0.1)
+            """,
+            (
+                (day, f"{country}-{sector}", sector, country, sector)
+                for day in days
+                for country in COUNTRIES
+                for sector in sectors[:4]
+            ),
+        )
+        conn.executemany(
+            """
+            INSERT INTO collection_log (timestamp, market, status)
+            VALUES (?, ?, ?)
+            """,
+            (
+                (f"{day}T00:00:00", country, "failed" if index % 9 == 0 else "success")
+                for index, day in enumerate(days)
+                for country in COUNTRIES
+            ),
+        )
+        conn.executemany(
+            """
+            INSERT INTO instrument_universe (
+                country, ticker, name, sector, last_seen_date, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (country, f"T{ticker:05d}", f"Ticker {ticker}", sectors[ticker % 11], days[-1], days[-1])
+                for country in COUNTRIES
+                for ticker in range(2000)
+            ),
+        )
+        conn.commit()
+
+    def _full_scans(self, sql: str, params: tuple) -> list[str]:
+        plan = self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        scans = []
+        for row in plan:
+            match = FULL_SCAN.match(row["detail"])
+            if match and database.table_exists(self.conn, match.group(1)):
+                scans.append(row["detail"])
+        return scans
+
+    def test_registered_hot_queries_use_an_index(self) -> None:
+        self.assertTrue(database.HOT_QUERIES)
+        for name, (sql, params) in database.HOT_QUERIES.items():
+            with self.subTest(query=name):
+                self.assertEqual(self._full_scans(sql, params), [])
+
+    def test_hot_queries_still_use_an_index_after_analyze(self) -> None:
+        self.conn.execute("ANALYZE")
+        try:
+            for name, (sql, params) in database.HOT_QUERIES.items():
+                with self.subTest(query=name):
+                    self.assertEqual(self._full_scans(sql, params), [])
+        finally:
+            self.conn.execute("DROP TABLE IF EXISTS sqlite_stat1")
+            self.conn.commit()
+
+    def test_detector_flags_unindexed_scan(self) -> None:
+        self.assertEqual(
+            self._full_scans(
+                "SELECT * FROM sector_performance WHERE weekly_return > ?",
+                (0,),
+            ),
+            ["SCAN sector_performance"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
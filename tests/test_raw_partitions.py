@@ -0,0 +1,175 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from scripts import build_kr_sector_reference
+
+
+def _stock_row(ticker: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "ticker": ticker,
+        "name": f"{ticker} Corp",
+        "country": "KR",
+        "sector": "반도체",
+        "market_cap": 1_000_000_000,
+        "close_price": 100.0,
+        "daily_return": 1.5,
+        "volume": 1_000_000,
+        "avg_volume_20d": 900_000,
+        "is_filtered": 1,
+        "is_abnormal": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+class RawPartitionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.raw_db_path = self.data_dir / "marketbot_raw.db"
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.raw_db_path),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write_live(self, rows: list[dict]) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _live_dates(self) -> list[str]:
+        conn = database.get_raw_connection()
+        try:
+            return [row[0] for row in conn.execute("SELECT date FROM stock_daily ORDER BY date")]
+        finally:
+            conn.close()
+
+    def test_partition_keys(self) -> None:
+        self.assertEqual(database.raw_partition_key("2026-04-20"), "2026-04")
+        self.assertEqual(database.raw_partition_key("2026-04-20", "quarter"), "2026Q2")
+        self.assertEqual(database._raw_partition_bounds("2026Q2"), (20260401, 20260631))
+
+    def test_seal_moves_closed_months_out_of_live_db(self) -> None:
+        self._write_live(
+            [
+                _stock_row("005930", "2026-02-27"),
+                _stock_row("005930", "2026-03-31"),
+                _stock_row("005930", "2026-04-01"),
+            ]
+        )
+
+        sealed = database.seal_raw_partitions(as_of="2026-04-20")
+
+        self.assertEqual(sealed, ["2026-02", "2026-03"])
+        self.assertEqual(self._live_dates(), ["2026-04-01"])
+        self.assertEqual(
+            [key for key, _ in database.list_raw_partitions()],
+            ["2026-02", "2026-03"],
+        )
+        conn = sqlite3.connect(str(database._raw_partition_path("2026-03")))
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            self.assertEqual(conn.execute("SELECT date FROM stock_daily").fetchall(), [("2026-03-31",)])
+        finally:
+            conn.close()
+
+    def test_range_reads_attach_only_needed_partitions(self) -> None:
+        self._write_live(
+            [
+                _stock_row("005930", "2026-01-30"),
+                _stock_row("005930", "2026-02-27"),
+                _stock_row("005930", "2026-03-31"),
+                _stock_row("005930", "2026-04-01"),
+            ]
+        )
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        with database.open_raw_range("2026-03-25", "2026-04-20") as conn:
+            attached = [row[1] for row in conn.execute("PRAGMA database_list")]
+            dates = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT date FROM stock_daily WHERE date BETWEEN ? AND ? ORDER BY date",
+                    ("2026-03-25", "2026-04-20"),
+                )
+            ]
+
+        self.assertEqual(attached, ["main", "temp", "p0"])
+        self.assertEqual(dates, ["2026-03-31", "2026-04-01"])
+
+        with database.open_raw_range() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM stock_daily").fetchone()[0], 4)
+
+    def test_late_rows_win_until_merged_into_partition(self) -> None:
+        self._write_live([_stock_row("005930", "2026-03-31", close_price=100.0)])
+        database.seal_raw_partitions(as_of="2026-04-20")
+        self._write_live([_stock_row("005930", "2026-03-31", close_price=105.0)])
+
+        with database.open_raw_range("2026-03-01", "2026-03-31") as conn:
+            rows = conn.execute("SELECT close_price FROM stock_daily").fetchall()
+        self.assertEqual([row[0] for row in rows], [105.0])
+
+        self.assertEqual(database.seal_raw_partitions(as_of="2026-04-20"), ["2026-03"])
+        self.assertEqual(self._live_dates(), [])
+        with database.open_raw_range("2026-03-01", "2026-03-31") as conn:
+            rows = conn.execute("SELECT close_price FROM stock_daily").fetchall()
+        self.assertEqual([row[0] for row in rows], [105.0])
+
+    def test_prune_keeps_newest_partitions(self) -> None:
+        self._write_live(
+            [
+                _stock_row("005930", "2026-01-30"),
+                _stock_row("005930", "2026-02-27"),
+                _stock_row("005930", "2026-03-31"),
+            ]
+        )
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        pruned = database.prune_raw_partitions(keep=2)
+
+        self.assertEqual(pruned, ["2026-01"])
+        self.assertEqual(
+            [key for key, _ in database.list_raw_partitions()],
+            ["2026-02", "2026-03"],
+        )
+
+    def test_sector_reference_reads_sealed_partitions(self) -> None:
+        self._write_live(
+            [
+                _stock_row("005930", "2026-03-31", sector="전기전자"),
+                _stock_row("000660", "2026-03-31"),
+                _stock_row("005930", "2026-04-01"),
+            ]
+        )
+        database.seal_raw_partitions(as_of="2026-04-20")
+
+        with patch.object(
+            build_kr_sector_reference, "RAW_DB_PATH", self.raw_db_path
+        ), patch.object(build_kr_sector_reference, "ROOT", Path(self.tempdir.name)):
+            reference = build_kr_sector_reference.build_reference()
+
+        self.assertEqual(reference["latest_date"], "2026-04-01")
+        self.assertEqual(reference["tickers"], {"000660": "반도체", "005930": "반도체"})
+
+
+if __name__ == "__main__":
+    unittest.main()
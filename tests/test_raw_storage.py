@@ -0,0 +1,175 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from scripts import build_kr_sector_reference
+from src.collectors.korea import KoreaCollector
+
+
+def _stock_row(ticker: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "ticker": ticker,
+        "name": f"{ticker} Corp",
+        "country": "KR",
+        "sector": "반도체",
+        "market_cap": 1_000_000_000,
+        "close_price": 100.0,
+        "daily_return": 1.5,
+        "volume": 1_000_000,
+        "avg_volume_20d": 900_000,
+        "is_filtered": 1,
+        "is_abnormal": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+class RawStorageTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.raw_db_path = self.data_dir / "marketbot_raw.db"
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.raw_db_path),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _create_v1_raw_db(self, rows: list[dict]) -> None:
+        conn = sqlite3.connect(str(self.raw_db_path))
+        try:
+            database._raw_v1_base_schema(conn)
+            conn.executemany(
+                """
+                INSERT INTO stock_daily (
+                    date, ticker, name, country, sector, market_cap,
+                    close_price, daily_return, volume, avg_volume_20d,
+                    is_filtered, is_abnormal
+                )
+                VALUES (
+                    :date, :ticker, :name, :country, :sector, :market_cap,
+                    :close_price, :daily_return, :volume, :avg_volume_20d,
+                    :is_filtered, :is_abnormal
+                )
+                """,
+                rows,
+            )
+            conn.execute(
+                "CREATE TABLE schema_version (version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TEXT NOT NULL)"
+            )
+            conn.execute("INSERT INTO schema_version VALUES (1, 'base_schema', '2026-01-01')")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _view_rows(self) -> list[dict]:
+        conn = database.get_raw_connection()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM stock_daily ORDER BY date, ticker"
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def test_migration_moves_legacy_rows_into_dimension_and_fact(self) -> None:
+        legacy_rows = [
+            _stock_row("005930", "2026-04-17", name="삼성전자"),
+            _stock_row("005930", "2026-04-20", name="삼성전자", close_price=101.0),
+            _stock_row("000660", "2026-04-20", name="SK하이닉스", sector="기타"),
+        ]
+        self._create_v1_raw_db(legacy_rows)
+
+        database.init_raw_db()
+
+        conn = database.get_raw_connection()
+        try:
+            self.assertFalse(database.table_exists(conn, "stock_daily_legacy"))
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM raw_instrument").fetchone()[0],
+                2,
+            )
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM stock_daily_fact").fetchone()[0],
+                3,
+            )
+            fact_types = conn.execute(
+                "SELECT DISTINCT typeof(date), typeof(instrument_id) FROM stock_daily_fact"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        self.assertEqual([tuple(row) for row in fact_types], [("integer", "integer")])
+        self.assertEqual(
+            self._view_rows(),
+            sorted(legacy_rows, key=lambda row: (row["date"], row["ticker"])),
+        )
+
+    def test_upsert_keeps_latest_meaningful_name_and_sector(self) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(
+                conn,
+                [
+                    _stock_row("005930", "2026-04-20", name="삼성전자"),
+                    _stock_row("005930", "2026-04-17", name="옛 이름", sector="전기전자"),
+                    _stock_row("005930", "2026-04-21", name="", sector="기타"),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        rows = self._view_rows()
+        self.assertEqual([row["date"] for row in rows], ["2026-04-17", "2026-04-20", "2026-04-21"])
+        self.assertEqual({row["name"] for row in rows}, {"삼성전자"})
+        self.assertEqual({row["sector"] for row in rows}, {"반도체"})
+
+    def test_existing_readers_work_through_the_view(self) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(
+                conn,
+                [
+                    _stock_row("005930", "2026-04-16", close_price=98.0),
+                    _stock_row("005930", "2026-04-17", close_price=99.0),
+                    _stock_row("000660", "2026-04-17", sector="반도체", close_price=200.0),
+                    _stock_row("AAPL", "2026-04-17", country="US", close_price=180.0),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        close_map = KoreaCollector()._load_cached_close_map(
+            ["005930", "000660", "AAPL"],
+            "2026-04-20",
+        )
+        self.assertEqual(close_map, {"005930": 99.0, "000660": 200.0})
+
+        with patch.object(
+            build_kr_sector_reference, "RAW_DB_PATH", self.raw_db_path
+        ), patch.object(build_kr_sector_reference, "ROOT", Path(self.tempdir.name)):
+            reference = build_kr_sector_reference.build_reference()
+
+        self.assertEqual(reference["latest_date"], "2026-04-17")
+        self.assertEqual(reference["tickers"], {"000660": "반도체", "005930": "반도체"})
+
+
+if __name__ == "__main__":
+    unittest.main()
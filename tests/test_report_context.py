@@ -0,0 +1,287 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src import config, reporter
+from src.config import COUNTRIES, SECTORS
+from src.report_context import (
+    clear_report_context_cache,
+    get_report_context,
+    load_report_context,
+)
+
+WATCHLIST = "KR:005930:삼성전자,US:NVDA"
+
+
+def _sector_row(country: str, sector: str, daily_return: float | None, leader: str) -> dict:
+    return {
+        "date": "2026-04-20",
+        "country": country,
+        "sector": sector,
+        "daily_return": daily_return,
+        "weekly_return": 1.0,
+        "breadth": 0.6,
+        "volume_change": 0.0,
+        "stock_count": 20,
+        "top_gainers": [{"name": leader, "return": 3.1}],
+        "top_losers": [],
+        "collected_at": "2026-04-20T09:00:00",
+    }
+
+
+class ReportContextTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.dict(os.environ, {"MARKETBOT_WATCHLIST": WATCHLIST}),
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+        clear_report_context_cache()
+        self._seed()
+
+    def tearDown(self) -> None:
+        clear_report_context_cache()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _seed(self) -> None:
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(
+                conn,
+                [
+                    _sector_row("US", "정보기술", 1.5, "NVIDIA"),
+                    _sector_row("KR", "정보기술", 0.8, "삼성전자"),
+                    _sector_row("JP", "정보기술", None, "Tokyo Electron"),
+                    _sector_row("KR", "금융", -0.6, "KB금융"),
+                ],
+            )
+            database.upsert_trend_scores(
+                conn,
+                [
+                    {
+                        "date": "2026-04-20",
+                        "sector": "정보기술",
+                        "trend_score": 42.0,
+                        "countries_positive": 2,
+                        "countries_negative": 0,
+                        "global_avg_return": 1.15,
+                        "global_breadth": 0.6,
+                        "momentum_signal": "accelerating",
+                    }
+                ],
+            )
+            database.upsert_instrument_universe(
+                conn,
+                "KR",
+                [{"ticker": "005930", "name": "삼성전자", "sector": "정보기술", "date": "2026-04-20"}],
+            )
+            database.upsert_flow_signals(
+                conn,
+                [
+                    {
+                        "created_date": created_date,
+                        "sector": "정보기술",
+                        "leader": "US",
+                        "follower": follower,
+                        "lag": 1,
+                        "leader_return": 1.5,
+                        "predicted_direction": direction,
+                        "correlation": 0.5,
+                    }
+                    for created_date, follower, direction in (
+                        ("2026-04-01", "KR", 1),
+                        ("2026-04-02", "JP", -1),
+                        ("2026-04-20", "KR", 1),
+                    )
+                ],
+            )
+            for signal_id, hit in ((1, 1), (2, 0)):
+                database.resolve_flow_signal(
+                    conn, signal_id, status="verified", target_date="2026-04-03",
+                    follower_return=0.4, hit=hit,
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _render_all(self, context=None) -> list:
+        return [
+            reporter.format_daily_report(date="2026-04-20", context=context),
+            reporter.format_flow_report(date="2026-04-20", context=context),
+            reporter.format_trending_report(date="2026-04-20", context=context),
+            reporter.format_watchlist_report(date="2026-04-20", context=context),
+            reporter.format_abnormal_report(date="2026-04-20", context=context),
+            reporter.format_sector_detail("정보기술", date="2026-04-20", context=context),
+            reporter.format_country_detail("KR", date="2026-04-20", context=context),
+        ]
+
+    def test_shared_context_renders_the_same_reports(self) -> None:
+        context = get_report_context("2026-04-20")
+        self.assertEqual(self._render_all(context), self._render_all())
+
+        self.assertEqual(
+            context.sector_row("US", "정보기술")["top_gainers"], [{"name": "NVIDIA", "return": 3.1}]
+        )
+        self.assertEqual(
+            [row["country"] for row in context.by_sector["정보기술"]], ["US", "KR", "JP"]
+        )
+        self.assertEqual(set(context.watch_snapshots), {("KR", "005930")})
+        self.assertEqual([row["follower"] for row in context.pending_signals()], ["KR"])
+
+        conn = database.get_connection()
+        try:
+            for since in (None, "2026-04-02", "2026-05-01"):
+                self.assertEqual(
+                    context.signal_stats(since_date=since),
+                    database.get_flow_signal_stats(conn, since_date=since),
+                )
+        finally:
+            conn.close()
+
+    def test_context_is_reused_until_report_tables_change(self) -> None:
+        first = get_report_context()
+        self.assertEqual(first.date, "2026-04-20")
+        self.assertIs(get_report_context(), first)
+        self.assertIsNot(load_report_context(), first)
+
+        # 리포트가 읽지 않는 테이블 쓰기는 캐시를 깨지 않는다
+        conn = database.get_connection()
+        try:
+            database.log_collection(conn, "KR", "success", 10, 0, 1.0)
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertIs(get_report_context(), first)
+
+        conn = database.get_connection()
+        try:
+            database.resolve_flow_signal(conn, 3, status="expired")
+            conn.commit()
+        finally:
+            conn.close()
+        second = get_report_context()
+        self.assertIsNot(second, first)
+        self.assertEqual(second.pending_signals(), [])
+        self.assertIs(get_report_context(), second)
+
+        with patch.dict(os.environ, {"MARKETBOT_WATCHLIST": "US:NVDA"}):
+            self.assertEqual(len(get_report_context().watch_items), 1)
+
+    def test_report_revision_bumps_once_per_write(self) -> None:
+        conn = database.get_connection()
+        try:
+            triggers = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'report_revision_%'"
+            ).fetchall()
+            self.assertEqual(triggers, [])
+
+            rows = [
+                {"ticker": f"{index:06d}", "name": f"종목{index}", "sector": "금융", "date": "2026-04-20"}
+                for index in range(database.BULK_UPSERT_THRESHOLD + 10)
+            ]
+            before = database.get_data_revision(conn, "report")
+            database.upsert_instrument_universe(conn, "KR", rows)
+            self.assertEqual(database.get_data_revision(conn, "report"), before + 1)
+
+            # 바뀐 행이 없는 쓰기는 리비전을 올리지 않는다
+            database.upsert_instrument_universe(conn, "KR", rows)
+            database.replace_stock_lead_lag_scores(conn, "2026-04-20", [])
+            self.assertEqual(database.get_data_revision(conn, "report"), before + 1)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def test_prerendered_reports_are_served_until_data_changes(self) -> None:
+        stored = reporter.prerender_reports()
+        self.assertEqual(stored, 4 + len(set(SECTORS) | {"정보기술", "금융"}) + len(COUNTRIES))
+
+        self.assertEqual(reporter.get_prerendered_report("report"), reporter.format_daily_report())
+        self.assertEqual(
+            reporter.get_prerendered_report("sector", "정보기술"),
+            [reporter.format_sector_detail("정보기술")],
+        )
+        self.assertEqual(
+            reporter.get_prerendered_report("country", "KR"),
+            [reporter.format_country_detail("KR")],
+        )
+        self.assertIsNone(reporter.get_prerendered_report("sector", "없는섹터"))
+        with patch.dict(os.environ, {"MARKETBOT_WATCHLIST": "US:NVDA"}):
+            self.assertIsNone(reporter.get_prerendered_report("report"))
+
+        # 렌더링 시각은 상관없고, 날짜 입력 키가 다르면 쓰지 않는다
+        conn = database.get_connection()
+        try:
+            conn.execute("UPDATE rendered_reports SET rendered_at = '2000-01-01T00:00:00'")
+            conn.commit()
+            self.assertIsNotNone(reporter.get_prerendered_report("trending"))
+            conn.execute("UPDATE rendered_reports SET render_key = 'x'")
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertIsNone(reporter.get_prerendered_report("trending"))
+
+        reporter.prerender_reports()
+        self.assertIsNotNone(reporter.get_prerendered_report("trending"))
+        conn = database.get_connection()
+        try:
+            database.upsert_trend_scores(
+                conn,
+                [
+                    {
+                        "date": "2026-04-20",
+                        "sector": "정보기술",
+                        "trend_score": -5.0,
+                        "countries_positive": 0,
+                        "countries_negative": 2,
+                        "global_avg_return": -1.0,
+                        "global_breadth": 0.2,
+                        "momentum_signal": "decelerating",
+                    }
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertIsNone(reporter.get_prerendered_report("trending"))
+
+    def test_render_key_follows_stale_threshold_and_scoreboard_window(self) -> None:
+        context = get_report_context()
+        now = datetime(2026, 4, 21, 23, 0)
+        with patch.object(reporter, "datetime", wraps=datetime) as mocked:
+            mocked.utcnow.return_value = now
+            key = reporter.report_render_key(context)
+            self.assertEqual(key, "0:2026-04-01")
+
+            # 자정을 넘겨도 경고·스코어보드 입력이 같으면 키가 그대로다
+            mocked.utcnow.return_value = now + timedelta(hours=3)
+            self.assertEqual(reporter.report_render_key(context), key)
+
+            # 검증 시그널이 스코어보드 구간을 벗어나면 키가 바뀐다
+            mocked.utcnow.return_value = datetime(2026, 4, 21) + timedelta(
+                days=config.LEADLAG_SCOREBOARD_WINDOW_DAYS + 1
+            )
+            self.assertNotEqual(reporter.report_render_key(context), key)
+
+            stale = datetime(2026, 4, 20) + timedelta(days=config.STATUS_STALE_AFTER_DAYS + 1)
+            mocked.utcnow.return_value = stale
+            self.assertTrue(reporter.report_render_key(context).startswith(
+                f"{config.STATUS_STALE_AFTER_DAYS + 1}:"
+            ))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -398,6 +398,90 @@ class ReportSmokeTests(unittest.TestCase):
         self.assertIn("KOSPI +0.15% (04-19) · 대비 +0.25%", detail)
         self.assertIn("금융", detail)
 
+    def _upsert_sector(self, date: str, country: str, daily_return: float) -> None:
+        conn = database.get_connection()
+        database.upsert_sector_performance(
+            conn,
+            [
+                {
+                    "date": date,
+                    "country": country,
+                    "sector": "정보기술",
+                    "daily_return": daily_return,
+                    "weekly_return": 1.0,
+                    "breadth": 0.5,
+                    "volume_change": 0.0,
+                    "stock_count": 50,
+                    "top_gainers": [],
+                    "top_losers": [],
+                    "collected_at": f"{date}T00:00:00",
+                }
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+    def test_prepare_recomputes_only_dates_marked_dirty(self) -> None:
+        with patch("src.leadlag.compute_lead_lag_scores", return_value=[]) as score, patch(
+            "src.leadlag.rescore_lead_lag_dates", return_value=0
+        ) as rescore:
+            first = report_script.prepare_report_data()
+            self.assertEqual(first["trend_dates"], ["2026-04-20"])
+            self.assertEqual(first["lead_lag_dates"], ["2026-04-20"])
+            score.assert_called_once_with(date="2026-04-20", mode="incremental")
+            rescore.assert_not_called()
+
+            conn = database.get_connection()
+            self.assertEqual(database.get_dirty_sector_dates(conn), [])
+            conn.execute(
+                """
+                INSERT INTO lead_lag_scores (date, sector, follower_sector, leader, follower, lag)
+                VALUES ('2026-04-19', '정보기술', '정보기술', 'US', 'KR', 1),
+                       ('2026-01-02', '정보기술', '정보기술', 'US', 'KR', 1)
+                """
+            )
+            conn.execute("UPDATE trend_scores SET trend_score = 99.0 WHERE date = '2026-04-20'")
+            conn.commit()
+            conn.close()
+
+            # 늦게 도착한 지난 날짜 수집은 그 날짜와 그 날짜를 창에 담은 기준일만 다시 계산한다
+            self._upsert_sector("2026-04-19", "JP", 1.5)
+            score.reset_mock()
+            late = report_script.prepare_report_data()
+
+            self.assertEqual(late["dirty"], 1)
+            self.assertEqual(late["trend_dates"], ["2026-04-19"])
+            self.assertEqual(late["lead_lag_dates"], ["2026-04-19", "2026-04-20"])
+            rescore.assert_called_once_with(["2026-04-19"], cross_sector="off")
+            score.assert_called_once_with(date="2026-04-20", mode="incremental")
+
+            conn = database.get_connection()
+            scores = dict(
+                conn.execute("SELECT date, MAX(trend_score) FROM trend_scores GROUP BY date").fetchall()
+            )
+            conn.close()
+            self.assertEqual(scores["2026-04-20"], 99.0)
+            self.assertIn("2026-04-19", scores)
+
+            # 값이 그대로인 재수집은 표시를 남기지 않아 준비 단계가 바로 끝난다
+            self._upsert_sector("2026-04-19", "JP", 1.5)
+            score.reset_mock()
+            rescore.reset_mock()
+            with patch("src.analyzer.compute_trend_scores_range") as backfill:
+                idle = report_script.prepare_report_data()
+            self.assertEqual(
+                idle, {"dirty": 0, "trend_dates": [], "lead_lag_dates": [], "nodes": {}}
+            )
+            backfill.assert_not_called()
+            score.assert_not_called()
+            rescore.assert_not_called()
+
+            forced = report_script.prepare_report_data(date="2026-04-20", force=True)
+            self.assertEqual(forced["trend_dates"], ["2026-04-20"])
+            self.assertEqual(forced["lead_lag_dates"], ["2026-04-20"])
+            self.assertEqual(set(forced["nodes"].values()), {"ran"})
+            score.assert_called_once()
+
     def test_format_sector_detail_uses_country_and_sector_benchmarks(self) -> None:
         detail = reporter.format_sector_detail("정보기술", date="2026-04-20")
 
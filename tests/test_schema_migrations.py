@@ -0,0 +1,130 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+
+
+class SchemaMigrationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.summary_db_path = self.data_dir / "marketbot.db"
+        self.raw_db_path = self.data_dir / "marketbot_raw.db"
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.summary_db_path),
+            patch.object(database, "RAW_DB_PATH", self.raw_db_path),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _schema_versions(self, path: Path) -> list[int]:
+        conn = sqlite3.connect(str(path))
+        try:
+            rows = conn.execute(
+                "SELECT version FROM schema_version ORDER BY version"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows]
+
+    def test_init_db_records_every_migration_version(self) -> None:
+        database.init_db()
+        database.init_raw_db()
+
+        self.assertEqual(
+            self._schema_versions(self.summary_db_path),
+            [version for version, _, _ in database.SUMMARY_MIGRATIONS],
+        )
+        self.assertEqual(
+            self._schema_versions(self.raw_db_path),
+            [version for version, _, _ in database.RAW_MIGRATIONS],
+        )
+
+    def test_init_db_runs_schema_work_once_per_process(self) -> None:
+        database.init_db()
+
+        with patch.object(database, "_connect", wraps=database._connect) as mock_connect:
+            database.init_db()
+            database.init_db()
+
+        mock_connect.assert_not_called()
+
+    def test_init_db_skips_ddl_when_file_is_already_current(self) -> None:
+        database.init_db()
+        database._reset_schema_guard()
+
+        statements: list[str] = []
+        original_connect = database._connect
+
+        def tracing_connect(path, profile="durable"):
+            conn = original_connect(path, profile)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch.object(database, "_connect", tracing_connect):
+            database.init_db()
+
+        self.assertFalse(any("CREATE" in sql.upper() for sql in statements))
+
+    def test_init_db_recreates_schema_when_file_was_removed(self) -> None:
+        database.init_db()
+        self.summary_db_path.unlink()
+
+        database.init_db()
+
+        conn = database.get_connection()
+        try:
+            self.assertTrue(database.table_exists(conn, "sector_performance"))
+        finally:
+            conn.close()
+
+    def test_unversioned_legacy_db_is_upgraded_in_order(self) -> None:
+        conn = sqlite3.connect(str(self.summary_db_path))
+        conn.execute(
+            """
+            CREATE TABLE collection_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                market TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total_stocks INTEGER,
+                filtered_stocks INTEGER,
+                abnormal_stocks INTEGER,
+                error_message TEXT
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        database.init_db()
+
+        conn = database.get_connection()
+        try:
+            self.assertTrue(
+                database._column_exists(conn, "collection_log", "failure_code")
+            )
+            self.assertTrue(
+                database._column_exists(conn, "collection_log", "raw_error_excerpt")
+            )
+        finally:
+            conn.close()
+        self.assertEqual(
+            self._schema_versions(self.summary_db_path)[-1],
+            database.SUMMARY_MIGRATIONS[-1][0],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import math
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src.config import COUNTRIES
+from src.panel import clear_sector_return_panel_cache, load_sector_return_panel
+
+
+def _sector_row(date: str, country: str, sector: str = "반도체", daily_return=1.0) -> dict:
+    return {
+        "date": date,
+        "country": country,
+        "sector": sector,
+        "daily_return": daily_return,
+        "weekly_return": 0.0,
+        "breadth": 0.5,
+        "volume_change": 0.0,
+        "stock_count": 10,
+        "top_gainers": [],
+        "top_losers": [],
+        "collected_at": f"{date}T09:00:00",
+    }
+
+
+class SectorReturnPanelTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+        clear_sector_return_panel_cache()
+
+    def tearDown(self) -> None:
+        clear_sector_return_panel_cache()
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _execute(self, sql: str, params=()) -> None:
+        conn = database.get_connection()
+        try:
+            conn.execute(sql, params)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _write(self, rows: list[dict]) -> None:
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _load(self):
+        conn = database.get_connection()
+        try:
+            return load_sector_return_panel(conn), database.get_data_revision(conn)
+        finally:
+            conn.close()
+
+    def _pivot(self) -> dict:
+        conn = database.get_connection()
+        try:
+            rows = conn.execute(
+                """
+                SELECT sector, date, country, daily_return FROM sector_performance
+                WHERE sector != '기타' AND daily_return IS NOT NULL
+                """
+            ).fetchall()
+        finally:
+            conn.close()
+        return {(sector, date, country): value for sector, date, country, value in rows}
+
+    @staticmethod
+    def _cells(panel) -> dict:
+        cells = {}
+        for s, sector in enumerate(panel.sectors):
+            for c, country in enumerate(panel.countries):
+                for d, date in enumerate(panel.dates):
+                    value = panel.values[s, c, d]
+                    if not math.isnan(value):
+                        cells[(sector, date, country)] = float(value)
+        return cells
+
+    def test_panel_columns_cover_every_configured_market(self) -> None:
+        # 시장을 config에 추가하면 패널 열과 트리거를 바꾸는 마이그레이션도 함께 추가해야 한다
+        self.assertEqual(database.SECTOR_PANEL_COUNTRIES, tuple(sorted(COUNTRIES)))
+
+    def test_triggers_keep_panel_in_step_with_every_write(self) -> None:
+        self._write(
+            [
+                _sector_row("2026-04-20", "KR", daily_return=1.0),
+                _sector_row("2026-04-20", "US", daily_return=2.0),
+                _sector_row("2026-04-21", "KR", sector="에너지", daily_return=-1.0),
+                _sector_row("2026-04-21", "KR", sector="기타", daily_return=5.0),
+            ]
+        )
+        panel, revision = self._load()
+        self.assertEqual(self._cells(panel), self._pivot())
+        self.assertEqual(panel.sectors, ["반도체", "에너지"])
+
+        self._write([_sector_row("2026-04-20", "US", daily_return=-2.5)])
+        self._execute(
+            "UPDATE sector_performance SET daily_return = NULL WHERE date = '2026-04-20' AND country = 'KR'"
+        )
+        self._execute("UPDATE sector_performance SET date = '2026-04-22' WHERE sector = '에너지'")
+        self._write([_sector_row("2026-04-23", "JP", daily_return=0.5)])
+        self._execute("DELETE FROM sector_performance WHERE date = '2026-04-23'")
+
+        updated, updated_revision = self._load()
+        self.assertGreater(updated_revision, revision)
+        self.assertEqual(
+            self._cells(updated),
+            {("반도체", "2026-04-20", "US"): -2.5, ("에너지", "2026-04-22", "KR"): -1.0},
+        )
+        self.assertEqual(self._cells(updated), self._pivot())
+        self.assertEqual(list(updated.dates), ["2026-04-20", "2026-04-22"])
+
+    def test_cached_panel_is_reused_until_revision_changes(self) -> None:
+        self._write([_sector_row("2026-04-20", "KR")])
+
+        first, _ = self._load()
+        second, _ = self._load()
+        self.assertIs(first, second)
+        self.assertFalse(first.values.flags.writeable)
+
+        self._write([_sector_row("2026-04-21", "KR")])
+        third, _ = self._load()
+        self.assertIsNot(third, first)
+        self.assertEqual(list(third.dates), ["2026-04-20", "2026-04-21"])
+        self.assertEqual(list(third.window("2026-04-21").dates), ["2026-04-21"])
+
+    def test_range_panel_spans_frozen_years_and_prefers_live_cells(self) -> None:
+        self._write(
+            [
+                _sector_row("2023-05-02", "KR", daily_return=1.0),
+                _sector_row("2024-05-02", "KR", daily_return=1.0),
+                _sector_row("2024-05-02", "US", daily_return=2.0),
+            ]
+        )
+        database.freeze_summary_years(as_of="2026-04-20")
+        self._write([_sector_row("2024-05-02", "KR", daily_return=-3.0)])
+
+        with database.open_summary_range("2023-01-01", "2024-12-31") as conn:
+            panel = load_sector_return_panel(conn)
+
+        self.assertEqual(
+            self._cells(panel),
+            {
+                ("반도체", "2023-05-02", "KR"): 1.0,
+                ("반도체", "2024-05-02", "KR"): -3.0,
+                ("반도체", "2024-05-02", "US"): 2.0,
+            },
+        )
+
+    def test_migration_backfills_existing_rows(self) -> None:
+        self._write(
+            [
+                _sector_row("2026-04-20", "KR", daily_return=1.0),
+                _sector_row("2026-04-20", "VN", daily_return=0.25),
+            ]
+        )
+        conn = database.get_connection()
+        try:
+            conn.execute("DELETE FROM sector_return_panel")
+            conn.commit()
+            database._summary_v6_sector_return_panel(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+        panel, _ = self._load()
+        self.assertEqual(
+            self._cells(panel),
+            {("반도체", "2026-04-20", "KR"): 1.0, ("반도체", "2026-04-20", "VN"): 0.25},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
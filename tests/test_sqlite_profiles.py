@@ -0,0 +1,94 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src.config import SQLITE_PROFILES
+
+SYNCHRONOUS_LEVELS = {"OFF": 0, "NORMAL": 1, "FULL": 2}
+TEMP_STORE_LEVELS = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+
+
+class SqliteProfileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _pragma(self, conn, name: str):
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_each_profile_applies_its_pragmas(self) -> None:
+        for profile, settings in SQLITE_PROFILES.items():
+            with self.subTest(profile=profile):
+                conn = database._connect(self.data_dir / f"{profile}.db", profile)
+                try:
+                    self.assertEqual(self._pragma(conn, "journal_mode"), "wal")
+                    self.assertEqual(
+                        self._pragma(conn, "synchronous"),
+                        SYNCHRONOUS_LEVELS[settings["synchronous"]],
+                    )
+                    self.assertEqual(self._pragma(conn, "cache_size"), settings["cache_size"])
+                    self.assertEqual(
+                        self._pragma(conn, "temp_store"),
+                        TEMP_STORE_LEVELS[settings["temp_store"]],
+                    )
+                    self.assertEqual(self._pragma(conn, "page_size"), settings["page_size"])
+                    self.assertEqual(self._pragma(conn, "busy_timeout"), settings["busy_timeout_ms"])
+                finally:
+                    conn.close()
+
+    def test_page_size_is_only_set_when_file_is_created(self) -> None:
+        path = self.data_dir / "existing.db"
+        conn = database._connect(path, "durable")
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.close()
+
+        conn = database._connect(path, "bulk_load")
+        try:
+            self.assertEqual(
+                self._pragma(conn, "page_size"),
+                SQLITE_PROFILES["durable"]["page_size"],
+            )
+            self.assertEqual(self._pragma(conn, "synchronous"), SYNCHRONOUS_LEVELS["OFF"])
+        finally:
+            conn.close()
+
+    def test_default_profiles_per_database(self) -> None:
+        summary_conn = database.get_connection()
+        raw_conn = database.get_raw_connection()
+        try:
+            self.assertEqual(
+                self._pragma(summary_conn, "synchronous"),
+                SYNCHRONOUS_LEVELS[SQLITE_PROFILES[database.SUMMARY_DB_PROFILE]["synchronous"]],
+            )
+            self.assertEqual(
+                self._pragma(raw_conn, "synchronous"),
+                SYNCHRONOUS_LEVELS[SQLITE_PROFILES[database.RAW_DB_PROFILE]["synchronous"]],
+            )
+        finally:
+            summary_conn.close()
+            raw_conn.close()
+
+    def test_unknown_profile_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            database.get_connection("turbo")
+
+
+if __name__ == "__main__":
+    unittest.main()
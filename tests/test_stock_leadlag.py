@@ -0,0 +1,212 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import src.database as database
+from src.config import LEADLAG_MAX_LAG
+from src.leadlag import _close_minutes
+from src.stock_leadlag import (
+    StockReturnMatrix,
+    _exact_pair_score,
+    run_stock_lead_lag,
+    score_stock_pairs,
+)
+
+
+def _planted_matrix(n_dates: int = 200, seed: int = 3) -> StockReturnMatrix:
+    """KR·US·JP 각 4종목. KR0→US1(lag 1), JP2→KR3(lag 0), US0→JP1(lag 2)을 심는다."""
+    rng = np.random.default_rng(seed)
+    countries = np.array(["KR"] * 4 + ["US"] * 4 + ["JP"] * 4, dtype=object)
+    tickers = np.array([f"{country}{index % 4}" for index, country in enumerate(countries)], dtype=object)
+    returns = rng.normal(size=(len(tickers), n_dates))
+    returns[5, 1:] = 0.9 * returns[0, :-1] + 0.3 * returns[5, 1:]
+    returns[3] = 0.8 * returns[10] + 0.6 * returns[3]
+    returns[9, 2:] = 0.7 * returns[4, :-2] + 0.7 * returns[9, 2:]
+    returns[rng.random(returns.shape) < 0.05] = np.nan
+    return StockReturnMatrix(
+        countries,
+        tickers,
+        tickers.copy(),
+        np.array(["반도체"] * len(tickers), dtype=object),
+        np.arange(n_dates).astype(object),
+        returns,
+    )
+
+
+def _brute_force(matrix: StockReturnMatrix, top_pairs: int) -> list[tuple]:
+    rows = []
+    for leader in range(len(matrix.tickers)):
+        for follower in range(len(matrix.tickers)):
+            if matrix.countries[leader] == matrix.countries[follower]:
+                continue
+            min_lag = 0 if _close_minutes(matrix.countries[leader]) < _close_minutes(matrix.countries[follower]) else 1
+            scored = [
+                _exact_pair_score(matrix.returns[leader], matrix.returns[follower], lag)
+                for lag in range(min_lag, LEADLAG_MAX_LAG + 1)
+            ]
+            scored = [row for row in scored if row is not None]
+            if scored:
+                best = max(scored, key=lambda row: abs(row["correlation"]))
+                rows.append((matrix.tickers[leader], matrix.tickers[follower], best["lag"], best["correlation"]))
+    rows.sort(key=lambda row: -row[3])
+    return rows[:top_pairs]
+
+
+class StockPairEngineTests(unittest.TestCase):
+    def test_tiled_engine_matches_brute_force_for_any_tile_size(self) -> None:
+        matrix = _planted_matrix()
+        expected = _brute_force(matrix, top_pairs=3)
+        self.assertEqual(
+            [row[:3] for row in expected],
+            [("KR0", "US1", 1), ("JP2", "KR3", 0), ("US0", "JP1", 2)],
+        )
+
+        for tile in (1, 5, 64):
+            rows = score_stock_pairs(matrix, top_pairs=3, tile=tile)
+            self.assertEqual(
+                [
+                    (row["leader_ticker"], row["follower_ticker"], row["lag"], row["correlation"])
+                    for row in rows
+                ],
+                expected,
+                msg=f"tile={tile}",
+            )
+
+    def test_same_market_pairs_and_short_histories_are_skipped(self) -> None:
+        matrix = _planted_matrix(n_dates=100)
+        self.assertEqual(score_stock_pairs(matrix, top_pairs=5, tile=4), [])
+
+        matrix = _planted_matrix()
+        only_korea = StockReturnMatrix(
+            matrix.countries[:4], matrix.tickers[:4], matrix.names[:4],
+            matrix.sectors[:4], matrix.dates, matrix.returns[:4],
+        )
+        self.assertEqual(score_stock_pairs(only_korea, top_pairs=5, tile=2), [])
+
+
+class StockLeadLagJobTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+        database.init_raw_db()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write_history(self, periods: int = 160) -> str:
+        rng = np.random.default_rng(7)
+        dates = [
+            date.strftime("%Y-%m-%d") for date in pd.bdate_range("2025-09-01", periods=periods)
+        ]
+        returns = {
+            (country, f"{country}{index}"): rng.normal(size=len(dates))
+            for country in ("KR", "US")
+            for index in range(4)
+        }
+        returns[("US", "US2")][1:] = returns[("KR", "KR1")][:-1] + 0.2 * returns[("US", "US2")][1:]
+        # 가장 강한 페어지만 거래대금이 적어 시장별 상위 3종목에서 빠진다
+        returns[("US", "US3")][1:] = returns[("KR", "KR0")][:-1]
+        volume = {"KR0": 10, "US3": 10}
+
+        rows = [
+            {
+                "date": date,
+                "ticker": ticker,
+                "name": f"{ticker} Corp",
+                "country": country,
+                "sector": "반도체",
+                "close_price": 100.0,
+                "daily_return": round(float(series[index]), 4),
+                "volume": volume.get(ticker, 1_000_000),
+                "is_filtered": 1,
+            }
+            for (country, ticker), series in returns.items()
+            for index, date in enumerate(dates)
+        ]
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(
+                conn,
+                [
+                    {
+                        "date": dates[-1],
+                        "country": "KR",
+                        "sector": "반도체",
+                        "daily_return": 0.0,
+                        "weekly_return": 0.0,
+                        "breadth": 0.5,
+                        "volume_change": 0.0,
+                        "stock_count": 4,
+                        "top_gainers": [],
+                        "top_losers": [],
+                        "collected_at": f"{dates[-1]}T09:00:00",
+                    }
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        return dates[-1]
+
+    def test_job_stores_top_liquid_pairs_for_latest_date(self) -> None:
+        date = self._write_history()
+
+        returned = run_stock_lead_lag(top_per_market=3, top_pairs=2, tile=2)
+
+        conn = database.get_connection()
+        try:
+            stored = database.get_stock_lead_lag_scores(conn)
+        finally:
+            conn.close()
+        self.assertEqual(len(stored), 2)
+        self.assertEqual([row["date"] for row in returned], [date, date])
+        top = stored[0]
+        self.assertEqual(
+            (top["date"], top["leader_ticker"], top["follower_ticker"], top["lag"]),
+            (date, "KR1", "US2", 1),
+        )
+        self.assertEqual((top["leader_name"], top["follower_sector"]), ("KR1 Corp", "반도체"))
+        self.assertGreater(top["correlation"], 0.9)
+        self.assertEqual(top["n_obs"], 159)
+        tickers = {row[key] for row in stored for key in ("leader_ticker", "follower_ticker")}
+        self.assertFalse(tickers & {"KR0", "US3"})
+
+    def test_job_reads_more_sealed_partitions_than_sqlite_can_attach(self) -> None:
+        date = self._write_history(periods=300)
+        before = run_stock_lead_lag(top_per_market=3, top_pairs=2, tile=2)
+
+        sealed = database.seal_raw_partitions(as_of="2026-12-01")
+        self.assertGreater(len(sealed), 10)
+        start = (pd.Timestamp(date) - pd.Timedelta(days=365)).strftime("%Y-%m-%d")
+        chunks = database.raw_range_chunks(start, date)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual((chunks[0][0], chunks[-1][1]), (start, date))
+
+        self.assertEqual(run_stock_lead_lag(top_per_market=3, top_pairs=2, tile=2), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
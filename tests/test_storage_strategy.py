@@ -108,9 +108,10 @@ class StorageStrategyTests(unittest.TestCase):
                 WHERE type = 'table' AND name = 'stock_daily'
                 """
             ).fetchone()
-            raw_count = raw_conn.execute(
-                "SELECT COUNT(*) FROM stock_daily"
-            ).fetchone()[0]
+            with database.open_raw_range() as range_conn:
+                raw_count = range_conn.execute(
+                    "SELECT COUNT(*) FROM stock_daily"
+                ).fetchone()[0]
             abnormal_count = summary_conn.execute(
                 "SELECT COUNT(*) FROM abnormal_stock_summary"
             ).fetchone()[0]
@@ -0,0 +1,264 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src import summary_export
+
+
+def _sector_row(country: str, sector: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "country": country,
+        "sector": sector,
+        "daily_return": 1.25,
+        "weekly_return": 2.0,
+        "breadth": 0.5,
+        "volume_change": None,
+        "stock_count": 10,
+        "top_gainers": [{"ticker": "005930", "return": 3.1}],
+        "top_losers": [],
+        "collected_at": f"{date}T09:00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+class SummaryExportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.export_dir = self.data_dir / "summary_export"
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        database.init_db()
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(
+                conn,
+                [
+                    _sector_row("US", "Energy", "2026-04-20"),
+                    _sector_row("KR", "반도체", "2026-04-20"),
+                    _sector_row("KR", "반도체", "2026-03-31"),
+                ],
+            )
+            database.upsert_trend_scores(
+                conn,
+                [
+                    {
+                        "date": "2026-04-20",
+                        "sector": "Energy",
+                        "trend_score": 0.4,
+                        "countries_positive": 3,
+                        "countries_negative": 1,
+                        "global_avg_return": 0.8,
+                        "global_breadth": 0.6,
+                        "momentum_signal": "up",
+                    }
+                ],
+            )
+            database.log_collection(conn, "KR", "success", 100, 80, 2)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _snapshot(self, table: str, order: str) -> list[dict]:
+        conn = database.get_connection()
+        try:
+            rows = conn.execute(f"SELECT * FROM {table} ORDER BY {order}").fetchall()
+            return [{key: row[key] for key in row.keys() if key != "id"} for row in rows]
+        finally:
+            conn.close()
+
+    def test_export_shards_by_month_and_country_without_ids(self) -> None:
+        summary_export.export_summary_db()
+
+        shards = sorted(
+            str(path.relative_to(self.export_dir))
+            for path in self.export_dir.rglob("*.ndjson")
+        )
+        self.assertIn("sector_performance/2026-03/KR.ndjson", shards)
+        self.assertIn("sector_performance/2026-04/KR.ndjson", shards)
+        self.assertIn("sector_performance/2026-04/US.ndjson", shards)
+        self.assertIn("trend_scores/2026-04.ndjson", shards)
+
+        line = (self.export_dir / "sector_performance/2026-04/KR.ndjson").read_text(encoding="utf-8")
+        record = json.loads(line)
+        self.assertNotIn("id", record)
+        self.assertEqual(record["sector"], "반도체")
+        self.assertIn("반도체", line)
+
+    def test_export_is_deterministic_and_only_touches_changed_shards(self) -> None:
+        summary_export.export_summary_db()
+        before = {
+            path: path.read_bytes() for path in self.export_dir.rglob("*") if path.is_file()
+        }
+
+        self.assertEqual(summary_export.export_summary_db()["shards_written"], 0)
+
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(
+                conn, [_sector_row("US", "Energy", "2026-04-20", daily_return=-0.5)]
+            )
+            conn.execute("DELETE FROM sector_performance WHERE date = '2026-03-31'")
+            conn.commit()
+        finally:
+            conn.close()
+
+        result = summary_export.export_summary_db()
+        after = {
+            path: path.read_bytes() for path in self.export_dir.rglob("*") if path.is_file()
+        }
+
+        self.assertEqual(result["shards_written"], 1)
+        self.assertEqual(result["shards_removed"], 1)
+        changed = {
+            str(path.relative_to(self.export_dir))
+            for path in before
+            if after.get(path) != before[path]
+        }
+        self.assertEqual(
+            changed,
+            {
+                "sector_performance/2026-03/KR.ndjson",
+                "sector_performance/2026-04/US.ndjson",
+            },
+        )
+        self.assertFalse((self.export_dir / "sector_performance/2026-03").exists())
+
+    def test_import_rebuilds_equivalent_db(self) -> None:
+        summary_export.export_summary_db()
+        orders = {
+            "sector_performance": "date, country, sector",
+            "sector_performance_dirty": "date, country",
+            "trend_scores": "date, sector",
+            "collection_log": "timestamp",
+        }
+        expected = {table: self._snapshot(table, order) for table, order in orders.items()}
+
+        database.DB_PATH.unlink()
+        result = summary_export.import_summary_db()
+
+        # 3 sector rows + their 3 dirty (date, country) marks + 1 trend + 1 log
+        self.assertEqual(result["rows"], 8)
+        for table, order in orders.items():
+            self.assertEqual(self._snapshot(table, order), expected[table])
+        conn = database.get_connection()
+        try:
+            self.assertEqual(
+                database._get_schema_version(conn),
+                max(version for version, *_ in database.SUMMARY_MIGRATIONS),
+            )
+        finally:
+            conn.close()
+
+    def test_import_fills_follower_sector_of_older_exports(self) -> None:
+        shard = self.export_dir / "lead_lag_scores" / "2026-04.ndjson"
+        shard.parent.mkdir(parents=True)
+        # follower_sector 컬럼이 생기기 전(v6)에 내보낸 샤드
+        columns = ["date", "sector", "leader", "follower", "lag", "correlation"]
+        record = dict(zip(columns, ["2026-04-20", "반도체", "US", "KR", 1, 0.6]))
+        shard.write_text(json.dumps(record, ensure_ascii=False) + "\n", encoding="utf-8")
+        manifest = {
+            "schema_version": 6,
+            "tables": {
+                "lead_lag_scores": {
+                    "columns": columns,
+                    "shards": ["lead_lag_scores/2026-04.ndjson"],
+                }
+            },
+        }
+        (self.export_dir / summary_export.MANIFEST_NAME).write_text(
+            json.dumps(manifest), encoding="utf-8"
+        )
+
+        summary_export.import_summary_db()
+
+        rows = self._snapshot("lead_lag_scores", "date")
+        self.assertEqual([(row["sector"], row["follower_sector"]) for row in rows], [("반도체", "반도체")])
+
+    def test_import_reads_shards_missing_from_the_manifest(self) -> None:
+        summary_export.export_summary_db()
+        manifest_path = self.export_dir / summary_export.MANIFEST_NAME
+        manifest = manifest_path.read_text(encoding="utf-8")
+        self.assertNotIn("ndjson", manifest)
+
+        # 다른 시장 커밋이 rebase로 들어와 manifest는 그대로인데 샤드만 늘어난 경우
+        shard = self.export_dir / "sector_performance/2026-04/JP.ndjson"
+        record = json.loads(
+            (self.export_dir / "sector_performance/2026-04/US.ndjson").read_text(encoding="utf-8")
+        )
+        record["country"] = "JP"
+        shard.write_text(json.dumps(record, ensure_ascii=False) + "\n", encoding="utf-8")
+
+        database.DB_PATH.unlink()
+        summary_export.import_summary_db()
+
+        rows = self._snapshot("sector_performance", "date, country")
+        self.assertEqual([row["country"] for row in rows], ["KR", "JP", "KR", "US"])
+
+    def test_node_runs_export_only_fingerprints(self) -> None:
+        conn = database.get_connection()
+        try:
+            database.record_derived_node_run(
+                conn,
+                {
+                    "date": "2026-04-20",
+                    "node": "trend_scores",
+                    "fingerprint": "abc123",
+                    "status": "ran",
+                    "run_seconds": 1.5,
+                    "fingerprint_seconds": 0.01,
+                    "updated_at": "2026-04-20T22:00:00",
+                },
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        summary_export.export_summary_db()
+        record = json.loads(
+            (self.export_dir / "derived_node_runs/2026-04.ndjson").read_text(encoding="utf-8")
+        )
+        self.assertEqual(record, {"date": "2026-04-20", "node": "trend_scores", "fingerprint": "abc123"})
+
+        database.DB_PATH.unlink()
+        summary_export.import_summary_db()
+        conn = database.get_connection()
+        try:
+            self.assertEqual(
+                database.get_derived_node_fingerprint(conn, "2026-04-20", "trend_scores"), "abc123"
+            )
+            self.assertEqual(database.get_derived_node_runs(conn)[0]["status"], "imported")
+        finally:
+            conn.close()
+
+    def test_import_rejects_newer_schema(self) -> None:
+        summary_export.export_summary_db()
+        manifest_path = self.export_dir / summary_export.MANIFEST_NAME
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest["schema_version"] = summary_export.SUMMARY_SCHEMA_VERSION + 1
+        manifest_path.write_text(json.dumps(manifest), encoding="utf-8")
+
+        with self.assertRaisesRegex(ValueError, "newer"):
+            summary_export.import_summary_db()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+
+
+def _sector_row(date: str, sector: str = "반도체", **overrides) -> dict:
+    row = {
+        "date": date,
+        "country": "KR",
+        "sector": sector,
+        "daily_return": 1.0,
+        "weekly_return": 2.0,
+        "breadth": 0.5,
+        "volume_change": 0.1,
+        "stock_count": 10,
+        "top_gainers": [],
+        "top_losers": [],
+        "collected_at": f"{date}T09:00:00",
+    }
+    row.update(overrides)
+    return row
+
+
+def _signal_row(created_date: str, follower: str) -> dict:
+    return {
+        "created_date": created_date,
+        "sector": "반도체",
+        "leader": "US",
+        "follower": follower,
+        "lag": 1,
+        "leader_return": 2.0,
+        "predicted_direction": 1,
+        "correlation": 0.6,
+    }
+
+
+class SummaryYearTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tempdir.name) / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        database.init_db()
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write(self, sector_rows: list[dict], signal_rows: list[dict] = ()) -> None:
+        conn = database.get_connection()
+        try:
+            database.upsert_sector_performance(conn, sector_rows)
+            database.upsert_flow_signals(conn, list(signal_rows))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _live_dates(self) -> list[str]:
+        conn = database.get_connection()
+        try:
+            return [
+                row[0]
+                for row in conn.execute("SELECT date FROM sector_performance ORDER BY date")
+            ]
+        finally:
+            conn.close()
+
+    def test_freeze_keeps_recent_closed_year_live(self) -> None:
+        self._write([_sector_row("2024-12-31"), _sector_row("2025-12-31"), _sector_row("2026-04-20")])
+
+        frozen = database.freeze_summary_years(as_of="2026-04-20")
+
+        self.assertEqual(frozen, [2024])
+        self.assertEqual(self._live_dates(), ["2025-12-31", "2026-04-20"])
+        self.assertEqual([year for year, _ in database.list_summary_years()], [2024])
+
+        conn = sqlite3.connect(str(database._summary_year_path(2024)))
+        try:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            self.assertEqual(
+                conn.execute("SELECT date FROM sector_performance").fetchall(),
+                [("2024-12-31",)],
+            )
+        finally:
+            conn.close()
+
+    def test_pending_flow_signals_stay_live(self) -> None:
+        self._write(
+            [_sector_row("2024-06-03")],
+            [_signal_row("2024-06-03", "KR"), _signal_row("2024-06-03", "JP")],
+        )
+        conn = database.get_connection()
+        try:
+            signal_id = conn.execute(
+                "SELECT id FROM flow_signals WHERE follower = 'KR'"
+            ).fetchone()[0]
+            database.resolve_flow_signal(
+                conn,
+                signal_id,
+                status="verified",
+                target_date="2024-06-04",
+                follower_return=1.2,
+                hit=1,
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        database.freeze_summary_years(as_of="2026-04-20")
+
+        conn = database.get_connection()
+        try:
+            live = [
+                row[0] for row in conn.execute("SELECT follower FROM flow_signals")
+            ]
+        finally:
+            conn.close()
+        self.assertEqual(live, ["JP"])
+
+        with database.open_summary_range("2024-01-01", "2024-12-31") as conn:
+            statuses = dict(
+                conn.execute("SELECT follower, status FROM flow_signals").fetchall()
+            )
+        self.assertEqual(statuses, {"JP": "pending", "KR": "verified"})
+
+    def test_range_reader_unions_frozen_years_and_prefers_live_rows(self) -> None:
+        self._write([_sector_row("2023-05-02"), _sector_row("2024-05-02", daily_return=1.0)])
+        database.freeze_summary_years(as_of="2026-04-20")
+        self._write([_sector_row("2024-05-02", daily_return=-3.0)])
+
+        with database.open_summary_range("2024-01-01", "2024-12-31") as conn:
+            attached = [row[1] for row in conn.execute("PRAGMA database_list")]
+            rows = database.get_latest_sector_performance(conn, date="2024-05-02")
+        self.assertEqual(attached, ["main", "temp", "y0"])
+        self.assertEqual([row["daily_return"] for row in rows], [-3.0])
+
+        with database.open_summary_range() as conn:
+            self.assertEqual(
+                conn.execute("SELECT COUNT(*) FROM sector_performance").fetchone()[0],
+                2,
+            )
+
+        self.assertEqual(database.freeze_summary_years(as_of="2026-04-20"), [2024])
+        self.assertEqual(self._live_dates(), [])
+
+    def test_range_reader_fills_columns_missing_from_older_year_files(self) -> None:
+        conn = database.get_connection()
+        try:
+            database.upsert_lead_lag_scores(
+                conn,
+                [
+                    {
+                        "date": "2023-05-02", "sector": "반도체", "leader": "US", "follower": "KR",
+                        "lag": 1, "correlation": 0.6, "direction_agreement": 0.7, "n_obs": 40,
+                    }
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        database.freeze_summary_years(as_of="2026-04-20")
+
+        # lead_lag_scores를 follower_sector·p-value 컬럼이 생기기 전 모양으로 되돌린다.
+        frozen = sqlite3.connect(str(database._summary_year_path(2023)))
+        try:
+            frozen.executescript(
+                """
+                ALTER TABLE lead_lag_scores RENAME TO current_scores;
+                CREATE TABLE lead_lag_scores (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date TEXT NOT NULL, sector TEXT NOT NULL,
+                    leader TEXT NOT NULL, follower TEXT NOT NULL, lag INTEGER NOT NULL,
+                    correlation REAL, direction_agreement REAL, n_obs INTEGER,
+                    UNIQUE(date, sector, leader, follower)
+                );
+                INSERT INTO lead_lag_scores (
+                    date, sector, leader, follower, lag, correlation, direction_agreement, n_obs
+                )
+                SELECT date, sector, leader, follower, lag, correlation, direction_agreement, n_obs
+                FROM current_scores;
+                DROP TABLE current_scores;
+                """
+            )
+        finally:
+            frozen.close()
+
+        with database.open_summary_range("2023-01-01", "2023-12-31") as conn:
+            rows = database.get_lead_lag_scores(conn, date="2023-05-02")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["follower_sector"], "반도체")
+        self.assertIsNone(rows[0]["p_value"])
+
+    def test_latest_sector_performance_falls_back_to_frozen_year(self) -> None:
+        self._write([_sector_row("2023-05-02", sector="에너지")])
+        database.freeze_summary_years(as_of="2026-04-20")
+
+        conn = database.get_connection()
+        try:
+            rows = database.get_latest_sector_performance(conn, date="2023-05-02")
+        finally:
+            conn.close()
+        self.assertEqual([row["sector"] for row in rows], ["에너지"])
+
+    def test_checkpoint_reports_frozen_years(self) -> None:
+        self._write([_sector_row("2020-01-02")])
+
+        result = database.checkpoint_db()
+
+        self.assertEqual(result["frozen_years"], [2020])
+        self.assertTrue(result["vacuumed_summary"])
+
+
+if __name__ == "__main__":
+    unittest.main()
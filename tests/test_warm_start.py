@@ -0,0 +1,145 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import src.database as database
+from src import warm_start
+
+HAS_ZSTANDARD = importlib.util.find_spec("zstandard") is not None
+
+
+def _stock_row(ticker: str, date: str, **overrides) -> dict:
+    row = {
+        "date": date,
+        "ticker": ticker,
+        "name": f"{ticker} Corp",
+        "country": "KR",
+        "sector": "반도체",
+        "market_cap": 1_000_000_000,
+        "close_price": 100.0,
+        "daily_return": 1.5,
+        "volume": 1_000_000,
+        "avg_volume_20d": 900_000,
+        "is_filtered": 1,
+        "is_abnormal": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+class WarmStartTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tempdir.name)
+        self.data_dir = self.root / "data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.bundle_dir = self.root / "bundle"
+
+        self.patchers = [
+            patch.object(database, "DATA_DIR", self.data_dir),
+            patch.object(database, "DB_PATH", self.data_dir / "marketbot.db"),
+            patch.object(database, "RAW_DB_PATH", self.data_dir / "marketbot_raw.db"),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        self._write(
+            [
+                _stock_row("005930", "2026-01-30"),
+                _stock_row("005930", "2026-02-27"),
+                _stock_row("005930", "2026-03-31"),
+                _stock_row("005930", "2026-04-01"),
+                _stock_row("005930", "2026-05-04"),
+            ]
+        )
+        database.seal_raw_partitions(as_of="2026-05-10")
+
+    def tearDown(self) -> None:
+        for patcher in reversed(self.patchers):
+            patcher.stop()
+        self.tempdir.cleanup()
+
+    def _write(self, rows: list[dict]) -> None:
+        database.init_raw_db()
+        conn = database.get_raw_connection()
+        try:
+            database.upsert_stock_daily(conn, rows)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _close_prices(self) -> list[float]:
+        with database.open_raw_range() as conn:
+            return [
+                row[0] for row in conn.execute("SELECT close_price FROM stock_daily ORDER BY date")
+            ]
+
+    def test_bundle_covers_live_db_and_recent_partitions(self) -> None:
+        self.assertEqual(
+            [path.name for path in warm_start.warm_start_files()],
+            [
+                "marketbot_raw.db",
+                "stock_daily_2026-02.db",
+                "stock_daily_2026-03.db",
+                "stock_daily_2026-04.db",
+            ],
+        )
+
+    def test_round_trip_into_empty_data_dir(self) -> None:
+        stats = warm_start.save_bundle(self.bundle_dir, codec="gzip")
+        self.assertEqual(stats["written"], 4)
+        self.assertLess(stats["bytes_out"], stats["bytes_in"])
+
+        for path in self.data_dir.rglob("*"):
+            if path.is_file():
+                path.unlink()
+        database._reset_schema_guard()
+
+        restored = warm_start.restore_bundle(self.bundle_dir)
+
+        self.assertEqual(restored["restored"], 4)
+        self.assertEqual(self._close_prices(), [100.0, 100.0, 100.0, 100.0])
+
+    def test_unchanged_files_are_skipped_on_save_and_restore(self) -> None:
+        warm_start.save_bundle(self.bundle_dir, codec="gzip")
+        self._write([_stock_row("005930", "2026-05-05", close_price=101.0)])
+
+        stats = warm_start.save_bundle(self.bundle_dir, codec="gzip")
+
+        self.assertEqual((stats["written"], stats["skipped"]), (1, 3))
+        parts = list((self.bundle_dir / warm_start.PARTS_DIRNAME).iterdir())
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(warm_start.restore_bundle(self.bundle_dir)["skipped"], 4)
+
+    def test_restore_rejects_corrupt_part(self) -> None:
+        warm_start.save_bundle(self.bundle_dir, codec="gzip")
+        manifest = warm_start.load_manifest(self.bundle_dir)
+        entry = manifest["files"]["marketbot_raw.db"]
+        other = manifest["files"]["raw_partitions/stock_daily_2026-04.db"]
+        (self.bundle_dir / warm_start.PARTS_DIRNAME / entry["part"]).write_bytes(
+            (self.bundle_dir / warm_start.PARTS_DIRNAME / other["part"]).read_bytes()
+        )
+        database.RAW_DB_PATH.unlink()
+
+        with self.assertRaisesRegex(ValueError, "does not match"):
+            warm_start.restore_bundle(self.bundle_dir)
+        self.assertFalse(database.RAW_DB_PATH.exists())
+
+    @unittest.skipIf(HAS_ZSTANDARD, "zstandard installed")
+    def test_zstd_requires_zstandard(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "zstandard"):
+            warm_start.save_bundle(self.bundle_dir, codec="zstd")
+
+    @unittest.skipUnless(HAS_ZSTANDARD, "zstandard not installed")
+    def test_zstd_round_trip(self) -> None:
+        warm_start.save_bundle(self.bundle_dir, codec="zstd")
+        database.RAW_DB_PATH.unlink()
+
+        self.assertEqual(warm_start.restore_bundle(self.bundle_dir)["restored"], 1)
+        self.assertEqual(len(self._close_prices()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()